@@ -99,6 +99,10 @@ function doPost(e) {
         result = handleGetHandStatus(requestData);
         break;
 
+      case 'batchWrite':
+        result = handleBatchWrite(requestData);
+        break;
+
       case 'test':
         result = {
           status: 'success',
@@ -113,7 +117,7 @@ function doPost(e) {
         result = {
           status: 'error',
           message: `알 수 없는 액션: ${action}`,
-          availableActions: ['updateSheet', 'updateHand', 'analyzeHand', 'updateIndex', 'batchVerify', 'verifyUpdate', 'getHandStatus', 'test'],
+          availableActions: ['updateSheet', 'updateHand', 'analyzeHand', 'updateIndex', 'batchVerify', 'verifyUpdate', 'getHandStatus', 'batchWrite', 'test'],
           receivedAction: action,
           receivedData: requestData
         };
@@ -428,6 +432,170 @@ function updateIndexSheet(indexSheetUrl, handNumber, filename) {
 // 8. 일괄 처리 함수들
 // ========================================
 
+// 여러 행 쓰기와 Index 업데이트를 한 요청으로 처리 (시트마다 openSheetByUrl 한 번,
+// 행마다 연속한 열 구간마다 setValues 한 번 — handleSheetUpdate처럼 쓰는 칸만 건드림)
+// - sheets: [{ sheetUrl, rows: [{ row, values: { 열번호: 값 }, stamp }] }] (stamp면 I열에 현재 시각)
+// - index:  [{ sheetUrl, handNumber, filename }] (updateIndexSheet처럼 A열에서 찾아 E열에 파일명)
+function handleBatchWrite(data) {
+  console.log('📦 일괄 업데이트 시작...');
+
+  const groups = Array.isArray(data.sheets) ? data.sheets : [];
+  const indexUpdates = Array.isArray(data.index) ? data.index : [];
+  if (groups.length === 0 && indexUpdates.length === 0) {
+    return {
+      status: 'error',
+      message: 'sheets 또는 index 배열이 필요합니다'
+    };
+  }
+
+  try {
+    const updateTime = new Date();
+    const opened = {};   // URL → 시트
+    const targets = {};  // 시트 키 → { sheet, rows: { 행: { 열: 값 } }, columnA }
+    const errors = [];
+
+    const target = (url) => {
+      if (!(url in opened)) {
+        opened[url] = url ? openSheetByUrl(url) : null;
+      }
+      const sheet = opened[url];
+      if (!sheet) {
+        return null;
+      }
+      const key = `${sheet.getParent().getId()}#${sheet.getSheetId()}`;
+      if (!targets[key]) {
+        targets[key] = { sheet: sheet, rows: {}, columnA: null };
+      }
+      return targets[key];
+    };
+
+    groups.forEach(group => {
+      const url = group && group.sheetUrl;
+      const t = target(url);
+      if (!t) {
+        errors.push({ sheetUrl: url, message: '시트를 열 수 없습니다. URL과 권한을 확인하세요.' });
+        return;
+      }
+      (group.rows || []).forEach(item => {
+        const row = item ? parseInt(item.row) : NaN;
+        if (isNaN(row) || row < 1 || !item.values || typeof item.values !== 'object') {
+          errors.push({ sheetUrl: url, row: item, message: '유효한 행 번호와 values가 필요합니다' });
+          return;
+        }
+        const cells = t.rows[row] || (t.rows[row] = {});
+        Object.keys(item.values).forEach(col => {
+          const c = parseInt(col);
+          if (isNaN(c) || c < 1) {
+            errors.push({ sheetUrl: url, row: row, message: `잘못된 열 번호: ${col}` });
+            return;
+          }
+          cells[c] = item.values[col];
+        });
+        if (item.stamp) {
+          cells[9] = updateTime;
+        }
+      });
+    });
+
+    indexUpdates.forEach(item => {
+      const url = item && (item.sheetUrl || item.indexSheetUrl);
+      const t = target(url);
+      if (!t) {
+        errors.push({ sheetUrl: url, message: 'Index 시트를 열 수 없습니다' });
+        return;
+      }
+      if (!t.columnA) {
+        const lastRow = t.sheet.getLastRow();
+        t.columnA = lastRow > 0 ? t.sheet.getRange(1, 1, lastRow, 1).getValues() : [];
+      }
+      let foundRow = -1;
+      for (let i = 0; i < t.columnA.length; i++) {
+        const cellValue = t.columnA[i][0];
+        if (cellValue && cellValue.toString().includes(item.handNumber)) {
+          foundRow = i + 1;
+          break;
+        }
+      }
+      if (foundRow === -1) {
+        errors.push({ sheetUrl: url, handNumber: item.handNumber,
+                      message: `핸드 번호 "${item.handNumber}"를 찾을 수 없습니다` });
+        return;
+      }
+      (t.rows[foundRow] || (t.rows[foundRow] = {}))[5] = item.filename;
+    });
+
+    const written = [];
+    Object.keys(targets).forEach(key => {
+      const t = targets[key];
+      const rowNumbers = Object.keys(t.rows)
+        .map(Number)
+        .filter(row => Object.keys(t.rows[row]).length > 0)
+        .sort((a, b) => a - b);
+      if (rowNumbers.length === 0) {
+        return;
+      }
+
+      const maxRow = t.sheet.getMaxRows();
+      const lastRow = rowNumbers[rowNumbers.length - 1];
+      if (lastRow > maxRow) {
+        t.sheet.insertRowsAfter(maxRow, lastRow - maxRow);
+      }
+
+      // 행마다 연속한 열 구간만 setValues (쓰지 않는 칸은 읽지도 다시 쓰지도 않으므로
+      // 그 사이 다른 사용자가 고친 값이나 수식을 덮어쓰지 않음)
+      let cells = 0;
+      rowNumbers.forEach(row => {
+        const columns = Object.keys(t.rows[row]).map(Number).sort((a, b) => a - b);
+        let start = 0;
+        for (let i = 1; i <= columns.length; i++) {
+          if (i < columns.length && columns[i] === columns[i - 1] + 1) {
+            continue;
+          }
+          const segment = columns.slice(start, i).map(col => t.rows[row][col]);
+          t.sheet.getRange(row, columns[start], 1, segment.length).setValues([segment]);
+          cells += segment.length;
+          start = i;
+        }
+      });
+
+      written.push({ sheetName: t.sheet.getName(), rows: rowNumbers.length, cells: cells });
+    });
+
+    SpreadsheetApp.flush();
+
+    if (written.length === 0) {
+      return {
+        status: 'error',
+        message: '기록할 수 있는 항목이 없습니다',
+        errors: errors
+      };
+    }
+
+    const total = written.reduce((sum, item) => sum + item.cells, 0);
+    console.log(`✅ 일괄 업데이트 완료: ${total}개 셀, 오류 ${errors.length}개`);
+
+    const result = {
+      status: 'success',
+      message: `${total}개 셀 일괄 업데이트 완료`,
+      data: {
+        sheets: written,
+        updatedAt: updateTime.toISOString()
+      }
+    };
+    if (errors.length > 0) {
+      result.errors = errors;
+    }
+    return result;
+
+  } catch (error) {
+    console.error('❌ 일괄 업데이트 오류:', error);
+    return {
+      status: 'error',
+      message: error.toString()
+    };
+  }
+}
+
 function handleBatchVerify(data) {
   console.log('🚀 일괄 상태 확인 시작...');
 
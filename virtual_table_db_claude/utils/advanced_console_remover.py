@@ -2,64 +2,64 @@
 # -*- coding: utf-8 -*-
 
 import re
+import sys
+from typing import Optional, Tuple
 
-def advanced_clean_console_logs(file_path):
-    """더 정교한 콘솔 로그 제거"""
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from console_stripper import strip_console_calls
+from run_report import RunReport, subn
+from targets import expand_targets
 
-    # 제거할 패턴들 (더 포괄적)
-    advanced_patterns = [
-        # AI 관련 console.log (이모지 포함)
-        r'console\.log\([^)]*["\']AI["\'][^)]*✅[^)]*\);?\s*\n?',
+def transform(content: str, path: str = '', report: Optional[RunReport] = None) -> Tuple[str, int]:
+    """메모리 버퍼에서 태그 로그 제거 후 (내용, 제거 개수) 반환"""
 
-        # SHEET 관련 (일부는 남겨두고 디버그성만)
-        r'console\.log\([^)]*["\']SHEET["\'][^)]*🚀[^)]*\);?\s*\n?',
-        r'console\.log\([^)]*["\']SHEET["\'][^)]*ℹ️[^)]*\);?\s*\n?',
+    # 제거 대상 태그/이모지 조합 (일부 SHEET/PERFORMANCE 로그는 남겨둠)
+    advanced_patterns = re.compile(
+        r'["\']AI["\'][\s\S]*✅'
+        r'|["\']SHEET["\'][\s\S]*(?:🚀|ℹ️)'
+        r'|["\']PERFORMANCE["\'][\s\S]*ℹ️'
+        r'|["\']CACHE["\'][\s\S]*💾'
+    )
 
-        # PERFORMANCE 관련
-        r'console\.log\([^)]*["\']PERFORMANCE["\'][^)]*ℹ️[^)]*\);?\s*\n?',
+    def is_target(call_text, method):
+        return advanced_patterns.search(call_text) is not None
 
-        # CACHE 관련 (성공 메시지)
-        r'console\.log\([^)]*["\']CACHE["\'][^)]*💾[^)]*\);?\s*\n?',
+    # 태그가 붙은 console.log와 주석 처리된 console.log를 한 번의 스캔으로 제거
+    content, calls = strip_console_calls(content, path, methods=('log',),
+                                         include_debuglog=False, predicate=is_target,
+                                         strip_commented=True, report=report)
+    removed_count = len(calls)
 
-        # 주석처리된 디버그 로그 제거
-        r'//\s*console\.log\([^)]*\);\s*//[^\\n]*\n?',
+    # 연속된 빈 줄 정리
+    content, _ = subn(report, 'collapse_blank_lines', r'\n\s*\n\s*\n', '\n\n', content)
 
-        # 빈 줄과 주석만 있는 줄들도 정리
-        r'\n\s*\n\s*\n',  # 3개 이상 연속 빈 줄을 2개로
-    ]
+    return content, removed_count
 
-    removed_count = 0
+def advanced_clean_console_logs(file_path):
+    """더 정교한 콘솔 로그 제거"""
 
-    for pattern in advanced_patterns:
-        matches = list(re.finditer(pattern, content, re.MULTILINE | re.DOTALL))
-        for match in reversed(matches):
-            content = content[:match.start()] + content[match.end():]
-            removed_count += 1
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
 
-    # 연속된 빈 줄 정리
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    report = RunReport('advanced_console_remover', file_path)
+    report.record_before(content)
+    content, removed_count = transform(content, file_path, report)
+    report.record_after(content)
 
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
 
     print(f"Additional console logs removed: {removed_count}")
 
-    # 최종 개수 확인
-    remaining = len(re.findall(r'console\.', content))
-    print(f"Remaining console calls: {remaining}")
+    # 최종 개수 확인 (문자열/주석 안의 'console.'은 제외한 실제 호출)
+    after = report.console_after
+    print(f"Remaining console calls: {sum(after.values())}")
 
     # 남은 콘솔 로그들의 타입별 개수
-    error_count = len(re.findall(r'console\.error', content))
-    warn_count = len(re.findall(r'console\.warn', content))
-    log_count = len(re.findall(r'console\.log', content))
-
-    print(f"  - console.error: {error_count} (mostly preserved for critical error handling)")
-    print(f"  - console.warn: {warn_count}")
-    print(f"  - console.log: {log_count}")
+    print(f"  - console.error: {after.get('console.error', 0)} (mostly preserved for critical error handling)")
+    print(f"  - console.warn: {after.get('console.warn', 0)}")
+    print(f"  - console.log: {after.get('console.log', 0)}")
+    print(f"Report: {report.write()}")
 
 if __name__ == "__main__":
-    html_file = r"C:\claude\virtual_table_db_claude\index.html"
-    advanced_clean_console_logs(html_file)
\ No newline at end of file
+    for html_file in expand_targets(sys.argv[1:]):
+        advanced_clean_console_logs(html_file)
\ No newline at end of file
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정리/수정 스크립트 벤치마크
+- index.html 형태의 합성 입력(350KB~50MB)을 정답 개수와 함께 생성
+- 단계마다 새 프로세스에서 실행해 실행 시간, 최대 RSS, 처리량(MB/s) 측정
+- 결과를 JSON으로 저장하고 이전 결과와 비교해 회귀 표시
+
+사용법:
+    python benchmark.py [--sizes 350K,2M,10M,50M] [--stages strip_console,stream] [--output 결과.json]
+    python benchmark.py --compare 이전결과.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pipeline import STAGES
+from targets import CACHE_DIR_NAME, REPO_ROOT
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = ('350K', '2M', '10M', '50M')
+# 파이프라인 단계 + 스트리밍 제거기
+STREAM_STAGE = 'stream'
+BENCH_STAGES = tuple(STAGES) + (STREAM_STAGE,)
+DEFAULT_TIMEOUT = 120.0
+# 이전 결과 대비 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_RATIO = 1.10
+# 한 <script> 블록의 대략적인 최대 크기
+SCRIPT_BLOCK_SIZE = 256 * 1024
+
+_UNITS = {'K': 1024, 'M': 1024 * 1024, 'G': 1024 * 1024 * 1024}
+
+
+class Case(NamedTuple):
+    stage: str
+    size_label: str
+    input_bytes: int
+    status: str            # 'ok', 'timeout', 'error'
+    seconds: Optional[float]
+    mb_per_s: Optional[float]
+    peak_rss_kb: Optional[int]
+    input_rss_kb: Optional[int]   # 입력을 읽은 직후 RSS (단계 자체 사용량 = peak - input)
+    edits: Optional[int]
+    expected: Optional[int]
+    error: Optional[str]
+
+
+def parse_size(text: str) -> int:
+    """'350K', '2M', '1048576' 형식을 바이트 수로 변환"""
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+# ---------------------------------------------------------------------------
+# 합성 입력 생성
+# ---------------------------------------------------------------------------
+
+GROUND_TRUTH_KEYS = (
+    'console_log',      # 실제 console.log 호출 (아래 두 항목 포함)
+    'tagged_log',       # 'AI' 태그 + ✅ (advanced_console 제거 대상)
+    'multiline_log',    # 여러 줄에 걸친 console.log
+    'debug_log',        # debugLog(...) 호출
+    'console_error',    # catch 블록 안의 console.error (보존 대상)
+    'commented_log',    # 주석 처리된 console.log
+    'decoy_string',     # 문자열 안의 'console.log(' (호출 아님)
+    'template_literal', # 템플릿 리터럴 개수
+)
+
+# 단계별로 정답과 비교할 수정 횟수
+EXPECTED_EDITS = {
+    'strip_console': ('console_log', 'debug_log'),
+    'final_console': ('console_log',),
+    'advanced_console': ('tagged_log', 'commented_log'),
+    STREAM_STAGE: ('console_log', 'debug_log'),
+}
+
+_NAMES = ('handNumber', 'tableId', 'playerName', 'seatIndex', 'chipCount', 'rowIndex')
+_EMOJI = ('🔍', '📊', '🔄', '🎯', '💾', '🚀')
+
+
+def _fragment(rng: random.Random, i: int, counts: Dict[str, int]) -> str:
+    """index.html 스크립트와 비슷한 코드 조각 하나와 정답 개수 갱신"""
+    name = rng.choice(_NAMES)
+    kind = rng.randrange(10)
+    if kind == 0:
+        counts['console_log'] += 1
+        counts['tagged_log'] += 1
+        counts['template_literal'] += 1
+        return f"    console.log('AI', `✅ 분석 완료: ${{{name}}} #{i}`);\n"
+    if kind == 1:
+        counts['console_log'] += 1
+        return f"    console.log('{rng.choice(_EMOJI)} [DEBUG] {name}:', {name}, {i});\n"
+    if kind == 2:
+        counts['console_log'] += 1
+        counts['multiline_log'] += 1
+        counts['template_literal'] += 1
+        return (f"    console.log(\n"
+                f"      `{rng.choice(_EMOJI)} 통계 ${{{name}}}/{i}`,\n"
+                f"      {{ total: {i}, ok: true }}\n"
+                f"    );\n")
+    if kind == 3:
+        counts['debug_log'] += 1
+        counts['template_literal'] += 1
+        return f"    debugLog(`🔄 동기화 ${{{name}}} ({i})`);\n"
+    if kind == 4:
+        counts['console_error'] += 1
+        return (f"    try {{\n"
+                f"      await updateSheet{i % 7}({name});\n"
+                f"    }} catch (error) {{\n"
+                f"      console.error('❌ [ERROR] 시트 업데이트 실패:', error);\n"
+                f"    }}\n")
+    if kind == 5:
+        counts['template_literal'] += 1
+        return (f"    const row{i} = `<tr data-id=\"${{{name}}}\"><td>${{{name}}}</td>"
+                f"<td>{i}</td></tr>`;\n")
+    if kind == 6:
+        counts['decoy_string'] += 1
+        return f"    const hint{i} = \"console.log('{name}') 는 호출이 아님\";\n"
+    if kind == 7:
+        counts['commented_log'] += 1
+        return f"    // console.log('old {name}', {i});\n"
+    if kind == 8:
+        return (f"    if ({name} > {i}) {{\n"
+                f"      {name} = Math.max({name} / 2, {i % 97});\n"
+                f"    }}\n")
+    return f"    const value{i} = data.{name} ? data.{name}.trim() : '';\n"
+
+
+def generate_index_html(target_bytes: int, seed: int = 0,
+                        block_size: int = SCRIPT_BLOCK_SIZE) -> Tuple[str, Dict[str, int]]:
+    """target_bytes 크기의 index.html 형태 문서와 정답 개수 반환
+
+    스크립트는 block_size 단위의 <script> 블록으로 나눈다. 실제 index.html처럼
+    하나의 거대한 블록을 만들려면 block_size를 target_bytes 이상으로 준다.
+    """
+    rng = random.Random(seed)
+    counts = {key: 0 for key in GROUND_TRUTH_KEYS}
+    head = ('<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="UTF-8">\n'
+            '<title>Virtual Table DB</title>\n<style>\n'
+            'body { font-family: sans-serif; }\n.hand-row { padding: 4px; }\n'
+            '</style>\n</head>\n<body>\n<div id="app"><table id="hands"></table></div>\n')
+    tail = '</body>\n</html>\n'
+
+    parts = [head]
+    size = len(head.encode('utf-8')) + len(tail.encode('utf-8'))
+    i = 0
+    while size < target_bytes:
+        block = ['<script>\n']
+        written = 0
+        while written < block_size and size + written < target_bytes:
+            body = [f'async function handler{i}(data) {{\n']
+            for _ in range(rng.randrange(4, 12)):
+                body.append(_fragment(rng, i, counts))
+                i += 1
+            body.append('}\n\n')
+            text = ''.join(body)
+            block.append(text)
+            written += len(text.encode('utf-8'))
+        block.append('</script>\n')
+        text = ''.join(block)
+        parts.append(text)
+        size += len(text.encode('utf-8'))
+    parts.append(tail)
+    return ''.join(parts), counts
+
+
+# ---------------------------------------------------------------------------
+# 측정 (자식 프로세스)
+# ---------------------------------------------------------------------------
+
+def _max_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _measure(stage: str, input_path: str, conn):
+    """자식 프로세스: 입력을 읽고 단계 하나를 실행한 뒤 측정값을 전송"""
+    # 수정기들의 줄 단위 진행 로그가 측정 출력에 섞이지 않도록 버림
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    try:
+        if stage == STREAM_STAGE:
+            from stream_cleaner import strip_file_streaming
+            input_rss = _max_rss_kb()
+            started = time.perf_counter()
+            stats = strip_file_streaming(input_path, input_path + '.out')
+            seconds = time.perf_counter() - started
+            edits = stats.removed
+        else:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            input_rss = _max_rss_kb()
+            started = time.perf_counter()
+            _, edits = STAGES[stage](content, input_path)
+            seconds = time.perf_counter() - started
+        conn.send(('ok', seconds, edits, _max_rss_kb(), input_rss, None))
+    except Exception as e:  # 측정 실패도 결과로 기록
+        conn.send(('error', None, None, None, None, f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+def measure(stage: str, input_path: str, timeout: float) -> Tuple:
+    """새 프로세스에서 단계를 실행 (RSS가 다른 측정과 섞이지 않도록 spawn 사용)"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_measure, args=(stage, input_path, child))
+    process.start()
+    child.close()
+    try:
+        if parent.poll(timeout):
+            return parent.recv()
+        return ('timeout', None, None, None, None, f'{timeout:.0f}s 초과')
+    except EOFError:
+        return ('error', None, None, None, None, f'exit code {process.exitcode}')
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        parent.close()
+
+
+def run_benchmark(sizes: Sequence[str], stages: Sequence[str], timeout: float = DEFAULT_TIMEOUT,
+                  seed: int = 0, work_dir: Optional[str] = None,
+                  block_size: int = SCRIPT_BLOCK_SIZE) -> Tuple[List[Case], Dict[str, Dict[str, int]]]:
+    """크기별 입력을 생성하고 모든 단계를 측정"""
+    unknown = [name for name in stages if name not in BENCH_STAGES]
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {', '.join(unknown)} (사용 가능: {', '.join(BENCH_STAGES)})")
+
+    cases = []
+    truths = {}
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        for label in sizes:
+            content, truth = generate_index_html(parse_size(label), seed, block_size)
+            truths[label] = truth
+            input_path = os.path.join(tmp, f'index-{label}.html')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            input_bytes = os.path.getsize(input_path)
+            del content
+
+            for stage in stages:
+                status, seconds, edits, peak, input_rss, error = measure(stage, input_path, timeout)
+                keys = EXPECTED_EDITS.get(stage)
+                expected = sum(truth[key] for key in keys) if keys else None
+                mb_per_s = input_bytes / (1024 * 1024) / seconds if seconds else None
+                case = Case(stage, label, input_bytes, status, seconds, mb_per_s, peak,
+                            input_rss, edits, expected, error)
+                cases.append(case)
+                print_case(case)
+    return cases, truths
+
+
+# ---------------------------------------------------------------------------
+# 결과 저장/비교
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def save_results(cases: List[Case], truths: Dict[str, Dict[str, int]],
+                 output_path: Optional[str] = None) -> str:
+    commit = _git_commit()
+    if output_path is None:
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        output_path = os.path.join(REPO_ROOT, CACHE_DIR_NAME, 'benchmarks',
+                                   f'bench-{stamp}-{commit or "nogit"}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    data = {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'ground_truth': truths,
+        'cases': [case._asdict() for case in cases],
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return output_path
+
+
+def load_results(path: str) -> List[Case]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [Case(**case) for case in data['cases']]
+
+
+def compare_results(base: List[Case], current: List[Case],
+                    ratio: float = REGRESSION_RATIO) -> List[Tuple[Case, Case, float]]:
+    """(stage, size)가 같은 케이스끼리 비교해 ratio 이상 느려진 목록 반환"""
+    previous = {(c.stage, c.size_label): c for c in base}
+    regressions = []
+    for case in current:
+        old = previous.get((case.stage, case.size_label))
+        if old is None or not old.seconds or not case.seconds:
+            continue
+        change = case.seconds / old.seconds
+        mark = '🔺' if change >= ratio else ('🔻' if change <= 1 / ratio else '  ')
+        print(f"{mark} {case.stage:<22} {case.size_label:>5}  "
+              f"{old.seconds * 1000:10.1f} → {case.seconds * 1000:10.1f} ms  x{change:.2f}")
+        if change >= ratio:
+            regressions.append((old, case, change))
+    return regressions
+
+
+def print_case(case: Case):
+    if case.status != 'ok':
+        print(f"⚠️  {case.stage:<22} {case.size_label:>5}  {case.status}: {case.error}")
+        return
+    check = ''
+    if case.expected is not None:
+        check = '✅' if case.edits == case.expected else f'❌ (정답 {case.expected})'
+    print(f"⏱️  {case.stage:<22} {case.size_label:>5}  {case.seconds * 1000:10.1f} ms  "
+          f"{case.mb_per_s:8.2f} MB/s  RSS {case.peak_rss_kb / 1024:7.1f} MB  "
+          f"{case.edits:7d} edits {check}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 index.html로 정리/수정 단계 성능 측정")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="쉼표로 구분한 입력 크기 (예: 350K,2M)")
+    parser.add_argument('--stages', default=','.join(BENCH_STAGES),
+                        help=f"쉼표로 구분한 단계 (사용 가능: {', '.join(BENCH_STAGES)})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="케이스당 제한 시간(초)")
+    parser.add_argument('--seed', type=int, default=0, help="입력 생성 시드")
+    parser.add_argument('--block-size', default='256K', help="<script> 블록 하나의 크기 (예: 50M이면 단일 블록)")
+    parser.add_argument('--work-dir', help="합성 입력을 만들 임시 디렉터리 위치")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본: .cleanup_cache/benchmarks/)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--fail-on-regression', action='store_true', help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    try:
+        cases, truths = run_benchmark(sizes, stages, args.timeout, args.seed, args.work_dir,
+                                      parse_size(args.block_size))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    output_path = save_results(cases, truths, args.output)
+    print(f"💾 결과 저장: {output_path}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), cases)
+        print(f"📊 회귀 {len(regressions)}건 (기준 x{REGRESSION_RATIO:.2f})")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
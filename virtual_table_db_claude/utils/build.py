@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로덕션 빌드: 인라인 스크립트를 외부 번들로 분리
+- index.html의 인라인 <script> 블록을 추출해 console/debugLog 제거 (pipeline 단계 재사용)
+- 토큰 단위 축소: 주석/들여쓰기 제거, 문자열/템플릿/정규식은 그대로 두고
+  줄바꿈은 ASI가 바뀌지 않도록 유지. 축소 전후 토큰 열이 같은지 확인
+- 최상위 문장 경계에서 몇 개의 번들로 나누고 내용 해시를 파일명에 붙여 장기 캐시 가능하게 함
+  (앞 번들이 실행 중에 뒤 번들의 function/var 선언을 쓰면 그 경계에서는 나누지 않음)
+- 출력 디렉터리에 index.html을 다시 써서 번들을 순서대로 <script src>로 참조
+- 구문 오류가 있는 블록은 축소/분할 없이 제거만 한 번들 하나로 내보냄 (--strict면 중단)
+- HTML이 참조하는 로컬 <script src>/<link href> 파일은 같은 상대 경로로 출력 디렉터리에 복사.
+  원본에 없는 로컬 참조가 하나라도 있으면 빌드 실패
+
+사용법:
+    python build.py [index.html] [--out-dir dist] [--bundle-size 131072] [--min-inline 4096]
+                    [--stages strip_console] [--no-minify] [--strict]
+"""
+
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from incremental import top_level_cuts
+from js_lexer import COMMENT, NAME, NUMBER, PUNCT, TRIVIA, WS, apply_splices, tokenize
+from js_verify import verify
+from pipeline import DEFAULT_STAGES, run_stages
+from source_index import FUNCTION, SourceIndex
+from targets import REPO_ROOT
+
+DEFAULT_OUT_DIR = 'dist'
+ASSETS_DIR = 'assets'
+MANIFEST_NAME = 'build-manifest.json'
+# 번들 하나의 목표 크기 (축소 후 문자 수)
+DEFAULT_BUNDLE_SIZE = 128 * 1024
+# 이보다 작은 블록은 요청 수만 늘리므로 인라인으로 둠
+DEFAULT_MIN_INLINE = 4 * 1024
+HASH_LENGTH = 10
+
+_SCRIPT_CLOSE_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+_MODULE_TYPE_RE = re.compile(r'\btype\s*=\s*["\']?module\b', re.IGNORECASE)
+_ID_CHAR_RE = re.compile(r'[\w$\\\u0080-\U0010ffff]')
+# 출력 디렉터리에 함께 있어야 하는 참조: <script src>, <link href>
+_REF_TAG_RE = re.compile(r'<(script|link)\b((?:"[^"]*"|\'[^\']*\'|[^"\'>])*)>', re.IGNORECASE)
+_REF_ATTR_RE = re.compile(r'\b(src|href)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+# 스킴(https:, data: ...), 프로토콜 상대(//), 조각(#)은 로컬 파일이 아님
+_EXTERNAL_REF_RE = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//|#)')
+
+
+class Bundle(NamedTuple):
+    path: str        # 출력 디렉터리 기준 경로 (assets/index.1.<hash>.js)
+    size: int        # 바이트
+    gzip_size: int
+
+
+class BuildResult(NamedTuple):
+    html_path: str
+    bundles: List[Bundle]
+    html_before: int          # 원본 HTML 바이트
+    html_before_gzip: int
+    html_after: int           # 번들을 참조하도록 다시 쓴 HTML 바이트
+    html_after_gzip: int
+    skipped: List[str]        # 축소/분할을 건너뛴 블록 설명
+    copied: List[str] = []    # 출력 디렉터리에 복사한 로컬 참조 파일 (출력 디렉터리 기준 경로)
+
+    @property
+    def first_load_gzip(self) -> int:
+        return self.html_after_gzip + sum(b.gzip_size for b in self.bundles)
+
+    @property
+    def repeat_load_gzip(self) -> int:
+        # 번들은 해시 파일명이라 캐시에서 읽고 HTML만 다시 받음
+        return self.html_after_gzip
+
+
+def _gzip_size(data: bytes) -> int:
+    return len(gzip.compress(data, 9, mtime=0))
+
+
+def _needs_space(prev: str, prev_kind: str, value: str) -> bool:
+    """공백을 지우면 두 토큰이 붙어 다른 토큰이 되는지"""
+    a, b = prev[-1], value[0]
+    if _ID_CHAR_RE.match(a) and _ID_CHAR_RE.match(b):
+        return True
+    if (a == '+' and b == '+') or (a == '-' and b == '-'):
+        return True
+    if a == '/' and b in '/*':
+        return True
+    if (a == '<' and b == '!') or (a == '-' and b == '>'):
+        return True  # <!-- / --> 는 스크립트 안에서도 HTML 주석으로 해석될 수 있음
+    return prev_kind == NUMBER and b == '.'
+
+
+def minify_js(text: str) -> str:
+    """주석과 불필요한 공백을 제거 (문자열/템플릿/정규식 토큰은 원문 그대로)
+
+    공백에 줄바꿈이 있었으면 줄바꿈 하나를 남겨 자동 세미콜론 삽입 결과를 유지한다.
+    '/' 주변 공백은 렉서가 나눗셈/정규식을 잘못 구분했을 때를 대비해 남긴다.
+    """
+    out = []
+    prev = None
+    prev_kind = None
+    gap = False
+    newline = False
+    for tok in tokenize(text):
+        if tok.kind in TRIVIA:
+            gap = True
+            if tok.kind == WS or text.startswith('/*', tok.start):
+                newline = newline or text.find('\n', tok.start, tok.end) >= 0
+            continue
+        value = text[tok.start:tok.end]
+        if prev is not None and gap:
+            if newline:
+                out.append('\n')
+            elif _needs_space(prev, prev_kind, value) or \
+                    (tok.kind == PUNCT and value[0] == '/') or \
+                    (prev_kind == PUNCT and prev[0] == '/'):
+                out.append(' ')
+        out.append(value)
+        prev, prev_kind = value, tok.kind
+        gap = newline = False
+    return ''.join(out)
+
+
+def _significant(text: str) -> List[str]:
+    return [text[tok.start:tok.end] for tok in tokenize(text) if tok.kind not in TRIVIA]
+
+
+def _hoisted_names(index: SourceIndex) -> Tuple[Dict[str, int], List[Tuple[int, str]],
+                                                 Dict[str, Set[str]]]:
+    """(최상위 function/var 선언 위치, 즉시 실행 위치의 이름 참조, 선언 함수 본문별 참조 이름)
+
+    최상위 function 선언의 본문 밖은 모두 즉시 실행될 수 있는 코드로 본다
+    (익명 함수/화살표 함수/메서드 본문 포함, 보수적으로).
+    """
+    text = index.content
+    sig = [tok for tok in index.tokens[0] if tok.kind != COMMENT] if index.tokens else []
+    sig_starts = [tok.start for tok in sig]
+
+    def statement_start(offset: int) -> bool:
+        # function 선언(문장 시작)과 함수 식 구분
+        i = bisect.bisect_left(sig_starts, offset)
+        return i == 0 or text[sig[i - 1].start:sig[i - 1].end] in (';', '{', '}')
+
+    declarations = [f for f in index.functions
+                    if f.kind == FUNCTION and f.name and text.startswith('function', f.start)
+                    and index.function_at(f.start - 1) is None and statement_start(f.start)]
+    hoisted: Dict[str, int] = {}
+    for f in declarations:
+        hoisted.setdefault(f.name, f.start)
+    bodies: Dict[str, Set[str]] = {f.name: set() for f in declarations}
+    starts = [f.start for f in declarations]
+    immediate: List[Tuple[int, str]] = []
+    for i, tok in enumerate(sig):
+        if tok.kind != NAME:
+            continue
+        name = text[tok.start:tok.end]
+        if i > 0 and text[sig[i - 1].start:sig[i - 1].end] in ('.', '?.'):
+            continue
+        if name == 'var' and i + 1 < len(sig) and sig[i + 1].kind == NAME and \
+                index.function_at(tok.start) is None:
+            hoisted.setdefault(text[sig[i + 1].start:sig[i + 1].end], tok.start)
+        j = bisect.bisect_right(starts, tok.start) - 1
+        if j >= 0 and tok.start < declarations[j].end:
+            bodies[declarations[j].name].add(name)
+        else:
+            immediate.append((tok.start, name))
+    return hoisted, immediate, bodies
+
+
+def split_bundle(text: str, bundle_size: int = DEFAULT_BUNDLE_SIZE) -> List[str]:
+    """최상위 문장 경계에서 bundle_size 안팎의 조각으로 분할
+
+    경계 앞의 코드가 (즉시 실행되는 코드에서 호출 가능한 함수 본문까지 따라가서) 경계 뒤의
+    최상위 function/var 선언을 참조하면, 한 스크립트였을 때와 달리 아직 정의되지 않으므로
+    그 경계는 건너뛴다.
+    """
+    if len(text) <= bundle_size:
+        return [text]
+    index = SourceIndex(text, 'bundle.js')
+    hoisted, immediate, bodies = _hoisted_names(index)
+
+    def safe(cut: int) -> bool:
+        seen: Set[str] = set()
+        pending = [name for offset, name in immediate if offset < cut]
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            declared = hoisted.get(name)
+            if declared is None:
+                continue
+            if declared >= cut:
+                return False
+            pending.extend(bodies.get(name, ()))
+        return True
+
+    parts = []
+    start = 0
+    for cut in top_level_cuts(index, 0):
+        if cut - start >= bundle_size and len(text) - cut >= bundle_size // 4 and safe(cut):
+            parts.append(text[start:cut])
+            start = cut
+    parts.append(text[start:])
+    return parts
+
+
+def _script_tag(html: str, lo: int, hi: int) -> Tuple[int, int, str]:
+    """본문 범위 (lo, hi)를 감싸는 <script ...>...</script>의 (시작, 끝, 여는 태그 속성)"""
+    tag_start = html.rfind('<script', 0, lo)
+    attrs = html[tag_start + len('<script'):lo - 1]
+    close = _SCRIPT_CLOSE_RE.match(html, hi)
+    return tag_start, close.end() if close else hi, attrs
+
+
+def _content_name(stem: str, i: int, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{i}.{digest}.js"
+
+
+def local_refs(html: str, regions: Sequence[Tuple[int, int]] = ()) -> List[str]:
+    """<script src>/<link href> 중 로컬 파일 참조 (쿼리/조각 제거, 등장 순서, 중복 제거).
+    regions(인라인 스크립트 본문) 안의 문자열에 든 태그는 제외"""
+    starts = [lo for lo, _ in regions]
+    refs: List[str] = []
+    for tag in _REF_TAG_RE.finditer(html):
+        i = bisect.bisect_right(starts, tag.start()) - 1
+        if i >= 0 and tag.start() < regions[i][1]:
+            continue
+        attr = _REF_ATTR_RE.search(tag.group(2))
+        if not attr:
+            continue
+        value = next(v for v in attr.group(2, 3, 4) if v is not None).strip()
+        if not value or _EXTERNAL_REF_RE.match(value):
+            continue
+        path = re.split(r'[?#]', value, maxsplit=1)[0]
+        if path and path not in refs:
+            refs.append(path)
+    return refs
+
+
+def _resolve_refs(refs: Sequence[str], base_dir: str) -> List[Tuple[str, str]]:
+    """로컬 참조를 (출력 기준 상대 경로, 원본 경로)로. 없는 파일이나 밖을 가리키는 참조는 ValueError"""
+    resolved = []
+    unresolved = []
+    for ref in refs:
+        rel = os.path.normpath(ref.lstrip('/'))
+        source = os.path.join(base_dir, rel)
+        if rel.startswith(os.pardir) or os.path.isabs(rel) or not os.path.isfile(source):
+            unresolved.append(ref)
+        else:
+            resolved.append((rel, source))
+    if unresolved:
+        raise ValueError(f"출력에 포함할 수 없는 로컬 참조: {', '.join(unresolved)}")
+    return resolved
+
+
+def build(html_path: str, out_dir: Optional[str] = None, bundle_size: int = DEFAULT_BUNDLE_SIZE,
+          min_inline: int = DEFAULT_MIN_INLINE, stages: Sequence[str] = DEFAULT_STAGES,
+          minify: bool = True, strict: bool = False) -> BuildResult:
+    """html_path의 인라인 스크립트를 번들로 빼서 out_dir에 index.html과 assets/를 기록"""
+    if out_dir is None:
+        out_dir = os.path.join(REPO_ROOT, DEFAULT_OUT_DIR)
+    with open(html_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    html, _ = run_stages(original, stages, html_path, verify=True)
+    index = SourceIndex.of(html, html_path)
+    issues = verify(html, html_path)
+    stem = os.path.splitext(os.path.basename(html_path))[0]
+
+    splices = []
+    files: List[Tuple[str, bytes]] = []
+    skipped = []
+    for lo, hi in index.regions:
+        body = html[lo:hi]
+        if len(body) < min_inline:
+            continue
+        tag_start, tag_end, attrs = _script_tag(html, lo, hi)
+        broken = [issue for issue in issues if lo <= issue.offset < hi]
+        if broken:
+            if strict:
+                raise ValueError(f"구문 오류가 있는 스크립트 블록 (line {index.line_of(lo)}): {broken[0]}")
+            skipped.append(f"line {index.line_of(lo)}: 구문 오류 {len(broken)}개, 첫 오류 {broken[0]}")
+            parts = [body]
+        else:
+            code = body
+            if minify:
+                code = minify_js(body)
+                if _significant(code) != _significant(body):
+                    raise ValueError(f"축소 전후 토큰이 다름 (line {index.line_of(lo)})")
+            # 모듈은 최상위 스코프를 공유하지 않으므로 나누지 않음
+            parts = [code] if _MODULE_TYPE_RE.search(attrs) else split_bundle(code, bundle_size)
+
+        tags = []
+        for part in parts:
+            data = part.strip('\n').encode('utf-8') + b'\n'
+            name = _content_name(stem, len(files) + 1, data)
+            files.append((name, data))
+            tags.append(f'<script{attrs} src="{ASSETS_DIR}/{name}"></script>')
+        splices.append((tag_start, tag_end, '\n  '.join(tags)))
+
+    output = apply_splices(html, splices)
+    # 번들로 바꾼 태그는 인라인 블록이라 원본 HTML의 참조만 보면 됨
+    refs = _resolve_refs(local_refs(html, index.regions), os.path.dirname(os.path.abspath(html_path)))
+    _write_output(out_dir, os.path.basename(html_path), output, files, refs)
+
+    before = original.encode('utf-8')
+    after = output.encode('utf-8')
+    bundles = [Bundle(f'{ASSETS_DIR}/{name}', len(data), _gzip_size(data)) for name, data in files]
+    result = BuildResult(html_path, bundles, len(before), _gzip_size(before),
+                         len(after), _gzip_size(after), skipped, [rel for rel, _ in refs])
+    _write_manifest(out_dir, result)
+    return result
+
+
+def _write_output(out_dir: str, html_name: str, html: str, files: List[Tuple[str, bytes]],
+                  refs: Sequence[Tuple[str, str]] = ()):
+    """번들, 참조 파일, HTML 기록. 이전 빌드 매니페스트에 있던 번들 중 안 쓰게 된 파일은 삭제"""
+    assets = os.path.join(out_dir, ASSETS_DIR)
+    os.makedirs(assets, exist_ok=True)
+    previous = _read_manifest(out_dir)
+    current = set()
+    for name, data in files:
+        current.add(f'{ASSETS_DIR}/{name}')
+        path = os.path.join(assets, name)
+        if not os.path.exists(path):  # 해시 파일명이므로 있으면 내용도 같음
+            with open(path, 'wb') as f:
+                f.write(data)
+    for stale in previous - current:
+        path = os.path.join(out_dir, stale)
+        if os.path.exists(path):
+            os.remove(path)
+    for rel, source in refs:
+        target = os.path.join(out_dir, rel)
+        os.makedirs(os.path.dirname(target) or out_dir, exist_ok=True)
+        shutil.copyfile(source, target)
+    with open(os.path.join(out_dir, html_name), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def _read_manifest(out_dir: str) -> Set[str]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return {bundle['path'] for bundle in json.load(f).get('bundles', [])}
+    except (OSError, ValueError):
+        return set()
+
+
+def _write_manifest(out_dir: str, result: BuildResult):
+    data = {
+        'html': os.path.basename(result.html_path),
+        'bundles': [bundle._asdict() for bundle in result.bundles],
+        'html_before': result.html_before,
+        'html_before_gzip': result.html_before_gzip,
+        'html_after': result.html_after,
+        'html_after_gzip': result.html_after_gzip,
+        'first_load_gzip': result.first_load_gzip,
+        'repeat_load_gzip': result.repeat_load_gzip,
+        'skipped': result.skipped,
+        'copied': result.copied,
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def print_result(result: BuildResult, out_dir: str):
+    print(f"📦 {result.html_path} → {out_dir}")
+    for bundle in result.bundles:
+        print(f"  - {bundle.path:<40} {bundle.size:9d} B  (gzip {bundle.gzip_size} B)")
+    for path in result.copied:
+        print(f"  - {path:<40} (복사)")
+    for note in result.skipped:
+        print(f"  ⚠️ 축소/분할 생략 {note}")
+    print(f"  HTML {result.html_before} B → {result.html_after} B")
+    print(f"  첫 로드 (gzip): {result.html_before_gzip} B → {result.first_load_gzip} B")
+    print(f"  재방문 (gzip, 번들 캐시): {result.html_before_gzip} B → {result.repeat_load_gzip} B")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인라인 스크립트를 해시 번들로 분리하는 프로덕션 빌드")
+    parser.add_argument('html', nargs='?', default=os.path.join(REPO_ROOT, 'index.html'),
+                        help="대상 HTML (기본: index.html)")
+    parser.add_argument('--out-dir', default=os.path.join(REPO_ROOT, DEFAULT_OUT_DIR),
+                        help="출력 디렉터리 (기본: dist/)")
+    parser.add_argument('--bundle-size', type=int, default=DEFAULT_BUNDLE_SIZE,
+                        help="번들 하나의 목표 크기 (문자 수)")
+    parser.add_argument('--min-inline', type=int, default=DEFAULT_MIN_INLINE,
+                        help="이보다 작은 스크립트 블록은 인라인으로 둠")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help="번들 전에 적용할 pipeline 단계 (쉼표 구분)")
+    parser.add_argument('--no-minify', action='store_true', help="축소 없이 분리만")
+    parser.add_argument('--strict', action='store_true', help="구문 오류가 있는 블록이 있으면 중단")
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    try:
+        result = build(args.html, args.out_dir, args.bundle_size, args.min_inline, stages,
+                       minify=not args.no_minify, strict=args.strict)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print_result(result, args.out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+호출 그래프 분석과 죽은 함수 제거
+- index.html 인라인 스크립트와 <script src>로 불러오는 로컬 JS 파일을 한 전역 스코프로 보고 분석
+- 노드: SourceIndex가 찾은 이름 있는 함수 (function 선언/식, 화살표 함수, 메서드)
+- 간선: 함수 본문 안의 이름 참조 (호출뿐 아니라 콜백으로 넘기는 참조 포함, obj.name도 같은 이름으로 연결)
+- 루트: HTML on* 속성 핸들러, window.* 내보내기, setInterval/setTimeout 콜백,
+  addEventListener/on* 프로퍼티 핸들러, 그 밖의 최상위(즉시 실행) 코드와 문자열 안의 name( 참조
+- 루트에서 닿지 않는 함수를 보고하고, --remove면 문장 위치의 function 선언을 제거
+
+문자열로 만든 핸들러나 window[name] 같은 동적 참조는 보수적으로 루트/참조로 취급한다.
+
+사용법:
+    python call_graph.py [index.html] [--extra 파일.js ...] [--remove] [--json 경로] [--limit 50]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from js_lexer import COMMENT, NAME, STRING, TEMPLATE, apply_splices, is_html
+from js_verify import new_issues, verify
+from snapshot_store import backup_content
+from source_index import FUNCTION, FunctionSpan, SourceIndex
+from targets import REPO_ROOT
+
+# 루트 종류
+HTML_HANDLER = 'html'
+WINDOW_EXPORT = 'window'
+TIMER = 'timer'
+LISTENER = 'listener'
+TOP_LEVEL = 'top_level'
+STRING_REF = 'string'
+UNPARSED = 'unparsed'  # 구문 오류가 있는 함수 안의 참조 (함수 경계를 믿을 수 없어 루트로 취급)
+
+_TIMERS = frozenset(['setTimeout', 'setInterval', 'requestAnimationFrame', 'requestIdleCallback',
+                     'queueMicrotask'])
+_GLOBAL_OBJECTS = frozenset(['window', 'globalThis', 'self'])
+# 이름으로 부르지 않아도 언어가 호출하는 메서드
+_IMPLICIT = frozenset(['constructor', 'connectedCallback', 'disconnectedCallback', 'toString',
+                       'valueOf', 'toJSON'])
+_SCRIPT_SRC_RE = re.compile(r'<script\b[^>]*\bsrc\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_HTML_HANDLER_RE = re.compile(r'\son[a-z]+\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+_CALL_IN_TEXT_RE = re.compile(r'([A-Za-z_$][\w$]*)\s*\(')
+
+
+class FunctionNode(NamedTuple):
+    path: str
+    name: str
+    kind: str
+    start: int
+    end: int
+    line: int
+    clean: bool      # 함수 범위 안에 기존 구문 오류가 없는지
+    removable: bool  # 문장 위치의 function 선언이고 안쪽에 구문 오류가 없어 통째로 지울 수 있는지
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+class Root(NamedTuple):
+    name: str
+    reason: str
+    path: str
+    line: int
+
+
+class CallGraph:
+    """여러 파일의 함수를 한 전역 이름 공간에 모은 호출 그래프"""
+
+    def __init__(self):
+        self.nodes: List[FunctionNode] = []
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        self.references: Dict[int, Set[str]] = defaultdict(set)  # 노드 → 참조하는 이름
+        self.roots: List[Root] = []
+        self.exports: Dict[str, List[Root]] = defaultdict(list)
+        self.reference_count: Dict[str, int] = defaultdict(int)  # 정의 외 참조 횟수
+        self.contents: Dict[str, str] = {}
+        self.issues: Dict[str, List[int]] = {}  # 파일별 기존 구문 오류 오프셋
+
+    def add_source(self, path: str, content: str):
+        """파일 하나(HTML이면 인라인 스크립트와 on* 속성)를 그래프에 추가"""
+        self.contents[path] = content
+        self.issues[path] = [issue.offset for issue in verify(content, path)]
+        index = SourceIndex.of(content, path)
+        first = len(self.nodes)
+        for f in index.functions:
+            if f.name:
+                self._add_node(path, index, f)
+        node_at = {self.nodes[i].start: i for i in range(first, len(self.nodes))}
+
+        def owner_of(offset: int) -> Tuple[Optional[int], bool]:
+            """offset을 감싸는 가장 안쪽의 이름 있고 구문 오류 없는 함수 노드 (최상위면 None)
+
+            두 번째 값은 구문 오류가 있는 함수를 건너뛰었는지 여부.
+            """
+            unparsed = False
+            f = index.function_at(offset)
+            while f is not None:
+                i = node_at.get(f.start)
+                if i is not None:
+                    if self.nodes[i].clean:
+                        return i, unparsed
+                    unparsed = True
+                f = index.function_at(f.start - 1)
+            return None, unparsed
+
+        function_starts = {f.start for f in index.functions}
+        for tokens in index.tokens:
+            sig = [tok for tok in tokens if tok.kind != COMMENT]
+            values = [content[tok.start:tok.end] for tok in sig]
+            n = len(sig)
+            for i, tok in enumerate(sig):
+                value = values[i]
+                if tok.kind in (STRING, TEMPLATE):
+                    names = [m.group(1) for m in _CALL_IN_TEXT_RE.finditer(value)]
+                    if names:
+                        self._reference(path, index, owner_of, tok.start, names, STRING_REF)
+                    continue
+                if tok.kind != NAME:
+                    continue
+                prev = values[i - 1] if i > 0 else None
+                nxt = values[i + 1] if i + 1 < n else None
+                after = sig[i + 2].start if i + 2 < n else -1
+                # 정의 위치의 이름 (function foo, foo = function/화살표, foo: ..., 메서드 이름)
+                if prev == 'function' or tok.start in function_starts and nxt == '(' or \
+                        nxt in ('=', ':') and after in function_starts:
+                    if prev == '.' and i >= 2 and values[i - 2] in _GLOBAL_OBJECTS and nxt == '=':
+                        self._export(path, index, value, tok.start)
+                    continue
+                if prev in ('.', '?.'):
+                    if i >= 2 and values[i - 2] in _GLOBAL_OBJECTS and nxt == '=':
+                        self._export(path, index, value, tok.start)
+                        continue
+                reason = TOP_LEVEL
+                if i >= 2 and values[i - 1] == '(' and values[i - 2] in _TIMERS:
+                    reason = TIMER
+                elif prev == ',' and _listener_call(values, i) or \
+                        prev == '=' and i >= 2 and values[i - 2].startswith('on'):
+                    reason = LISTENER
+                self._reference(path, index, owner_of, tok.start, [value], reason)
+            # window['name'] 형태의 내보내기/참조
+            for i in range(n - 2):
+                if values[i] in _GLOBAL_OBJECTS and values[i + 1] == '[' and sig[i + 2].kind == STRING:
+                    self._export(path, index, values[i + 2][1:-1], sig[i + 2].start)
+
+        if is_html(path):
+            covered = index.regions
+            for m in _HTML_HANDLER_RE.finditer(content):
+                if any(lo <= m.start() < hi for lo, hi in covered):
+                    continue
+                code = m.group(1) if m.group(1) is not None else m.group(2)
+                line = index.line_of(m.start())
+                for name in _IDENTIFIER_RE.findall(code):
+                    self.roots.append(Root(name, HTML_HANDLER, path, line))
+                    self.reference_count[name] += 1
+
+    def _add_node(self, path: str, index: SourceIndex, f: FunctionSpan):
+        content = index.content
+        # 구문 오류가 있으면 괄호 짝이 어긋나 함수 끝이 부정확하므로 지우지 않는다
+        issues = self.issues[path]
+        clean = bisect.bisect_left(issues, f.start) == bisect.bisect_left(issues, f.end)
+        removable = clean and f.kind == FUNCTION and content.startswith('function', f.start) and \
+            _statement_position(content, index, f.start)
+        node = FunctionNode(path, f.name, f.kind, f.start, f.end, index.line_of(f.start),
+                            clean, removable)
+        self.by_name[f.name].append(len(self.nodes))
+        self.nodes.append(node)
+
+    def _reference(self, path, index, owner_of, offset, names, reason):
+        owner, unparsed = owner_of(offset)
+        for name in names:
+            self.reference_count[name] += 1
+            if owner is None:
+                self.roots.append(Root(name, UNPARSED if unparsed else reason, path,
+                                       index.line_of(offset)))
+            else:
+                self.references[owner].add(name)
+
+    def _export(self, path, index, name, offset):
+        root = Root(name, WINDOW_EXPORT, path, index.line_of(offset))
+        self.roots.append(root)
+        self.exports[name].append(root)
+
+    def reachable(self) -> Set[int]:
+        """루트에서 이름 참조를 따라 닿는 노드 번호 집합"""
+        seen: Set[int] = set()
+        pending = [i for root in self.roots for i in self.by_name.get(root.name, ())]
+        pending.extend(i for name in _IMPLICIT for i in self.by_name.get(name, ()))
+        while pending:
+            i = pending.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            node = self.nodes[i]
+            # 안쪽 함수는 바깥 함수 본문의 일부이므로 함께 살아 있음
+            for j in self.by_name.get(node.name, ()):
+                pending.append(j)
+            for name in self.references.get(i, ()):
+                pending.extend(self.by_name.get(name, ()))
+            pending.extend(j for j, other in enumerate(self.nodes)
+                           if other.path == node.path and node.start < other.start < node.end)
+        return seen
+
+    def unreachable(self) -> List[FunctionNode]:
+        live = self.reachable()
+        return [node for i, node in enumerate(self.nodes) if i not in live]
+
+    def unused_exports(self) -> List[Root]:
+        """window.*로 내보냈지만 다른 어디서도 (HTML/문자열 포함) 참조하지 않는 이름"""
+        return [roots[0] for name, roots in sorted(self.exports.items())
+                if not self.reference_count.get(name)]
+
+
+def _statement_position(content: str, index: SourceIndex, offset: int) -> bool:
+    """offset 직전의 유효 문자가 문장 경계(; { } 또는 영역 시작)인지"""
+    pos = offset - 1
+    while pos >= 0:
+        span = index.span_at(pos)
+        if span is not None and span.kind == COMMENT:
+            pos = span.start - 1
+            continue
+        if not content[pos].isspace():
+            return content[pos] in ';{}' or index.region_at(pos) is None
+        pos -= 1
+    return True
+
+
+def _listener_call(values: List[str], i: int) -> bool:
+    """values[i]가 addEventListener('x', NAME ...)의 두 번째 인자인지"""
+    return i >= 4 and values[i - 2][:1] in '\'"`' and values[i - 3] == '(' and \
+        values[i - 4] in ('addEventListener', 'on')
+
+
+def local_scripts(html_path: str, content: str) -> List[str]:
+    """HTML이 <script src>로 불러오는 로컬 JS 파일 경로 (URL 제외, 존재하는 것만)"""
+    base = os.path.dirname(os.path.abspath(html_path))
+    paths = []
+    for src in _SCRIPT_SRC_RE.findall(content):
+        if re.match(r'^[a-z]+:|^//', src, re.IGNORECASE):
+            continue
+        path = os.path.normpath(os.path.join(base, src.split('?')[0]))
+        if os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+def build_graph(html_path: str, extra: Sequence[str] = ()) -> CallGraph:
+    graph = CallGraph()
+    with open(html_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    graph.add_source(html_path, content)
+    for path in local_scripts(html_path, content) + list(extra):
+        with open(path, 'r', encoding='utf-8') as f:
+            graph.add_source(path, f.read())
+    return graph
+
+
+def remove_unreachable(graph: CallGraph, dry_run: bool = False) -> Dict[str, List[FunctionNode]]:
+    """죽은 function 선언을 파일별로 제거 (바깥 함수가 이미 지워지는 안쪽 함수는 제외)
+
+    살아 있는 함수를 안에 품은 함수는 남기고, 제거 후 구문 검증에서 새 오류가 생기면
+    그 파일은 건드리지 않는다.
+    """
+    live = [graph.nodes[i] for i in graph.reachable()]
+    dead = [node for node in graph.unreachable() if node.removable and
+            not any(other.path == node.path and node.start < other.start < node.end
+                    for other in live)]
+    by_path: Dict[str, List[FunctionNode]] = defaultdict(list)
+    for node in sorted(dead, key=lambda n: (n.path, n.start)):
+        group = by_path[node.path]
+        if group and node.start < group[-1].end:
+            continue
+        group.append(node)
+
+    removed = {}
+    for path, nodes in by_path.items():
+        content = graph.contents[path]
+        index = SourceIndex.of(content, path)
+        baseline = verify(content, path)
+        accepted, splices, result = [], [], content
+        for node in nodes:
+            trial = sorted(splices + [_line_extent(index, node.start, node.end) + ('',)])
+            candidate = apply_splices(content, trial)
+            added = new_issues(content, baseline, candidate, verify(candidate, path))
+            if added:
+                print(f"⚠️ {path}:{node.line} {node.name}: 제거하면 구문 오류가 생겨 남김 ({added[0]})")
+                continue
+            accepted.append(node)
+            splices, result = trial, candidate
+        if not accepted:
+            continue
+        removed[path] = accepted
+        if not dry_run:
+            backup_content(path, content, 'call_graph: remove unreachable functions')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(result)
+    return removed
+
+
+def _line_extent(index: SourceIndex, start: int, end: int):
+    """함수가 줄 전체를 차지하면 들여쓰기와 마지막 줄바꿈, 바로 위에 붙은 주석까지 포함"""
+    content = index.content
+    line_start, _ = index.line_span(index.line_of(start))
+    _, line_end = index.line_span(index.line_of(max(end - 1, start)))
+    if content[line_start:start].strip() or content[end:line_end].strip():
+        return start, end
+    while line_start > 0:
+        gap = content[:line_start].rstrip()
+        if not gap or content.count('\n', len(gap), line_start) > 1:
+            break  # 빈 줄로 떨어진 주석은 함수 설명이 아님
+        span = index.span_at(len(gap) - 1)
+        if span is None or span.kind != COMMENT:
+            break
+        comment_line, _ = index.line_span(index.line_of(span.start))
+        if content[comment_line:span.start].strip():
+            break
+        line_start = comment_line
+    return line_start, min(line_end + 1, len(content))
+
+
+def report_dict(graph: CallGraph) -> dict:
+    dead = graph.unreachable()
+    reasons: Dict[str, int] = defaultdict(int)
+    for root in graph.roots:
+        reasons[root.reason] += 1
+    return {
+        'functions': len(graph.nodes),
+        'roots': dict(sorted(reasons.items())),
+        'unreachable': [dict(node._asdict(), size=node.size) for node in dead],
+        'unreachable_bytes': sum(node.size for node in dead if node.removable),
+        'unused_exports': [root._asdict() for root in graph.unused_exports()],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="호출 그래프로 닿지 않는 함수를 찾고 제거")
+    parser.add_argument('html', nargs='?', default=os.path.join(REPO_ROOT, 'index.html'),
+                        help="대상 HTML (기본: index.html)")
+    parser.add_argument('--extra', nargs='*', default=[], help="함께 분석할 JS 파일")
+    parser.add_argument('--remove', action='store_true', help="닿지 않는 function 선언 제거")
+    parser.add_argument('--dry-run', action='store_true', help="--remove와 함께: 저장하지 않음")
+    parser.add_argument('--json', help="분석 결과를 JSON으로 저장할 경로")
+    parser.add_argument('--limit', type=int, default=50, help="출력할 최대 함수 수")
+    args = parser.parse_args(argv)
+
+    graph = build_graph(args.html, args.extra)
+    report = report_dict(graph)
+    dead = graph.unreachable()
+    print(f"🔎 함수 {report['functions']}개, 루트 {sum(report['roots'].values())}개 "
+          f"({', '.join(f'{k} {v}' for k, v in report['roots'].items())})")
+    print(f"💀 닿지 않는 함수 {len(dead)}개 (제거 가능 {report['unreachable_bytes']} B)")
+    for node in sorted(dead, key=lambda n: -n.size)[:args.limit]:
+        mark = '' if node.removable else ' (보고만)'
+        print(f"   - {os.path.relpath(node.path)}:{node.line} {node.name} [{node.kind}] {node.size} B{mark}")
+    for root in graph.unused_exports():
+        print(f"   ⚠️ 참조되지 않는 내보내기: window.{root.name} ({os.path.relpath(root.path)}:{root.line})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📝 {args.json}")
+    if args.remove:
+        removed = remove_unreachable(graph, dry_run=args.dry_run)
+        for path, nodes in removed.items():
+            print(f"🗑️ {os.path.relpath(path)}: 함수 {len(nodes)}개 제거 "
+                  f"({sum(node.size for node in nodes)} B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,29 @@
 - 성능 최적화를 위한 프로덕션 준비 작업
 """
 
+import io
 import re
 import os
-from typing import List, Tuple
+import sys
+import time
+from collections import Counter, deque
+from typing import Iterable, Iterator, Optional, Tuple
+
+from rule_matcher import Rule, RuleMatcher
+from run_report import RunReport
+from snapshot_store import backup_content
+from targets import expand_targets
+
+_CONSOLE_CALL_RE = re.compile(r'console\.(log|warn|info|debug|error)\s*\(')
 
 class ConsoleLogCleaner:
     def __init__(self, file_path: str):
         self.file_path = file_path
-        self.backup_path = file_path + '.backup'
+        self.backup_id = None
         self.removed_count = 0
         self.preserved_count = 0
+        self.removed_bytes = Counter()   # 규칙 이름 → 제거한 바이트
+        self.preserved_hits = Counter()  # 규칙 이름 → 보존한 문장 수
         self.console_patterns = {
             'debug_logs': [
                 # 디버그용 콘솔 로그들 (제거 대상)
@@ -55,13 +68,20 @@ class ConsoleLogCleaner:
             ]
         }
 
+        # 규칙 세트를 우선순위 순서(보존 > 디버그 > 일반)로 한 번만 컴파일
+        rules = [Rule(category, f'{category}#{i}', pattern, re.IGNORECASE)
+                 for category in ('critical_errors', 'debug_logs')
+                 for i, pattern in enumerate(self.console_patterns[category])]
+        rules.append(Rule('general_logs', 'general_logs#0', r'console\.(log|warn|info|debug)\s*\('))
+        self.matcher = RuleMatcher(rules, ['critical_errors', 'debug_logs', 'general_logs'])
+
     def create_backup(self) -> bool:
-        """백업 파일 생성"""
+        """백업 스냅샷 생성"""
         try:
             with open(self.file_path, 'r', encoding='utf-8') as original:
-                with open(self.backup_path, 'w', encoding='utf-8') as backup:
-                    backup.write(original.read())
-            print(f"✅ 백업 생성 완료: {self.backup_path}")
+                self.backup_id = backup_content(self.file_path, original.read(),
+                                                'console_cleanup_script')
+            print(f"✅ 백업 생성 완료: {self.backup_id[:12]}")
             return True
         except Exception as e:
             print(f"❌ 백업 생성 실패: {e}")
@@ -69,78 +89,91 @@ class ConsoleLogCleaner:
 
     def is_critical_error(self, line: str) -> bool:
         """중요한 에러 처리인지 판단"""
-        for pattern in self.console_patterns['critical_errors']:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
+        return any(m.category == 'critical_errors' for m in self.matcher.scan(line))
 
     def should_remove_console(self, line: str) -> bool:
-        """콘솔 로그 제거 여부 판단"""
+        """콘솔 로그 제거 여부 판단 (한 번의 매칭으로 분류)"""
+        match = self.matcher.classify(line)
+        if match is None:
+            return False
+
         # 중요한 에러는 보존
-        if self.is_critical_error(line):
+        if match.category == 'critical_errors':
             self.preserved_count += 1
+            self.preserved_hits[match.rule] += 1
             return False
 
-        # 디버그 로그는 제거
-        for pattern in self.console_patterns['debug_logs']:
-            if re.search(pattern, line, re.IGNORECASE):
-                self.removed_count += 1
-                return True
-
         # 일반적인 console.log/warn/info/debug는 제거
-        if re.search(r'console\.(log|warn|info|debug)\s*\(', line):
+        if match.category == 'general_logs':
             # try-catch 블록 내의 console.error는 보존
             if 'console.error' in line and ('catch' in line or 'error' in line.lower()):
                 self.preserved_count += 1
+                self.preserved_hits[match.rule] += 1
                 return False
-            self.removed_count += 1
-            return True
 
-        return False
+        # 디버그 로그는 제거 (line은 제거될 문장 전체)
+        self.removed_count += 1
+        self.removed_bytes[match.rule] += len(line.encode('utf-8'))
+        return True
+
+    def clean_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """줄 단위 콘솔 로그 정리 (스트리밍)
+
+        멀티라인 문장을 판단하는 데 필요한 만큼만 앞서 읽고, 보존할 줄은 즉시 내보낸다.
+        """
+        source = iter(lines)
+        lookahead = deque()  # 문장 판단을 위해 미리 읽었지만 아직 처리하지 않은 줄
+
+        def next_line():
+            if lookahead:
+                return lookahead.popleft()
+            return next(source, None)
+
+        while True:
+            line = next_line()
+            if line is None:
+                return
+
+            # 멀티라인 console.log 처리
+            if not _CONSOLE_CALL_RE.search(line):
+                yield line
+                continue
+
+            # 완전한 console 문장을 찾기 위해 다음 줄들도 확인
+            statement = [line]
+            open_parens = line.count('(') - line.count(')')
+            while open_parens > 0:
+                following = next_line()
+                if following is None:
+                    break
+                statement.append(following)
+                open_parens += following.count('(') - following.count(')')
+
+            # 제거 여부 판단 (제거하면 읽은 줄을 모두 버림)
+            if self.should_remove_console(''.join(statement)):
+                continue
+
+            # 보존 - 현재 라인만 내보내고 나머지 줄은 다시 검사
+            yield line
+            lookahead.extendleft(reversed(statement[1:]))
+
+    def clean_content(self, content: str) -> str:
+        """메모리 버퍼의 콘솔 로그 정리"""
+        return ''.join(self.clean_lines(io.StringIO(content)))
 
     def clean_console_logs(self) -> bool:
-        """콘솔 로그 정리 실행"""
+        """콘솔 로그 정리 실행 (임시 파일로 스트리밍한 뒤 원본 교체)"""
+        temp_path = self.file_path + '.cleanup.tmp'
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-
-            cleaned_lines = []
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-
-                # 멀티라인 console.log 처리
-                if re.search(r'console\.(log|warn|info|debug|error)\s*\(', line):
-                    # 완전한 console 문장을 찾기 위해 다음 줄들도 확인
-                    full_statement = line
-                    j = i + 1
-                    open_parens = line.count('(') - line.count(')')
-
-                    while j < len(lines) and open_parens > 0:
-                        full_statement += lines[j]
-                        open_parens += lines[j].count('(') - lines[j].count(')')
-                        j += 1
-
-                    # 제거 여부 판단
-                    if self.should_remove_console(full_statement):
-                        # 제거된 라인 수만큼 스킵
-                        i = j
-                        continue
-                    else:
-                        # 보존 - 현재 라인만 추가
-                        cleaned_lines.append(line)
-                else:
-                    cleaned_lines.append(line)
-
-                i += 1
-
-            # 정리된 내용을 파일에 저장
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                file.writelines(cleaned_lines)
-
+            with open(self.file_path, 'r', encoding='utf-8') as source, \
+                    open(temp_path, 'w', encoding='utf-8') as target:
+                target.writelines(self.clean_lines(source))
+            os.replace(temp_path, self.file_path)
             return True
 
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             print(f"❌ 콘솔 로그 정리 실패: {e}")
             return False
 
@@ -149,12 +182,25 @@ class ConsoleLogCleaner:
         return {
             'removed': self.removed_count,
             'preserved': self.preserved_count,
-            'total_processed': self.removed_count + self.preserved_count
+            'total_processed': self.removed_count + self.preserved_count,
+            'rule_hits': {name: hits for _, name, _, hits in self.matcher.hit_counts() if hits}
         }
 
-def main():
-    html_file = r"C:\claude\virtual_table_db_claude\index.html"
-
+def transform(content: str, path: str = '', report: Optional[RunReport] = None) -> Tuple[str, int]:
+    """메모리 버퍼에서 콘솔 로그 정리 후 (내용, 제거 개수) 반환"""
+    cleaner = ConsoleLogCleaner(path)
+    started = time.perf_counter()
+    cleaned = cleaner.clean_content(content)
+    if report is not None:
+        # 규칙은 하나의 정규식으로 한 번에 분류하므로 시간은 'classify'에 합산
+        report.rule('classify').seconds += time.perf_counter() - started
+        for _, name, _, hits in cleaner.matcher.hit_counts():
+            if hits:
+                report.rule(name).add(hits, cleaner.removed_bytes[name], cleaner.preserved_hits[name])
+    return cleaned, cleaner.removed_count
+
+def clean_file(html_file: str):
+    """파일 하나의 콘솔 로그 정리 (백업 포함)"""
     if not os.path.exists(html_file):
         print(f"❌ 파일을 찾을 수 없습니다: {html_file}")
         return
@@ -176,9 +222,15 @@ def main():
         print(f"📊 제거된 로그: {stats['removed']}개")
         print(f"📊 보존된 로그: {stats['preserved']}개")
         print(f"📊 총 처리된 로그: {stats['total_processed']}개")
-        print(f"💾 백업 파일: {cleaner.backup_path}")
+        for name, hits in sorted(stats['rule_hits'].items(), key=lambda item: -item[1]):
+            print(f"   - {name}: {hits}")
+        print(f"💾 백업 스냅샷: {cleaner.backup_id[:12]} (snapshot_store.py restore로 복원)")
     else:
         print("❌ 콘솔 로그 정리 실패")
 
+def main():
+    for html_file in expand_targets(sys.argv[1:]):
+        clean_file(html_file)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단일 패스 console/debugLog 제거 엔진
+- js_lexer 토큰 스트림을 한 번만 순회하며 제거 대상 호출의 splice 범위 수집
+- 문자열/템플릿/주석/정규식 내부의 'console.log'는 건드리지 않음
+- 문장 위치의 호출은 줄 단위로 제거, 식 위치의 호출은 'void 0'으로 치환해 구문 보존
+"""
+
+import re
+import sys
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from js_lexer import (
+    COMMENT, NAME, PUNCT, TEMPLATE, TRIVIA, Token, apply_splices, tokenize,
+)
+from run_report import RunReport
+from source_index import SourceIndex
+from targets import expand_targets
+
+# 기본 제거 대상 (console.error는 에러 처리용으로 보존)
+DEFAULT_METHODS = frozenset(['log', 'info', 'debug', 'warn', 'trace'])
+DEBUG_LOG = 'debugLog'
+
+_OPEN = {'(': ')', '[': ']', '{': '}'}
+_CLOSE = frozenset(')]}')
+# 이 토큰 뒤에 오는 호출은 문장 시작 위치
+_STATEMENT_BEFORE = frozenset([';', '{', '}'])
+# if (...) / else / do 뒤의 호출은 빈 문장(';')으로 치환해야 제어 흐름이 유지됨
+_CONTROL_BEFORE = frozenset([')', 'else', 'do'])
+# 줄바꿈 뒤에 와도 앞 식을 이어가는 토큰 (ASI가 적용되지 않음)
+_CONTINUATION = frozenset([
+    '.', '?.', '(', '[', '`', ',', '?', ':', '+', '-', '*', '/', '%', '**', '=',
+    '==', '===', '!=', '!==', '<', '>', '<=', '>=', '&&', '||', '??', '&', '|',
+    '^', '<<', '>>', '>>>', 'instanceof', 'in',
+])
+
+_COMMENTED_CONSOLE_RE = re.compile(r'//\s*(?:console\.\w+|debugLog)\s*\(')
+
+
+class ConsoleCall(NamedTuple):
+    method: str        # 'log', 'warn', ... 또는 'debugLog', 주석이면 'comment'
+    start: int         # 호출 시작 오프셋
+    end: int           # 닫는 괄호 다음 오프셋
+    splice_start: int  # 실제로 잘라낼 범위
+    splice_end: int
+    replacement: str
+
+
+Predicate = Callable[[str, str], bool]
+
+
+def _line_extent(text: str, start: int, end: int, lo: int, hi: int) -> Tuple[int, int]:
+    """범위가 한 줄을 온전히 차지하면 들여쓰기와 줄바꿈까지 포함하도록 확장"""
+    s = start
+    while s > lo and text[s - 1] in ' \t':
+        s -= 1
+    e = end
+    while e < hi and text[e] in ' \t\r':
+        e += 1
+    line_start = s == lo or text[s - 1] == '\n'
+    line_end = e == hi or text[e] == '\n'
+    if line_start and line_end:
+        return s, min(e + 1, hi)
+    return start, end
+
+
+def find_console_calls(text: str, lo: int, hi: int,
+                       methods: Iterable[str] = DEFAULT_METHODS,
+                       include_debuglog: bool = True,
+                       predicate: Optional[Predicate] = None,
+                       strip_commented: bool = False,
+                       tokens: Optional[Iterable[Token]] = None) -> List[ConsoleCall]:
+    """text[lo:hi] 구간(하나의 JS 영역)에서 제거할 호출 목록을 오프셋 순으로 반환"""
+    calls, _ = scan_console_calls(text, lo, hi, methods, include_debuglog, predicate,
+                                  strip_commented, tokens=tokens)
+    return calls
+
+
+def scan_console_calls(text: str, lo: int, hi: int,
+                       methods: Iterable[str] = DEFAULT_METHODS,
+                       include_debuglog: bool = True,
+                       predicate: Optional[Predicate] = None,
+                       strip_commented: bool = False,
+                       boundaries: Optional[List[int]] = None,
+                       tokens: Optional[Iterable[Token]] = None) -> Tuple[List[ConsoleCall], int]:
+    """find_console_calls와 같지만 (호출 목록, 닫히지 않은 첫 호출 위치)를 반환
+
+    닫는 괄호를 찾지 못한 호출이 없으면 두 번째 값은 hi다. boundaries 리스트를 넘기면
+    템플릿 밖에서 ';', '{', '}' 뒤 줄바꿈 직후 위치(문장 경계)를 채워 준다.
+    스트리밍 처리에서 청크를 자를 안전한 위치를 고르는 데 쓴다.
+
+    tokens에 SourceIndex의 영역 토큰을 넘기면 다시 토큰화하지 않는다
+    (공백 토큰이 없으므로 boundaries와 함께 쓸 수 없음).
+    """
+    methods = frozenset(methods)
+    sig = []       # 유효 토큰 (공백/주석 제외)
+    comments = []  # 주석 처리된 console 호출
+    template_depth = 0
+    pending = False
+    for tok in tokenize(text, lo, hi) if tokens is None else tokens:
+        if tok.kind in TRIVIA:
+            if pending:
+                newline = text.find('\n', tok.start, tok.end)
+                if newline >= 0:
+                    boundaries.append(newline + 1)
+                    pending = False
+            if strip_commented and tok.kind == COMMENT and \
+                    _COMMENTED_CONSOLE_RE.match(text, tok.start):
+                comments.append(tok)
+            continue
+        sig.append(tok)
+        if boundaries is not None:
+            pending = False
+            if tok.kind == TEMPLATE:
+                if text[tok.start] == '}':
+                    template_depth -= 1
+                if text.endswith('${', tok.start, tok.end):
+                    template_depth += 1
+            elif template_depth == 0 and tok.end - tok.start == 1 and text[tok.start] in ';{}':
+                pending = True
+
+    calls = []
+    unclosed = hi
+    n = len(sig)
+    i = 0
+    while i < n:
+        tok = sig[i]
+        if tok.kind != NAME:
+            i += 1
+            continue
+        name = text[tok.start:tok.end]
+        prev = text[sig[i - 1].start:sig[i - 1].end] if i > 0 else None
+        if prev in ('.', '?.', 'function'):
+            i += 1
+            continue
+
+        if name == 'console' and i + 3 < n and text[sig[i + 1].start:sig[i + 1].end] == '.':
+            method = text[sig[i + 2].start:sig[i + 2].end]
+            paren = i + 3
+            if method not in methods:
+                i += 1
+                continue
+        elif name == DEBUG_LOG and include_debuglog and i + 1 < n:
+            method = DEBUG_LOG
+            paren = i + 1
+        else:
+            i += 1
+            continue
+
+        if sig[paren].kind != PUNCT or text[sig[paren].start] != '(':
+            i += 1
+            continue
+
+        # 괄호 짝 찾기 (문자열/템플릿 조각은 토큰 단위로 건너뜀)
+        depth = 0
+        close = -1
+        for j in range(paren, n):
+            t = sig[j]
+            if t.kind != PUNCT:
+                continue
+            c = text[t.start]
+            if t.end - t.start == 1 and c in _OPEN:
+                depth += 1
+            elif t.end - t.start == 1 and c in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    close = j
+                    break
+        if close < 0:
+            unclosed = min(unclosed, tok.start)
+            i += 1
+            continue
+
+        start, end = tok.start, sig[close].end
+        if predicate is not None and not predicate(text[start:end], method):
+            i = close + 1
+            continue
+
+        nxt = sig[close + 1] if close + 1 < n else None
+        nxt_text = text[nxt.start:nxt.end] if nxt else None
+        if nxt_text == ';':
+            stmt_end, ends_statement = nxt.end, True
+        elif nxt is None or nxt_text == '}':
+            stmt_end, ends_statement = end, True
+        elif nxt.kind != TEMPLATE and nxt_text not in _CONTINUATION and \
+                '\n' in text[end:nxt.start]:
+            stmt_end, ends_statement = end, True
+        else:
+            stmt_end, ends_statement = end, False
+
+        if ends_statement and (prev is None or prev in _STATEMENT_BEFORE):
+            s, e = _line_extent(text, start, stmt_end, lo, hi)
+            calls.append(ConsoleCall(method, start, end, s, e, ''))
+        elif ends_statement and prev in _CONTROL_BEFORE:
+            calls.append(ConsoleCall(method, start, end, start, stmt_end, ';'))
+        else:
+            calls.append(ConsoleCall(method, start, end, start, end, 'void 0'))
+        i = close + 1
+
+    if comments:
+        for tok in comments:
+            s, e = _line_extent(text, tok.start, tok.end, lo, hi)
+            calls.append(ConsoleCall('comment', tok.start, tok.end, s, e, ''))
+        calls.sort(key=lambda call: call.splice_start)
+    return calls, unclosed
+
+
+def strip_console_calls(content: str, path: str = '',
+                        methods: Iterable[str] = DEFAULT_METHODS,
+                        include_debuglog: bool = True,
+                        predicate: Optional[Predicate] = None,
+                        strip_commented: bool = False,
+                        report: Optional[RunReport] = None) -> Tuple[str, List[ConsoleCall]]:
+    """파일 내용 전체에서 console/debugLog 호출을 제거
+
+    HTML이면 인라인 <script> 블록만, JS/GS 파일이면 전체를 대상으로 한다.
+    모든 범위를 먼저 수집한 뒤 한 번의 join으로 적용하므로 제거 횟수와
+    무관하게 선형 시간에 동작한다.
+
+    report를 넘기면 스캔 시간은 'scan', 호출 종류별 제거 수와
+    바이트는 'console.<method>'/'debugLog', predicate로 남긴 후보는 kept로 기록한다.
+    """
+    if report is not None and predicate is not None:
+        predicate = _counting_predicate(predicate, report)
+
+    started = time.perf_counter()
+    index = SourceIndex.of(content, path)
+    calls: List[ConsoleCall] = []
+    for (lo, hi), tokens in zip(index.regions, index.tokens):
+        calls.extend(find_console_calls(content, lo, hi, methods, include_debuglog,
+                                        predicate, strip_commented, tokens))
+    splices = [(c.splice_start, c.splice_end, c.replacement) for c in calls]
+    result = apply_splices(content, splices)
+
+    if report is not None:
+        report.rule('scan').seconds += time.perf_counter() - started
+        report.rule('scan').add(len(calls))
+        for c in calls:
+            removed = len(content[c.splice_start:c.splice_end].encode('utf-8')) - len(c.replacement)
+            report.rule(_rule_name(c.method)).add(1, removed)
+    return result, calls
+
+
+def _rule_name(method: str) -> str:
+    if method in (DEBUG_LOG, 'comment'):
+        return method
+    return 'console.' + method
+
+
+def _counting_predicate(predicate: Predicate, report: RunReport) -> Predicate:
+    """predicate에 걸려 남겨 둔 후보 수와 판정 시간을 report에 기록"""
+    stats = report.rule('predicate')
+
+    def wrapped(call_text: str, method: str) -> bool:
+        started = time.perf_counter()
+        keep = not predicate(call_text, method)
+        stats.seconds += time.perf_counter() - started
+        stats.add(0 if keep else 1, 0, 1 if keep else 0)
+        if keep:
+            report.rule(_rule_name(method)).add(kept=1)
+        return not keep
+    return wrapped
+
+
+def main():
+    for file_path in expand_targets(sys.argv[1:]):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        cleaned, calls = strip_console_calls(content, file_path)
+        if calls:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(cleaned)
+        print(f"{file_path}: {len(calls)} calls removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
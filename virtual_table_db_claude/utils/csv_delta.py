@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+게시된 시트 CSV의 스냅샷 델타 엔진
+- 시트별로 마지막 스냅샷(행 목록)과 행 해시를 보관
+- 새로 받은 CSV와 행 해시를 비교해 삽입/수정/삭제를 계산 (공통 앞/뒤를 먼저 잘라내
+  추가나 국소 수정은 변경 크기에 비례해 계산)
+- 행 끝의 빈 칸은 잘라서 보관/전송 (열 수만 늘어난 CSV는 변경 없음)
+- 결과는 버전 커서가 붙은 간결한 JSON 패치. 클라이언트는 자기 커서 이후의 변경만 적용
+- 커서가 너무 오래됐거나(기록 밖) 서버가 바뀌었으면(epoch 불일치) 전체 스냅샷을 보냄
+
+패치 형식:
+    {"sheet": 키, "base": 이전 커서, "cursor": 새 커서, "rows": 새 행 수, "digest": 해시,
+     "ops": [[시작, 삭제 수, [새 행, ...]], ...],
+     "stats": {"inserted": n, "updated": n, "deleted": n}}
+
+ops는 이전 스냅샷 기준 위치이며 시작 위치 내림차순이라 순서대로 splice하면 된다:
+    for (const [start, count, rows] of patch.ops) data.splice(start, count, ...rows);
+
+사용법:
+    python csv_delta.py diff <이전.csv> <새.csv>
+    python csv_delta.py poll <CSV URL> [--interval 10] [--count 0] [--state 디렉터리]
+"""
+
+import argparse
+import csv
+import difflib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import urllib.request
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from targets import CACHE_DIR_NAME, REPO_ROOT
+
+STATE_DIR_NAME = 'csv_delta'
+HISTORY_VERSIONS = 32  # 시트마다 델타로 응답할 수 있는 이전 버전 수
+
+# 프런트엔드가 캐시를 피하려고 붙이는 파라미터 (시트 식별에서 제외)
+CACHE_BUSTERS = frozenset(['t', 'random', '_', 'ts', 'cb', 'nocache'])
+
+Row = List[str]
+
+
+def trim_row(cells: Sequence[str]) -> Row:
+    """행 끝의 빈 칸 제거 (시트 열 수만 늘어난 경우를 변경으로 보지 않도록)"""
+    if not cells or cells[-1] != '':
+        return cells if isinstance(cells, list) else list(cells)
+    end = len(cells) - 1
+    while end and cells[end - 1] == '':
+        end -= 1
+    return list(cells[:end])
+
+
+def row_hash(cells: Sequence[str]) -> bytes:
+    """행 하나의 8바이트 해시 (trim_row한 행 기준)"""
+    return hashlib.blake2b('\x1f'.join(cells).encode('utf-8'), digest_size=8).digest()
+
+
+def digest_of(hashes: Sequence[bytes]) -> str:
+    """스냅샷 전체 해시 (클라이언트가 패치 적용 결과를 확인하는 용도)"""
+    return hashlib.blake2b(b''.join(hashes), digest_size=8).hexdigest()
+
+
+def parse_csv(text: str) -> List[Row]:
+    """CSV 본문 → 행 목록 (행 끝 빈 칸 제거)"""
+    return [trim_row(row) for row in csv.reader(io.StringIO(text))]
+
+
+def sheet_key(url: str) -> str:
+    """캐시 무효화 파라미터(&t=, &random= 등)를 뺀 URL"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in CACHE_BUSTERS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def diff_hashes(old: Sequence[bytes], new: Sequence[bytes]) -> List[Tuple[int, int, int, int]]:
+    """행 해시 목록 비교 → 바뀐 구간 [(i1, i2, j1, j2)] (old[i1:i2]가 new[j1:j2]로 바뀜), 위치 순"""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+        suffix += 1
+    a = old[prefix:len(old) - suffix]
+    b = new[prefix:len(new) - suffix]
+    if not a and not b:
+        return []
+    # 빈 행처럼 같은 해시가 많으면 autojunk 없이는 제곱 시간이 걸린다 (결과는 항상 올바름)
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=True)
+    return [(prefix + i1, prefix + i2, prefix + j1, prefix + j2)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def make_patch(old: Sequence[bytes], new: Sequence[bytes], rows: Sequence[Row]):
+    """(ops, stats). ops는 시작 위치 내림차순의 [시작, 삭제 수, 새 행 목록]"""
+    ops = []
+    stats = {'inserted': 0, 'updated': 0, 'deleted': 0}
+    for i1, i2, j1, j2 in diff_hashes(old, new):
+        removed, added = i2 - i1, j2 - j1
+        stats['updated'] += min(removed, added)
+        stats['inserted'] += max(added - removed, 0)
+        stats['deleted'] += max(removed - added, 0)
+        ops.append([i1, removed, [list(row) for row in rows[j1:j2]]])
+    ops.reverse()
+    return ops, stats
+
+
+def apply_patch(rows: List[Row], patch: dict) -> List[Row]:
+    """클라이언트 쪽 적용 (검증/테스트용). 전체 스냅샷이면 그대로 교체"""
+    if patch.get('full'):
+        return [list(row) for row in patch['data']]
+    rows = list(rows)
+    for start, count, added in patch['ops']:
+        rows[start:start + count] = added
+    return rows
+
+
+class SheetState:
+    """시트 하나의 현재 스냅샷과 이전 버전들의 행 해시"""
+
+    def __init__(self, epoch: str, version: int = 0, rows: Optional[List[Row]] = None):
+        self.epoch = epoch
+        self.version = version
+        self.rows: List[Row] = rows or []
+        self.hashes: List[bytes] = [row_hash(row) for row in self.rows]
+        self.history: 'OrderedDict[int, List[bytes]]' = OrderedDict()
+        self.history[version] = self.hashes
+        self.patches: Dict[int, dict] = {}  # 이전 버전 → 현재 버전 패치 (버전이 바뀌면 비움)
+
+    def cursor(self, version: Optional[int] = None) -> str:
+        return f"{self.epoch}.{self.version if version is None else version}"
+
+
+class DeltaTracker:
+    """시트별 스냅샷 보관과 커서 기준 델타 계산
+
+    state_dir를 주면 시트마다 현재 스냅샷을 저장해 재시작 후에도 같은 커서로 이어서 응답한다
+    (이전 버전 기록은 메모리에만 있어 재시작 전 커서는 전체 스냅샷을 받는다).
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, history: int = HISTORY_VERSIONS):
+        self.state_dir = state_dir
+        self.history = history
+        self.sheets: Dict[str, SheetState] = {}
+
+    def _state(self, key: str) -> SheetState:
+        state = self.sheets.get(key)
+        if state is None:
+            state = self._load(key) or SheetState(uuid.uuid4().hex[:8])
+            self.sheets[key] = state
+        return state
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.state_dir, f'{name}.json')
+
+    def _load(self, key: str) -> Optional[SheetState]:
+        if not self.state_dir or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            return SheetState(saved['epoch'], saved['version'], saved['rows'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key: str, state: SheetState):
+        if not self.state_dir:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self._path(key) + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'epoch': state.epoch, 'version': state.version,
+                       'rows': state.rows}, f, ensure_ascii=False)
+        os.replace(tmp, self._path(key))
+
+    def update(self, key: str, rows: List[Row]) -> Tuple[int, bool]:
+        """새로 받은 스냅샷 반영 → (현재 버전, 바뀌었는지)"""
+        state = self._state(key)
+        rows = [trim_row(row) for row in rows]
+        hashes = [row_hash(row) for row in rows]
+        if hashes == state.hashes:
+            return state.version, False
+        state.version += 1
+        state.rows = rows
+        state.hashes = hashes
+        state.history[state.version] = hashes
+        state.patches.clear()
+        while len(state.history) > self.history:
+            state.history.popitem(last=False)
+        self._save(key, state)
+        return state.version, True
+
+    def since(self, key: str, cursor: Optional[str] = None) -> dict:
+        """cursor 이후의 패치 (커서를 모르면 전체 스냅샷)"""
+        state = self._state(key)
+        base = _parse_cursor(cursor, state.epoch)
+        old = state.history.get(base) if base is not None else None
+        header = {'sheet': key, 'cursor': state.cursor(), 'rows': len(state.rows),
+                  'digest': digest_of(state.hashes)}
+        if old is None:
+            return dict(header, full=True, data=state.rows)
+        patch = state.patches.get(base)
+        if patch is None:
+            # 같은 커서로 폴링하는 클라이언트가 많으므로 버전 쌍마다 한 번만 계산
+            ops, stats = make_patch(old, state.hashes, state.rows)
+            patch = dict(header, base=state.cursor(base), ops=ops, stats=stats)
+            # 패치가 전체보다 커지면(대규모 재정렬 등) 전체 스냅샷이 더 싸다
+            if sum(len(added) for _, _, added in ops) > len(state.rows):
+                patch = dict(header, full=True, data=state.rows)
+            state.patches[base] = patch
+        return patch
+
+    def poll(self, key: str, text: str, cursor: Optional[str] = None) -> dict:
+        """CSV 본문을 반영하고 cursor 이후의 패치를 돌려줌"""
+        self.update(key, parse_csv(text))
+        return self.since(key, cursor)
+
+
+def _parse_cursor(cursor: Optional[str], epoch: str) -> Optional[int]:
+    if not cursor or '.' not in cursor:
+        return None
+    cursor_epoch, _, version = cursor.partition('.')
+    if cursor_epoch != epoch or not version.isdigit():
+        return None
+    return int(version)
+
+
+def default_state_dir() -> str:
+    return os.path.join(REPO_ROOT, CACHE_DIR_NAME, STATE_DIR_NAME)
+
+
+def _json_size(data) -> int:
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def _fetch(url: str, timeout: float = 30.0) -> str:
+    bust = f"{'&' if '?' in url else '?'}t={int(time.time() * 1000)}"
+    with urllib.request.urlopen(url + bust, timeout=timeout) as response:
+        return response.read().decode('utf-8')
+
+
+def cmd_diff(args) -> int:
+    with open(args.old, 'r', encoding='utf-8', newline='') as f:
+        old_rows = parse_csv(f.read())
+    with open(args.new, 'r', encoding='utf-8', newline='') as f:
+        new_rows = parse_csv(f.read())
+    tracker = DeltaTracker()
+    tracker.update(args.new, old_rows)
+    cursor = tracker.sheets[args.new].cursor()
+    tracker.update(args.new, new_rows)
+    patch = tracker.since(args.new, cursor)
+    print(json.dumps(patch, ensure_ascii=False, separators=(',', ':')))
+    full = _json_size(new_rows)
+    if not patch.get('full'):
+        stats = patch['stats']
+        print(f"📊 삽입 {stats['inserted']}, 수정 {stats['updated']}, 삭제 {stats['deleted']} | "
+              f"패치 {_json_size(patch):,} B / 전체 {full:,} B", file=sys.stderr)
+    return 0
+
+
+def cmd_poll(args) -> int:
+    tracker = DeltaTracker(args.state)
+    key = sheet_key(args.url)
+    cursor = None
+    rows: List[Row] = []
+    polls = 0
+    while True:
+        try:
+            text = _fetch(args.url)
+        except OSError as error:
+            print(f"⚠️ 가져오기 실패: {error}")
+        else:
+            started = time.perf_counter()
+            patch = tracker.poll(key, text, cursor)
+            elapsed = (time.perf_counter() - started) * 1000
+            rows = apply_patch(rows, patch)
+            cursor = patch['cursor']
+            if patch.get('full'):
+                print(f"📥 전체 {patch['rows']}행 ({len(text.encode('utf-8')):,} B), 커서 {cursor}")
+            elif patch['ops']:
+                stats = patch['stats']
+                print(f"🔄 삽입 {stats['inserted']}, 수정 {stats['updated']}, 삭제 {stats['deleted']} "
+                      f"→ 패치 {_json_size(patch):,} B / CSV {len(text.encode('utf-8')):,} B "
+                      f"({elapsed:.1f} ms), 커서 {cursor}")
+            else:
+                print(f"⏸️ 변경 없음 ({elapsed:.1f} ms)")
+        polls += 1
+        if args.count and polls >= args.count:
+            return 0
+        time.sleep(args.interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시트 CSV 스냅샷 델타 (바뀐 행만 전달)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('diff', help="두 CSV 파일의 패치 출력")
+    p.add_argument('old')
+    p.add_argument('new')
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser('poll', help="게시된 CSV를 주기적으로 받아 델타만 보고")
+    p.add_argument('url')
+    p.add_argument('--interval', type=float, default=10.0, help="폴링 간격(초)")
+    p.add_argument('--count', type=int, default=0, help="폴링 횟수 (0이면 무한)")
+    p.add_argument('--state', default=default_state_dir(), help="스냅샷 저장 디렉터리")
+    p.set_defaults(func=cmd_poll)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
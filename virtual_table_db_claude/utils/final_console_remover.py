@@ -1,62 +1,63 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import re
+import sys
+from typing import Optional, Tuple
 
-def final_clean_console_logs(file_path):
-    """최종 콘솔 로그 제거"""
+from console_stripper import strip_console_calls
+from run_report import RunReport, subn
+from targets import expand_targets
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def transform(content: str, path: str = '', report: Optional[RunReport] = None) -> Tuple[str, int]:
+    """메모리 버퍼에서 console.log 제거 후 (내용, 제거 개수) 반환"""
 
     # 모든 console.log 제거 (console.error는 보존)
-    final_patterns = [
-        # 모든 console.log를 제거 (멀티라인 고려)
-        r'\s*console\.log\([^;]*;\s*\n?',
-        r'\s*console\.log\([^)]*\);\s*\n?',
+    # 멀티라인 호출과 }console.log 형태도 렉서가 괄호 짝으로 처리
+    content, calls = strip_console_calls(content, path, methods=('log',),
+                                         include_debuglog=False, report=report)
+    removed_count = len(calls)
 
-        # 줄 끝에 }console.log 형태 수정
-        r'}console\.log\([^)]*\);\s*\n?',
-    ]
+    # 연속 빈 줄 정리
+    content, _ = subn(report, 'collapse_blank_lines', r'\n\s*\n\s*\n', '\n\n', content)
 
-    removed_count = 0
+    return content, removed_count
 
-    for pattern in final_patterns:
-        old_content = content
-        content = re.sub(pattern, '\n', content, flags=re.MULTILINE | re.DOTALL)
-        removed_count += len(re.findall(pattern, old_content, re.MULTILINE | re.DOTALL))
+def final_clean_console_logs(file_path):
+    """최종 콘솔 로그 제거"""
 
-    # }console.log 형태 특별 처리
-    content = re.sub(r'}console\.log\([^)]*\);', '}', content)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
 
-    # 연속 빈 줄 정리
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    report = RunReport('final_console_remover', file_path)
+    report.record_before(content)
+    content, removed_count = transform(content, file_path, report)
+    report.record_after(content)
 
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
 
     print(f"Final console.log removal: {removed_count}")
 
-    # 최종 검증
-    remaining = len(re.findall(r'console\.', content))
-    error_count = len(re.findall(r'console\.error', content))
-    warn_count = len(re.findall(r'console\.warn', content))
-    log_count = len(re.findall(r'console\.log', content))
-
+    # 최종 검증 (렉서로 센 실제 호출 개수)
+    before = report.console_before
+    after = report.console_after
+    remaining = sum(after.values())
     print(f"Final count:")
     print(f"  - Total console calls: {remaining}")
-    print(f"  - console.error: {error_count} (preserved)")
-    print(f"  - console.warn: {warn_count} (mostly preserved)")
-    print(f"  - console.log: {log_count} (should be 0)")
+    print(f"  - console.error: {after.get('console.error', 0)} (preserved)")
+    print(f"  - console.warn: {after.get('console.warn', 0)} (mostly preserved)")
+    print(f"  - console.log: {after.get('console.log', 0)} (should be 0)")
 
-    original_count = 742
+    original_count = sum(before.values())
     removed_total = original_count - remaining
+    removal_rate = removed_total / original_count * 100 if original_count else 0.0
     print(f"\nSummary:")
     print(f"  - Original console calls: {original_count}")
     print(f"  - Removed console calls: {removed_total}")
     print(f"  - Remaining console calls: {remaining}")
-    print(f"  - Removal rate: {(removed_total/original_count*100):.1f}%")
+    print(f"  - Removal rate: {removal_rate:.1f}%")
+    print(f"  - Report: {report.write()}")
 
 if __name__ == "__main__":
-    html_file = r"C:\claude\virtual_table_db_claude\index.html"
-    final_clean_console_logs(html_file)
\ No newline at end of file
+    for html_file in expand_targets(sys.argv[1:]):
+        final_clean_console_logs(html_file)
\ No newline at end of file
@@ -4,18 +4,45 @@
 Fix ALL JavaScript syntax errors in index.html - comprehensive version
 """
 
+import io
 import re
-
-def fix_all_syntax_errors(file_path):
-    """Fix all remaining JavaScript syntax errors"""
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    fixes_count = 0
+import time
+from typing import List, Optional, Tuple
+
+from js_verify import verify
+from run_report import RunReport
+from snapshot_store import backup_content
+from targets import expand_targets
+
+# What each rule fixes, for the per-line summary
+RULE_LABELS = {
+    'specific_line': 'Replaced with comment',
+    'orphaned_colon': 'Orphaned colon',
+    'orphaned_comma': 'Orphaned comma',
+    'single_comma': 'Single comma',
+    'orphaned_paren': 'Orphaned );',
+    'template_literal_fragment': 'Template literal fragment',
+    'template_expression_fragment': 'Template expression fragment',
+    'orphaned_ms': 'Orphaned }ms',
+    'orphaned_punctuation': 'Orphaned punctuation',
+}
+
+
+def apply_fixes(content: str, path: str = '',
+                report: Optional[RunReport] = None) -> Tuple[str, List[Tuple[int, str]]]:
+    """Apply the line fixes to an in-memory buffer, returning (content, fixes)
+
+    fixes lists (line number, rule name) for every fixed line; nothing is printed.
+    The rules are one elif chain per line, so the report gets the total loop
+    time as 'line_rules' and per-rule matches/bytes under each rule name.
+    """
+
+    lines = io.StringIO(content).readlines()
+    fixes = []
     fixed_lines = []
 
-    # Track specific line fixes
+    # Track specific line fixes. These line numbers come from one past version
+    # of index.html, so only apply them where the verifier still reports a problem.
     specific_fixes = {
         1268: "        // Fixed: subtitle 로그 제거",
         1664: "            // Fixed: 복사완료, 빈값 로그 제거",
@@ -26,12 +53,14 @@ def fix_all_syntax_errors(file_path):
         6016: "        // Fixed: 시간 형식 로그 제거"
     }
 
+    started = time.perf_counter()
+    broken_lines = {issue.line for issue in verify(content, path)}
     for i, line in enumerate(lines, 1):
+        fixed_by = None
         # Check if this line needs specific fix
-        if i in specific_fixes:
+        if i in specific_fixes and i in broken_lines:
             fixed_lines.append(specific_fixes[i] + '\n')
-            fixes_count += 1
-            print(f"Fixed line {i}: Replaced with comment")
+            fixed_by = 'specific_line'
         else:
             # Apply pattern-based fixes
             original_line = line
@@ -39,65 +68,85 @@ def fix_all_syntax_errors(file_path):
             # Pattern 1: Line starting with : followed by template literal
             if re.match(r'^\s*:`[^`]*\);?\s*$', line):
                 line = re.sub(r'^(\s*):.*$', r'\1// Fixed: removed orphaned colon line', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Orphaned colon")
+                fixed_by = 'orphaned_colon'
 
             # Pattern 2: Line starting with comma
             elif re.match(r'^\s*,\s*[^/]', line):
                 # Check if it's a continuation that should be commented
                 if re.match(r'^\s*,\s*[^:]+:.*\);?\s*$', line):
                     line = re.sub(r'^(\s*),(.*)$', r'\1//\2', line)
-                    fixes_count += 1
-                    print(f"Fixed line {i}: Orphaned comma")
+                    fixed_by = 'orphaned_comma'
                 elif re.match(r'^\s*,\s*$', line):
                     line = re.sub(r'^(\s*),\s*$', r'\1// Fixed: removed orphaned comma', line)
-                    fixes_count += 1
-                    print(f"Fixed line {i}: Single comma")
+                    fixed_by = 'single_comma'
 
             # Pattern 3: Orphaned closing parenthesis and semicolon
             elif re.match(r'^\s*\);?\s*$', line):
                 line = re.sub(r'^(\s*)\);?\s*$', r'\1// Fixed: removed orphaned );', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Orphaned );")
+                fixed_by = 'orphaned_paren'
 
             # Pattern 4: Lines ending with template literal fragments
             elif re.search(r'[^/]\s*`\);?\s*$', line) and not re.search(r'[\'"][^\'"`]*`\);?\s*$', line):
                 line = re.sub(r'`\);?\s*$', '"; // Fixed: template literal', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Template literal fragment")
+                fixed_by = 'template_literal_fragment'
 
             # Pattern 5: Lines with orphaned template expressions ${...}`)
             elif re.search(r'\$\{[^}]+\}`\);?\s*$', line):
                 line = re.sub(r'(\$\{[^}]+\})`\);?\s*$', r'\1"; // Fixed', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Template expression fragment")
+                fixed_by = 'template_expression_fragment'
 
             # Pattern 6: Line with }ms without proper context
             elif re.match(r'^\s*\}ms\s*$', line):
                 line = re.sub(r'^(\s*)\}ms\s*$', r'\1// Fixed: removed }ms', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Orphaned }}ms")
+                fixed_by = 'orphaned_ms'
 
             # Pattern 7: Lines that are just punctuation marks
             elif re.match(r'^\s*[,:;`]+\s*$', line):
                 line = re.sub(r'^(\s*)[,:;`]+\s*$', r'\1// Fixed: removed orphaned punctuation', line)
-                fixes_count += 1
-                print(f"Fixed line {i}: Orphaned punctuation")
+                fixed_by = 'orphaned_punctuation'
 
             fixed_lines.append(line)
 
+        if fixed_by:
+            fixes.append((i, fixed_by))
+        if fixed_by and report is not None:
+            # Per-rule match count and bytes removed from the line
+            removed = len(lines[i - 1].encode('utf-8')) - len(fixed_lines[-1].encode('utf-8'))
+            report.rule(fixed_by).add(1, removed)
+
+    if report is not None:
+        report.rule('line_rules').seconds += time.perf_counter() - started
+
+    return ''.join(fixed_lines), fixes
+
+
+def transform(content: str, path: str = '', report: Optional[RunReport] = None) -> Tuple[str, int]:
+    """Pipeline stage: apply_fixes with the number of fixed lines"""
+    content, fixes = apply_fixes(content, path, report)
+    return content, len(fixes)
+
+def fix_all_syntax_errors(file_path):
+    """Fix all remaining JavaScript syntax errors"""
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original_content = f.read()
+
+    content, fixes = apply_fixes(original_content, file_path)
+    for line, rule in fixes:
+        print(f"Fixed line {line}: {RULE_LABELS[rule]}")
+    fixes_count = len(fixes)
+
     # Write the fixed content
     if fixes_count > 0:
-        # Create backup
-        with open(file_path + '.full_backup', 'w', encoding='utf-8') as f:
-            f.writelines(lines)
+        # Create backup snapshot
+        snapshot_id = backup_content(file_path, original_content, 'fix_all_syntax_errors')
 
         # Write fixed content
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(fixed_lines)
+            f.write(content)
 
         print(f"\nTotal fixes applied: {fixes_count}")
-        print(f"Backup saved as: {file_path}.full_backup")
+        print(f"Backup snapshot: {snapshot_id[:12]}")
         print("File successfully fixed!")
     else:
         print("No syntax errors found to fix.")
@@ -105,6 +154,8 @@ def fix_all_syntax_errors(file_path):
     return fixes_count
 
 if __name__ == "__main__":
-    file_path = "C:\\claude\\virtual_table_db_claude\\index.html"
-    fixes = fix_all_syntax_errors(file_path)
-    print(f"\n✅ Fixed {fixes} syntax errors")
\ No newline at end of file
+    import sys
+
+    for file_path in expand_targets(sys.argv[1:]):
+        fixes = fix_all_syntax_errors(file_path)
+        print(f"\n✅ Fixed {fixes} syntax errors")
\ No newline at end of file
@@ -5,76 +5,134 @@ Fix JavaScript syntax errors in index.html
 """
 
 import re
+from typing import Dict, Optional, Tuple
 
-def fix_syntax_errors(file_path):
-    """Fix all JavaScript syntax errors in the file"""
+from linear_scan import RuleTimeout, budgeted_subn, candidate_subn, lead_char_subn
+from run_report import RunReport, measure
+from snapshot_store import backup_content
+from targets import expand_targets
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Line starts where patterns 3 and 5 can match
+_COLON_LINE = re.compile(r'^\s*:', re.MULTILINE)
+_COMMA_LINE = re.compile(r'^\s*,', re.MULTILINE)
+_QUOTE_BACKTICK_CALL = re.compile(r'"\s*`\s*\)\s*;')
+
+
+def _next_backtick(text, candidate):
+    # Every ':' line before the next backtick shares the same `); tail check
+    k = text.find('`', candidate.end())
+    return k if k >= 0 else len(text)
+
+
+def _next_equals(text, candidate):
+    # Every ',' line before the next '=' shares the same = "..." tail check
+    e = text.find('=', candidate.end())
+    if e < 0:
+        return len(text)
+    return e if e > candidate.end() else candidate.end()
+
+
+# What each pattern fixes, for the per-pattern summary
+PATTERN_LABELS = {
+    'pattern1': '}`); pattern',
+    'pattern2': 'standalone `); pattern',
+    'pattern3': ': ... `); pattern',
+    'pattern4': '"`); pattern',
+    'pattern5': 'comma-starting lines',
+    'pattern6': "|| '...'}`); pattern",
+}
+
+
+def apply_fixes(content: str, path: str = '', report: Optional[RunReport] = None,
+                budget: Optional[float] = None) -> Tuple[str, Dict[str, int]]:
+    """Apply the syntax fixes to an in-memory buffer, returning (content, counts)
+
+    counts maps each pattern name to its number of fixes; nothing is printed.
+    Patterns 3-5 used to backtrack across the whole file from every start
+    position; they now run through linear scanners that give the same result.
+    Each pattern raises RuleTimeout if it exceeds `budget` seconds.
+    """
 
-    original_content = content
-    fixes_count = 0
+    counts = {}
 
     # Pattern 1: Fix incomplete console.log remnants like }"`);
     pattern1 = r'\}\s*"\s*`\s*\)\s*;'
-    matches1 = re.findall(pattern1, content)
-    if matches1:
-        content = re.sub(pattern1, '// Fixed syntax error', content)
-        fixes_count += len(matches1)
-        print(f"Fixed {len(matches1)} instances of }}`); pattern")
+    content, n = measure(report, 'pattern1', lambda text: budgeted_subn(
+        pattern1, '// Fixed syntax error', text, rule='pattern1', budget=budget), content)
+    counts['pattern1'] = n
 
     # Pattern 2: Fix standalone `); at end of lines
     pattern2 = r'^(\s*)`\);?\s*$'
-    matches2 = re.findall(pattern2, content, re.MULTILINE)
-    if matches2:
-        content = re.sub(pattern2, r'\1// Fixed syntax error', content, flags=re.MULTILINE)
-        fixes_count += len(matches2)
-        print(f"Fixed {len(matches2)} instances of standalone `); pattern")
+    content, n = measure(report, 'pattern2', lambda text: budgeted_subn(
+        pattern2, r'\1// Fixed syntax error', text, re.MULTILINE, rule='pattern2', budget=budget), content)
+    counts['pattern2'] = n
 
     # Pattern 3: Fix lines starting with : and ending with `);
-    pattern3 = r'^(\s*):([^`]*)`\);?\s*$'
-    matches3 = re.findall(pattern3, content, re.MULTILINE)
-    if matches3:
-        content = re.sub(pattern3, r'\1//\2', content, flags=re.MULTILINE)
-        fixes_count += len(matches3)
-        print(f"Fixed {len(matches3)} instances of : ... `); pattern")
+    pattern3 = re.compile(r'^(\s*):([^`]*)`\);?\s*$', re.MULTILINE)
+    content, n = measure(report, 'pattern3', lambda text: candidate_subn(
+        text, pattern3, r'\1//\2', _COLON_LINE, _next_backtick, rule='pattern3', budget=budget), content)
+    counts['pattern3'] = n
 
     # Pattern 4: Fix lines with incomplete template literals ending with "`);
-    pattern4 = r'([^/])\s*"\s*`\s*\)\s*;'
-    matches4 = re.findall(pattern4, content)
-    if matches4:
-        content = re.sub(pattern4, r'\1"; // Fixed syntax', content)
-        fixes_count += len(matches4)
-        print(f"Fixed {len(matches4)} instances of \"`); pattern")
+    # (same result as re.sub(r'([^/])\s*"\s*`\s*\)\s*;', r'\1"; // Fixed syntax', ...))
+    content, n = measure(report, 'pattern4', lambda text: lead_char_subn(
+        text, _QUOTE_BACKTICK_CALL, '/', lambda lead, m: lead + '"; // Fixed syntax',
+        rule='pattern4', budget=budget), content)
+    counts['pattern4'] = n
 
     # Pattern 5: Fix lines with , at the beginning followed by template literal
-    pattern5 = r'^(\s*),\s*([^=]+)=\s*"([^"]*)".*`\);?\s*$'
-    matches5 = re.findall(pattern5, content, re.MULTILINE)
-    if matches5:
-        content = re.sub(pattern5, r'\1// \2= "\3"', content, flags=re.MULTILINE)
-        fixes_count += len(matches5)
-        print(f"Fixed {len(matches5)} instances of comma-starting lines")
+    pattern5 = re.compile(r'^(\s*),\s*([^=]+)=\s*"([^"]*)".*`\);?\s*$', re.MULTILINE)
+    content, n = measure(report, 'pattern5', lambda text: candidate_subn(
+        text, pattern5, r'\1// \2= "\3"', _COMMA_LINE, _next_equals, rule='pattern5', budget=budget), content)
+    counts['pattern5'] = n
 
     # Pattern 6: Fix || '...'}`); pattern
     pattern6 = r'\|\|\s*\'([^\']*)\'\s*\}\s*"\s*`\s*\)\s*;'
-    matches6 = re.findall(pattern6, content)
-    if matches6:
-        content = re.sub(pattern6, r"|| '\1'; // Fixed syntax", content)
-        fixes_count += len(matches6)
-        print(f"Fixed {len(matches6)} instances of || '...'}}`); pattern")
+    content, n = measure(report, 'pattern6', lambda text: budgeted_subn(
+        pattern6, r"|| '\1'; // Fixed syntax", text, rule='pattern6', budget=budget), content)
+    counts['pattern6'] = n
+
+    return content, counts
+
+
+def transform(content: str, path: str = '', report: Optional[RunReport] = None,
+              budget: Optional[float] = None) -> Tuple[str, int]:
+    """Pipeline stage: apply_fixes with the total number of fixes"""
+    content, counts = apply_fixes(content, path, report, budget)
+    return content, sum(counts.values())
+
+
+def print_counts(counts: Dict[str, int]):
+    """Print the per-pattern counts returned by apply_fixes"""
+    for name, n in counts.items():
+        if n:
+            print(f"Fixed {n} instances of {PATTERN_LABELS[name]}")
+
+def fix_syntax_errors(file_path):
+    """Fix all JavaScript syntax errors in the file"""
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original_content = f.read()
+
+    try:
+        content, counts = apply_fixes(original_content, file_path)
+    except RuleTimeout as e:
+        print(f"Aborted, file left unchanged: {e}")
+        return 0
+    print_counts(counts)
+    fixes_count = sum(counts.values())
 
     # Save the fixed content
     if fixes_count > 0:
-        # Create backup
-        with open(file_path + '.syntax_backup', 'w', encoding='utf-8') as f:
-            f.write(original_content)
+        # Create backup snapshot
+        snapshot_id = backup_content(file_path, original_content, 'fix_syntax_errors')
 
         # Write fixed content
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(content)
 
         print(f"\nTotal fixes applied: {fixes_count}")
-        print(f"Backup saved as: {file_path}.syntax_backup")
+        print(f"Backup snapshot: {snapshot_id[:12]}")
         print("File successfully fixed!")
     else:
         print("No syntax errors found to fix.")
@@ -84,9 +142,7 @@ def fix_syntax_errors(file_path):
 if __name__ == "__main__":
     import sys
 
-    file_path = "C:\\claude\\virtual_table_db_claude\\index.html"
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-
-    fixes = fix_syntax_errors(file_path)
+    fixes = 0
+    for file_path in expand_targets(sys.argv[1:]):
+        fixes += fix_syntax_errors(file_path)
     sys.exit(0 if fixes >= 0 else 1)
\ No newline at end of file
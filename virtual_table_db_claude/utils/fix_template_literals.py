@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+모든 깨진 템플릿 리터럴 일괄 수정 스크립트
+"""
+import re
+from typing import Optional, Tuple
+
+from linear_scan import RuleTimeout, line_marker_subn, marker_subn
+from run_report import RunReport, measure
+from snapshot_store import backup_content
+from targets import expand_targets
+
+# 원래 정규식 `([^`]*)MARKER...`는 시작 위치마다 다음 백틱까지 되추적해 백틱이 드문
+# 파일에서 O(n^2)이 된다 (index.html에서 규칙당 약 17초). 같은 결과를 내는 선형 스캔으로 처리.
+#   1. ([^`]*)}"; // Fixed: template literal\s*(.*?;?)      (MULTILINE)
+#   2. ([^`]*)" // Fixed[^;\n]*\s*(.*?)$                    (MULTILINE)
+#   3. ([^`]*)}\.\.\."; // Fixed: template literal
+#   4. ^\s*// Fixed syntax error\s*$\n                      (MULTILINE)
+#   5. ^\s*// Fixed: removed orphaned [^;]*;\s*              (MULTILINE)
+_TAIL1 = re.compile(r'\s*(.*?;?)', re.MULTILINE)
+_TAIL2 = re.compile(r'[^;\n]*\s*(.*?)$', re.MULTILINE)
+_TAIL4 = re.compile(r'\s*$\n', re.MULTILINE)
+_TAIL5 = re.compile(r'[^;]*;\s*')
+
+def _close_template(content_part: str, tail) -> str:
+    rest = tail.group(1).strip()
+    if rest and not rest.startswith('//'):
+        return f'{content_part}`);\n        {rest}'
+    return f'{content_part}`);\n'
+
+def transform(content: str, path: str = '', report: Optional[RunReport] = None,
+              budget: Optional[float] = None) -> Tuple[str, int]:
+    """메모리 버퍼에 템플릿 리터럴 수정 적용 후 (내용, 수정 횟수) 반환
+
+    규칙 하나가 budget초(기본 linear_scan.DEFAULT_BUDGET)를 넘기면 RuleTimeout을 던진다.
+    """
+
+    fixes = 0
+
+    # 1. 기본 패턴: }"; // Fixed: template literal 수정
+    content, n = measure(report, 'fixed_template_literal', lambda text: marker_subn(
+        text, '}"; // Fixed: template literal', _close_template, _TAIL1,
+        rule='fixed_template_literal', budget=budget), content)
+    fixes += n
+
+    # 2. 다른 패턴들: "; // Fixed 수정
+    content, n = measure(report, 'fixed_comment', lambda text: marker_subn(
+        text, '" // Fixed', _close_template, _TAIL2,
+        rule='fixed_comment', budget=budget), content)
+    fixes += n
+
+    # 3. 특별한 패턴: }..." 수정
+    content, n = measure(report, 'fixed_ellipsis', lambda text: marker_subn(
+        text, '}..."; // Fixed: template literal', lambda part, _: part + '}`);',
+        rule='fixed_ellipsis', budget=budget), content)
+    fixes += n
+
+    # 4. Fixed syntax error 단독 주석 제거
+    content, n = measure(report, 'fixed_syntax_error_comment', lambda text: line_marker_subn(
+        text, '// Fixed syntax error', _TAIL4,
+        rule='fixed_syntax_error_comment', budget=budget), content)
+    fixes += n
+
+    # 5. Fixed: removed orphaned 패턴 정리
+    content, n = measure(report, 'removed_orphaned_comment', lambda text: line_marker_subn(
+        text, '// Fixed: removed orphaned ', _TAIL5,
+        rule='removed_orphaned_comment', budget=budget), content)
+    fixes += n
+
+    return content, fixes
+
+def fix_template_literals(file_path):
+    """깨진 템플릿 리터럴 패턴들을 일괄 수정"""
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    try:
+        fixed, fixes = transform(content, file_path)
+    except RuleTimeout as e:
+        # 시간 예산 초과 시 파일은 건드리지 않음
+        print(f"❌ {file_path}: {e}")
+        return False
+
+    # 백업 스냅샷 생성
+    snapshot_id = backup_content(file_path, content, 'fix_template_literals')
+    content = fixed
+
+    print("Template literals fixed successfully:")
+    print("1. Fixed }\" patterns to `)")
+    print("2. Removed Fixed syntax error comments")
+    print("3. Cleaned orphaned code")
+    print("4. Backup snapshot:", snapshot_id[:12])
+
+    # 파일 저장
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    return True
+
+if __name__ == "__main__":
+    import sys
+
+    for file_path in expand_targets(sys.argv[1:]):
+        fix_template_literals(file_path)
\ No newline at end of file
@@ -4,46 +4,52 @@
 근본적 구문 오류 해결 - debugLog를 안전하게 처리
 """
 
-import re
+from typing import Optional, Tuple
 
-def fundamental_fix(file_path):
-    """debugLog 호출을 안전하게 주석 처리"""
+from js_lexer import apply_splices
+from linear_scan import RuleTimeout, backtick_quote_subn, call_statement_subn
+from run_report import RunReport, measure
+from snapshot_store import backup_content
+from source_index import SourceIndex
+from targets import expand_targets
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def transform(content: str, path: str = '', report: Optional[RunReport] = None,
+              budget: Optional[float] = None) -> Tuple[str, int]:
+    """메모리 버퍼에 근본 수정 적용 후 (내용, 수정 횟수) 반환
 
-    # 백업 생성
-    with open(file_path + '.before_fundamental_fix', 'w', encoding='utf-8') as f:
-        f.write(content)
+    규칙 하나가 budget초(기본 linear_scan.DEFAULT_BUDGET)를 넘기면 RuleTimeout을 던진다.
+    """
 
     fixes = []
 
-    # 1. 특정 라인 수정 (982번 줄 문제)
-    lines = content.split('\n')
-
-    # 982번 줄 근처 수정 (0-indexed이므로 981)
-    if len(lines) > 981:
-        if 'debugLog(' in lines[981] and 'return filename' in lines[981]:
-            # 잘못 합쳐진 라인 분리 및 수정
-            lines[981] = '        // debugLog 호출 제거됨'
-            lines.insert(982, '        return filename;')
-            fixes.append("Line 982: Fixed merged debugLog and return statement")
-
-    content = '\n'.join(lines)
+    # 1. debugLog 호출과 return filename이 한 줄로 잘못 합쳐진 줄 분리
+    # (예전에는 982번 줄만 보았지만, 줄 번호가 밀려도 찾도록 인덱스로 해당 줄을 조회)
+    index = SourceIndex.of(content, path)
+    splices = []
+    pos = content.find('return filename')
+    while pos >= 0:
+        line = index.line_of(pos)
+        if 'debugLog(' in index.line_text(line):
+            start, end = index.line_span(line)
+            splices.append((start, end, '        // debugLog 호출 제거됨\n        return filename;'))
+            fixes.append(f"Line {line}: Fixed merged debugLog and return statement")
+            pos = end
+        pos = content.find('return filename', pos + 1)
+    content = apply_splices(content, splices)
 
     # 2. 모든 debugLog 함수 호출을 안전하게 주석 처리
     # 단순 제거가 아닌 전체 호출을 주석으로 변경
-    pattern = r'(\s*)debugLog\([^;]*\);'
-
-    def replace_debuglog(match):
-        indent = match.group(1)
-        return f'{indent}// debugLog 호출 제거'
-
-    content = re.sub(pattern, replace_debuglog, content, flags=re.MULTILINE | re.DOTALL)
+    # (\s*)debugLog\([^;]*\); 와 같은 결과를 선형 스캔으로 (호출마다 ';'까지 되추적하지 않음)
+    content, n = measure(report, 'comment_debuglog', lambda text: call_statement_subn(
+        text, 'debugLog', lambda indent: f'{indent}// debugLog 호출 제거',
+        rule='comment_debuglog', budget=budget), content)
+    fixes.extend(["debugLog 호출 주석 처리"] * n)
 
     # 3. 깨진 템플릿 리터럴 수정
-    # 백틱으로 시작해서 따옴표로 끝나는 패턴
-    content = re.sub(r'`([^`]*)"', r'`\1`', content)
+    # 백틱으로 시작해서 따옴표로 끝나는 패턴: `([^`]*)" → `\1`
+    content, n = measure(report, 'broken_template_literal', lambda text: backtick_quote_subn(
+        text, rule='broken_template_literal', budget=budget), content)
+    fixes.extend(["깨진 템플릿 리터럴 수정"] * n)
 
     # 4. 파일 끝에 debugLog 함수를 빈 함수로 재정의 추가
     debug_override = """
@@ -54,8 +60,29 @@ if (typeof debugLog === 'undefined') {
 }
 """
 
-    # </script> 태그 바로 앞에 삽입
-    content = content.replace('</script>', debug_override + '\n</script>', 1)
+    # </script> 태그 바로 앞에 삽입 (이미 정의되어 있으면 생략)
+    if 'window.debugLog = function() {};' not in content and '</script>' in content:
+        content = content.replace('</script>', debug_override + '\n</script>', 1)
+        fixes.append("debugLog 빈 함수 정의 추가")
+
+    return content, len(fixes)
+
+def fundamental_fix(file_path):
+    """debugLog 호출을 안전하게 주석 처리"""
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    try:
+        fixed, _ = transform(content, file_path)
+    except RuleTimeout as e:
+        # 시간 예산 초과 시 파일은 건드리지 않음
+        print(f"❌ {file_path}: {e}")
+        return False
+
+    # 백업 스냅샷 생성
+    snapshot_id = backup_content(file_path, content, 'fundamental_fix')
+    content = fixed
 
     # 파일 저장
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -65,9 +92,12 @@ if (typeof debugLog === 'undefined') {
     print("1. debugLog 호출을 안전하게 주석 처리")
     print("2. 깨진 템플릿 리터럴 수정")
     print("3. debugLog 빈 함수 정의 추가")
-    print("4. 백업 파일: " + file_path + '.before_fundamental_fix')
+    print("4. 백업 스냅샷: " + snapshot_id[:12])
 
     return True
 
 if __name__ == "__main__":
-    fundamental_fix("C:\\claude\\virtual_table_db_claude\\index.html")
\ No newline at end of file
+    import sys
+
+    for file_path in expand_targets(sys.argv[1:]):
+        fundamental_fix(file_path)
\ No newline at end of file
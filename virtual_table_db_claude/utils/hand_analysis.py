@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+핸드 AI 분석 일괄 실행기
+- 지금은 브라우저(index.html의 callGeminiAPIAdvanced)나 Apps Script(handleHandAnalysis →
+  analyzeWithGemini, 실패하면 generateDefaultAnalysis)가 핸드를 하나씩 분석하고,
+  같은 핸드를 다시 분석하면 모델도 다시 호출한다
+- 여러 핸드를 asyncio로 동시에(--concurrency 개까지) 분석하고, 429/5xx/시간 초과는
+  지수 백오프(지터 포함, Retry-After 우선)로 다시 시도
+- 결과는 디스크의 LRU 캐시(SQLite)에 보관. 키는 정규화한 핸드 데이터(핸드 번호, 파일명,
+  handData)와 백엔드 설정(모델, 프롬프트 버전)의 해시라 같은 핸드를 다시 돌리면 캐시 적중만 한다
+- 한 번의 실행 안에서 같은 키의 핸드는 모델을 한 번만 호출
+- 백엔드는 교체 가능: gemini(analyzeWithGemini와 같은 프롬프트/설정), stub(로컬 가짜 모델,
+  지연/일시 오류 흉내). 실패한 핸드는 --fallback이면 generateDefaultAnalysis 결과로 채움
+  (대체 결과는 캐시하지 않음)
+
+입력: 핸드 객체({handNumber, filename, timestamp, handData})의 JSON 배열,
+{"hands": [...]}, 또는 한 줄에 하나씩인 JSON Lines
+
+사용법:
+    python hand_analysis.py hands.json [--backend stub|gemini] [--concurrency 4] [--output out.json]
+    GEMINI_API_KEY=... python hand_analysis.py hands.jsonl --backend gemini --fallback
+    python hand_analysis.py --bench 500
+"""
+
+import abc
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from hand_index import js_key
+from sheet_backend import generate_default_analysis
+from targets import CACHE_DIR_NAME, REPO_ROOT
+
+CACHE_SUBDIR = 'hand_analysis'
+CACHE_FILE = 'results.db'
+DEFAULT_CACHE_SIZE = 50_000  # 캐시에 남길 최대 결과 수 (넘으면 가장 오래 안 쓴 것부터 삭제)
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 30.0
+BASE_DELAY = 0.5             # 첫 재시도 대기(초), 시도마다 두 배
+MAX_DELAY = 30.0
+
+GEMINI_API_URL = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent'
+DEFAULT_MODEL = 'gemini-1.5-flash'
+PROMPT_VERSION = 1  # 프롬프트를 바꾸면 올려서 이전 캐시를 무효화
+RETRYABLE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+
+class AnalysisError(Exception):
+    """다시 시도해도 소용없는 분석 실패"""
+
+
+class TransientError(AnalysisError):
+    """잠시 후 다시 시도할 수 있는 실패 (할당량, 서버 오류, 시간 초과)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ========================================
+# 핸드 정규화와 캐시 키
+# ========================================
+
+def normalize_hand(hand: dict) -> dict:
+    """분석 결과에 영향을 주는 값만 정규화 (timestamp는 프롬프트에 쓰이지 않아 제외)"""
+    number = hand.get('handNumber')
+    number = '' if number is None else js_key(number).strip().lstrip('#').strip()
+    if number.isdigit():
+        number = str(int(number))
+    return {
+        'handNumber': number,
+        'filename': str(hand.get('filename') or '').strip(),
+        'handData': hand.get('handData') or {},
+    }
+
+
+def cache_key(hand: dict, backend_key: str) -> str:
+    data = json.dumps([backend_key, normalize_hand(hand)], ensure_ascii=False,
+                      sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def build_prompt(hand: dict) -> str:
+    """appScripts.gs analyzeWithGemini와 같은 프롬프트"""
+    data = json.dumps(hand.get('handData') or {}, ensure_ascii=False, separators=(',', ':'))
+    return (f"\n포커 핸드를 3줄로 요약해주세요:\n"
+            f"- 핸드 번호: {hand.get('handNumber')}\n"
+            f"- 파일명: {hand.get('filename')}\n"
+            f"- 데이터: {data}\n\n"
+            f"간단명료하게 50자 이내로 작성해주세요.\n")
+
+
+# ========================================
+# 디스크 LRU 캐시
+# ========================================
+
+def default_cache_path() -> str:
+    return os.path.join(REPO_ROOT, CACHE_DIR_NAME, CACHE_SUBDIR, CACHE_FILE)
+
+
+class ResultCache:
+    """SQLite에 저장하는 LRU 캐시 (키 → 분석 결과)
+
+    조회할 때마다 사용 순번을 갱신하고, max_entries를 넘으면 순번이 가장 오래된 항목부터 지운다.
+    결과는 넣을 때마다 커밋하므로 중간에 끊겨도 그때까지의 분석은 남는다.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_CACHE_SIZE):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS results ('
+                        'key TEXT PRIMARY KEY, analysis TEXT NOT NULL, '
+                        'created TEXT NOT NULL, used INTEGER NOT NULL)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_used ON results(used)')
+        self.clock, self.count = self.db.execute(
+            'SELECT COALESCE(MAX(used), 0), COUNT(*) FROM results').fetchone()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.db.execute('SELECT analysis FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self.clock += 1
+        self.db.execute('UPDATE results SET used = ? WHERE key = ?', (self.clock, key))
+        return row[0]
+
+    def put(self, key: str, analysis: str):
+        self.clock += 1
+        with self.db:
+            replaced = self.db.execute('UPDATE results SET analysis = ?, used = ? WHERE key = ?',
+                                       (analysis, self.clock, key)).rowcount
+            if not replaced:
+                self.db.execute('INSERT INTO results VALUES (?, ?, ?, ?)',
+                                (key, analysis, time.strftime('%Y-%m-%dT%H:%M:%S'), self.clock))
+                self.count += 1
+            if self.count > self.max_entries:
+                self.db.execute('DELETE FROM results WHERE key IN '
+                                '(SELECT key FROM results ORDER BY used LIMIT ?)',
+                                (self.count - self.max_entries,))
+                self.count = self.max_entries
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+# ========================================
+# 분석 백엔드
+# ========================================
+
+class AnalysisBackend(abc.ABC):
+    """분석 백엔드 인터페이스. key는 결과를 바꾸는 설정(모델, 프롬프트 버전 등)을 담아야 한다.
+    analyze는 timeout초 안에 끝나지 않으면 호출 자체를 멈추고 TransientError를 내야 한다
+    (바깥에서 취소하면 스레드에서 도는 호출은 계속 남아 동시 호출 수 제한을 넘게 됨)"""
+
+    name = 'base'
+
+    @property
+    @abc.abstractmethod
+    def key(self) -> str:
+        ...
+
+    @abc.abstractmethod
+    async def analyze(self, hand: dict, timeout: float) -> str:
+        ...
+
+
+class GeminiBackend(AnalysisBackend):
+    """Gemini generateContent 호출 (analyzeWithGemini와 같은 설정, 결과는 100자까지)
+
+    제한 시간은 urlopen의 소켓 timeout으로 걸어 스레드 안의 호출이 직접 끝나게 한다.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model: str = DEFAULT_MODEL):
+        self.api_key = api_key
+        self.model = model
+
+    @property
+    def key(self) -> str:
+        return f"gemini:{self.model}:t0.7:max100:v{PROMPT_VERSION}"
+
+    def _request(self, hand: dict, timeout: float) -> str:
+        payload = json.dumps({
+            'contents': [{'parts': [{'text': build_prompt(hand)}]}],
+            'generationConfig': {'temperature': 0.7, 'maxOutputTokens': 100},
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{GEMINI_API_URL.format(model=self.model)}?key={self.api_key}",
+            data=payload, headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as error:
+            if error.code in RETRYABLE_STATUS:
+                retry_after = error.headers.get('Retry-After')
+                raise TransientError(f"Gemini API 오류: {error.code}",
+                                     float(retry_after) if retry_after and retry_after.isdigit() else None)
+            raise AnalysisError(f"Gemini API 오류: {error.code}")
+        except (urllib.error.URLError, TimeoutError, ConnectionError, http.client.HTTPException) as error:
+            # HTTPException: 본문이 중간에 끊긴 IncompleteRead, 잘못된 상태 줄 등
+            raise TransientError(f"Gemini 연결 실패: {type(error).__name__} {error}")
+        try:
+            result = json.loads(body.decode('utf-8'))
+        except ValueError:
+            raise AnalysisError(f"Gemini 응답이 JSON이 아님: {body[:80]!r}")
+        try:
+            text = result['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError):
+            raise AnalysisError('Gemini 응답 형식 오류')
+        return text.strip()[:100]
+
+    async def analyze(self, hand: dict, timeout: float) -> str:
+        return await asyncio.to_thread(self._request, hand, timeout)
+
+
+class StubBackend(AnalysisBackend):
+    """테스트/벤치마크용 로컬 가짜 모델
+
+    지연(latency ± jitter)을 두고, failure_rate 확률로 TransientError를 낸다.
+    실패 여부와 결과는 핸드와 시도 횟수로 정해지므로 같은 입력이면 매번 같다.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02,
+                 failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.attempts: Dict[str, int] = {}
+
+    @property
+    def key(self) -> str:
+        return f"stub:v{PROMPT_VERSION}"
+
+    async def analyze(self, hand: dict, timeout: float) -> str:
+        normalized = normalize_hand(hand)
+        digest = cache_key(hand, self.key)
+        attempt = self.attempts[digest] = self.attempts.get(digest, 0) + 1
+        rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+            if delay > timeout:
+                await asyncio.sleep(timeout)
+                raise TransientError(f"stub: {timeout:g}초 안에 응답 없음")
+            await asyncio.sleep(delay)
+            if rng.random() < self.failure_rate:
+                raise TransientError('stub: 429 Too Many Requests')
+        finally:
+            self.in_flight -= 1
+        data = normalized['handData']
+        return '\n'.join([
+            f"핸드 #{normalized['handNumber'] or 'N/A'} 요약",
+            f"파일: {normalized['filename'] or 'unknown.mp4'}",
+            f"데이터 {len(data) if isinstance(data, (dict, list)) else 1}개 항목 ({digest[:8]})",
+        ])
+
+
+# ========================================
+# 일괄 실행기
+# ========================================
+
+class AnalysisResult(NamedTuple):
+    hand_number: object
+    filename: object
+    analysis: Optional[str]
+    source: str          # cache | model | fallback | error
+    attempts: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {'handNumber': self.hand_number, 'filename': self.filename,
+                'analysis': self.analysis, 'source': self.source, 'attempts': self.attempts}
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class RunStats:
+    def __init__(self):
+        self.hands = 0
+        self.hits = 0
+        self.calls = 0
+        self.retries = 0
+        self.shared = 0     # 같은 실행 안에서 다른 핸드의 호출 결과를 같이 쓴 수
+        self.failures = 0
+        self.fallbacks = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> dict:
+        return {name: round(value, 3) if isinstance(value, float) else value
+                for name, value in vars(self).items()}
+
+
+class HandAnalyzer:
+    """핸드 목록을 동시 호출 수 제한 안에서 분석하고 결과를 캐시에 저장"""
+
+    def __init__(self, backend: AnalysisBackend, cache: Optional[ResultCache] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, base_delay: float = BASE_DELAY,
+                 max_delay: float = MAX_DELAY, fallback: bool = False, seed: Optional[int] = None):
+        self.backend = backend
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.fallback = fallback
+        self.rng = random.Random(seed)
+        self.stats = RunStats()
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt번째 실패 뒤 대기 시간: 서버가 준 Retry-After, 아니면 지터를 섞은 지수 백오프"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+    async def _call(self, hand: dict, semaphore: asyncio.Semaphore) -> tuple:
+        """(분석 결과, 시도 횟수, 오류). 대기하는 동안에는 동시 호출 자리를 비워 둔다"""
+        error = None
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                self.stats.calls += 1
+                try:
+                    return await self.backend.analyze(hand, self.timeout), attempt + 1, None
+                except TransientError as caught:
+                    error = caught
+                except AnalysisError as caught:
+                    return None, attempt + 1, str(caught)
+            if attempt < self.retries:
+                self.stats.retries += 1
+                await asyncio.sleep(self.backoff(attempt, error.retry_after))
+        return None, self.retries + 1, str(error)
+
+    async def _analyze(self, hand: dict, key: str, semaphore: asyncio.Semaphore) -> AnalysisResult:
+        number, filename = hand.get('handNumber'), hand.get('filename')
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._call(hand, semaphore))
+        else:
+            self.stats.shared += 1
+        try:
+            analysis, attempts, error = await task
+        except Exception:
+            self._pending.pop(key, None)
+            raise
+        if analysis is not None:
+            if self.cache is not None and self._pending.pop(key, None) is not None:
+                self.cache.put(key, analysis)
+            return AnalysisResult(number, filename, analysis, 'model', attempts)
+        self._pending.pop(key, None)
+        self.stats.failures += 1
+        if self.fallback:
+            self.stats.fallbacks += 1
+            return AnalysisResult(number, filename, generate_default_analysis(hand),
+                                  'fallback', attempts, error)
+        return AnalysisResult(number, filename, None, 'error', attempts, error)
+
+    async def run(self, hands: Sequence[dict]) -> List[AnalysisResult]:
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._pending = {}
+        jobs = []
+        for hand in hands:
+            self.stats.hands += 1
+            number, filename = hand.get('handNumber'), hand.get('filename')
+            if not number and not filename:
+                self.stats.failures += 1
+                jobs.append(_done(AnalysisResult(number, filename, None, 'error',
+                                                 error='핸드 번호 또는 파일명이 필요합니다')))
+                continue
+            key = cache_key(hand, self.backend.key)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                self.stats.hits += 1
+                jobs.append(_done(AnalysisResult(number, filename, cached, 'cache')))
+            else:
+                jobs.append(self._analyze(hand, key, semaphore))
+        # 한 핸드의 예상 못 한 예외가 나머지 결과를 버리지 않도록 핸드마다 오류로 기록
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for i, (hand, result) in enumerate(zip(hands, results)):
+            if isinstance(result, BaseException):
+                self.stats.failures += 1
+                results[i] = AnalysisResult(hand.get('handNumber'), hand.get('filename'), None, 'error',
+                                            error=f"{type(result).__name__}: {result}")
+        if self.cache is not None:
+            self.cache.db.commit()
+        self.stats.seconds += time.perf_counter() - started
+        return list(results)
+
+
+async def _done(result: AnalysisResult) -> AnalysisResult:
+    return result
+
+
+def analyze_hands(hands: Sequence[dict], backend: AnalysisBackend,
+                  cache: Optional[ResultCache] = None, **options) -> tuple:
+    """동기 호출용: (결과 목록, RunStats)"""
+    analyzer = HandAnalyzer(backend, cache, **options)
+    results = asyncio.run(analyzer.run(hands))
+    return results, analyzer.stats
+
+
+# ========================================
+# 입력과 벤치마크
+# ========================================
+
+def load_hands(source: str) -> List[dict]:
+    """JSON 배열, {"hands": [...]}, JSON Lines 중 하나 ('-'는 표준 입력)"""
+    if source == '-':
+        text = sys.stdin.read()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get('hands', [data])
+    if not isinstance(data, list) or not all(isinstance(hand, dict) for hand in data):
+        raise ValueError("핸드 객체 목록이 아닙니다")
+    return data
+
+
+def generate_hands(count: int, duplicate_ratio: float = 0.1, seed: int = 0) -> Iterable[dict]:
+    """벤치마크용 핸드 (일부는 표기만 다른 같은 핸드)"""
+    rng = random.Random(seed)
+    made: List[dict] = []
+    for index in range(count):
+        if made and rng.random() < duplicate_ratio:
+            hand = dict(rng.choice(made))
+            hand['handNumber'] = f" #{hand['handNumber']}"
+            hand['timestamp'] = hand['timestamp'] + rng.randrange(1, 60)
+        else:
+            number = 1000 + index
+            hand = {
+                'handNumber': number,
+                'filename': f"{number}_Player{rng.randrange(200)}_Player{rng.randrange(200)}.mp4",
+                'timestamp': 1735700000 + index * 90,
+                'handData': {
+                    'players': [f"Player{rng.randrange(200)}" for _ in range(rng.randrange(2, 7))],
+                    'board': [rng.choice('AKQJT98765432') + rng.choice('shdc') for _ in range(5)],
+                    'pot': rng.randrange(1000, 2_000_000),
+                },
+            }
+            made.append(hand)
+        yield hand
+
+
+def run_benchmark(count: int, concurrency: int, failure_rate: float, latency: float,
+                  seed: int = 0) -> int:
+    hands = list(generate_hands(count, seed=seed))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(os.path.join(directory, CACHE_FILE))
+        try:
+            rounds = []
+            for label in ('첫 실행', '다시 실행'):
+                backend = StubBackend(latency=latency, jitter=latency / 2,
+                                      failure_rate=failure_rate, seed=seed)
+                analyzer = HandAnalyzer(backend, cache, concurrency=concurrency,
+                                        base_delay=latency, max_delay=latency * 8, seed=seed)
+                results = asyncio.run(analyzer.run(hands))
+                stats = analyzer.stats
+                rounds.append(results)
+                print(f"⚡ {label}: {stats.seconds * 1000:.0f} ms | 핸드 {stats.hands}, "
+                      f"캐시 적중 {stats.hits}, 모델 호출 {backend.calls} (재시도 {stats.retries}, "
+                      f"공유 {stats.shared}), 실패 {stats.failures}, 최대 동시 {backend.peak_in_flight}")
+                if backend.peak_in_flight > concurrency:
+                    print(f"❌ 동시 호출 제한 초과: {backend.peak_in_flight} > {concurrency}")
+                    return 1
+            serial = count * latency
+            print(f"📊 순차 호출 추정 {serial * 1000:.0f} ms, 캐시 {len(cache)}개")
+        finally:
+            cache.close()
+
+    first, second = rounds
+    done = [a for a in first if a.source == 'model']
+    if any(b.source != 'cache' or b.analysis != a.analysis
+           for a, b in zip(first, second) if a.source == 'model'):
+        print("❌ 다시 실행한 결과가 캐시와 다름")
+        return 1
+    if second and any(result.source not in ('cache', 'error') for result in second):
+        print("❌ 다시 실행에서 모델을 호출함")
+        return 1
+    print(f"✅ 분석 {len(done)}개, 다시 실행은 모두 캐시 적중")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핸드 AI 분석 일괄 실행 (동시 호출 제한, 재시도, 결과 캐시)")
+    parser.add_argument('source', nargs='?', help="핸드 JSON/JSON Lines 파일 또는 '-'")
+    parser.add_argument('--backend', choices=('stub', 'gemini'), default='stub')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Gemini 모델")
+    parser.add_argument('--api-key', default=os.environ.get('GEMINI_API_KEY', ''),
+                        help="Gemini API 키 (기본: 환경 변수 GEMINI_API_KEY)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시 호출 수")
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help="핸드당 재시도 횟수")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="호출 한 번의 제한 시간(초)")
+    parser.add_argument('--cache', default=default_cache_path(), help="결과 캐시 SQLite 경로")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="캐시 최대 항목 수")
+    parser.add_argument('--no-cache', action='store_true', help="캐시를 읽거나 쓰지 않음")
+    parser.add_argument('--fallback', action='store_true',
+                        help="실패한 핸드는 generateDefaultAnalysis 결과로 채움")
+    parser.add_argument('--output', help="결과 JSON 저장 경로 (없으면 표준 출력)")
+    parser.add_argument('--bench', type=int, metavar='N', help="N개 합성 핸드를 stub 백엔드로 두 번 실행")
+    parser.add_argument('--failure-rate', type=float, default=0.1, help="벤치마크 stub의 일시 오류 비율")
+    parser.add_argument('--latency', type=float, default=20.0, help="벤치마크 stub의 호출 지연(ms)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error("--concurrency는 1 이상이어야 합니다")
+    if args.bench:
+        return run_benchmark(args.bench, args.concurrency, args.failure_rate,
+                             args.latency / 1000, args.seed)
+    if not args.source:
+        parser.error("source 또는 --bench가 필요합니다")
+
+    try:
+        hands = load_hands(args.source)
+    except (OSError, ValueError) as error:
+        print(f"❌ 핸드 읽기 실패: {error}", file=sys.stderr)
+        return 1
+    if args.backend == 'gemini':
+        if not args.api_key:
+            parser.error("gemini 백엔드에는 --api-key 또는 GEMINI_API_KEY가 필요합니다")
+        backend: AnalysisBackend = GeminiBackend(args.api_key, args.model)
+    else:
+        backend = StubBackend(seed=args.seed)
+
+    cache = None if args.no_cache else ResultCache(args.cache, args.cache_size)
+    try:
+        results, stats = analyze_hands(hands, backend, cache, concurrency=args.concurrency,
+                                       retries=args.retries, timeout=args.timeout,
+                                       fallback=args.fallback)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    text = json.dumps({'results': [result.to_dict() for result in results], 'stats': stats.to_dict()},
+                      ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    print(f"📊 핸드 {stats.hands}개 ({stats.seconds * 1000:.0f} ms) | 캐시 적중 {stats.hits}, "
+          f"호출 {stats.calls} (재시도 {stats.retries}), 실패 {stats.failures}"
+          + (f", 기본 분석 {stats.fallbacks}" if args.fallback else ''), file=sys.stderr)
+    return 1 if stats.failures and not args.fallback else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+핸드 시트 변경을 SSE로 여러 브라우저에 나눠 보내는 asyncio 서버
+- 탭마다 30초 setInterval로 CSV를 받는 대신(incrementalUpdate, preloadAllHandStatuses)
+  서버 하나가 핸드 소스를 주기적으로 한 번만 읽음
+  (로컬 CSV는 크기/수정 시각이 바뀔 때만, URL은 ETag/Last-Modified 조건부 요청)
+- csv_delta의 행 해시 비교로 바뀐 행만 찾아 이벤트로 보냄
+    newHand      시트 끝에 추가됐거나 빈 행이 채워진 핸드
+    handUpdated  기존 핸드 행의 내용이 바뀜 (상태, 파일명, 분석 등)
+    reset        행이 삭제/중간 삽입돼 행 번호가 밀렸거나 한 번에 너무 많이 바뀜 → CSV 다시 읽기
+    ready        처음 연결했을 때 현재 커서
+    heartbeat    일정 간격 (SSEHandDetector의 heartbeatTimeout 90초보다 충분히 짧게)
+- 이벤트는 한 번만 직렬화해 최근 이벤트 링 버퍼에 넣고, 클라이언트는 각자 커서만 가짐
+  (클라이언트 수만큼 큐를 복사하지 않음)
+- 재접속할 때 Last-Event-ID(헤더 또는 ?lastEventId=)가 링 버퍼 안이면 놓친 이벤트만 다시 보냄.
+  버퍼 밖이거나 서버가 재시작됐으면(epoch 불일치) reset
+- 클라이언트별 배압: 전송 버퍼가 WRITE_BUFFER를 넘으면 drain이 끝나야 다음 프레임을 씀.
+  drain이 write_timeout을 넘거나 max_lag개 이상 뒤처지면 그 클라이언트만 끊음
+  (브라우저가 재접속해 Last-Event-ID로 이어받음)
+- GET /metrics: 연결 수, 보낸 이벤트/바이트, 끊은 느린 클라이언트, 폴링 통계
+
+이벤트 형식 (id는 "epoch.순번", data는 한 줄 JSON):
+    id: 3f2a9c1e.42
+    event: newHand
+    data: {"handNumber": 123, "row": 57, "time": 1700000000, "status": "미완료",
+           "filename": "hand_123.mp4", "cells": ["...", ...]}
+
+사용법:
+    python hand_events.py <핸드 CSV URL 또는 파일> [--port 8788] [--interval 5] [--heartbeat 15]
+    # 로컬 sheet_backend의 시트: "http://127.0.0.1:8787/exec?format=csv&sheetUrl=..."
+    # 브라우저: new EventSource('http://127.0.0.1:8788/events')
+    python hand_events.py --bench 2000 [--rows 5000] [--rounds 20] [--slow 5]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from csv_delta import Row, diff_hashes, parse_csv, row_hash
+from hand_index import generate_hand_rows, js_parse_int
+from sheet_backend import (COL_FILENAME, COL_HAND, COL_STATUS, COL_TIME, DEFAULT_HOST,
+                           BadRequest, read_request)
+
+DEFAULT_PORT = 8788
+DEFAULT_INTERVAL = 5.0     # 소스 폴링 간격(초)
+MAX_POLL_BACKOFF = 60.0    # 폴링이 예기치 않게 실패할 때 늘려 가는 대기의 상한(초)
+HEARTBEAT_INTERVAL = 15.0  # 초
+RING_SIZE = 1024           # Last-Event-ID로 다시 보낼 수 있는 최근 이벤트 수
+MAX_LAG = 256              # 이만큼 뒤처진 클라이언트는 끊음 (RING_SIZE보다 작아야 재접속 때 이어받음)
+WRITE_TIMEOUT = 10.0       # 소켓 drain 제한(초)
+WRITE_BUFFER = 64 * 1024   # 클라이언트별 전송 버퍼가 이보다 크면 drain
+RETRY_MS = 2000            # 브라우저 재접속 대기 (SSEHandDetector reconnectDelay와 같게)
+
+HEADER_ROW = 0
+_EMPTY_ROW = row_hash([])
+
+
+class SourceError(Exception):
+    """핸드 소스를 읽지 못함"""
+
+
+# ========================================
+# 핸드 소스
+# ========================================
+
+class FileSource:
+    """로컬 CSV 파일. 크기나 수정 시각이 바뀌었을 때만 다시 읽음"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.label = path
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def read(self) -> Optional[str]:
+        """바뀌었으면 CSV 본문, 그대로면 None"""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return None
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+        except OSError as error:
+            raise SourceError(str(error)) from error
+        self._stamp = stamp
+        return text
+
+
+class UrlSource:
+    """게시된 시트 CSV URL. ETag/Last-Modified가 오면 조건부 요청으로 304를 받음"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url
+        self.label = url
+        self.timeout = timeout
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
+    def read(self) -> Optional[str]:
+        headers = {'Cache-Control': 'no-cache'}
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                text = response.read().decode('utf-8')
+                self._etag = response.headers.get('ETag')
+                self._last_modified = response.headers.get('Last-Modified')
+        except urllib.error.HTTPError as error:
+            if error.code == 304:
+                return None
+            raise SourceError(f'HTTP {error.code}') from error
+        except (OSError, UnicodeDecodeError) as error:
+            raise SourceError(str(error)) from error
+        return text
+
+
+def open_source(spec: str) -> Union[FileSource, UrlSource]:
+    if urlsplit(spec).scheme in ('http', 'https'):
+        return UrlSource(spec)
+    return FileSource(spec)
+
+
+# ========================================
+# 변경 감지
+# ========================================
+
+def _cell(row: Row, col: int) -> str:
+    return row[col - 1] if len(row) >= col else ''
+
+
+def hand_payload(index: int, row: Row) -> dict:
+    """행 하나 → 이벤트 data (row는 시트 행 번호, 1행 = 헤더)"""
+    value = _cell(row, COL_HAND).strip()
+    number = js_parse_int(value)
+    return {
+        'handNumber': number if number is not None else (value or None),
+        'row': index + 1,
+        'time': js_parse_int(_cell(row, COL_TIME)),
+        'status': _cell(row, COL_STATUS),
+        'filename': _cell(row, COL_FILENAME),
+        'cells': row,
+    }
+
+
+class HandTracker:
+    """마지막으로 읽은 핸드 시트와 비교해 새 핸드/바뀐 핸드를 찾음"""
+
+    def __init__(self, max_events: int = MAX_LAG):
+        self.max_events = max_events  # 한 번에 이보다 많이 바뀌면 개별 이벤트 대신 reset
+        self.rows: Optional[List[Row]] = None
+        self.hashes: List[bytes] = []
+
+    def update(self, rows: List[Row]) -> List[Tuple[str, dict]]:
+        """새 스냅샷 반영 → [(이벤트 이름, data)]. 첫 스냅샷은 기준만 잡고 이벤트 없음"""
+        hashes = [row_hash(row) for row in rows]
+        old, first = self.hashes, self.rows is None
+        self.rows, self.hashes = rows, hashes
+        if first:
+            return []
+
+        events: List[Tuple[str, dict]] = []
+        for i1, i2, j1, j2 in diff_hashes(old, hashes):
+            removed, added = i2 - i1, j2 - j1
+            # 끝에 붙은 행이 아니면서 행 수가 달라지면 뒤쪽 행 번호가 모두 밀린다
+            if i1 == HEADER_ROW or (removed != added and (i2 != len(old) or added < removed)):
+                return [('reset', {'reason': 'rows_shifted', 'rows': len(rows)})]
+            for offset, j in enumerate(range(j1, j2)):
+                if hashes[j] == _EMPTY_ROW:
+                    if offset < removed:
+                        events.append(('handUpdated', hand_payload(j, rows[j])))
+                    continue
+                was_empty = offset >= removed or old[i1 + offset] == _EMPTY_ROW
+                events.append(('newHand' if was_empty else 'handUpdated', hand_payload(j, rows[j])))
+            if len(events) > self.max_events:
+                return [('reset', {'reason': 'too_many_changes', 'rows': len(rows)})]
+        return events
+
+
+# ========================================
+# 이벤트 허브 (링 버퍼 + 깨우기)
+# ========================================
+
+def format_event(event: str, data, event_id: Optional[str] = None) -> bytes:
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class EventHub:
+    """직렬화한 최근 이벤트의 링 버퍼. 순번은 1부터 연속이라 커서로 바로 자를 수 있다"""
+
+    def __init__(self, ring_size: int = RING_SIZE):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.ring: Deque[Tuple[int, bytes]] = deque(maxlen=ring_size)
+        self.beat = 0
+        self.beat_frame = b''
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def event_id(self, seq: Optional[int] = None) -> str:
+        return f'{self.epoch}.{self.seq if seq is None else seq}'
+
+    def parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """이 서버가 낸 id면 순번, 아니면 None"""
+        epoch, _, seq = (event_id or '').strip().partition('.')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, event: str, data) -> int:
+        self.seq += 1
+        self.ring.append((self.seq, format_event(event, data, self.event_id())))
+        self._notify()
+        return self.seq
+
+    def heartbeat(self):
+        self.beat += 1
+        self.beat_frame = format_event('heartbeat', {'time': int(time.time() * 1000)})
+        self._notify()
+
+    def close(self):
+        self.closed = True
+        self._notify()
+
+    def _notify(self):
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    async def wait(self):
+        await self._wakeup.wait()
+
+    def resumable(self, seq: int) -> bool:
+        oldest = self.ring[0][0] if self.ring else self.seq + 1
+        return oldest - 1 <= seq <= self.seq
+
+    def since(self, seq: int) -> List[bytes]:
+        """seq 다음부터 현재까지의 프레임 (resumable(seq)일 때만)"""
+        if seq >= self.seq:
+            return []
+        start = seq - self.ring[0][0] + 1
+        return [frame for _, frame in islice(self.ring, start, None)]
+
+
+# ========================================
+# SSE 서버
+# ========================================
+
+class HandEventServer:
+    """핸드 소스 폴링 한 개 + SSE 클라이언트 여러 개"""
+
+    def __init__(self, source, interval: float = DEFAULT_INTERVAL,
+                 heartbeat: float = HEARTBEAT_INTERVAL, ring_size: int = RING_SIZE,
+                 max_lag: int = MAX_LAG, write_timeout: float = WRITE_TIMEOUT):
+        self.source = source
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.max_lag = max_lag
+        self.write_timeout = write_timeout
+        self.hub = EventHub(ring_size)
+        self.tracker = HandTracker(max_lag)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {
+            'connections': 0, 'peak_clients': 0, 'resumed': 0, 'reset_sent': 0,
+            'dropped_slow': 0, 'frames_sent': 0, 'bytes_sent': 0,
+            'polls': 0, 'poll_errors': 0, 'last_poll_ms': 0.0, 'last_error': None,
+            'events': {},
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, poll: bool = True):
+        """poll=False면 폴링 루프 없이 시작 (poll_once를 직접 부름)"""
+        self.server = await asyncio.start_server(self._serve_connection, host, port, backlog=4096)
+        if poll:
+            self._tasks.append(asyncio.create_task(self._poll_loop()))
+        if self.heartbeat > 0:
+            self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self.hub.close()
+        if self.server is not None:
+            self.server.close()
+        for writer in list(self.clients):
+            writer.transport.abort()
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def poll_once(self) -> int:
+        """소스를 한 번 읽고 바뀐 핸드를 발행 → 발행한 이벤트 수"""
+        self.stats['polls'] += 1
+        try:
+            text = await asyncio.to_thread(self.source.read)
+        except SourceError as error:
+            self.stats['poll_errors'] += 1
+            self.stats['last_error'] = str(error)
+            return 0
+        if text is None:
+            return 0
+        started = time.perf_counter()
+        events = self.tracker.update(parse_csv(text))
+        for event, data in events:
+            self.hub.publish(event, data)
+            counts = self.stats['events']
+            counts[event] = counts.get(event, 0) + 1
+        self.stats['last_poll_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return len(events)
+
+    async def _poll_loop(self):
+        """poll_once를 interval마다 실행. 예기치 않은 예외(파싱 실패 등)로 루프가 끝나면
+        스트림이 조용히 멈추므로, 기록하고 간격을 두 배씩(최대 MAX_POLL_BACKOFF) 늘려 계속 폴링"""
+        failures = 0
+        while True:
+            try:
+                await self.poll_once()
+                failures = 0
+            except Exception as error:
+                failures += 1
+                self.stats['poll_errors'] += 1
+                self.stats['last_error'] = f"{type(error).__name__}: {error}"
+                print(f"⚠️  폴링 실패 ({failures}회 연속): {self.stats['last_error']}\n"
+                      f"{traceback.format_exc()}", file=sys.stderr)
+            backoff = min(max(self.interval, 1.0) * 2 ** (failures - 1), MAX_POLL_BACKOFF) if failures else 0.0
+            await asyncio.sleep(max(self.interval, backoff))
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self.hub.heartbeat()
+
+    def metrics(self) -> dict:
+        hub = self.hub
+        return dict(self.stats, clients=len(self.clients), cursor=hub.event_id(),
+                    ring=len(hub.ring), source=self.source.label,
+                    rows=len(self.tracker.rows or []))
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            method, target, _, headers, _ = request
+            url = urlsplit(target)
+            if method == 'OPTIONS':
+                writer.write(_head(204, 'text/plain', {'Content-Length': '0'}))
+            elif method != 'GET':
+                writer.write(_head(405, 'text/plain', {'Content-Length': '0'}))
+            elif url.path.rstrip('/').endswith('/metrics'):
+                payload = json.dumps(self.metrics(), ensure_ascii=False).encode('utf-8')
+                writer.write(_head(200, 'application/json',
+                                   {'Content-Length': str(len(payload))}) + payload)
+            else:
+                params = dict(parse_qsl(url.query))
+                last_id = headers.get('last-event-id') or params.get('lastEventId')
+                await self._stream(writer, last_id)
+                return
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        except BadRequest as error:
+            writer.write(_head(error.status, 'text/plain', {'Content-Length': '0'}))
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, last_id: Optional[str]):
+        hub = self.hub
+        self.stats['connections'] += 1
+        self.clients.add(writer)
+        self.stats['peak_clients'] = max(self.stats['peak_clients'], len(self.clients))
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            first = [_head(200, 'text/event-stream', {
+                'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}),
+                f'retry: {RETRY_MS}\n\n'.encode('ascii')]
+            seq = hub.parse_id(last_id)
+            if seq is not None and hub.resumable(seq) and hub.seq - seq <= self.max_lag:
+                self.stats['resumed'] += 1
+                cursor = seq
+            else:
+                cursor = hub.seq
+                status = {'cursor': hub.event_id(), 'rows': len(self.tracker.rows or [])}
+                if last_id:
+                    self.stats['reset_sent'] += 1
+                    first.append(format_event('reset', dict(status, reason='stale_cursor'),
+                                              hub.event_id()))
+                else:
+                    first.append(format_event('ready', status, hub.event_id()))
+            pending = [b''.join(first)]
+            beat = hub.beat
+            transport = writer.transport
+            while not hub.closed:
+                # 프레임 bytes는 모든 클라이언트가 공유한다 (합쳐서 복사하지 않음).
+                # 커널이 받지 못한 만큼만 전송 버퍼에 쌓이고, 그게 넘칠 때만 drain으로 기다림
+                for frame in pending:
+                    if transport.is_closing():
+                        return  # 클라이언트가 끊음 (다음 쓰기 시도에서 알게 됨)
+                    writer.write(frame)
+                    self.stats['bytes_sent'] += len(frame)
+                    if transport.get_write_buffer_size() > WRITE_BUFFER:
+                        await asyncio.wait_for(writer.drain(), self.write_timeout)
+                if hub.seq - cursor > self.max_lag or not hub.resumable(cursor):
+                    self.stats['dropped_slow'] += 1
+                    return
+                pending = hub.since(cursor)
+                if pending:
+                    cursor = hub.seq
+                    beat = hub.beat
+                    self.stats['frames_sent'] += len(pending)
+                elif beat != hub.beat:
+                    beat = hub.beat
+                    pending = [hub.beat_frame]
+                else:
+                    await hub.wait()
+        except asyncio.TimeoutError:
+            self.stats['dropped_slow'] += 1
+        finally:
+            self.clients.discard(writer)
+
+
+def _head(status: int, content_type: str, extra: Dict[str, str]) -> bytes:
+    reason = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 405: 'Method Not Allowed',
+              411: 'Length Required', 413: 'Payload Too Large'}.get(status, 'OK')
+    head = [
+        f'HTTP/1.1 {status} {reason}',
+        f'Content-Type: {content_type}; charset=utf-8',
+        'Access-Control-Allow-Origin: *',
+        'Access-Control-Allow-Methods: GET, OPTIONS',
+        'Access-Control-Allow-Headers: Content-Type, Last-Event-ID',
+        'Connection: close' if status != 200 or content_type != 'text/event-stream'
+        else 'Connection: keep-alive',
+    ]
+    head.extend(f'{name}: {value}' for name, value in extra.items())
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1')
+
+
+async def serve(source, host: str, port: int, interval: float, heartbeat: float):
+    server = HandEventServer(source, interval, heartbeat)
+    await server.start(host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C는 KeyboardInterrupt로 처리
+    print(f"📡 핸드 이벤트 스트림: http://{host}:{server.port}/events (지표: /metrics)")
+    print(f"   소스: {source.label} ({interval:g}초마다)")
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        metrics = server.metrics()
+        print(f"📊 연결 {metrics['connections']}회 (최대 동시 {metrics['peak_clients']}), "
+              f"이벤트 {metrics['events']}, 느린 클라이언트 끊음 {metrics['dropped_slow']}")
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+class _BenchClient:
+    """SSE 스트림을 읽으며 id별 도착 시각을 기록"""
+
+    def __init__(self, received: Dict[int, List[float]], epoch_of):
+        self.received = received
+        self.epoch_of = epoch_of
+        self.last_id: Optional[str] = None
+        self.ids: List[int] = []
+        self.events: List[str] = []
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+
+    async def connect(self, port: int, last_id: Optional[str] = None, rcvbuf: int = 0):
+        if rcvbuf:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+            sock.setblocking(False)
+            await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+            self.reader, self.writer = await asyncio.open_connection(sock=sock)
+        else:
+            self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+        extra = f'Last-Event-ID: {last_id}\r\n' if last_id else ''
+        self.writer.write(f'GET /events HTTP/1.1\r\nHost: bench\r\n{extra}\r\n'.encode('latin-1'))
+
+    def listen(self):
+        self.task = asyncio.create_task(self._read())
+
+    async def _read(self):
+        event = None
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    return
+                if line.startswith(b'id: '):
+                    self.last_id = line[4:].decode().strip()
+                    seq = self.epoch_of(self.last_id)
+                    self.ids.append(seq)
+                    self.received.setdefault(seq, []).append(time.perf_counter())
+                elif line.startswith(b'event: '):
+                    event = line[7:].decode().strip()
+                    self.events.append(event)
+                    if event in ('ready', 'reset'):
+                        self.ready.set()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        if self.task:
+            self.task.cancel()
+        if self.writer:
+            self.writer.transport.abort()
+
+
+def _write_csv(path: str, rows: List[Row]):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+    os.replace(tmp, path)
+
+
+def _percentiles(values: List[float]) -> str:
+    if not values:
+        return '-'
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))] * 1000
+    return f"p50 {pick(0.5):.1f} ms, p99 {pick(0.99):.1f} ms, 최대 {values[-1] * 1000:.1f} ms"
+
+
+async def run_benchmark(clients: int, rows: int, rounds: int, per_round: int, slow: int,
+                        seed: int = 0) -> int:
+    rng = random.Random(seed)
+    header = ['A', '시간', 'C', '핸드', '상태', '파일명', 'G', '분석', '업데이트']
+    sheet = [header] + generate_hand_rows(rows, seed)
+    workdir = tempfile.mkdtemp(prefix='hand_events_')
+    path = os.path.join(workdir, 'hands.csv')
+    _write_csv(path, sheet)
+
+    server = HandEventServer(FileSource(path), heartbeat=0, write_timeout=1.0)
+    await server.start('127.0.0.1', 0, poll=False)
+    await server.poll_once()
+    received: Dict[int, List[float]] = {}
+    published: Dict[int, float] = {}
+    epoch_of = lambda event_id: server.hub.parse_id(event_id) or 0
+
+    started = time.perf_counter()
+    fleet = [_BenchClient(received, epoch_of) for _ in range(clients)]
+    for chunk in range(0, clients, 500):
+        batch = fleet[chunk:chunk + 500]
+        await asyncio.gather(*(client.connect(server.port) for client in batch))
+        for client in batch:
+            client.listen()
+    await asyncio.gather(*(client.ready.wait() for client in fleet))
+    print(f"🔌 SSE 클라이언트 {clients}개 연결: {time.perf_counter() - started:.2f}초")
+
+    # 읽지 않는 느린 클라이언트 (수신 버퍼를 작게)
+    laggards = [_BenchClient({}, epoch_of) for _ in range(slow)]
+    for client in laggards:
+        await client.connect(server.port, rcvbuf=4096)
+    await asyncio.sleep(0.1)
+
+    padding = 'x' * 400  # 분석 텍스트 흉내
+
+    async def publish_round(added: int, text: str = padding) -> float:
+        """핸드 added개 추가 + 기존 행 하나 상태 변경 → 파일 쓰고 폴링, 발행 시각"""
+        next_hand = len(sheet)
+        for offset in range(added):
+            row = list(sheet[-1])
+            row[0], row[3] = f'#{next_hand + offset}', str(next_hand + offset)
+            row[1] = str(int(row[1] or 1_700_000_000) + 60)
+            row[7] = text
+            sheet.append(row)
+        target = rng.randrange(1, len(sheet) - added)
+        sheet[target] = list(sheet[target])
+        sheet[target][4] = '복사완료' if sheet[target][4] != '복사완료' else '미완료'
+        _write_csv(path, sheet)
+        before = server.hub.seq
+        t0 = time.perf_counter()
+        count = await server.poll_once()
+        poll_ms.append(server.stats['last_poll_ms'])
+        for seq in range(before + 1, before + count + 1):
+            published[seq] = t0
+        return t0
+
+    async def wait_for(clients_: List[_BenchClient], seq: int):
+        deadline = time.perf_counter() + 10
+        while (any(client.ids[-1:] != [seq] for client in clients_)
+               and time.perf_counter() < deadline):
+            await asyncio.sleep(0.002)
+
+    # 일부는 중간에 끊었다가 Last-Event-ID로 재접속
+    resumers = fleet[:max(1, clients // 20)]
+    steady = fleet[len(resumers):]
+    fanout: List[float] = []
+    poll_ms: List[float] = []
+    for round_no in range(rounds):
+        if round_no == rounds // 2:
+            for client in resumers:
+                client.close()
+        t0 = await publish_round(per_round)
+        await wait_for(steady, server.hub.seq)
+        fanout.append(max(received.get(server.hub.seq, [t0])) - t0)
+    latencies = [when - published[seq] for seq, times in received.items()
+                 if seq in published for when in times]
+    complete = sum(1 for client in steady if client.ids[-1:] == [server.hub.seq])
+    metrics = server.metrics()
+    print(f"📤 이벤트 {server.hub.seq}개 → 프레임 {metrics['frames_sent']:,}개, "
+          f"{metrics['bytes_sent'] / 1024 / 1024:.1f} MiB (벤치 클라이언트도 같은 이벤트 루프)")
+    print(f"   폴링+비교 ({len(sheet):,}행): {statistics.median(poll_ms):.1f} ms (중앙값)")
+    print(f"   전달 지연: {_percentiles(latencies)}")
+    print(f"   라운드별 마지막 클라이언트까지: {_percentiles(fanout)}")
+    print(f"   끝까지 받은 클라이언트: {complete}/{len(steady)}")
+
+    # 재접속: 놓친 이벤트만 빠짐없이 다시 받는지
+    expected_ids = {}
+    for client in resumers:
+        expected_ids[id(client)] = list(range(epoch_of(client.last_id) + 1, server.hub.seq + 1))
+        client.ids.clear()
+        await client.connect(server.port, client.last_id)
+        client.listen()
+    await wait_for(resumers, server.hub.seq)
+    resume_ok = all(client.ids == expected_ids[id(client)] for client in resumers)
+    print(f"🔁 Last-Event-ID 재접속 {len(resumers)}개: "
+          f"{'놓친 이벤트만 모두 수신' if resume_ok else '❌ 누락/중복'}")
+
+    # 배압: 읽지 않는 클라이언트만 끊기고 읽는 클라이언트는 계속 받는지
+    controls = steady[:10]
+    for client in fleet[:len(resumers)] + steady[10:]:
+        client.close()
+    # 긴 분석 텍스트로 소켓 버퍼(루프백은 수 MB까지 자동 조정)를 넘길 만큼 보냄
+    burst = server.max_lag // 2
+    for _ in range(4):
+        await publish_round(burst, 'x' * 16000)
+        await wait_for(controls, server.hub.seq)
+    await asyncio.sleep(server.write_timeout + 0.5)
+    dropped = server.metrics()['dropped_slow']
+    controls_ok = all(client.ids[-1:] == [server.hub.seq] for client in controls)
+    print(f"🐢 이벤트 {4 * (burst + 1)}개 몰아 보내기: 읽지 않는 클라이언트 {dropped}/{slow}개 끊음, "
+          f"읽는 클라이언트 {len(controls)}개 {'모두 수신' if controls_ok else '❌ 누락'}")
+
+    for client in fleet + laggards:
+        client.close()
+    await server.close()
+    os.remove(path)
+    os.rmdir(workdir)
+    ok = resume_ok and controls_ok and complete == len(steady) and dropped == slow
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핸드 시트 변경을 SSE로 나눠 보내는 서버")
+    parser.add_argument('source', nargs='?', help="핸드 시트 CSV URL 또는 파일 경로")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="바인드 주소")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="포트 (0이면 임의 포트)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="소스 폴링 간격(초)")
+    parser.add_argument('--heartbeat', type=float, default=HEARTBEAT_INTERVAL,
+                        help="하트비트 간격(초, 0이면 끔)")
+    parser.add_argument('--bench', type=int, metavar='CLIENTS',
+                        help="클라이언트 N개로 전달 지연/재접속/배압 벤치마크")
+    parser.add_argument('--rows', type=int, default=5000, help="벤치마크 시트 행 수")
+    parser.add_argument('--rounds', type=int, default=20, help="벤치마크 변경 횟수")
+    parser.add_argument('--per-round', type=int, default=5, help="라운드마다 추가할 핸드 수")
+    parser.add_argument('--slow', type=int, default=5, help="읽지 않는 클라이언트 수")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return asyncio.run(run_benchmark(args.bench, args.rows, args.rounds, args.per_round,
+                                         args.slow))
+    if not args.source:
+        parser.error("핸드 시트 CSV URL 또는 파일 경로가 필요합니다")
+    try:
+        asyncio.run(serve(open_source(args.source), args.host, args.port,
+                          args.interval, args.heartbeat))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+핸드 조회 인덱스 (getHandStatus / batchVerify 질의 엔진)
+- 게시된 핸드 CSV(또는 시트 B열)에서 정렬된 타임스탬프 인덱스를 만들고
+  bisect로 허용 오차(기본 180초) 안의 후보 구간을 O(log n)에 찾음
+- first_match: appScripts.gs의 handleGetHandStatus와 같은 결과 (위에서부터 처음 맞는 행)
+- nearest: 허용 오차 안에서 시간 차이가 가장 작은 행 (같으면 위쪽 행)
+- 행 번호 인덱스로 batchVerify는 요청한 행만 읽음 (min..max 전체 범위를 읽지 않음)
+- 선형 검색 기준 구현(linear_*)과 결과를 대조하는 벤치마크 포함
+
+사용법:
+    python hand_index.py [핸드.csv] [--rows 20000] [--queries 5000] [--batch 50] [--seed 0]
+"""
+
+import argparse
+import bisect
+import csv
+import io
+import random
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+HAND_TIME_TOLERANCE = 180  # 초
+TIME_COLUMN = 2     # B열: 핸드 시간 (Unix 초)
+STATUS_COLUMN = 5   # E열: 상태
+VERIFY_COLUMNS = 9  # batchVerify가 읽는 A..I열
+
+_INT_RE = re.compile(r'\s*([+-]?\d+)')
+_NUMBER_RE = re.compile(r'\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*')
+
+
+def js_parse_int(value) -> Optional[int]:
+    """JS parseInt: 앞쪽 정수 부분만 읽고, 없으면 None (NaN)"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value == value and abs(value) != float('inf') else None
+    m = _INT_RE.match(str(value))
+    return int(m.group(1)) if m else None
+
+
+def js_number(value) -> Optional[float]:
+    """JS Number 변환 (isNaN 판단용). 숫자가 아니면 None"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value)
+    if not text.strip():
+        return 0.0
+    return float(text) if _NUMBER_RE.fullmatch(text) else None
+
+
+def js_key(value) -> str:
+    """JS 객체 키로 쓸 때의 문자열 (5 → '5', 5.0 → '5')"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return 'null' if value is None else str(value)
+
+
+class TimeIndex:
+    """(타임스탬프, 행 번호)를 타임스탬프 순으로 정렬한 인덱스"""
+
+    def __init__(self, pairs: Iterable[Tuple[int, int]]):
+        """pairs: (행 번호, 타임스탬프). 타임스탬프가 None인 행은 빠짐"""
+        entries = sorted((stamp, row) for row, stamp in pairs if stamp is not None)
+        self.stamps = [stamp for stamp, _ in entries]
+        self.rows = [row for _, row in entries]
+
+    @classmethod
+    def from_sorted(cls, stamps: Sequence[int], rows: Sequence[int]) -> 'TimeIndex':
+        """이미 (타임스탬프, 행 번호) 순으로 정렬된 두 열을 그대로 사용 (복사 없음)"""
+        index = cls.__new__(cls)
+        index.stamps = stamps
+        index.rows = rows
+        return index
+
+    @classmethod
+    def from_values(cls, values: Iterable[Tuple[int, object]]) -> 'TimeIndex':
+        """(행 번호, 셀 값)에서 parseInt가 되는 값만 인덱싱"""
+        return cls((row, js_parse_int(value)) for row, value in values if value not in ('', None))
+
+    def __len__(self) -> int:
+        return len(self.stamps)
+
+    def window(self, target: int, tolerance: int = HAND_TIME_TOLERANCE) -> Tuple[int, int]:
+        """|타임스탬프 - target| <= tolerance 인 항목의 [lo, hi) 구간"""
+        return (bisect.bisect_left(self.stamps, target - tolerance),
+                bisect.bisect_right(self.stamps, target + tolerance))
+
+    def first_match(self, target: int, tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+        """허용 오차 안에서 가장 위쪽 행 (선형 검색과 같은 결과)
+
+        구간은 허용 오차 폭(기본 6분)에 든 핸드뿐이라 보통 몇 개이므로 구간 최소값은 바로 구한다.
+        """
+        lo, hi = self.window(target, tolerance)
+        return min(self.rows[lo:hi]) if lo < hi else None
+
+    def nearest(self, target: int, tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+        """허용 오차 안에서 시간 차이가 가장 작은 행 (같으면 위쪽 행)"""
+        lo, hi = self.window(target, tolerance)
+        if lo >= hi:
+            return None
+        best = min(range(lo, hi), key=lambda i: (abs(self.stamps[i] - target), self.rows[i]))
+        return self.rows[best]
+
+
+class HandTable:
+    """핸드 시트(CSV) 전체와 타임스탬프/행 번호 인덱스"""
+
+    def __init__(self, rows: Sequence[Sequence[str]]):
+        self.rows: List[Sequence[str]] = list(rows)  # rows[n - 1]이 n행 (행 번호 인덱스)
+        self.time_index = TimeIndex.from_values(
+            (n, row[TIME_COLUMN - 1] if len(row) >= TIME_COLUMN else '')
+            for n, row in enumerate(self.rows, 1))
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'HandTable':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return cls(list(csv.reader(f)))
+
+    @classmethod
+    def from_text(cls, text: str) -> 'HandTable':
+        """게시된 CSV 본문 (fetch 결과 그대로)"""
+        return cls(list(csv.reader(io.StringIO(text))))
+
+    @property
+    def last_row(self) -> int:
+        return len(self.rows)
+
+    def cell(self, row: int, col: int) -> str:
+        if 1 <= row <= len(self.rows):
+            cells = self.rows[row - 1]
+            if col <= len(cells):
+                return cells[col - 1]
+        return ''
+
+    def row_values(self, row: int, cols: int = VERIFY_COLUMNS) -> List[str]:
+        return [self.cell(row, col) for col in range(1, cols + 1)]
+
+    def find_hand(self, hand_time, nearest: bool = False,
+                  tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+        target = js_parse_int(hand_time)
+        if target is None:
+            return None
+        index = self.time_index
+        return index.nearest(target, tolerance) if nearest else index.first_match(target, tolerance)
+
+    def hand_status(self, hand_time, nearest: bool = False) -> Optional[Tuple[int, str]]:
+        """(행 번호, E열 상태). 없으면 None"""
+        row = self.find_hand(hand_time, nearest)
+        return None if row is None else (row, self.cell(row, STATUS_COLUMN))
+
+    def batch_verify(self, rows: Sequence) -> Optional[Dict[str, dict]]:
+        """handleBatchVerify의 data와 같은 결과. 요청한 행만 읽음 (유효한 행이 없으면 None)"""
+        return batch_results(rows, lambda numbers: {n: self.row_values(n) for n in numbers})
+
+
+def batch_results(rows: Sequence, read_rows) -> Optional[Dict[str, dict]]:
+    """batchVerify 결과 조립. read_rows(행 번호 집합) → {행 번호: A..I 값}
+
+    유효한 행 번호가 하나도 없으면 None (Apps Script에서는 getRange 좌표 오류).
+    """
+    numbers = [js_number(row) for row in rows]
+    valid = {int(n) for n in numbers if n is not None}
+    if not valid or min(valid) < 1:
+        return None
+    values = read_rows(valid)
+    results = {}
+    for row, number in zip(rows, numbers):
+        if number is None:
+            results[js_key(row)] = {'error': '유효하지 않은 행 번호'}
+            continue
+        row_data = values[int(number)]
+        results[js_key(row)] = {
+            'row': row,
+            'time': row_data[1],
+            'status': row_data[4],
+            'filename': row_data[5],
+            'analysis': row_data[7],
+            'lastUpdate': row_data[8],
+        }
+    return results
+
+
+# ========================================
+# 선형 검색 기준 구현 (appScripts.gs와 같은 방식)
+# ========================================
+
+def linear_first_match(table: HandTable, hand_time,
+                       tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+    """B열을 위에서부터 훑어 허용 오차 안의 첫 행"""
+    target = js_parse_int(hand_time)
+    if target is None:
+        return None
+    for n, row in enumerate(table.rows, 1):
+        value = row[TIME_COLUMN - 1] if len(row) >= TIME_COLUMN else ''
+        if not value:
+            continue
+        stamp = js_parse_int(value)
+        if stamp is not None and abs(stamp - target) <= tolerance:
+            return n
+    return None
+
+
+def linear_nearest(table: HandTable, hand_time,
+                   tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+    """허용 오차 안에서 시간이 가장 가까운 행 (같으면 위쪽 행)"""
+    target = js_parse_int(hand_time)
+    if target is None:
+        return None
+    best = None
+    for n, row in enumerate(table.rows, 1):
+        stamp = js_parse_int(row[TIME_COLUMN - 1]) if len(row) >= TIME_COLUMN and \
+            row[TIME_COLUMN - 1] else None
+        if stamp is not None and abs(stamp - target) <= tolerance:
+            key = (abs(stamp - target), n)
+            if best is None or key < best:
+                best = key
+    return best[1] if best else None
+
+
+def range_batch_verify(table: HandTable, rows: Sequence) -> Optional[Dict[str, dict]]:
+    """min..max 연속 범위를 통째로 읽는 기존 방식"""
+    def read_range(numbers):
+        lo, hi = min(numbers), max(numbers)
+        block = [table.row_values(n) for n in range(lo, hi + 1)]
+        return {n: block[n - lo] for n in range(lo, hi + 1)}
+    return batch_results(rows, read_range)
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+def generate_hand_rows(count: int, seed: int = 0, start: int = 1_700_000_000) -> List[List[str]]:
+    """하루치 핸드 시트 흉내: 대체로 시간순, 간격 30초~6분, 가끔 순서가 뒤섞이거나 빈 시간"""
+    rng = random.Random(seed)
+    rows = []
+    stamp = start
+    for n in range(1, count + 1):
+        stamp += rng.randint(30, 360)
+        value = stamp + (rng.randint(-600, 600) if rng.random() < 0.02 else 0)
+        rows.append([
+            f'#{n}', '' if rng.random() < 0.01 else str(value), '', f'H{n}',
+            rng.choice(['미완료', '복사완료', '']), f'hand_{n}.mp4', rng.choice(['', 'A', 'B']),
+            '', '',
+        ])
+    return rows
+
+
+def _timed(fn, items) -> Tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(item) for item in items]
+    return time.perf_counter() - started, results
+
+
+def run_benchmark(table: HandTable, queries: int, batch: int, seed: int = 0,
+                  linear_limit: int = 50) -> bool:
+    """인덱스는 질의 전체, 선형 검색은 앞쪽 linear_limit개만 실행해 그 구간의 결과를 대조"""
+    rng = random.Random(seed)
+    stamps = table.time_index.stamps
+    lo = stamps[0] - 600 if stamps else 0
+    hi = stamps[-1] + 600 if stamps else 1
+    targets = [str(rng.randint(lo, hi)) for _ in range(queries)]
+    last = max(table.last_row, 1)
+    batches = [rng.sample(range(1, last + 1), min(batch, last)) for _ in range(max(queries // 10, 1))]
+
+    started = time.perf_counter()
+    HandTable(table.rows)
+    build = time.perf_counter() - started
+    print(f"🔎 행 {table.last_row}개, 인덱스 항목 {len(table.time_index)}개 (구축 {build * 1000:.1f} ms)")
+
+    ok = True
+    cases = [
+        ('getHandStatus (first)', lambda t: linear_first_match(table, t),
+         lambda t: table.find_hand(t), targets),
+        ('getHandStatus (nearest)', lambda t: linear_nearest(table, t),
+         lambda t: table.find_hand(t, nearest=True), targets),
+        (f'batchVerify ({batch}행)', lambda rows: range_batch_verify(table, rows),
+         table.batch_verify, batches),
+    ]
+    for name, linear, indexed, items in cases:
+        sample = items[:linear_limit]
+        linear_time, expected = _timed(linear, sample)
+        indexed_time, actual = _timed(indexed, items)
+        same = expected == actual[:len(sample)]
+        ok = ok and same
+        per_linear = linear_time / len(sample) * 1e6
+        per_indexed = indexed_time / len(items) * 1e6
+        speedup = per_linear / per_indexed if per_indexed else float('inf')
+        print(f"   {'✅' if same else '❌'} {name:24} 선형 {per_linear:10.1f} µs  "
+              f"인덱스 {per_indexed:8.1f} µs  ({speedup:,.0f}배, 대조 {len(sample)}회)")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핸드 조회 인덱스 벤치마크 (선형 검색과 결과 대조)")
+    parser.add_argument('csv', nargs='?', help="게시된 핸드 CSV (없으면 합성 데이터)")
+    parser.add_argument('--rows', type=int, default=20000, help="합성 데이터 행 수")
+    parser.add_argument('--queries', type=int, default=5000, help="getHandStatus 질의 수")
+    parser.add_argument('--batch', type=int, default=50, help="batchVerify 한 번에 요청하는 행 수")
+    parser.add_argument('--linear', type=int, default=50, help="선형 검색으로 대조할 질의 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    args = parser.parse_args(argv)
+
+    table = HandTable.from_csv(args.csv) if args.csv else \
+        HandTable(generate_hand_rows(args.rows, args.seed))
+    if not run_benchmark(table, args.queries, args.batch, args.seed, args.linear):
+        print("❌ 인덱스 결과가 선형 검색과 다름")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
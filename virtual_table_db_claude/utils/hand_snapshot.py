@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+핸드 시트의 열 기반 바이너리 스냅샷 (mmap으로 바로 여는 고정 레이아웃)
+- handleBatchVerify/getHandStatus가 읽는 열만 저장:
+  B 시간, E 상태, F 파일명, H 분석, I 최종 업데이트
+- 시간은 정수 배열 (모두 u32에 들어가면 u32, 아니면 int64), 상태는 enum 코드(u8, 256종을 넘으면 u16), 나머지 문자열은
+  공유 문자열 테이블의 u32 id
+- (타임스탬프, 행 번호)로 정렬한 인덱스 열을 같이 저장해 열자마자 bisect 조회 가능
+- 열은 mmap 위의 memoryview라 복사 없이 읽고, 문자열은 접근할 때만 디코드
+
+파일 레이아웃 (리틀 엔디언, 섹션은 8바이트 정렬):
+    헤더      '<4sHHII'  매직 b'VTHS', 포맷 버전, 열 수, 행 수, 문자열 수
+    디렉터리  열마다 '<16s1s3xQQ'  이름, 타입 코드(q/I/H/B), 오프셋, 항목 수
+    섹션      stamp, time_text, status, filename, analysis, last_update,
+              sorted_stamp, sorted_row, status_values, str_offsets, str_blob
+
+행 번호는 시트와 같다 (1행 = 헤더 = 인덱스 0). 시간 셀이 parseInt 결과와 글자까지 같으면
+time_text는 CANONICAL, 아니면 원문 문자열 id (빈 칸, "1700000000.5" 등).
+
+사용법:
+    python hand_snapshot.py convert <핸드.csv> [출력.vths]
+    python hand_snapshot.py info <스냅샷.vths>
+    python hand_snapshot.py bench [--rows 20000] [--queries 2000] [--seed 0]
+"""
+
+import argparse
+import csv
+import gc
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from hand_index import (HAND_TIME_TOLERANCE, STATUS_COLUMN, TIME_COLUMN, VERIFY_COLUMNS,
+                        HandTable, TimeIndex, batch_results, generate_hand_rows, js_parse_int)
+
+MAGIC = b'VTHS'
+FORMAT_VERSION = 1
+SUFFIX = '.vths'
+
+HEADER = struct.Struct('<4sHHII')
+ENTRY = struct.Struct('<16s1s3xQQ')
+ALIGN = 8
+
+# 시간 셀이 비었거나 parseInt가 NaN인 행의 stamp 값 (타입 코드별)
+NO_STAMP = {'I': 0xFFFFFFFF, 'q': -(1 << 63)}
+CANONICAL = 0xFFFFFFFF  # time_text: 원문이 str(stamp)와 같음
+
+# 저장하는 문자열 열 (시트 열 번호)
+STRING_COLUMNS = (('filename', 6), ('analysis', 8), ('last_update', 9))
+COLUMN_OF = dict(STRING_COLUMNS)
+
+
+class SnapshotError(ValueError):
+    """스냅샷 파일 형식 오류"""
+
+
+class StringTable:
+    """쓰기용 문자열 인터닝 (id 0은 빈 문자열)"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {'': 0}
+        self.values: List[str] = ['']
+
+    def intern(self, value: str) -> int:
+        found = self.ids.get(value)
+        if found is None:
+            found = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return found
+
+    def encode(self) -> Tuple[array, bytes]:
+        offsets = array('I', [0])
+        blob = bytearray()
+        for value in self.values:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        return offsets, bytes(blob)
+
+
+def _cell(row: Sequence[str], col: int) -> str:
+    return row[col - 1] if col <= len(row) else ''
+
+
+def build_columns(rows: Sequence[Sequence[str]]) -> Tuple[Dict[str, array], StringTable]:
+    """CSV 행 → 열 배열과 문자열 테이블"""
+    strings = StringTable()
+    stamps: List[Optional[int]] = []
+    time_text = array('I')
+    status_codes: Dict[str, int] = {}
+    status = []
+    text_columns = {name: array('I') for name, _ in STRING_COLUMNS}
+
+    for row in rows:
+        raw = _cell(row, TIME_COLUMN)
+        value = js_parse_int(raw) if raw else None
+        if value is not None and not -(1 << 63) < value < (1 << 63):
+            value = None
+        stamps.append(value)
+        time_text.append(CANONICAL if value is not None and raw == str(value) else strings.intern(raw))
+        state = _cell(row, STATUS_COLUMN)
+        status.append(status_codes.setdefault(state, len(status_codes)))
+        for name, col in STRING_COLUMNS:
+            text_columns[name].append(strings.intern(_cell(row, col)))
+
+    entries = sorted((value, n) for n, value in enumerate(stamps, 1) if value is not None)
+    typecode = 'I' if not entries or (entries[0][0] >= 0 and entries[-1][0] < NO_STAMP['I']) else 'q'
+    missing = NO_STAMP[typecode]
+    columns = {
+        'stamp': array(typecode, [missing if value is None else value for value in stamps]),
+        'time_text': time_text,
+        'status': array('B' if len(status_codes) <= 256 else 'H', status),
+        **text_columns,
+        'sorted_stamp': array(typecode, [value for value, _ in entries]),
+        'sorted_row': array('I', [n for _, n in entries]),
+        'status_values': array('I', [strings.intern(value) for value in status_codes]),
+    }
+    return columns, strings
+
+
+def write_snapshot(rows: Sequence[Sequence[str]], path: str) -> int:
+    """스냅샷 파일을 원자적으로 기록하고 크기(바이트)를 반환"""
+    columns, strings = build_columns(rows)
+    offsets, blob = strings.encode()
+    sections = list(columns.items()) + [('str_offsets', offsets), ('str_blob', array('B', blob))]
+
+    position = HEADER.size + ENTRY.size * len(sections)
+    directory = []
+    for name, values in sections:
+        position += -position % ALIGN
+        directory.append(ENTRY.pack(name.encode('ascii'), values.typecode.encode('ascii'),
+                                    position, len(values)))
+        position += values.itemsize * len(values)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), len(rows), len(strings.values)))
+        f.writelines(directory)
+        for name, values in sections:
+            f.write(b'\0' * (-f.tell() % ALIGN))
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(f)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())  # 교체 전에 디스크에 반영 (바로 mmap하는 쪽이 쓰기 지연을 떠안지 않게)
+    os.replace(tmp_path, path)
+    return size
+
+
+def convert(csv_path: str, output: Optional[str] = None) -> Tuple[str, int]:
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    output = output or os.path.splitext(csv_path)[0] + SUFFIX
+    return output, write_snapshot(rows, output)
+
+
+class HandSnapshot:
+    """mmap으로 연 스냅샷. HandTable과 같은 조회 API (cell/row_values/find_hand/hand_status/batch_verify)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:  # 빈 파일은 mmap할 수 없음
+                raise SnapshotError(f"{path}: 헤더가 잘림") from error
+        self._columns: Dict[str, memoryview] = {}
+        self._strings: Dict[int, str] = {}
+        self.stamps = self.time_index = None
+        # 섹션이 빠졌거나 문자열 번호가 범위 밖인 파일도 SnapshotError로, 실패하면 뷰와 mmap을 닫음
+        try:
+            self._columns = columns = self._read_directory()
+            self.stamps = columns['stamp']
+            self.time_index = TimeIndex.from_sorted(columns['sorted_stamp'], columns['sorted_row'])
+            self.status_values = [self.string(i) for i in columns['status_values']]
+        except (KeyError, IndexError) as error:
+            self.close()
+            raise SnapshotError(f"{path}: 섹션이 없거나 깨짐 ({type(error).__name__}: {error})") from error
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_directory(self) -> Dict[str, memoryview]:
+        """헤더/디렉터리를 검증한 뒤 열 뷰를 만든다 (검증 중 실패하면 뷰가 남지 않음)"""
+        size = len(self._map)
+        if size < HEADER.size:
+            raise SnapshotError(f"{self.path}: 헤더가 잘림")
+        magic, version, count, self.row_count, self.string_count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path}: 스냅샷 파일이 아님")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path}: 지원하지 않는 포맷 버전 {version}")
+        if sys.byteorder != 'little':
+            raise SnapshotError("빅 엔디언 환경에서는 mmap 뷰를 쓸 수 없음")
+        if HEADER.size + count * ENTRY.size > size:
+            raise SnapshotError(f"{self.path}: 디렉터리가 잘림")
+        sections = []
+        for i in range(count):
+            name, typecode, offset, items = ENTRY.unpack_from(self._map, HEADER.size + i * ENTRY.size)
+            typecode = typecode.decode('ascii')
+            end = offset + struct.calcsize(typecode) * items
+            if end > size:
+                raise SnapshotError(f"{self.path}: 섹션이 파일 밖을 가리킴")
+            sections.append((name.rstrip(b'\0').decode('ascii'), typecode, offset, end))
+        with memoryview(self._map) as buffer:
+            return {name: buffer[offset:end].cast(typecode) for name, typecode, offset, end in sections}
+
+    def close(self):
+        """열 뷰를 모두 놓고 mmap을 닫는다"""
+        for view in self._columns.values():
+            view.release()
+        self._columns = {}
+        self.stamps = self.time_index = None
+        self._map.close()
+
+    def __enter__(self) -> 'HandSnapshot':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def last_row(self) -> int:
+        return self.row_count
+
+    def column(self, name: str) -> memoryview:
+        """열의 복사 없는 뷰 (stamp, status, filename 등). close() 전에 release해야 함"""
+        return self._columns[name]
+
+    def string(self, index: int) -> str:
+        value = self._strings.get(index)
+        if value is None:
+            offsets = self._columns['str_offsets']
+            raw = self._columns['str_blob'][offsets[index]:offsets[index + 1]]
+            value = self._strings[index] = bytes(raw).decode('utf-8')
+        return value
+
+    def cell(self, row: int, col: int) -> str:
+        if not 1 <= row <= self.row_count:
+            return ''
+        i = row - 1
+        if col == TIME_COLUMN:
+            text = self._columns['time_text'][i]
+            return str(self.stamps[i]) if text == CANONICAL else self.string(text)
+        if col == STATUS_COLUMN:
+            return self.status_values[self._columns['status'][i]]
+        for name, column in STRING_COLUMNS:
+            if col == column:
+                return self.string(self._columns[name][i])
+        return ''
+
+    def row_values(self, row: int, cols: int = VERIFY_COLUMNS) -> List[str]:
+        return [self.cell(row, col) for col in range(1, cols + 1)]
+
+    def find_hand(self, hand_time, nearest: bool = False,
+                  tolerance: int = HAND_TIME_TOLERANCE) -> Optional[int]:
+        target = js_parse_int(hand_time)
+        if target is None:
+            return None
+        index = self.time_index
+        return index.nearest(target, tolerance) if nearest else index.first_match(target, tolerance)
+
+    def hand_status(self, hand_time, nearest: bool = False) -> Optional[Tuple[int, str]]:
+        row = self.find_hand(hand_time, nearest)
+        return None if row is None else (row, self.cell(row, STATUS_COLUMN))
+
+    def batch_verify(self, rows: Sequence) -> Optional[Dict[str, dict]]:
+        return batch_results(rows, lambda numbers: {n: self.row_values(n) for n in numbers})
+
+
+def cmd_convert(args) -> int:
+    started = time.perf_counter()
+    output, size = convert(args.csv, args.output)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"✅ {output}: {size:,} B (CSV {os.path.getsize(args.csv):,} B, {elapsed:.0f} ms)")
+    return 0
+
+
+def cmd_info(args) -> int:
+    try:
+        snapshot = HandSnapshot(args.snapshot)
+    except (OSError, SnapshotError) as error:
+        print(f"❌ {error}")
+        return 1
+    with snapshot:
+        print(f"📦 {args.snapshot}: 행 {snapshot.row_count:,}, 문자열 {snapshot.string_count:,}, "
+              f"인덱스 항목 {len(snapshot.time_index):,}")
+        print(f"   상태 값: {snapshot.status_values}")
+        for name, view in snapshot._columns.items():
+            print(f"   {name:14} {view.format}  {len(view):>10,}개  {view.nbytes:>12,} B")
+    return 0
+
+
+def _measure(fn, repeat: int = 1):
+    """(결과, 최소 초, 할당된 최대 메모리 바이트). 시간은 tracemalloc 없이 repeat번 중 최소.
+    mmap 페이지는 파이썬 힙 밖이라 메모리에 포함되지 않음"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        gc.collect()  # 앞 단계 객체의 GC가 측정 구간에 끼지 않도록
+        started = time.perf_counter()
+        result = fn()
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del result  # 해제 비용은 측정에서 뺀다
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def cmd_bench(args) -> int:
+    rows = generate_hand_rows(args.rows, args.seed)
+    directory = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'hand_snapshot_{os.getpid()}')
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, 'hands.csv')
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+    try:
+        output, size = convert(csv_path)
+        table, csv_time, csv_peak = _measure(lambda: HandTable.from_csv(csv_path))
+        snapshot, open_time, open_peak = _measure(lambda: HandSnapshot(output), repeat=5)
+        print(f"📄 CSV {os.path.getsize(csv_path):,} B → 스냅샷 {size:,} B")
+        print(f"   CSV 파싱+인덱스  {csv_time * 1000:9.2f} ms  메모리 {csv_peak / 1024:10,.0f} KiB")
+        print(f"   스냅샷 열기(최소) {open_time * 1000:9.2f} ms  메모리 {open_peak / 1024:10,.0f} KiB "
+              f"(+ mmap {size / 1024:,.0f} KiB, 필요한 페이지만 적재)")
+
+        rng = random.Random(args.seed)
+        stamps = table.time_index.stamps
+        targets = [str(rng.randint(stamps[0] - 600, stamps[-1] + 600)) for _ in range(args.queries)]
+        batches = [rng.sample(range(1, args.rows + 1), min(50, args.rows))
+                   for _ in range(max(args.queries // 10, 1))]
+        stored = (TIME_COLUMN, STATUS_COLUMN) + tuple(COLUMN_OF.values())
+        with snapshot:
+            same = ([table.hand_status(t) for t in targets] == [snapshot.hand_status(t) for t in targets]
+                    and [table.find_hand(t, True) for t in targets]
+                    == [snapshot.find_hand(t, True) for t in targets]
+                    and [table.batch_verify(b) for b in batches]
+                    == [snapshot.batch_verify(b) for b in batches]
+                    and all(table.cell(n, col) == snapshot.cell(n, col)
+                            for n in range(1, args.rows + 2) for col in stored))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    if not same:
+        print("❌ 스냅샷 조회 결과가 CSV와 다름")
+        return 1
+    print(f"✅ getHandStatus {len(targets)}회, batchVerify {len(batches)}회, 저장한 열 전체 일치")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핸드 시트 바이너리 스냅샷 (mmap 열 기반)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('convert', help="핸드 CSV를 스냅샷으로 변환")
+    p.add_argument('csv')
+    p.add_argument('output', nargs='?', help=f"출력 경로 (기본: CSV 이름{SUFFIX})")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('info', help="스냅샷 열 구성 출력")
+    p.add_argument('snapshot')
+    p.set_defaults(func=cmd_info)
+
+    p = sub.add_parser('bench', help="합성 데이터로 CSV 대비 열기 시간/메모리 비교와 결과 대조")
+    p.add_argument('--rows', type=int, default=20000)
+    p.add_argument('--queries', type=int, default=2000)
+    p.add_argument('--seed', type=int, default=0)
+    p.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
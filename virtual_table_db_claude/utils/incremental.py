@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+콘텐츠 해시 기반 증분 처리
+- 문서를 <script> 블록과 최상위 문장(함수) 단위로 분할. 문장 경계에서 잘라도 결과가 같은
+  단계(pipeline.STATEMENT_SAFE_STAGES)가 아니면 <script> 블록 단위로만 분할 (watch.py와 같음)
+- 단위별 해시와 변환 결과를 매니페스트(.cleanup_cache/)에 저장
+- 재실행 시 바뀐 단위만 변환하고 나머지는 캐시 결과를 재사용
+
+사용법:
+    python incremental.py [파일|디렉터리|glob ...] [--stages strip_console,...] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from js_lexer import COMMENT, PUNCT, TEMPLATE
+from pipeline import DEFAULT_STAGES, STAGES, STATEMENT_SAFE_STAGES, UNIT_SAFE_STAGES, run_stages
+from source_index import SourceIndex
+from targets import CACHE_DIR_NAME, default_cache_dir, expand_targets
+
+MANIFEST_VERSION = 1
+
+# 너무 잘게 쪼개면 매니페스트만 커지므로 작은 단위는 이웃과 합친다
+MIN_UNIT_SIZE = 1024
+
+
+class Unit(NamedTuple):
+    start: int
+    end: int
+    is_js: bool
+
+
+class IncrementalStats(NamedTuple):
+    units: int
+    reused: int
+    transformed: int
+    edits: int
+    seconds: float
+
+
+def top_level_cuts(index: SourceIndex, region: int) -> List[int]:
+    """괄호/템플릿 깊이 0에서 '}' 또는 ';' 뒤 줄바꿈 직후 위치 목록"""
+    text = index.content
+    cuts = []
+    depth = 0
+    template_depth = 0
+    pending = False  # 최상위 문장이 방금 끝났는지
+    last = index.regions[region][0]
+    for tok in index.tokens[region]:
+        kind = tok.kind
+        if pending:
+            # 앞 토큰과의 공백 구간 (주석이면 주석 안까지)에서 첫 줄바꿈
+            newline = text.find('\n', last, tok.end if kind == COMMENT else tok.start)
+            if newline >= 0:
+                cuts.append(newline + 1)
+                pending = False
+        last = tok.end
+        if kind == COMMENT:
+            continue
+        pending = False
+        if kind == TEMPLATE:
+            if text[tok.start] == '}':
+                template_depth -= 1
+            if text.endswith('${', tok.start, tok.end):
+                template_depth += 1
+        elif kind == PUNCT and tok.end - tok.start == 1:
+            c = text[tok.start]
+            if c in '([{':
+                depth += 1
+            elif c in ')]}':
+                depth -= 1
+            if depth == 0 and template_depth == 0 and c in '};':
+                pending = True
+    if pending:
+        newline = text.find('\n', last, index.regions[region][1])
+        if newline >= 0:
+            cuts.append(newline + 1)
+    return cuts
+
+
+def split_units(content: str, path: str = '', statements: bool = True) -> List[Unit]:
+    """문서를 JS 단위와 그 사이의 비-JS 구간으로 분할 (모두 이어 붙이면 원문)
+
+    statements가 거짓이면 <script> 블록 하나가 단위 하나.
+    """
+    units = []
+    last = 0
+    index = SourceIndex.of(content, path)
+    for region, (lo, hi) in enumerate(index.regions):
+        if lo > last:
+            units.append(Unit(last, lo, False))
+        start = lo
+        for cut in top_level_cuts(index, region) if statements else ():
+            if cut - start >= MIN_UNIT_SIZE and cut < hi:
+                units.append(Unit(start, cut, True))
+                start = cut
+        if hi > start:
+            units.append(Unit(start, hi, True))
+        last = hi
+    if last < len(content):
+        units.append(Unit(last, len(content), False))
+    return units
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode('utf-8', 'surrogatepass'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class IncrementalRunner:
+    """단위 해시 → 변환 결과 매니페스트를 유지하며 바뀐 단위만 변환"""
+
+    def __init__(self, stages: Sequence[str] = DEFAULT_STAGES, cache_dir: Optional[str] = None):
+        unsafe = [name for name in stages if name not in UNIT_SAFE_STAGES]
+        if unsafe:
+            raise ValueError(f"단위별 실행이 불가능한 단계: {', '.join(unsafe)}")
+        unknown = [name for name in stages if name not in STAGES]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {', '.join(unknown)}")
+        self.stages = list(stages)
+        self.stage_key = ','.join(self.stages)
+        # advanced/final_console의 빈 줄 정리는 문장 경계를 넘으므로 그때는 블록 단위로
+        self.fine = all(name in STATEMENT_SAFE_STAGES for name in self.stages)
+        self.cache_dir = cache_dir
+
+    def manifest_path(self, file_path: str) -> str:
+        cache_dir = self.cache_dir or default_cache_dir(file_path)
+        name = os.path.basename(file_path)
+        return os.path.join(cache_dir, f'{name}.manifest.json')
+
+    def load_manifest(self, file_path: str) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path(file_path), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('stages') != self.stage_key:
+            return {}
+        return manifest.get('units', {})
+
+    def save_manifest(self, file_path: str, units: Dict[str, dict]):
+        path = self.manifest_path(file_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'stages': self.stage_key, 'units': units},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def run(self, content: str, path: str, cache: Dict[str, dict]) -> Tuple[str, Dict[str, dict], IncrementalStats]:
+        """content를 변환하고 (결과, 이번 실행에서 사용한 캐시 항목, 통계) 반환
+
+        반환되는 캐시에는 이번 문서에 존재하는 단위만 남으므로 오래된 항목은 자연히 정리된다.
+        """
+        started = time.perf_counter()
+        used: Dict[str, dict] = {}
+        parts = []
+        units = split_units(content, path, self.fine)
+        reused = transformed = edits = 0
+        unit_path = 'unit.js'
+
+        for unit in units:
+            text = content[unit.start:unit.end]
+            if not unit.is_js:
+                parts.append(text)
+                continue
+            key = _digest(self.stage_key, text)
+            entry = used.get(key) or cache.get(key)
+            if entry is None:
+                output, results = run_stages(text, self.stages, unit_path)
+                entry = {'output': output, 'edits': sum(r.edits for r in results)}
+                transformed += 1
+            else:
+                reused += 1
+            used[key] = entry
+            parts.append(entry['output'])
+            edits += entry['edits']
+
+        stats = IncrementalStats(sum(1 for u in units if u.is_js), reused, transformed, edits,
+                                 time.perf_counter() - started)
+        return ''.join(parts), used, stats
+
+
+def run_incremental(file_path: str, stages: Sequence[str] = DEFAULT_STAGES,
+                    cache_dir: Optional[str] = None, dry_run: bool = False) -> IncrementalStats:
+    """파일을 증분 변환하고 바뀐 경우에만 저장"""
+    runner = IncrementalRunner(stages, cache_dir)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    cache = runner.load_manifest(file_path)
+    content, used, stats = runner.run(original, file_path, cache)
+
+    if not dry_run:
+        if content != original:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # 저장된 결과가 다음 실행의 입력이므로 결과 문서의 단위도 캐시에 등록
+            # (바뀌지 않은 단위는 방금 만든 항목을 그대로 재사용)
+            _, settled, _ = runner.run(content, file_path, used)
+            used.update(settled)
+        runner.save_manifest(file_path, used)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="바뀐 스크립트 단위만 다시 정리")
+    parser.add_argument('files', nargs='*', help="대상 파일/디렉터리/glob (기본: index.html)")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"쉼표로 구분한 단계 순서 (사용 가능: {', '.join(sorted(UNIT_SAFE_STAGES))})")
+    parser.add_argument('--cache-dir', help=f"매니페스트 위치 (기본: 파일 옆 {CACHE_DIR_NAME}/)")
+    parser.add_argument('--dry-run', action='store_true', help="파일과 매니페스트를 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    for file_path in expand_targets(args.files):
+        try:
+            stats = run_incremental(file_path, stages, args.cache_dir, args.dry_run)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📁 {file_path}: {stats.units} units, {stats.reused} reused, "
+              f"{stats.transformed} transformed, {stats.edits} edits, "
+              f"{stats.seconds * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JavaScript 경량 렉서
+- 문자열, 템플릿 리터럴, 주석, 정규식 리터럴을 구분하는 토큰 스캐너
+- HTML 문서에서 인라인 <script> 블록 범위 추출
+- 정렬된 splice 범위를 한 번의 join으로 적용
+"""
+
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Token(NamedTuple):
+    kind: str
+    start: int
+    end: int
+
+
+# 정규식 리터럴이 올 수 있는 위치를 판단하기 위한 키워드
+REGEX_PRECEDING_KEYWORDS = frozenset([
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+])
+
+# 토큰 종류
+WS = 'ws'
+COMMENT = 'comment'
+STRING = 'string'
+TEMPLATE = 'template'
+REGEX = 'regex'
+NAME = 'name'
+NUMBER = 'number'
+PUNCT = 'punct'
+INVALID = 'invalid'
+
+TRIVIA = frozenset([WS, COMMENT])
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n\f\v\u00a0\u2028\u2029\ufeff]+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+  | (?P<name>[A-Za-z_$\u0080-\U0010ffff][\w$\u0080-\U0010ffff]*)
+  | (?P<number>0[xXoObB][0-9a-fA-F_]+n?|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+  | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=
+              |=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>
+              |[{}()\[\];,<>+\-*/%&|^!~?:=.@\#])
+''', re.VERBOSE)
+
+_REGEX_RE = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# 템플릿 리터럴 본문: `...` 또는 `...${ 까지
+_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*(`|\$\{)?')
+
+_SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_TYPE_ATTR_RE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+_JS_TYPES = frozenset([
+    'text/javascript', 'application/javascript', 'module', 'text/ecmascript',
+    'application/ecmascript',
+])
+
+
+def _regex_allowed(text: str, prev: Optional[Token]) -> bool:
+    """직전 유효 토큰 기준으로 '/'가 정규식 시작인지 판단"""
+    if prev is None:
+        return True
+    if prev.kind == PUNCT:
+        return text[prev.start:prev.end] not in (')', ']')
+    if prev.kind == NAME:
+        return text[prev.start:prev.end] in REGEX_PRECEDING_KEYWORDS
+    return False
+
+
+def tokenize(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Token]:
+    """text[start:end] 구간을 JS 토큰으로 분해
+
+    템플릿 리터럴은 `...${, }...${, }...` 조각(TEMPLATE)과 그 사이의
+    표현식 토큰으로 나누어 반환하므로 괄호 깊이 계산에 그대로 쓸 수 있다.
+    """
+    if end is None:
+        end = len(text)
+    pos = start
+    prev = None  # 직전 유효 토큰 (공백/주석 제외)
+    # 템플릿 표현식 내부의 중괄호 깊이 스택
+    brace_stack: List[int] = []
+    match_token = _TOKEN_RE.match
+    match_regex = _REGEX_RE.match
+    match_chunk = _TEMPLATE_CHUNK_RE.match
+
+    while pos < end:
+        ch = text[pos]
+
+        if ch == '`' or (ch == '}' and brace_stack and brace_stack[-1] == 0):
+            if ch == '}':
+                brace_stack.pop()
+            m = match_chunk(text, pos + 1, end)
+            stop = m.end()
+            if m.group(1) == '${':
+                brace_stack.append(0)
+            tok = Token(TEMPLATE, pos, stop)
+            yield tok
+            prev = tok
+            pos = stop
+            continue
+
+        if ch == '/' and pos + 1 < end and text[pos + 1] not in '/*' and _regex_allowed(text, prev):
+            m = match_regex(text, pos, end)
+            if m:
+                tok = Token(REGEX, pos, m.end())
+                yield tok
+                prev = tok
+                pos = m.end()
+                continue
+
+        m = match_token(text, pos, end)
+        if m is None:
+            tok = Token(INVALID, pos, pos + 1)
+            yield tok
+            prev = tok
+            pos += 1
+            continue
+
+        kind = m.lastgroup
+        tok = Token(kind, pos, m.end())
+        if kind == PUNCT and brace_stack:
+            if ch == '{':
+                brace_stack[-1] += 1
+            elif ch == '}':
+                brace_stack[-1] -= 1
+        yield tok
+        if kind not in TRIVIA:
+            prev = tok
+        pos = m.end()
+
+
+def script_blocks(html: str) -> List[Tuple[int, int]]:
+    """HTML 문서의 인라인 JS <script> 본문 범위 목록 (src 전용 태그 제외)"""
+    blocks = []
+    for m in _SCRIPT_RE.finditer(html):
+        type_match = _TYPE_ATTR_RE.search(m.group(1))
+        if type_match and type_match.group(1).lower() not in _JS_TYPES:
+            continue
+        if not m.group(2).strip():
+            continue
+        blocks.append((m.start(2), m.end(2)))
+    return blocks
+
+
+def is_html(path: str) -> bool:
+    return path.lower().endswith(('.html', '.htm'))
+
+
+def js_regions(text: str, path: str = '') -> List[Tuple[int, int]]:
+    """파일 종류에 따라 JS로 해석할 범위 목록 반환"""
+    if is_html(path) or (not path and text.lstrip()[:1] == '<'):
+        return script_blocks(text)
+    return [(0, len(text))]
+
+
+def apply_splices(text: str, splices: List[Tuple[int, int, str]]) -> str:
+    """(start, end, replacement) 목록을 한 번의 join으로 적용
+
+    splices는 start 기준으로 정렬되어 있고 서로 겹치지 않아야 한다.
+    """
+    if not splices:
+        return text
+    parts = []
+    last = 0
+    for start, end, replacement in splices:
+        if start < last:
+            raise ValueError(f"겹치는 splice 범위: {start} < {last}")
+        parts.append(text[last:start])
+        if replacement:
+            parts.append(replacement)
+        last = end
+    parts.append(text[last:])
+    return ''.join(parts)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JS 구문 검증
+- <script> 블록(또는 JS/GS 파일 전체)의 SourceIndex 토큰을 한 번 훑어 검사
+- 괄호/중괄호/대괄호 짝, 닫히지 않은 문자열/템플릿 리터럴/주석, 알 수 없는 문자
+- 문장 구조: ';' 뒤의 ',' / ':', 피연산자 없이 끝나는 연산자, '.' 뒤의 이름 누락 등
+- 모든 문제는 정확한 오프셋과 줄:열로 보고
+
+브라우저를 새로 고쳐 가며 오류를 하나씩 찾는 대신, 파이프라인이 단계마다 실행해
+단계가 새로 만든 오류를 곧바로 잡는다 (원래 있던 오류는 기준선으로 빼고 비교).
+
+사용법:
+    python js_verify.py [파일|디렉터리|glob ...] [--limit 20]
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from typing import List, NamedTuple, Optional, Sequence
+
+from js_lexer import COMMENT, INVALID, NAME, NUMBER, PUNCT, STRING, TEMPLATE, Token
+from source_index import SourceIndex
+from targets import expand_targets
+
+# 문제 종류
+UNTERMINATED_STRING = 'unterminated_string'
+UNTERMINATED_TEMPLATE = 'unterminated_template'
+UNTERMINATED_COMMENT = 'unterminated_comment'
+UNEXPECTED_CHAR = 'unexpected_char'
+UNCLOSED_BRACKET = 'unclosed_bracket'
+UNEXPECTED_CLOSE = 'unexpected_close'
+MISMATCHED_CLOSE = 'mismatched_close'
+UNEXPECTED_TOKEN = 'unexpected_token'
+
+_PAIRS = {'(': ')', '[': ']', '{': '}', '${': '}'}
+_CLOSERS = frozenset(')]}')
+
+_COMPLETE_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"|\'(?:[^\'\\\n]|\\[\s\S])*\'')
+
+# 뒤에 피연산자가 반드시 와야 하는 연산자
+_NEEDS_OPERAND = frozenset([
+    '=', '==', '===', '!=', '!==', '<', '>', '<=', '>=', '+', '-', '*', '/', '%', '**',
+    '&&', '||', '??', '&', '|', '^', '<<', '>>', '>>>', '!', '~', '?', '=>', '...',
+    '+=', '-=', '*=', '/=', '%=', '**=', '&=', '|=', '^=', '<<=', '>>=', '>>>=',
+    '&&=', '||=', '??=',
+])
+# 피연산자 자리에 올 수 없는 토큰
+_NOT_OPERAND = frozenset([')', ']', '}', ';', ',', ':'])
+# 이 토큰(또는 블록/파일 시작) 바로 뒤에 올 수 없는 토큰
+_NOT_AFTER = {
+    None: frozenset([',', ':']),
+    ';': frozenset([',', ':']),
+    '{': frozenset([',', ':']),
+    '(': frozenset([',', ':']),
+    ',': frozenset([':', ';']),
+}
+
+
+class SyntaxIssue(NamedTuple):
+    code: str
+    offset: int
+    line: int
+    column: int
+    message: str
+    related: int = -1  # 짝이 되는 여는 괄호 등 관련 위치 (없으면 -1)
+
+    def __str__(self):
+        return f"{self.line}:{self.column} (offset {self.offset}) {self.message}"
+
+
+class VerificationError(ValueError):
+    """파이프라인 단계가 구문 오류를 새로 만듦"""
+
+    def __init__(self, stage: str, issues: List[SyntaxIssue]):
+        self.stage = stage
+        self.issues = issues
+        shown = '; '.join(str(issue) for issue in issues[:3])
+        more = f" 외 {len(issues) - 3}개" if len(issues) > 3 else ''
+        super().__init__(f"'{stage}' 단계가 구문 오류 {len(issues)}개를 새로 만듦: {shown}{more}")
+
+
+def _scan(text: str, tokens: List[Token], issues: list):
+    """JS 영역 하나의 토큰(공백 제외)을 검사해 (code, offset, message, related)를 issues에 추가"""
+    stack = []  # (여는 토큰, 오프셋)
+    prev = None  # 직전 유효 토큰 문자열 (구간 시작이면 None)
+    prev_kind = None
+    prev_end = 0
+
+    for tok in tokens:
+        kind = tok.kind
+        if kind == COMMENT:
+            if text.startswith('/*', tok.start) and \
+                    (tok.end - tok.start < 4 or not text.startswith('*/', tok.end - 2)):
+                issues.append((UNTERMINATED_COMMENT, tok.start, "닫히지 않은 /* 주석", -1))
+            continue
+
+        value = text[tok.start:tok.end]
+        if kind == STRING:
+            if not _COMPLETE_STRING_RE.fullmatch(value):
+                issues.append((UNTERMINATED_STRING, tok.start, "닫히지 않은 문자열", -1))
+        elif kind == TEMPLATE:
+            opens = value.endswith('${')
+            closed = opens or (len(value) > 1 and value.endswith('`'))
+            if value[0] == '}':
+                _close(stack, '}', tok.start, issues)
+            if not closed:
+                issues.append((UNTERMINATED_TEMPLATE, tok.start, "닫히지 않은 템플릿 리터럴", -1))
+            if opens:
+                stack.append(('${', tok.end - 2))
+        elif kind == INVALID:
+            issues.append((UNEXPECTED_CHAR, tok.start, f"알 수 없는 문자 {value!r}", -1))
+        elif kind == PUNCT:
+            if value in _PAIRS:
+                stack.append((value, tok.start))
+            elif value in _CLOSERS:
+                _close(stack, value, tok.start, issues)
+
+        # 문장 구조
+        if kind == PUNCT and prev_kind in (None, PUNCT) and value in _NOT_AFTER.get(prev, ()):
+            issues.append((UNEXPECTED_TOKEN, tok.start,
+                           f"'{prev}' 뒤에 '{value}'가 올 수 없음" if prev else
+                           f"문장이 '{value}'로 시작함", -1))
+        elif prev_kind == PUNCT and prev in _NEEDS_OPERAND and kind == PUNCT and \
+                value in _NOT_OPERAND:
+            issues.append((UNEXPECTED_TOKEN, tok.start, f"'{prev}' 뒤에 피연산자가 없음", -1))
+        elif prev_kind == PUNCT and prev in ('.', '?.') and kind != NAME and value != '#' and \
+                not (prev == '?.' and value in ('(', '[')):
+            issues.append((UNEXPECTED_TOKEN, tok.start, f"'{prev}' 뒤에 속성 이름이 없음", -1))
+        elif prev_kind in (STRING, NUMBER) and kind in (STRING, NUMBER) and \
+                '\n' not in text[prev_end:tok.start]:
+            issues.append((UNEXPECTED_TOKEN, tok.start, "리터럴 두 개가 연산자 없이 이어짐", -1))
+
+        prev = value
+        prev_kind = kind
+        prev_end = tok.end
+
+    for opener, offset in reversed(stack):
+        issues.append((UNCLOSED_BRACKET, offset, f"닫히지 않은 '{opener}'", -1))
+
+
+def _close(stack: list, closer: str, offset: int, issues: list):
+    """닫는 괄호 처리. 짝이 안 맞으면 스택 안쪽에서 맞는 여는 괄호까지 되감아 복구"""
+    if stack and _PAIRS[stack[-1][0]] == closer:
+        stack.pop()
+        return
+    for depth in range(len(stack) - 1, -1, -1):
+        if _PAIRS[stack[depth][0]] == closer:
+            opener, opened = stack[-1]
+            issues.append((MISMATCHED_CLOSE, offset,
+                           f"'{opener}'가 '{closer}'로 닫힘", opened))
+            del stack[depth:]
+            return
+    issues.append((UNEXPECTED_CLOSE, offset, f"짝이 없는 '{closer}'", -1))
+
+
+def verify(content: str, path: str = '', limit: Optional[int] = None) -> List[SyntaxIssue]:
+    """파일 내용의 JS 영역을 검사해 문제 목록을 오프셋 순으로 반환 (없으면 빈 리스트)"""
+    index = SourceIndex.of(content, path)
+    raw = []
+    for tokens in index.tokens:
+        _scan(content, tokens, raw)
+    raw.sort(key=lambda item: item[1])
+    if limit is not None:
+        raw = raw[:limit]
+    return [SyntaxIssue(code, offset, index.line_of(offset), index.column_of(offset),
+                        message, related)
+            for code, offset, message, related in raw]
+
+
+def _signature(content: str, issue: SyntaxIssue):
+    """오프셋이 밀려도 같은 문제로 볼 수 있도록 (종류, 메시지, 해당 줄 내용)으로 식별"""
+    start = content.rfind('\n', 0, issue.offset) + 1
+    end = content.find('\n', issue.offset)
+    return issue.code, issue.message, content[start:end if end >= 0 else len(content)].strip()
+
+
+def new_issues(before: str, before_issues: Sequence[SyntaxIssue],
+               after: str, after_issues: Sequence[SyntaxIssue]) -> List[SyntaxIssue]:
+    """변환 후에 새로 생긴 문제만 반환 (변환 전부터 있던 문제는 제외)"""
+    baseline = Counter(_signature(before, issue) for issue in before_issues)
+    added = []
+    for issue in after_issues:
+        key = _signature(after, issue)
+        if baseline[key]:
+            baseline[key] -= 1
+        else:
+            added.append(issue)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인라인 <script>/JS 파일 구문 검증")
+    parser.add_argument('files', nargs='*', help="대상 파일/디렉터리/glob (기본: index.html)")
+    parser.add_argument('--limit', type=int, default=20, help="파일마다 출력할 최대 문제 수")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for file_path in expand_targets(args.files):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        issues = verify(content, file_path)
+        if not issues:
+            print(f"✅ {file_path}: 구문 문제 없음")
+            continue
+        failed += 1
+        print(f"❌ {file_path}: 구문 문제 {len(issues)}개")
+        for issue in issues[:args.limit]:
+            print(f"   - {issue}")
+        if len(issues) > args.limit:
+            print(f"   ... 외 {len(issues) - args.limit}개")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+선형 시간 치환 스캐너와 규칙별 시간 예산
+- `([^`]*)MARKER...` 처럼 시작 위치마다 파일 끝까지 되추적하던 정규식을
+  str.find/rfind 기반 스캔으로 바꿔 입력 길이에 선형으로 동작
+- 결과는 원래 정규식(re.subn)과 같도록 맞춤 (가장 왼쪽 매치, 탐욕적 그룹)
+- 규칙이 시간 예산을 넘기면 위치와 줄 번호를 담은 RuleTimeout으로 중단
+"""
+
+import re
+import time
+from typing import Callable, Match, Optional, Pattern, Tuple, Union
+
+# 규칙 하나에 허용하는 기본 시간(초)
+DEFAULT_BUDGET = 10.0
+
+
+class RuleTimeout(RuntimeError):
+    """규칙이 시간 예산을 넘겨 중단됨"""
+
+    def __init__(self, rule: str, budget: float, elapsed: float, offset: int, text: str):
+        self.rule = rule
+        self.budget = budget
+        self.elapsed = elapsed
+        self.offset = offset
+        self.line = text.count('\n', 0, offset) + 1
+        snippet = text[offset:offset + 60].replace('\n', '\\n')
+        super().__init__(f"규칙 '{rule}'이 시간 예산 {budget:.1f}s를 초과해 중단됨 "
+                         f"({elapsed:.2f}s 경과, offset {offset}, line {self.line}): {snippet!r}")
+
+
+class Budget:
+    """규칙 하나의 마감 시각. 스캐너가 반복마다 check()를 호출한다"""
+
+    def __init__(self, rule: str, text: str, seconds: Optional[float] = DEFAULT_BUDGET):
+        self.rule = rule
+        self.text = text
+        self.seconds = seconds
+        self.started = time.perf_counter()
+        self.deadline = None if seconds is None else self.started + seconds
+
+    def check(self, offset: int):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise RuleTimeout(self.rule, self.seconds, time.perf_counter() - self.started,
+                              offset, self.text)
+
+
+BudgetArg = Union[Budget, float, None]
+
+
+def _budget(rule: str, text: str, budget: BudgetArg) -> Budget:
+    if isinstance(budget, Budget):
+        return budget
+    return Budget(rule, text, DEFAULT_BUDGET if budget is None else budget)
+
+
+def marker_subn(text: str, marker: str, repl: Callable[[str, Optional[Match]], str],
+                tail: Optional[Pattern] = None, stop: str = '`',
+                rule: str = 'marker', budget: BudgetArg = None) -> Tuple[str, int]:
+    """`([^<stop>]*)<marker><tail>` 정규식의 선형 시간 구현
+
+    탐욕적 그룹은 현재 위치부터 다음 stop 문자 앞까지 중 tail까지 맞는 마지막 marker에서
+    끝나므로, 구간마다 rfind로 바로 찾는다. repl(그룹 1 문자열, tail 매치)의 반환값으로 치환.
+    marker에는 stop 문자가 없어야 한다.
+    """
+    check = _budget(rule, text, budget).check
+    length = len(text)
+    parts = []
+    pos = 0
+    count = 0
+    while pos < length:
+        check(pos)
+        k = text.find(stop, pos)
+        if k < 0:
+            k = length
+        found = None
+        m = text.rfind(marker, pos, k)
+        while m >= 0:
+            end = m + len(marker)
+            tail_match = tail.match(text, end) if tail is not None else None
+            if tail is None or tail_match is not None:
+                found = (m, tail_match.end() if tail_match else end, tail_match)
+                break
+            m = text.rfind(marker, pos, end - 1)
+        if found is None:
+            # 이 구간에서 시작하는 매치는 없음 (stop 문자 자체도 매치 시작이 될 수 없음)
+            parts.append(text[pos:k + 1])
+            pos = k + 1
+            continue
+        m, end, tail_match = found
+        parts.append(repl(text[pos:m], tail_match))
+        count += 1
+        pos = end
+    return ''.join(parts), count
+
+
+def line_marker_subn(text: str, marker: str, tail: Pattern, repl: str = '',
+                     rule: str = 'line_marker', budget: BudgetArg = None) -> Tuple[str, int]:
+    """`^\\s*<marker><tail>` (MULTILINE) 정규식의 선형 시간 구현
+
+    marker 앞은 공백만 있어야 하고, 매치는 그 공백 구간 안의 가장 이른 줄 시작에서 시작한다.
+    """
+    check = _budget(rule, text, budget).check
+    parts = []
+    pos = 0
+    search = 0
+    count = 0
+    while True:
+        m = text.find(marker, search)
+        if m < 0:
+            break
+        check(m)
+        search = m + 1
+        w = m
+        while w > pos and text[w - 1].isspace():
+            w -= 1
+        if w == 0 or text[w - 1] == '\n':
+            line_start = w
+        else:
+            newline = text.find('\n', w, m)
+            if newline < 0:
+                continue
+            line_start = newline + 1
+        tail_match = tail.match(text, m + len(marker))
+        if tail_match is None:
+            continue
+        parts.append(text[pos:line_start])
+        parts.append(repl)
+        count += 1
+        pos = search = tail_match.end()
+    parts.append(text[pos:])
+    return ''.join(parts), count
+
+
+def call_statement_subn(text: str, callee: str, repl: Callable[[str], str],
+                        rule: str = 'call_statement', budget: BudgetArg = None) -> Tuple[str, int]:
+    """`(\\s*)<callee>\\([^;]*\\);` 정규식의 선형 시간 구현
+
+    호출 뒤 첫 ';' 바로 앞이 ')'이면 매치. repl(앞쪽 공백)의 반환값으로 치환.
+    """
+    check = _budget(rule, text, budget).check
+    needle = callee + '('
+    parts = []
+    pos = 0
+    search = 0
+    semicolon = -1
+    count = 0
+    while True:
+        d = text.find(needle, search)
+        if d < 0:
+            break
+        check(d)
+        body = d + len(needle)
+        if semicolon < body:
+            semicolon = text.find(';', body)
+            if semicolon < 0:
+                break  # 이후 후보에도 ';'가 없음
+        if semicolon == body or text[semicolon - 1] != ')':
+            search = d + 1
+            continue
+        w = d
+        while w > pos and text[w - 1].isspace():
+            w -= 1
+        parts.append(text[pos:w])
+        parts.append(repl(text[w:d]))
+        count += 1
+        pos = search = semicolon + 1
+    parts.append(text[pos:])
+    return ''.join(parts), count
+
+
+def backtick_quote_subn(text: str, rule: str = 'backtick_quote',
+                        budget: BudgetArg = None) -> Tuple[str, int]:
+    """`` `([^`]*)" `` → `` `\\1` `` 의 선형 시간 구현
+
+    백틱마다 다음 백틱 전의 마지막 '"'까지를 매치로 본다.
+    """
+    check = _budget(rule, text, budget).check
+    parts = []
+    pos = 0
+    count = 0
+    while True:
+        b = text.find('`', pos)
+        if b < 0:
+            break
+        check(b)
+        k = text.find('`', b + 1)
+        if k < 0:
+            k = len(text)
+        q = text.rfind('"', b + 1, k)
+        if q < 0:
+            parts.append(text[pos:k])
+            pos = k
+            continue
+        parts.append(text[pos:b])
+        parts.append('`' + text[b + 1:q] + '`')
+        count += 1
+        pos = q + 1
+    parts.append(text[pos:])
+    return ''.join(parts), count
+
+
+def candidate_subn(text: str, pattern: Pattern, repl, candidates: Pattern,
+                   barrier: Callable[[str, Match], int],
+                   rule: str = 'candidate', budget: BudgetArg = None) -> Tuple[str, int]:
+    """탐욕적 구간이 줄을 넘어가는 줄 시작 고정 정규식의 선형 시간 실행
+
+    pattern은 candidates가 찾은 위치에서만 시도한다. 실패하면 barrier(text, 후보 매치)가
+    돌려준 위치 앞의 후보들은 같은 종결 문자를 공유해 똑같이 실패하므로 건너뛴다.
+    (예: ^(\\s*):([^`]*)`... 는 ':' 뒤 첫 백틱 이전의 모든 후보가 같은 결과)
+    """
+    check = _budget(rule, text, budget).check
+    parts = []
+    pos = 0
+    search = 0
+    count = 0
+    while True:
+        candidate = candidates.search(text, search)
+        if candidate is None:
+            break
+        start = candidate.start()
+        check(start)
+        m = pattern.match(text, start)
+        if m is None:
+            search = max(start + 1, barrier(text, candidate))
+            continue
+        parts.append(text[pos:start])
+        parts.append(m.expand(repl) if isinstance(repl, str) else repl(m))
+        count += 1
+        pos = search = m.end()
+    parts.append(text[pos:])
+    return ''.join(parts), count
+
+
+def lead_char_subn(text: str, core: Pattern, exclude: str, repl: Callable[[str, Match], str],
+                   rule: str = 'lead_char', budget: BudgetArg = None) -> Tuple[str, int]:
+    """`([^<exclude>])\\s*<core>` 정규식의 선형 시간 구현
+
+    core 앞 공백 구간마다 시작 위치를 하나씩 시도하지 않고, 구간 앞 문자(또는 구간 첫 공백)를
+    바로 그룹 1로 고른다. repl(그룹 1 문자, core 매치)의 반환값으로 치환.
+    """
+    check = _budget(rule, text, budget).check
+    parts = []
+    pos = 0
+    count = 0
+    for m in core.finditer(text):
+        q = m.start()
+        check(q)
+        if q <= pos:
+            continue
+        w = q
+        while w > pos and text[w - 1].isspace():
+            w -= 1
+        if w - 1 >= pos and text[w - 1] != exclude:
+            lead = w - 1
+        elif w < q:
+            lead = w
+        else:
+            continue
+        parts.append(text[pos:lead])
+        parts.append(repl(text[lead], m))
+        count += 1
+        pos = m.end()
+    parts.append(text[pos:])
+    return ''.join(parts), count
+
+
+def budgeted_subn(pattern: Union[str, Pattern], repl, text: str, flags: int = 0,
+                  rule: str = 'regex', budget: BudgetArg = None) -> Tuple[str, int]:
+    """이미 선형인 정규식용 re.subn 대체. 매치 사이마다 예산을 확인한다"""
+    check = _budget(rule, text, budget).check
+    regex = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+    parts = []
+    pos = 0
+    count = 0
+    for m in regex.finditer(text):
+        check(m.start())
+        parts.append(text[pos:m.start()])
+        parts.append(m.expand(repl) if isinstance(repl, str) else repl(m))
+        count += 1
+        pos = m.end()
+    parts.append(text[pos:])
+    return ''.join(parts), count
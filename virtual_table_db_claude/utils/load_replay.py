@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Apps Script doPost 요청 트레이스 재생 부하 생성기
+- 프런트엔드가 보내는 액션(updateSheet, batchVerify, getHandStatus, verifyUpdate)을
+  index.html과 같은 형태(text/plain JSON 본문)로 만들거나, 녹화한 트레이스를 그대로 재생
+- 열린 루프(open loop): 요청은 트레이스 시각에 맞춰 보내고 이전 응답을 기다리지 않음.
+  지연 시간은 원래 보내려던 시각부터 재므로 서버가 밀리면 대기 시간까지 드러남
+- 엔드포인트는 아무 URL (Apps Script /exec의 302 리다이렉트, https, chunked 응답 처리),
+  --local이면 sheet_backend를 따로 띄워 대상으로 씀
+- --rates로 도착률을 올려 가며 처리량이 못 따라가거나 p99/오류율이 기준을 넘는 포화 지점을 찾음
+- 결과: 액션별 요청 수, 오류(앱 status:error / HTTP / 시간 초과 / 연결), 처리량,
+  지연 시간 분위수와 로그 눈금 히스토그램을 JSON으로
+
+앱 오류(status: "error")는 따로 세고, 지연 시간 분위수도 성공 응답만으로 따로 낸다.
+프런트엔드의 getHandStatus는 handNumber를 null로 보내 Apps Script와 sheet_backend 모두 항상
+오류로 응답하므로 (계약 자체의 문제), 합성 트레이스는 기본으로 시트(--hands-csv 또는 합성 시트)의
+D열 핸드 번호를 넣어 실제 시간 인덱스 조회를 잰다. --null-hand-number면 index.html 그대로 null.
+
+트레이스 형식 (JSONL, 한 줄에 요청 하나, t는 시작부터의 초):
+    {"t": 0.125, "contentType": "text/plain", "body": "{\\"action\\":\\"batchVerify\\",...}"}
+    body는 문자열(원문 그대로) 또는 JSON 객체. sheet_backend --record가 이 형식으로 저장한다.
+
+사용법:
+    python load_replay.py <엔드포인트 URL> [--trace trace.jsonl] [--speed 1]
+    python load_replay.py <엔드포인트 URL> --rate 20 --duration 30 [--mix getHandStatus=10,...]
+    python load_replay.py --local [--delay 50] --rates 20,50,100,200 --duration 10 [--json 결과.json]
+    python load_replay.py <엔드포인트 URL> --hands-csv 게시된시트.csv --rate 20   # 실제 시트의 핸드로
+    python load_replay.py --save-trace trace.jsonl --rate 20 --duration 60
+"""
+
+import argparse
+import asyncio
+import bisect
+import csv
+import json
+import os
+import random
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from hand_index import generate_hand_rows, js_parse_int
+
+FRONTEND_ACTIONS = ('updateSheet', 'batchVerify', 'getHandStatus', 'verifyUpdate')
+# 화면에 보이는 핸드마다 상태 확인, 주기적인 일괄 확인, 가끔 시트 기록과 검증
+DEFAULT_MIX = 'getHandStatus=10,batchVerify=4,updateSheet=2,verifyUpdate=1'
+DEFAULT_SHEET_URL = 'https://docs.google.com/spreadsheets/d/loadtest/edit#gid=0'
+DEFAULT_CONNECTIONS = 256
+DEFAULT_TIMEOUT = 30.0
+MAX_REDIRECTS = 5
+
+# 포화 판단 기준 (앱 오류는 제외)
+DEFAULT_SLO_MS = 1000.0
+DEFAULT_MAX_ERROR_RATE = 0.01
+MIN_THROUGHPUT_RATIO = 0.9
+
+# 보내기 지연(부하 생성기 자신의 밀림) p99가 이보다 크면 결과가 서버 한계를 낮게 잡을 수 있음
+GENERATOR_LAG_MS = 20.0
+
+# 히스토그램 상한(ms): 0.1 ms ~ 63 s, 10배마다 10칸
+BUCKETS_MS = [round(10 ** (k / 10), 3) for k in range(-10, 49)]
+
+OK, APP_ERROR, HTTP_ERROR, TIMEOUT, TRANSPORT = 'ok', 'app_error', 'http_error', 'timeout', 'transport'
+OUTCOMES = (OK, APP_ERROR, HTTP_ERROR, TIMEOUT, TRANSPORT)
+FAILURES = (HTTP_ERROR, TIMEOUT, TRANSPORT)
+
+
+class TraceRequest(NamedTuple):
+    t: float            # 시작부터의 초
+    action: str
+    content_type: str
+    body: bytes
+    query: str = ''
+
+
+class Sample(NamedTuple):
+    action: str
+    scheduled: float    # 보내려던 시각 (이벤트 루프 시계)
+    sent: float
+    done: float
+    outcome: str
+
+
+# ========================================
+# 트레이스
+# ========================================
+
+def _encode(data) -> bytes:
+    """JSON.stringify와 같은 본문 (공백 없음, 한글 그대로)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _action_of(body: bytes) -> str:
+    try:
+        data = json.loads(body.decode('utf-8'))
+    except ValueError:
+        return 'unknown'
+    action = data.get('action') if isinstance(data, dict) else None
+    return action if isinstance(action, str) and action else 'unknown'
+
+
+def load_trace(path: str) -> List[TraceRequest]:
+    """JSONL 트레이스 → 시각순 요청 목록"""
+    requests = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                body = entry.get('body', '')
+                body = body.encode('utf-8') if isinstance(body, str) else _encode(body)
+                requests.append(TraceRequest(
+                    float(entry['t']), entry.get('action') or _action_of(body),
+                    entry.get('contentType') or 'text/plain', body, entry.get('query') or ''))
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                raise ValueError(f"{path}:{number}: 잘못된 트레이스 줄 ({error})") from error
+    requests.sort(key=lambda request: request.t)
+    return requests
+
+
+def save_trace(requests: Sequence[TraceRequest], path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            entry = {'t': round(request.t, 6), 'action': request.action,
+                     'contentType': request.content_type, 'body': request.body.decode('utf-8')}
+            if request.query:
+                entry['query'] = request.query
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'getHandStatus=10,batchVerify=4' → 가중치"""
+    mix = {}
+    for part in filter(None, (piece.strip() for piece in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in FRONTEND_ACTIONS:
+            raise ValueError(f"알 수 없는 액션: {name} (가능: {', '.join(FRONTEND_ACTIONS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("액션 비율이 비었습니다")
+    return mix
+
+
+def load_sheet_rows(path: str) -> List[List[str]]:
+    """게시된 핸드 시트 CSV (1행 = 헤더). 원격 엔드포인트에 실제로 있는 핸드로 요청을 만들 때"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def sheet_rows(rows: int, seed: int = 0) -> List[List[str]]:
+    """합성 트레이스와 --local 시트가 같이 쓰는 핸드 시트 (1행 = 헤더)"""
+    return [['A', '시간', 'C', '핸드', '상태', '파일명', 'G', '분석', '업데이트']] + \
+        generate_hand_rows(rows, seed)
+
+
+def frontend_body(action: str, rng: random.Random, sheet_url: str,
+                  hands: Sequence[Tuple[int, int, str]], null_hand_number: bool = False) -> dict:
+    """index.html이 보내는 것과 같은 필드의 요청 본문. hands: [(행 번호, 핸드 시간, 핸드 번호)]"""
+    row, stamp, number = rng.choice(hands)
+    if action == 'getHandStatus':
+        # index.html은 D열 입력 차단 때문에 handNumber를 null로 보냄 (null_hand_number면 그대로)
+        return {'action': action, 'sheetUrl': sheet_url,
+                'handNumber': None if null_hand_number else number, 'handTime': stamp}
+    if action == 'batchVerify':
+        picked = rng.sample(hands, min(len(hands), rng.randint(5, 50)))
+        return {'action': action, 'sheetUrl': sheet_url,
+                'rows': sorted(picked_row for picked_row, _, _ in picked)}
+    filename = f"{row}_Player{rng.randrange(100)}.mp4"
+    analysis = f"핸드 #{row - 1} 분석\n프리플랍 레이즈 후 턴에서 올인\n결과: 팟 {rng.randrange(1, 500)}BB"
+    if action == 'updateSheet':
+        return {'action': action, 'sheetUrl': sheet_url, 'rowNumber': row, 'handNumber': None,
+                'filename': filename, 'gColumnValue': 'A', 'aiAnalysis': analysis,
+                'subtitle': '', 'status': '복사완료'}
+    return {'action': action, 'sheetUrl': sheet_url, 'rowNumber': row,
+            'expectedFilename': filename, 'expectedAnalysis': analysis}
+
+
+def synthesize_trace(rate: float, duration: float, mix: Dict[str, float], sheet_url: str,
+                     rows: Sequence[Sequence[str]], seed: int = 0,
+                     null_hand_number: bool = False) -> List[TraceRequest]:
+    """도착률 rate(초당)의 포아송 도착, 액션은 mix 비율로. 핸드는 시간(B열)과 번호(D열)가 있는 행에서"""
+    rng = random.Random(seed)
+    hands = [(number, js_parse_int(row[1]) or 0, row[3]) for number, row in enumerate(rows, 1)
+             if number > 1 and len(row) > 3 and row[1] and row[3]]
+    if not hands:
+        raise ValueError("시간(B열)과 핸드 번호(D열)가 있는 행이 없습니다")
+    names, weights = list(mix), list(mix.values())
+    requests = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        action = rng.choices(names, weights)[0]
+        body = _encode(frontend_body(action, rng, sheet_url, hands, null_hand_number))
+        requests.append(TraceRequest(t, action, 'text/plain', body))
+        t += rng.expovariate(rate)
+    return requests
+
+
+def trace_rate(requests: Sequence[TraceRequest]) -> float:
+    if len(requests) < 2 or requests[-1].t <= 0:
+        return float(len(requests))
+    return len(requests) / requests[-1].t
+
+
+# ========================================
+# HTTP 클라이언트
+# ========================================
+
+class TransportError(Exception):
+    """연결 실패, 응답 형식 오류, 리다이렉트 초과"""
+
+
+class HttpClient:
+    """keep-alive 연결을 다시 쓰는 최소 HTTP/1.1 클라이언트 (http/https, 리다이렉트 따라감)
+
+    동시 연결은 connections개까지이고, 나머지 요청은 연결 자리가 날 때까지 기다린다
+    (그 대기 시간도 지연 시간에 들어감).
+    """
+
+    def __init__(self, connections: int = DEFAULT_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT):
+        self.slots = asyncio.Semaphore(connections)
+        self.timeout = timeout
+        self.idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = \
+            defaultdict(list)
+        self.opened = 0
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def post(self, url: str, body: bytes, content_type: str) -> Tuple[int, bytes]:
+        """(HTTP 상태, 본문). 시간 초과는 asyncio.TimeoutError"""
+        async with self.slots:
+            return await asyncio.wait_for(self._follow(url, body, content_type), self.timeout)
+
+    async def _follow(self, url: str, body: bytes, content_type: str) -> Tuple[int, bytes]:
+        method = 'POST'
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, payload = await self._exchange(method, url, body, content_type)
+            location = headers.get('location')
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return status, payload
+            # Apps Script /exec는 302로 googleusercontent의 결과 URL을 알려 줌 (GET으로 받음)
+            url = urljoin(url, location)
+            if status not in (307, 308):
+                method, body = 'GET', b''
+        raise TransportError(f"리다이렉트가 {MAX_REDIRECTS}번을 넘음")
+
+    async def _connect(self, scheme: str, host: str, port: int):
+        if scheme == 'https' and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == 'https' else None)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.opened += 1
+        return reader, writer
+
+    async def _exchange(self, method: str, url: str, body: bytes, content_type: str):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise TransportError(f"지원하지 않는 URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        head = [f'{method} {target} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: keep-alive',
+                'Accept: application/json']
+        if method != 'GET':
+            head += [f'Content-Type: {content_type}', f'Content-Length: {len(body)}']
+        request = ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+        # 쉬던 연결은 서버가 이미 닫았을 수 있으므로 응답을 한 바이트도 못 받았을 때만 새 연결로
+        # 다시 보냄. 일부라도 받았으면 서버가 요청(POST)을 처리했을 수 있어 다시 보내지 않음
+        while True:
+            reused = bool(self.idle[key])
+            reader, writer = self.idle[key].pop() if reused else await self._connect(*key)
+            received = False
+            try:
+                writer.write(request)
+                first = await reader.read(1)
+                if not first:
+                    raise ConnectionResetError('응답 전에 연결이 닫힘')
+                received = True
+                line = first + await reader.readline()
+                status, headers, payload, keep = await _read_response(line, reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError) as error:
+                writer.close()
+                if reused and not received:
+                    continue
+                raise TransportError(str(error) or type(error).__name__) from error
+            except BaseException:
+                writer.close()  # 시간 초과로 취소됐거나 응답이 깨짐: 연결을 다시 쓰지 않음
+                raise
+            if keep:
+                self.idle[key].append((reader, writer))
+            else:
+                writer.close()
+            return status, headers, payload
+
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+
+async def _read_response(line: bytes, reader: asyncio.StreamReader, method: str):
+    """(상태, 헤더, 본문, 연결을 다시 쓸 수 있는지)"""
+    parts = line.decode('latin-1').split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+        raise TransportError(f"잘못된 응답 줄: {line[:80]!r}")
+    version, status = parts[0], int(parts[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b'', None)
+        if line in (b'\r\n', b'\n'):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    keep = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        payload = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass  # 트레일러
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        payload = b''.join(chunks)
+    elif 'content-length' in headers:
+        payload = await reader.readexactly(int(headers['content-length']))
+    else:
+        payload, keep = await reader.read(), False
+    return status, headers, payload, keep
+
+
+# ========================================
+# 재생과 집계
+# ========================================
+
+def classify(status: int, payload: bytes) -> str:
+    if not 200 <= status < 300:
+        return HTTP_ERROR
+    try:
+        data = json.loads(payload.decode('utf-8'))
+    except ValueError:
+        return OK  # no-cors 테스트 등 JSON이 아닌 성공 응답
+    return APP_ERROR if isinstance(data, dict) and data.get('status') == 'error' else OK
+
+
+async def replay(requests: Sequence[TraceRequest], url: str, client: HttpClient,
+                 speed: float = 1.0) -> Tuple[List[Sample], float]:
+    """열린 루프 재생 → (표본, 시작 시각). 요청은 t/speed 시각에 보내고 응답을 기다리지 않음"""
+    loop = asyncio.get_running_loop()
+    samples: List[Sample] = []
+
+    async def fire(request: TraceRequest, scheduled: float):
+        sent = loop.time()
+        target = url
+        if request.query:
+            target += ('&' if urlsplit(url).query else '?') + request.query
+        try:
+            status, payload = await client.post(target, request.body, request.content_type)
+            outcome = classify(status, payload)
+        except asyncio.TimeoutError:
+            outcome = TIMEOUT
+        except (TransportError, OSError, ValueError):
+            outcome = TRANSPORT
+        samples.append(Sample(request.action, scheduled, sent, loop.time(), outcome))
+
+    start = loop.time() + 0.05
+    tasks = []
+    for request in requests:
+        scheduled = start + request.t / speed
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(request, scheduled)))
+    await asyncio.gather(*tasks)
+    return samples, start
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def histogram(latencies_ms: Sequence[float]) -> List[list]:
+    """[[상한 ms, 개수], ...] (빈 칸 제외, 마지막 칸을 넘으면 "+Inf")"""
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in latencies_ms:
+        counts[bisect.bisect_left(BUCKETS_MS, value)] += 1
+    bounds = BUCKETS_MS + ['+Inf']
+    return [[bounds[i], count] for i, count in enumerate(counts) if count]
+
+
+def summarize(samples: Sequence[Sample], start: float, duration: float) -> dict:
+    """표본 → 요청 수, 결과별 개수, 처리량, 지연 시간(보내려던 시각부터) 분위수와 히스토그램"""
+    latencies = sorted((sample.done - sample.scheduled) * 1000 for sample in samples)
+    lags = sorted((sample.sent - sample.scheduled) * 1000 for sample in samples)
+    ok_latencies = sorted((sample.done - sample.scheduled) * 1000 for sample in samples
+                          if sample.outcome == OK)
+    outcomes = {outcome: 0 for outcome in OUTCOMES}
+    for sample in samples:
+        outcomes[sample.outcome] += 1
+    count = len(samples)
+    span = max((sample.done for sample in samples), default=start) - start
+    failures = sum(outcomes[outcome] for outcome in FAILURES)
+    return {
+        'requests': count,
+        'outcomes': outcomes,
+        'error_rate': round(failures / count, 4) if count else 0.0,
+        'app_error_rate': round(outcomes[APP_ERROR] / count, 4) if count else 0.0,
+        'offered_rps': round(count / duration, 2) if duration > 0 else 0.0,
+        'throughput_rps': round(count / span, 2) if span > 0 else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / count, 3) if count else 0.0,
+            'p50': round(_percentile(latencies, 0.50), 3),
+            'p90': round(_percentile(latencies, 0.90), 3),
+            'p99': round(_percentile(latencies, 0.99), 3),
+            'p999': round(_percentile(latencies, 0.999), 3),
+            'max': round(latencies[-1], 3) if latencies else 0.0,
+        },
+        # 앱 오류는 조회 없이 바로 돌아오므로 성공 응답만의 지연 시간을 따로
+        'ok_latency_ms': {
+            'p50': round(_percentile(ok_latencies, 0.50), 3),
+            'p99': round(_percentile(ok_latencies, 0.99), 3),
+        },
+        'send_lag_ms': {'p99': round(_percentile(lags, 0.99), 3),
+                        'max': round(lags[-1], 3) if lags else 0.0},
+        'histogram': histogram(latencies),
+    }
+
+
+def step_report(samples: Sequence[Sample], start: float, duration: float,
+                slo_ms: float, max_error_rate: float) -> dict:
+    by_action: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_action[sample.action].append(sample)
+    overall = summarize(samples, start, duration)
+    reasons = []
+    if overall['throughput_rps'] < overall['offered_rps'] * MIN_THROUGHPUT_RATIO:
+        reasons.append(f"처리량 {overall['throughput_rps']} < 도착률 {overall['offered_rps']} req/s")
+    if overall['latency_ms']['p99'] > slo_ms:
+        reasons.append(f"p99 {overall['latency_ms']['p99']:.0f} ms > {slo_ms:.0f} ms")
+    if overall['error_rate'] > max_error_rate:
+        reasons.append(f"오류율 {overall['error_rate']:.2%} > {max_error_rate:.2%}")
+    return {
+        'duration_s': round(duration, 3),
+        'overall': overall,
+        'actions': {action: summarize(items, start, duration)
+                    for action, items in sorted(by_action.items())},
+        'saturated': bool(reasons),
+        'reasons': reasons,
+    }
+
+
+def print_step(step: dict):
+    overall = step['overall']
+    latency = overall['latency_ms']
+    mark = '🔥' if step['saturated'] else '✅'
+    print(f"{mark} 도착률 {overall['offered_rps']} req/s → 처리량 {overall['throughput_rps']} req/s, "
+          f"p50 {latency['p50']:.1f} ms, p99 {latency['p99']:.1f} ms, 오류율 {overall['error_rate']:.2%}"
+          + (f" ({'; '.join(step['reasons'])})" if step['reasons'] else ''))
+    if overall['send_lag_ms']['p99'] > GENERATOR_LAG_MS:
+        print(f"   ⚠️ 부하 생성기가 밀림 (보내기 지연 p99 {overall['send_lag_ms']['p99']:.0f} ms): "
+              f"이 단계 결과는 서버 한계보다 낮게 나올 수 있음")
+    for action, stats in step['actions'].items():
+        outcomes = stats['outcomes']
+        failed = sum(outcomes[outcome] for outcome in FAILURES)
+        ok = stats['ok_latency_ms']
+        print(f"   - {action:14} {stats['requests']:>6}건  성공 {outcomes[OK]:>6} (p50 {ok['p50']:>8.1f} ms, "
+              f"p99 {ok['p99']:>8.1f} ms)  앱 오류 {outcomes[APP_ERROR]:>5}  실패 {failed}")
+
+
+# ========================================
+# 실행
+# ========================================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_local_backend(rows: Sequence[Sequence[str]], sheet_url: str, delay_ms: float,
+                        workdir: str) -> Tuple[subprocess.Popen, str]:
+    """sheet_backend를 별도 프로세스로 띄움 (같은 이벤트 루프에서 재면 부하 생성기와 섞임)"""
+    csv_path = os.path.join(workdir, 'hands.csv')
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+    port = _free_port()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sheet_backend.py')
+    process = subprocess.Popen(
+        [sys.executable, script, '--port', str(port), '--csv', sheet_url, csv_path,
+         '--delay', str(delay_ms)], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"sheet_backend가 종료됨 (코드 {process.returncode})")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, f'http://127.0.0.1:{port}/exec'
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("sheet_backend가 시작되지 않음")
+
+
+async def run_steps(url: str, plans: List[Tuple[List[TraceRequest], float, float]],
+                    connections: int, timeout: float, slo_ms: float, max_error_rate: float,
+                    stop_on_saturation: bool) -> List[dict]:
+    """plans: [(트레이스, speed, 구간 길이 초)]. 포화된 단계에서 멈춤"""
+    client = HttpClient(connections, timeout)
+    steps = []
+    try:
+        for requests, speed, duration in plans:
+            samples, start = await replay(requests, url, client, speed)
+            step = step_report(samples, start, duration, slo_ms, max_error_rate)
+            step['connections_opened'] = client.opened
+            print_step(step)
+            steps.append(step)
+            if step['saturated'] and stop_on_saturation:
+                break
+    finally:
+        client.close()
+    return steps
+
+
+def saturation_point(steps: Sequence[dict]) -> Optional[dict]:
+    for index, step in enumerate(steps):
+        if step['saturated']:
+            last_good = steps[index - 1]['overall']['offered_rps'] if index else None
+            return {'offered_rps': step['overall']['offered_rps'], 'last_good_rps': last_good,
+                    'reasons': step['reasons']}
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apps Script doPost 트레이스 재생 부하 생성기")
+    parser.add_argument('url', nargs='?', help="엔드포인트 URL (Apps Script /exec 또는 로컬 대역)")
+    parser.add_argument('--local', action='store_true', help="sheet_backend를 띄워 대상으로 사용")
+    parser.add_argument('--delay', type=float, default=0.0, help="--local 백엔드의 요청당 인위 지연(ms)")
+    parser.add_argument('--trace', help="재생할 JSONL 트레이스 (없으면 합성)")
+    parser.add_argument('--save-trace', help="합성한 트레이스를 저장만 하고 끝냄")
+    parser.add_argument('--speed', type=float, default=1.0, help="녹화 트레이스 재생 배속")
+    parser.add_argument('--rate', type=float, default=20.0, help="합성 트레이스 도착률(req/s)")
+    parser.add_argument('--rates', help="도착률을 차례로 올려 포화 지점 찾기 (예: 10,20,50,100)")
+    parser.add_argument('--duration', type=float, default=30.0, help="단계마다 재생 시간(초)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="합성 트레이스 액션 비율")
+    parser.add_argument('--sheet-url', default=DEFAULT_SHEET_URL, help="요청에 넣을 시트 URL")
+    parser.add_argument('--rows', type=int, default=2000, help="합성 시트 핸드 수")
+    parser.add_argument('--hands-csv', help="요청에 쓸 핸드를 뽑을 시트 CSV (대상 시트를 내보낸 것, "
+                                            "--local이면 이 시트를 띄움)")
+    parser.add_argument('--null-hand-number', action='store_true',
+                        help="getHandStatus의 handNumber를 index.html처럼 null로 보냄 (항상 앱 오류)")
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS, help="최대 동시 연결")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="요청 시간 제한(초)")
+    parser.add_argument('--slo-ms', type=float, default=DEFAULT_SLO_MS, help="포화 판단 p99 기준(ms)")
+    parser.add_argument('--max-error-rate', type=float, default=DEFAULT_MAX_ERROR_RATE,
+                        help="포화 판단 오류율 기준 (앱 오류 제외)")
+    parser.add_argument('--keep-going', action='store_true', help="포화돼도 남은 단계를 계속 실행")
+    parser.add_argument('--json', help="결과 JSON 경로")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+        rates = [float(rate) for rate in args.rates.split(',')] if args.rates else [args.rate]
+    except ValueError as error:
+        parser.error(str(error))
+    if any(rate <= 0 for rate in rates) or args.duration <= 0 or args.speed <= 0:
+        parser.error("도착률, --duration, --speed는 0보다 커야 합니다")
+    if args.connections < 1:
+        parser.error("--connections는 1 이상이어야 합니다")
+
+    if args.hands_csv:
+        try:
+            rows = load_sheet_rows(args.hands_csv)
+        except OSError as error:
+            print(f"❌ 시트 CSV를 읽을 수 없음: {error}")
+            return 1
+    else:
+        rows = sheet_rows(args.rows, args.seed)
+    recorded = None
+    if args.trace:
+        try:
+            recorded = load_trace(args.trace)
+        except (OSError, ValueError) as error:
+            print(f"❌ 트레이스를 읽을 수 없음: {error}")
+            return 1
+        if not recorded:
+            print(f"❌ 빈 트레이스: {args.trace}")
+            return 1
+
+    if args.save_trace:
+        try:
+            requests = synthesize_trace(rates[0], args.duration, mix, args.sheet_url, rows, args.seed,
+                                        args.null_hand_number)
+        except ValueError as error:
+            print(f"❌ {error}")
+            return 1
+        save_trace(requests, args.save_trace)
+        print(f"📝 {args.save_trace}: 요청 {len(requests)}개, {args.duration:g}초")
+        return 0
+    if not args.url and not args.local:
+        parser.error("엔드포인트 URL 또는 --local이 필요합니다")
+
+    # 단계마다 (트레이스, 배속, 구간 길이)
+    if recorded is not None:
+        base = trace_rate(recorded)
+        speeds = [rate / base for rate in rates] if args.rates else [args.speed]
+        plans = [(recorded, speed, recorded[-1].t / speed) for speed in speeds]
+    else:
+        try:
+            plans = [(synthesize_trace(rate, args.duration, mix, args.sheet_url, rows, args.seed + i,
+                                       args.null_hand_number),
+                      1.0, args.duration) for i, rate in enumerate(rates)]
+        except ValueError as error:
+            print(f"❌ {error}")
+            return 1
+
+    process = None
+    workdir = tempfile.mkdtemp(prefix='load_replay_')
+    try:
+        if args.local:
+            process, url = start_local_backend(rows, args.sheet_url, args.delay, workdir)
+            print(f"🚀 로컬 sheet_backend: {url} (지연 {args.delay:g} ms, 핸드 {len(rows) - 1}개)")
+        else:
+            url = args.url
+        print(f"🎯 {url}: {len(plans)}단계, 연결 최대 {args.connections}개")
+        steps = asyncio.run(run_steps(url, plans, args.connections, args.timeout,
+                                      args.slo_ms, args.max_error_rate, not args.keep_going))
+    except (RuntimeError, KeyboardInterrupt) as error:
+        if isinstance(error, RuntimeError):
+            print(f"❌ {error}")
+        return 1
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+    saturation = saturation_point(steps)
+    if args.rates:
+        if saturation:
+            print(f"📈 포화: {saturation['offered_rps']} req/s "
+                  f"(마지막 정상 {saturation['last_good_rps']} req/s)")
+        else:
+            print(f"📈 {rates[-1]:g} req/s까지 포화 없음")
+    if args.json:
+        report = {
+            'target': url,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'trace': args.trace or {'synthesized': True, 'mix': mix, 'rows': args.rows,
+                                    'seed': args.seed},
+            'settings': {'connections': args.connections, 'timeout_s': args.timeout,
+                         'slo_ms': args.slo_ms, 'max_error_rate': args.max_error_rate},
+            'steps': steps,
+            'saturation': saturation,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📝 {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 파일 병렬 처리
+- 파일/디렉터리/glob 인자를 확장해 모든 JS 소스(.html/.js/.gs)를 대상으로 실행
+- 파일 단위, 그리고 HTML 안의 독립적인 <script> 블록 단위로 작업을 나눠 프로세스 풀에 분배
+- 결과는 작업 순서대로 결정적으로 병합하고 파일마다 한 번만 저장
+- pipeline.run_pipeline과 같은 검증: 작업마다 단계별 구문 검증, 병합한 파일 전체를 다시 검증해
+  새 구문 오류가 있으면 그 파일은 저장하지 않고 실패로 보고. 규칙별 계측은 파일마다
+  RunReport 하나로 합쳐 저장
+- 여러 파일이나 비슷한 크기의 블록이 여럿인 입력에서만 빨라진다. 입력이 PARALLEL_MIN_SIZE보다
+  작거나 가장 큰 작업이 전체의 MAX_JOB_SHARE를 넘으면 (index.html은 899행의 블록 하나가 대부분)
+  풀을 띄우지 않고 현재 프로세스에서 같은 순서로 실행
+
+사용법:
+    python parallel.py [파일|디렉터리|glob ...] [--stages ...] [--jobs N] [--dry-run]
+                       [--report-dir 경로] [--no-report] [--no-verify]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from js_lexer import apply_splices, is_html, script_blocks
+from js_verify import VerificationError, new_issues, verify as verify_syntax
+from linear_scan import RuleTimeout
+from pipeline import DEFAULT_STAGES, STAGES, UNIT_SAFE_STAGES, StageResult, run_stages
+from run_report import RuleStats, RunReport
+from snapshot_store import backup_content
+from targets import expand_targets
+
+# 이보다 작은 입력은 워커 시작/전송 비용이 처리 시간보다 큼 (작업 문자 수 합계)
+PARALLEL_MIN_SIZE = 256 * 1024
+# 작업 하나가 이 비율을 넘으면 나머지를 나눠도 그 작업 시간이 전체 시간을 정함
+MAX_JOB_SHARE = 0.5
+
+
+class Job(NamedTuple):
+    file_index: int
+    start: int        # 파일 내 범위 (파일 전체 작업이면 0, len)
+    end: int
+    text: str
+    path: str         # transform에 넘길 경로 (블록 작업이면 'block.js')
+
+
+class FileResult(NamedTuple):
+    path: str
+    changed: bool
+    jobs: int
+    edits: int
+    stage_seconds: Dict[str, float]
+    error: Optional[str] = None         # 검증 실패 등으로 저장하지 않은 이유
+    report: Optional[RunReport] = None
+
+
+def _run_job(args: Tuple[str, Sequence[str], str, bool]) \
+        -> Tuple[str, List[StageResult], Dict[str, RuleStats], Optional[str]]:
+    """(결과, 단계 결과, 규칙 계측, 오류). 단계가 구문 오류를 만들면 원문과 오류 메시지"""
+    text, stages, path, verify = args
+    report = RunReport('parallel', path)
+    try:
+        output, results = run_stages(text, stages, path, report, verify)
+    except (VerificationError, RuleTimeout) as error:
+        return text, [], report.rules, str(error)
+    return output, results, report.rules, None
+
+
+def _merge_rules(report: RunReport, rules: Dict[str, RuleStats]):
+    for name, stats in rules.items():
+        total = report.rules.get(name)
+        if total is None:
+            total = report.rules[name] = RuleStats(name)
+        total.seconds += stats.seconds
+        total.add(stats.matches, stats.bytes_removed, stats.kept)
+
+
+def verify_merged(path: str, original: str, content: str, stages: Sequence[str],
+                  report: Optional[RunReport] = None) -> Optional[str]:
+    """병합한 파일 전체를 pipeline.run_stages와 같은 기준으로 검증. 새 구문 오류가 있으면 메시지"""
+    stats = report.rule('verify') if report is not None else None
+    started = time.perf_counter()
+    before = verify_syntax(original, path)
+    after = verify_syntax(content, path)
+    if stats is not None:
+        stats.seconds += time.perf_counter() - started
+    added = new_issues(original, before, content, after)
+    if added and len(after) >= len(before):
+        return str(VerificationError(','.join(stages), added))
+    return None
+
+
+def plan_jobs(paths: Sequence[str], contents: Sequence[str], stages: Sequence[str]) -> List[Job]:
+    """파일별 작업 목록 생성 (블록 분할이 가능하면 <script> 블록 단위)"""
+    split_blocks = all(name in UNIT_SAFE_STAGES for name in stages)
+    jobs = []
+    for index, (path, content) in enumerate(zip(paths, contents)):
+        if split_blocks and is_html(path):
+            for lo, hi in script_blocks(content):
+                jobs.append(Job(index, lo, hi, content[lo:hi], 'block.js'))
+        else:
+            jobs.append(Job(index, 0, len(content), content, path))
+    return jobs
+
+
+def use_pool(jobs: Sequence[Job], workers: int) -> bool:
+    """프로세스 풀로 나눠 실행할 만한지 (아니면 현재 프로세스에서 순서대로 실행)"""
+    if workers <= 1 or len(jobs) <= 1:
+        return False
+    total = sum(len(job.text) for job in jobs)
+    return total >= PARALLEL_MIN_SIZE and max(len(job.text) for job in jobs) <= total * MAX_JOB_SHARE
+
+
+def run_parallel(paths: Sequence[str], stages: Sequence[str] = DEFAULT_STAGES,
+                 workers: Optional[int] = None, dry_run: bool = False,
+                 backup: bool = True, verify: bool = True) -> List[FileResult]:
+    """모든 파일을 읽고 작업을 분배한 뒤, 작업 순서대로 병합해 파일별로 한 번씩 저장
+
+    검증에 실패한 파일은 저장하지 않고 FileResult.error에 이유를 담는다.
+    """
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {', '.join(unknown)}")
+
+    contents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+
+    jobs = plan_jobs(paths, contents, stages)
+    payload = [(job.text, tuple(stages), job.path, verify) for job in jobs]
+    workers = workers or os.cpu_count() or 1
+
+    if not use_pool(jobs, workers):
+        outputs = [_run_job(args) for args in payload]
+    else:
+        # 작은 작업이 많을 때 프로세스 간 왕복을 줄이도록 묶어서 전달
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map은 제출 순서대로 결과를 돌려주므로 병합 순서가 실행 순서와 무관하다
+            outputs = list(pool.map(_run_job, payload, chunksize=chunksize))
+
+    reports = [RunReport('parallel', path) for path in paths]
+    splices: Dict[int, List[Tuple[int, int, str]]] = {}
+    stats: Dict[int, Tuple[int, int, Dict[str, float]]] = {}
+    errors: Dict[int, str] = {}
+    for job, (output, results, rules, error) in zip(jobs, outputs):
+        _merge_rules(reports[job.file_index], rules)
+        if error is not None:
+            errors.setdefault(job.file_index, f"{job.path} [{job.start}:{job.end}] {error}")
+        elif output != job.text:
+            splices.setdefault(job.file_index, []).append((job.start, job.end, output))
+        count, edits, seconds = stats.get(job.file_index, (0, 0, {}))
+        for r in results:
+            seconds[r.name] = seconds.get(r.name, 0.0) + r.seconds
+        stats[job.file_index] = (count + 1, edits + sum(r.edits for r in results), seconds)
+
+    file_results = []
+    for index, path in enumerate(paths):
+        report = reports[index]
+        report.record_before(contents[index])
+        content = contents[index]
+        error = errors.get(index)
+        if error is None and index in splices:
+            content = apply_splices(contents[index], splices[index])
+            if verify:
+                # 블록별 검증은 블록 경계를 넘는 문제를 못 보므로 병합 결과를 한 번 더 검증
+                error = verify_merged(path, contents[index], content, stages, report)
+        if error is not None:
+            content = contents[index]
+        changed = content != contents[index]
+        if changed and not dry_run:
+            if backup:
+                backup_content(path, contents[index], 'parallel: ' + ','.join(stages))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        report.record_after(content)
+        count, edits, seconds = stats.get(index, (0, 0, {}))
+        file_results.append(FileResult(path, changed, count, edits, seconds, error, report))
+    return file_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 파일/스크립트 블록을 병렬로 정리")
+    parser.add_argument('files', nargs='*', help="대상 파일/디렉터리/glob (기본: index.html)")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"쉼표로 구분한 단계 순서 (사용 가능: {', '.join(STAGES)})")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--dry-run', action='store_true', help="파일을 저장하지 않음")
+    parser.add_argument('--no-backup', action='store_true', help="백업 스냅샷을 만들지 않음")
+    parser.add_argument('--report-dir', help="실행 보고서 저장 위치 (기본: .cleanup_cache/reports/)")
+    parser.add_argument('--no-report', action='store_true', help="실행 보고서를 만들지 않음")
+    parser.add_argument('--no-verify', action='store_true', help="구문 검증을 건너뜀")
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    paths = expand_targets(args.files)
+    started = time.perf_counter()
+    try:
+        results = run_parallel(paths, stages, args.jobs, args.dry_run, not args.no_backup,
+                               not args.no_verify)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    for r in results:
+        if r.error is not None:
+            print(f"❌ {r.path}: 저장하지 않음 - {r.error}")
+            continue
+        mark = '✏️ ' if r.changed else '  '
+        print(f"{mark}{r.path}: {r.jobs} jobs, {r.edits} edits")
+        if r.report is not None and not args.no_report:
+            print(f"  📝 보고서: {r.report.write(r.report.default_path('.json', args.report_dir))}")
+    failed = sum(1 for r in results if r.error is not None)
+    print(f"📊 {len(results)} files, {sum(r.edits for r in results)} edits, {elapsed * 1000:.1f} ms"
+          + (f", 실패 {failed}" if failed else ''))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
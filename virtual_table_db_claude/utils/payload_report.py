@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+index.html 전송 크기/파싱 비용 보고서와 크기 예산 검사
+- 바이트(UTF-8)를 분류별로 나눔: HTML 마크업, 인라인 CSS(<style>), JS 코드/공백/주석/
+  수정 흔적 주석(// Fixed: ..., 콘솔 스팸 방지 등)/문자열/템플릿/정규식
+- <script>/<style> 블록별, 최상위 함수별(중첩 함수 포함) 바이트, 토큰 수(파싱 비용 지표), gzip 크기
+- 파일 전체의 gzip(-9)과 brotli 크기. brotli 모듈이 없으면 xz(raw, -9e)로 추정하고 "≈"로 표시
+  (블록/함수/분류별 압축 크기는 따로 압축한 값이라 전체 파일 안에서의 기여보다 크게 나옴)
+- --base로 다른 파일(예: index.html.full_backup)과 분류/블록/함수별 차이 비교
+- --budget 이름=크기 (또는 --budgets JSON)로 예산을 주면 넘는 항목을 보고하고 종료 코드 1
+- js_verify가 구문 문제를 찾으면 경고: 닫히지 않은 문자열/템플릿 등이 있으면 렉서가 그 뒤를
+  잘못 나눠 분류/토큰/함수 경계가 틀릴 수 있다
+
+확장자가 .html이 아니어도(.full_backup 등) 내용이 '<'로 시작하면 HTML로 본다.
+
+예산 이름: total, gzip, brotli, html, css, js, js_tokens, max_function, max_script,
+          그 밖의 분류 이름(js_comment, fix_marker, ...), --base가 있으면 growth, gzip_growth
+크기 단위: 12345, 300KB(=300*1024), 1.5MB
+
+사용법:
+    python payload_report.py [index.html] [--base index.html.full_backup] [--top 15]
+                             [--budget total=380KB --budget gzip=90KB ...] [--budgets budgets.json]
+                             [--json report.json]
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import lzma
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from js_lexer import COMMENT, REGEX, STRING, TEMPLATE, TRIVIA, WS, is_html, tokenize
+from js_verify import SyntaxIssue, verify
+from source_index import SourceIndex
+from targets import REPO_ROOT
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 xz로 추정
+    brotli = None
+
+DEFAULT_TOP = 15
+
+# 분류 (보고서 표시 순서)
+HTML = 'html'
+CSS = 'css'
+JS_CODE = 'js_code'
+JS_WHITESPACE = 'js_whitespace'
+JS_COMMENT = 'js_comment'
+FIX_MARKER = 'fix_marker'
+JS_STRING = 'js_string'
+JS_TEMPLATE = 'js_template'
+JS_REGEX = 'js_regex'
+CATEGORIES = (HTML, CSS, JS_CODE, JS_WHITESPACE, JS_COMMENT, FIX_MARKER, JS_STRING, JS_TEMPLATE, JS_REGEX)
+JS_CATEGORIES = CATEGORIES[2:]
+
+_TOKEN_CATEGORY = {WS: JS_WHITESPACE, COMMENT: JS_COMMENT, STRING: JS_STRING,
+                   TEMPLATE: JS_TEMPLATE, REGEX: JS_REGEX}
+# 수정 스크립트/콘솔 제거가 남긴 흔적 주석
+_MARKER_RE = re.compile(r'\bFixed\b|콘솔 스팸 방지|자동 실행 제거|\bRemoved\b')
+_STYLE_RE = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.IGNORECASE | re.DOTALL)
+_SIZE_RE = re.compile(r'^\s*([0-9]+(?:\.[0-9]+)?)\s*(|b|k|kb|kib|m|mb|mib)\s*$', re.IGNORECASE)
+_UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'kib': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2, 'mib': 1024 ** 2}
+
+
+class Part(NamedTuple):
+    key: str         # 비교용 이름 (같은 이름이 여럿이면 #2, #3 ...)
+    line: int
+    size: int        # 바이트
+    gzip_size: int
+    tokens: int      # 공백/주석 제외 토큰 수
+
+    def to_dict(self) -> dict:
+        return {'name': self.key, 'line': self.line, 'bytes': self.size,
+                'gzip': self.gzip_size, 'tokens': self.tokens}
+
+
+class PayloadReport(NamedTuple):
+    path: str
+    size: int
+    gzip_size: int
+    brotli_size: int
+    brotli_exact: bool
+    categories: Dict[str, int]
+    category_gzip: Dict[str, int]
+    js_tokens: int
+    scripts: List[Part]
+    styles: List[Part]
+    functions: List[Part]   # 최상위 함수 (다른 함수 안에 있지 않은 함수)
+    top_level: int          # 함수 밖 최상위 JS 바이트
+    syntax_issues: Sequence[SyntaxIssue] = ()  # 있으면 위 값들의 경계가 틀릴 수 있음
+
+    def metrics(self) -> Dict[str, int]:
+        """예산 검사에 쓰는 값"""
+        values = dict(self.categories)
+        values.update({
+            'total': self.size,
+            'gzip': self.gzip_size,
+            'brotli': self.brotli_size,
+            'js': sum(self.categories[name] for name in JS_CATEGORIES),
+            'js_tokens': self.js_tokens,
+            'max_function': max((part.size for part in self.functions), default=0),
+            'max_script': max((part.size for part in self.scripts), default=0),
+        })
+        return values
+
+    def to_dict(self, top: Optional[int] = None) -> dict:
+        functions = sorted(self.functions, key=lambda part: -part.size)
+        return {
+            'path': self.path,
+            'bytes': self.size,
+            'gzip': self.gzip_size,
+            'brotli': self.brotli_size,
+            'brotliEstimated': not self.brotli_exact,
+            'jsTokens': self.js_tokens,
+            'categories': {name: {'bytes': self.categories[name], 'gzip': self.category_gzip[name]}
+                           for name in CATEGORIES},
+            'scripts': [part.to_dict() for part in self.scripts],
+            'styles': [part.to_dict() for part in self.styles],
+            'topLevelBytes': self.top_level,
+            'functions': [part.to_dict() for part in functions[:top]],
+            'syntaxIssues': [str(issue) for issue in self.syntax_issues],
+        }
+
+
+def _gzip_size(data: bytes) -> int:
+    return len(gzip.compress(data, 9, mtime=0)) if data else 0
+
+
+def _brotli_size(data: bytes) -> Tuple[int, bool]:
+    """(brotli 크기, 실제 brotli 여부). 모듈이 없으면 xz raw -9e 크기를 근사값으로"""
+    if brotli is not None:
+        return len(brotli.compress(data, quality=11)), True
+    filters = [{'id': lzma.FILTER_LZMA2, 'preset': 9 | lzma.PRESET_EXTREME}]
+    return len(lzma.compress(data, format=lzma.FORMAT_RAW, filters=filters)), False
+
+
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def parse_size(value) -> int:
+    """'300KB', '1.5MB', 12345 → 바이트"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    m = _SIZE_RE.match(str(value))
+    if not m:
+        raise ValueError(f"크기 형식이 아닙니다: {value!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2).lower()])
+
+
+def _keyed(names: Sequence[str]) -> List[str]:
+    seen: Counter = Counter()
+    keys = []
+    for name in names:
+        seen[name] += 1
+        keys.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return keys
+
+
+def analyze(path: str, content: Optional[str] = None) -> PayloadReport:
+    if content is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    html = is_html(path) or content.lstrip()[:1] == '<'
+    # 경로 없이 넘기면 js_regions가 내용으로 HTML 여부를 판단함
+    index_path = path if is_html(path) or not html else ''
+    index = SourceIndex.of(content, index_path)
+    regions = index.regions
+
+    pieces: Dict[str, List[str]] = {name: [] for name in CATEGORIES}
+    sizes: Dict[str, int] = dict.fromkeys(CATEGORIES, 0)
+    token_starts: List[int] = []
+    for lo, hi in regions:
+        for tok in tokenize(content, lo, hi):
+            text = content[tok.start:tok.end]
+            category = _TOKEN_CATEGORY.get(tok.kind, JS_CODE)
+            if category == JS_COMMENT and _MARKER_RE.search(text):
+                category = FIX_MARKER
+            sizes[category] += _utf8_len(text)
+            pieces[category].append(text)
+            if tok.kind not in TRIVIA:
+                token_starts.append(tok.start)
+
+    def tokens_in(start: int, end: int) -> int:
+        return bisect.bisect_left(token_starts, end) - bisect.bisect_left(token_starts, start)
+
+    def part(name: str, start: int, end: int) -> Tuple[str, int, int, int, int]:
+        data = content[start:end].encode('utf-8')
+        return name, index.line_of(start), len(data), _gzip_size(data), tokens_in(start, end)
+
+    styles = []
+    style_spans = []
+    if html:
+        region_starts = [lo for lo, _ in regions]
+        for m in _STYLE_RE.finditer(content):
+            i = bisect.bisect_right(region_starts, m.start()) - 1
+            if i >= 0 and m.start() < regions[i][1]:
+                continue  # 스크립트 문자열 안의 <style>
+            styles.append(part('<style>', m.start(1), m.end(1)))
+            style_spans.append((m.start(1), m.end(1)))
+            sizes[CSS] += _utf8_len(m.group(1))
+            pieces[CSS].append(m.group(1))
+    sizes[HTML] = _utf8_len(content) - sum(sizes.values())
+    pos = 0
+    for lo, hi in sorted(regions + style_spans):
+        pieces[HTML].append(content[pos:lo])
+        pos = max(pos, hi)
+    pieces[HTML].append(content[pos:])
+
+    scripts = [part('<script>' if html else os.path.basename(path), lo, hi) for lo, hi in regions]
+
+    functions = []
+    top_level = sum(_utf8_len(content[lo:hi]) for lo, hi in regions)
+    outer_end = -1
+    for function in index.functions:
+        if function.start < outer_end:
+            continue
+        outer_end = function.end
+        name = function.name or f"(익명 {function.kind})"
+        functions.append(part(name, function.start, function.end))
+        top_level -= functions[-1][2]
+
+    data = content.encode('utf-8')
+    brotli_size, exact = _brotli_size(data)
+    return PayloadReport(
+        path=path,
+        size=len(data),
+        gzip_size=_gzip_size(data),
+        brotli_size=brotli_size,
+        brotli_exact=exact,
+        categories=sizes,
+        category_gzip={name: _gzip_size(''.join(pieces[name]).encode('utf-8')) for name in CATEGORIES},
+        js_tokens=len(token_starts),
+        scripts=[Part(key, *rest) for key, (_, *rest) in zip(_keyed([p[0] for p in scripts]), scripts)],
+        styles=[Part(key, *rest) for key, (_, *rest) in zip(_keyed([p[0] for p in styles]), styles)],
+        functions=[Part(key, *rest) for key, (_, *rest) in zip(_keyed([p[0] for p in functions]), functions)],
+        top_level=top_level,
+        syntax_issues=verify(content, index_path),
+    )
+
+
+# ========================================
+# 비교와 예산
+# ========================================
+
+def _part_changes(base: List[Part], head: List[Part]) -> List[dict]:
+    old = {part.key: part for part in base}
+    new = {part.key: part for part in head}
+    changes = []
+    for key in list(old) + [key for key in new if key not in old]:
+        a, b = old.get(key), new.get(key)
+        before, after = a.size if a else 0, b.size if b else 0
+        if before != after:
+            changes.append({'name': key, 'before': before, 'after': after, 'delta': after - before,
+                            'line': (b or a).line, 'status': 'added' if a is None else
+                            'removed' if b is None else 'changed'})
+    changes.sort(key=lambda change: -abs(change['delta']))
+    return changes
+
+
+def diff_reports(base: PayloadReport, head: PayloadReport) -> dict:
+    """base → head 차이 (블록은 순서, 함수는 이름 기준)"""
+    base_metrics, head_metrics = base.metrics(), head.metrics()
+    totals = {name: {'before': base_metrics[name], 'after': head_metrics[name],
+                     'delta': head_metrics[name] - base_metrics[name]}
+              for name in ('total', 'gzip', 'brotli', 'js_tokens') + CATEGORIES}
+    return {
+        'base': base.path,
+        'head': head.path,
+        'totals': totals,
+        'scripts': _part_changes(base.scripts, head.scripts),
+        'functions': _part_changes(base.functions, head.functions),
+    }
+
+
+def check_budgets(report: PayloadReport, budgets: Dict[str, int],
+                  diff: Optional[dict] = None) -> List[Tuple[str, int, int]]:
+    """예산을 넘은 (이름, 값, 예산) 목록. 모르는 이름이면 ValueError"""
+    metrics = report.metrics()
+    if diff is not None:
+        metrics['growth'] = diff['totals']['total']['delta']
+        metrics['gzip_growth'] = diff['totals']['gzip']['delta']
+    over = []
+    for name, limit in budgets.items():
+        if name not in metrics:
+            known = ', '.join(sorted(metrics))
+            raise ValueError(f"알 수 없는 예산 이름: {name} (사용 가능: {known})")
+        if metrics[name] > limit:
+            over.append((name, metrics[name], limit))
+    return over
+
+
+def load_budgets(path: Optional[str], pairs: Sequence[str]) -> Dict[str, int]:
+    budgets: Dict[str, int] = {}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: {{이름: 크기}} 객체가 아닙니다")
+        budgets.update({name: parse_size(value) for name, value in data.items()})
+    for pair in pairs:
+        name, sep, value = pair.partition('=')
+        if not sep:
+            raise ValueError(f"이름=크기 형식이 아닙니다: {pair}")
+        budgets[name.strip()] = parse_size(value)
+    return budgets
+
+
+# ========================================
+# 출력
+# ========================================
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.1f} KB"
+
+
+def _signed(delta: int, unit: str = ' B') -> str:
+    return f"{'+' if delta > 0 else ''}{delta:,}{unit}"
+
+
+def _unit(name: str) -> str:
+    """지표/예산 이름의 단위 (js_tokens만 토큰 수, 나머지는 바이트)"""
+    return ' 토큰' if name == 'js_tokens' else ' B'
+
+
+def print_report(report: PayloadReport, top: int = DEFAULT_TOP):
+    approx = '' if report.brotli_exact else '≈'
+    print(f"📦 {report.path}: {_kb(report.size)} | gzip {_kb(report.gzip_size)} | "
+          f"brotli {approx}{_kb(report.brotli_size)} | JS 토큰 {report.js_tokens:,}개")
+    print("  분류               바이트      비율     gzip(따로)")
+    for name in CATEGORIES:
+        size = report.categories[name]
+        if size:
+            print(f"  {name:<14} {size:>11,} B {size / report.size:>7.1%} {report.category_gzip[name]:>10,} B")
+    for title, parts in (('<script> 블록', report.scripts), ('<style> 블록', report.styles)):
+        if parts:
+            print(f"  {title} {len(parts)}개:")
+            for part in parts:
+                print(f"    - {part.key:<14} 줄 {part.line:>5}  {part.size:>9,} B  (gzip {part.gzip_size:,} B, "
+                      f"토큰 {part.tokens:,})")
+    functions = sorted(report.functions, key=lambda part: -part.size)
+    if functions and top > 0:
+        print(f"  최상위 함수 {len(functions)}개 중 큰 순서 {min(top, len(functions))}개 "
+              f"(함수 밖 최상위 코드 {report.top_level:,} B):")
+        for part in functions[:top]:
+            print(f"    - {part.key[:40]:<40} 줄 {part.line:>5}  {part.size:>8,} B  "
+                  f"(gzip {part.gzip_size:,} B, 토큰 {part.tokens:,})")
+    print_syntax_warning(report)
+
+
+def print_syntax_warning(report: PayloadReport, limit: int = 3):
+    issues = report.syntax_issues
+    if not issues:
+        return
+    print(f"⚠️  {report.path}: 구문 문제 {len(issues)}개 — 렉서가 이 뒤를 잘못 나눴을 수 있어 "
+          f"분류/토큰/함수 값이 부정확할 수 있음 (js_verify.py로 확인)")
+    for issue in issues[:limit]:
+        print(f"    - {issue}")
+    if len(issues) > limit:
+        print(f"    ... 외 {len(issues) - limit}개")
+
+
+def print_diff(diff: dict, top: int = DEFAULT_TOP):
+    print(f"🔍 {diff['base']} → {diff['head']}")
+    for name, change in diff['totals'].items():
+        if change['delta']:
+            print(f"  {name:<14} {change['before']:>11,} → {change['after']:>11,}  "
+                  f"({_signed(change['delta'], _unit(name))})")
+    for title in ('scripts', 'functions'):
+        changes = diff[title]
+        if changes and top > 0:
+            print(f"  {title} 변경 {len(changes)}개 (큰 순서 {min(top, len(changes))}개):")
+            for change in changes[:top]:
+                print(f"    - [{change['status']}] {change['name'][:40]:<40} {change['before']:>8,} → "
+                      f"{change['after']:>8,}  ({_signed(change['delta'])})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전송 크기/파싱 비용 분석과 크기 예산 검사")
+    parser.add_argument('file', nargs='?', default=os.path.join(REPO_ROOT, 'index.html'),
+                        help="대상 파일 (기본: index.html)")
+    parser.add_argument('--base', help="비교할 이전 버전 (예: index.html.full_backup)")
+    parser.add_argument('--budget', action='append', default=[], metavar='이름=크기',
+                        help="크기 예산 (여러 번 사용 가능, 예: total=380KB)")
+    parser.add_argument('--budgets', help="예산 JSON 파일 ({이름: 크기})")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="함수/변경 목록 표시 개수")
+    parser.add_argument('--json', help="보고서를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    try:
+        budgets = load_budgets(args.budgets, args.budget)
+        report = analyze(args.file)
+        base = analyze(args.base) if args.base else None
+    except (OSError, ValueError) as error:
+        print(f"❌ {error}")
+        return 1
+
+    print_report(report, args.top)
+    diff = diff_reports(base, report) if base else None
+    if diff:
+        print_diff(diff, args.top)
+        print_syntax_warning(base)
+
+    try:
+        over = check_budgets(report, budgets, diff)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 1
+
+    if args.json:
+        data = {'report': report.to_dict(), 'budgets': budgets,
+                'overBudget': [{'name': name, 'value': value, 'budget': limit} for name, value, limit in over]}
+        if diff:
+            data['diff'] = diff
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"📝 {args.json}")
+
+    if over:
+        for name, value, limit in over:
+            unit = _unit(name)
+            print(f"❌ 예산 초과: {name} {value:,}{unit} > {limit:,}{unit} ({_signed(value - limit, unit)})")
+        return 1
+    if budgets:
+        print(f"✅ 예산 {len(budgets)}개 모두 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
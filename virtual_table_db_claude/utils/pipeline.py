@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정리/수정 스크립트 통합 파이프라인
+- 파일을 한 번만 읽고, 하나의 버퍼를 단계별 transform에 순서대로 통과시킨 뒤 한 번만 저장
+- 단계별 소요 시간과 수정 횟수 보고
+- 백업은 실행당 스냅샷 하나만 생성 (단계마다 전체 복사본을 만들지 않음)
+- 파일마다 규칙별 계측 보고서(JSON)와 선택적으로 cProfile 덤프 저장
+- 단계마다 JS 구문 검증을 실행해, 단계가 새로 만든 구문 오류가 있으면 저장하지 않고 중단
+
+사용법:
+    python pipeline.py [파일|디렉터리|glob ...] [--stages strip_console,fix_syntax] [--dry-run] [--no-backup]
+                       [--report-dir 경로] [--no-report] [--profile] [--no-verify]
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import advanced_console_remover
+import console_cleanup_script
+import final_console_remover
+import fix_all_syntax_errors
+import fix_syntax_errors
+import fix_template_literals
+import fundamental_fix
+import simple_console_remover
+from js_verify import VerificationError, new_issues, verify as verify_syntax
+from linear_scan import RuleTimeout
+from run_report import RunReport, profiled
+from snapshot_store import backup_content
+from targets import expand_targets
+
+Transform = Callable[[str, str, Optional[RunReport]], Tuple[str, int]]
+
+# 단계 이름 → transform(content, path, report=None) -> (content, edits)
+STAGES: Dict[str, Transform] = {
+    'strip_console': simple_console_remover.transform,
+    'advanced_console': advanced_console_remover.transform,
+    'final_console': final_console_remover.transform,
+    'console_cleanup': console_cleanup_script.transform,
+    'fix_syntax': fix_syntax_errors.transform,
+    'fix_all_syntax': fix_all_syntax_errors.transform,
+    'fix_template_literals': fix_template_literals.transform,
+    'fundamental_fix': fundamental_fix.transform,
+}
+
+# 줄 번호나 문서 전체 위치에 의존하지 않아 스크립트 블록/단위별로 나눠 실행할 수 있는 단계
+UNIT_SAFE_STAGES = frozenset([
+    'strip_console', 'advanced_console', 'final_console', 'console_cleanup',
+    'fix_syntax', 'fix_template_literals',
+])
+
+# 그중 렉서 토큰만 보는 단계: console 호출 밖의 ';' '{' '}' 뒤 줄바꿈에서 잘라 조각별로 실행해도
+# 전체 실행과 결과가 같음 (watch.py가 편집된 문장 조각만 다시 실행). advanced/final_console은
+# 연속 빈 줄 정리가 조각 경계를 넘고 HTML 부분에도 적용되므로 스크립트 단위로만 나눈다
+# (incremental.py와 마찬가지로 스크립트 사이 HTML의 빈 줄은 정리하지 않음).
+STATEMENT_SAFE_STAGES = frozenset(['strip_console'])
+
+# 기본 순서: 렉서 기반 제거는 구문을 깨뜨리지 않으므로 수정 단계가 필요 없다.
+# fix_all_syntax 등 줄 번호/흔적 기반 수정기는 --stages로 명시할 때만 실행한다.
+DEFAULT_STAGES = ('strip_console',)
+
+
+class StageResult(NamedTuple):
+    name: str
+    seconds: float
+    edits: int
+    size_before: int
+    size_after: int
+    verify_seconds: float = 0.0
+
+
+def run_stages(content: str, stages: Sequence[str] = DEFAULT_STAGES, path: str = '',
+               report: Optional[RunReport] = None,
+               verify: bool = False) -> Tuple[str, List[StageResult]]:
+    """버퍼 하나를 단계 순서대로 변환 (파일 I/O 없음, report가 있으면 규칙별 계측)
+
+    verify가 참이면 단계마다 구문 검증을 실행하고, 입력에 없던 구문 오류가 생기면
+    그 단계 이름과 오류 위치를 담은 VerificationError를 던진다. 깨진 조각을 고쳐 렉서가
+    다시 맞춰지면 가려져 있던 오류가 새로 보일 수 있으므로, 전체 오류 수가 줄어든
+    단계는 통과시킨다.
+    """
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {', '.join(unknown)} (사용 가능: {', '.join(STAGES)})")
+
+    issues = verify_syntax(content, path) if verify else None
+    results = []
+    for name in stages:
+        size_before = len(content)
+        previous = content
+        started = time.perf_counter()
+        if report is not None:
+            report.stage = name
+            content, edits = STAGES[name](content, path, report)
+        else:
+            content, edits = STAGES[name](content, path)
+        elapsed = time.perf_counter() - started
+
+        verify_seconds = 0.0
+        if verify and content != previous:
+            checked = time.perf_counter()
+            after = verify_syntax(content, path)
+            verify_seconds = time.perf_counter() - checked
+            if report is not None:
+                report.rule('verify').seconds += verify_seconds
+            added = new_issues(previous, issues, content, after)
+            if added and len(after) >= len(issues):
+                raise VerificationError(name, added)
+            issues = after
+        results.append(StageResult(name, elapsed, edits, size_before, len(content), verify_seconds))
+    return content, results
+
+
+def run_pipeline(file_path: str, stages: Sequence[str] = DEFAULT_STAGES,
+                 backup: bool = True, dry_run: bool = False,
+                 report: Optional[RunReport] = None,
+                 verify: bool = True) -> List[StageResult]:
+    """파일을 한 번 읽고 모든 단계를 적용한 뒤 변경이 있으면 한 번 저장"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    if report is not None:
+        report.record_before(original)
+    content, results = run_stages(original, stages, file_path, report, verify)
+    if report is not None:
+        report.stage = ''
+        report.record_after(content)
+
+    if content != original and not dry_run:
+        if backup:
+            backup_content(file_path, original, 'pipeline: ' + ','.join(stages))
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return results
+
+
+def print_report(file_path: str, results: List[StageResult]):
+    total_time = sum(r.seconds for r in results)
+    total_edits = sum(r.edits for r in results)
+    verify_time = sum(r.verify_seconds for r in results)
+    print(f"📁 {file_path}")
+    for r in results:
+        delta = r.size_after - r.size_before
+        print(f"  - {r.name:<22} {r.seconds * 1000:8.1f} ms  {r.edits:5d} edits  {delta:+8d} chars")
+    print(f"  = 합계 {total_time * 1000:.1f} ms, {total_edits} edits")
+    if verify_time:
+        print(f"  ✔ 구문 검증 {verify_time * 1000:.1f} ms (새 구문 오류 없음)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="정리/수정 단계를 한 번의 읽기/쓰기로 실행")
+    parser.add_argument('files', nargs='*', help="대상 파일/디렉터리/glob (기본: index.html)")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"쉼표로 구분한 단계 순서 (사용 가능: {', '.join(STAGES)})")
+    parser.add_argument('--dry-run', action='store_true', help="파일을 저장하지 않음")
+    parser.add_argument('--no-backup', action='store_true', help="백업 스냅샷을 만들지 않음")
+    parser.add_argument('--report-dir', help="실행 보고서 저장 위치 (기본: .cleanup_cache/reports/)")
+    parser.add_argument('--no-report', action='store_true', help="실행 보고서를 만들지 않음")
+    parser.add_argument('--profile', action='store_true', help="보고서 옆에 cProfile 덤프(.prof) 저장")
+    parser.add_argument('--no-verify', action='store_true', help="단계별 구문 검증을 건너뜀")
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    for file_path in expand_targets(args.files):
+        report = None if args.no_report else RunReport('pipeline', file_path)
+        profile_path = report.default_path('.prof', args.report_dir) if report and args.profile else None
+        try:
+            with profiled(profile_path, report):
+                results = run_pipeline(file_path, stages, backup=not args.no_backup,
+                                       dry_run=args.dry_run, report=report,
+                                       verify=not args.no_verify)
+        except (ValueError, RuleTimeout) as e:
+            print(f"❌ {e}")
+            return 1
+        print_report(file_path, results)
+        if report is not None:
+            report.print_summary()
+            print(f"  📝 보고서: {report.write(report.default_path('.json', args.report_dir))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
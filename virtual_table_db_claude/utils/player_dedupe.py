@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+플레이어(Type) 시트 CSV의 스트리밍 중복 검출기
+- src/js/duplicate-remover.js의 analyzeRawCsvData와 같은 규칙:
+  같은 테이블 + 같은 이름 + 같은 좌석이고 상태가 IN인 행은 첫 행만 남기고 나머지가 삭제 대상
+- CSV를 한 행씩 읽으며 한 번만 훑는다 (O(n)). 파일 전체나 행 목록을 메모리에 두지 않음
+- 정규화한 (테이블, 이름, 좌석)을 64비트 blake2b 해시로 줄여 (해시 → 첫 행 번호)만 보관
+  → 메모리는 고유 키 수와 중복 수에 비례하고 행 내용과는 무관
+- 결과는 테이블별 batchUpdate 요청 단위로 묶은 삭제 계획(JSON)
+
+정규화: 앞뒤 공백 제거, 따옴표 제거(JS와 동일), 연속 공백 하나로, 유니코드 NFC,
+좌석은 숫자면 앞의 0 제거 ("03" == "3")
+
+batchUpdate는 이름으로 삭제하므로 같은 이름의 원본 행까지 지워질 수 있다.
+행 번호로 지우는 쪽을 위해 각 배치에 시트 행 번호(1부터, 헤더 포함, 내림차순)도 넣는다.
+
+사용법:
+    python player_dedupe.py <players.csv | CSV URL | -> [--batch 50] [--output plan.json]
+    python player_dedupe.py --bench 100000
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import random
+import sys
+import time
+import unicodedata
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+# Type 시트 열 (duplicate-remover.js와 동일)
+COL_PLAYER = 0
+COL_TABLE = 1
+COL_SEAT = 6
+COL_STATUS = 7
+MIN_COLUMNS = 8
+
+DEFAULT_BATCH = 50  # batchUpdate 한 번에 보낼 삭제 이름 수
+
+
+def normalize(value: str) -> str:
+    """키 비교용 셀 정규화"""
+    if '"' in value:
+        value = value.replace('"', '')
+    value = ' '.join(value.split())
+    if value.isascii():
+        return value
+    return unicodedata.normalize('NFC', value)
+
+
+def normalize_seat(value: str) -> str:
+    seat = normalize(value)
+    # isdigit()은 '²' 같은 위첨자도 참이라 int()가 실패함. int()가 받는 십진 숫자만 변환
+    return str(int(seat)) if seat.isdecimal() else seat
+
+
+def player_key(table: str, name: str, seat: str) -> int:
+    """정규화된 (테이블, 이름, 좌석)의 64비트 해시"""
+    data = '\x1f'.join((table, name, seat)).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class Duplicate:
+    """삭제 대상 행 하나"""
+
+    __slots__ = ('row', 'table', 'name', 'seat', 'first_row')
+
+    def __init__(self, row: int, table: str, name: str, seat: str, first_row: int):
+        self.row = row
+        self.table = table
+        self.name = name
+        self.seat = seat
+        self.first_row = first_row
+
+    def to_dict(self) -> dict:
+        return {'row': self.row, 'table': self.table, 'name': self.name,
+                'seat': self.seat, 'firstRow': self.first_row}
+
+
+class DuplicateScanner:
+    """CSV 행을 순서대로 받아 중복을 찾는다 (첫 등장 행을 유지)"""
+
+    def __init__(self):
+        self.first_rows: Dict[int, int] = {}  # 키 해시 → 처음 나온 시트 행 번호
+        self.duplicates: List[Duplicate] = []
+        self.rows = 0
+        self.players = 0
+
+    def scan(self, records: Iterable[Sequence[str]], header: bool = True) -> 'DuplicateScanner':
+        first_rows = self.first_rows
+        for record in records:
+            self.rows += 1
+            if header and self.rows == 1:
+                continue
+            if len(record) < MIN_COLUMNS:
+                continue
+            status = normalize(record[COL_STATUS]).upper() or 'IN'
+            if status != 'IN':
+                continue
+            name = normalize(record[COL_PLAYER])
+            table = normalize(record[COL_TABLE])
+            if not name or not table:
+                continue
+            self.players += 1
+            seat = normalize_seat(record[COL_SEAT])
+            key = player_key(table, name, seat)
+            first = first_rows.setdefault(key, self.rows)
+            if first != self.rows:
+                self.duplicates.append(Duplicate(self.rows, table, name, seat, first))
+        return self
+
+    @property
+    def unique(self) -> int:
+        return len(self.first_rows)
+
+    def plan(self, batch: int = DEFAULT_BATCH) -> dict:
+        """테이블별로 묶은 삭제 계획"""
+        by_table: Dict[str, List[Duplicate]] = OrderedDict()
+        for duplicate in self.duplicates:
+            by_table.setdefault(duplicate.table, []).append(duplicate)
+
+        batches = []
+        for table, items in by_table.items():
+            for start in range(0, len(items), batch):
+                chunk = items[start:start + batch]
+                batches.append({
+                    'action': 'batchUpdate',
+                    'table': table,
+                    'players': [],
+                    'deleted': [item.name for item in chunk],
+                    'rows': sorted((item.row for item in chunk), reverse=True),
+                })
+
+        return {
+            'rows': self.rows,
+            'players': self.players,
+            'unique': self.unique,
+            'duplicates': len(self.duplicates),
+            'tables': {table: len(items) for table, items in by_table.items()},
+            'batches': batches,
+            'items': [item.to_dict() for item in self.duplicates],
+        }
+
+
+def iter_records(source: str) -> Iterator[List[str]]:
+    """파일 경로, '-'(표준 입력), http(s) URL에서 CSV 행을 스트리밍"""
+    if source == '-':
+        yield from csv.reader(sys.stdin)
+    elif source.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(source, timeout=60) as response:
+            yield from csv.reader(io.TextIOWrapper(response, encoding='utf-8', newline=''))
+    else:
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.reader(f)
+
+
+def find_duplicates(source: str, header: bool = True) -> DuplicateScanner:
+    return DuplicateScanner().scan(iter_records(source), header=header)
+
+
+def generate_player_rows(count: int, tables: int = 200, duplicate_ratio: float = 0.05,
+                         seed: int = 0) -> Iterator[List[str]]:
+    """벤치마크용 Type 시트 행 생성 (헤더 포함)"""
+    rng = random.Random(seed)
+    yield ['Player', 'Table', 'Notable', 'Chips', 'UpdatedAt', 'Country', 'Seat', 'Status']
+    recent: List[List[str]] = []
+    for index in range(count):
+        if recent and rng.random() < duplicate_ratio:
+            row = list(rng.choice(recent))
+            # 공백/따옴표/좌석 표기만 다른 중복도 섞는다
+            row[COL_PLAYER] = f" {row[COL_PLAYER]} " if rng.random() < 0.3 else row[COL_PLAYER]
+            row[COL_SEAT] = row[COL_SEAT].zfill(2) if rng.random() < 0.3 else row[COL_SEAT]
+        else:
+            row = [f"Player{index}", f"Table{rng.randrange(tables)}", rng.choice(['TRUE', 'FALSE']),
+                   str(rng.randrange(1000, 500000)), f"2025-01-01 12:{index % 60:02d}",
+                   rng.choice(['KR', 'US', 'JP']), str(rng.randrange(1, 10)),
+                   rng.choice(['IN', 'IN', 'IN', 'OUT'])]
+            recent.append(row)
+            if len(recent) > 1000:
+                recent.pop(0)
+        yield row
+
+
+def naive_duplicates(records: Sequence[Sequence[str]]) -> List[int]:
+    """검증용: 정규화한 문자열 키를 그대로 쓰는 참조 구현 (삭제 대상 행 번호)"""
+    seen = set()
+    result = []
+    for number, record in enumerate(records, 1):
+        if number == 1 or len(record) < MIN_COLUMNS:
+            continue
+        if (normalize(record[COL_STATUS]).upper() or 'IN') != 'IN':
+            continue
+        name, table = normalize(record[COL_PLAYER]), normalize(record[COL_TABLE])
+        if not name or not table:
+            continue
+        key = (table, name, normalize_seat(record[COL_SEAT]))
+        if key in seen:
+            result.append(number)
+        else:
+            seen.add(key)
+    return result
+
+
+def run_benchmark(count: int, seed: int = 0) -> int:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(generate_player_rows(count, seed=seed))
+    text = buffer.getvalue()
+    print(f"📄 {count:,}행, {len(text.encode('utf-8')):,} B")
+
+    started = time.perf_counter()
+    scanner = DuplicateScanner().scan(csv.reader(io.StringIO(text)))
+    plan = scanner.plan()
+    elapsed = time.perf_counter() - started
+    print(f"⚡ 스캔+계획: {elapsed * 1000:.0f} ms ({scanner.rows / elapsed:,.0f} 행/초) | "
+          f"IN {scanner.players:,}, 고유 {scanner.unique:,}, 중복 {plan['duplicates']:,}, "
+          f"배치 {len(plan['batches'])}")
+
+    expected = naive_duplicates(list(csv.reader(io.StringIO(text))))
+    actual = [item.row for item in scanner.duplicates]
+    if actual != expected:
+        print(f"❌ 참조 구현과 불일치: {len(actual)} vs {len(expected)}")
+        return 1
+    print("✅ 참조 구현과 일치")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="플레이어 CSV 중복 검출 (테이블+이름+좌석)")
+    parser.add_argument('source', nargs='?', help="CSV 파일, '-'(표준 입력) 또는 게시된 CSV URL")
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help="batchUpdate 한 번의 삭제 수")
+    parser.add_argument('--no-header', action='store_true', help="첫 행도 데이터로 처리")
+    parser.add_argument('--output', help="삭제 계획 JSON 저장 경로 (없으면 표준 출력)")
+    parser.add_argument('--bench', type=int, metavar='N', help="N행 합성 데이터로 벤치마크")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_benchmark(args.bench, args.seed)
+    if not args.source:
+        parser.error("source 또는 --bench가 필요합니다")
+    if args.batch < 1:
+        parser.error("--batch는 1 이상이어야 합니다")
+
+    started = time.perf_counter()
+    try:
+        scanner = find_duplicates(args.source, header=not args.no_header)
+    except (OSError, csv.Error) as error:
+        print(f"❌ 읽기 실패: {error}", file=sys.stderr)
+        return 1
+    plan = scanner.plan(args.batch)
+    elapsed = time.perf_counter() - started
+
+    text = json.dumps(plan, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    print(f"📊 {scanner.rows:,}행 ({elapsed * 1000:.0f} ms) | IN {scanner.players:,}, "
+          f"중복 {plan['duplicates']:,}, 배치 {len(plan['batches'])}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 패턴 규칙 매처
+- 모든 규칙을 우선순위 순서의 이름 있는 그룹으로 묶은 정규식 하나로 컴파일하고 한 번만 훑음
+  (규칙은 (?=...) 안에 두어 폭 0으로 맞춘다. 일반 alternation은 앞쪽의 낮은 우선순위 적중이
+   뒤쪽의 높은 우선순위 적중을 삼켜 규칙별로 따로 검사할 때와 결과가 달라짐)
+- 각 위치에서는 그 위치에서 시작하는 가장 우선순위 높은 규칙이 m.lastgroup으로 나오므로
+  위치들 중 최고 순위가 곧 규칙별 re.search를 순서대로 한 결과. 최고 순위 규칙이 나오면 바로 멈춤
+- 모든 규칙의 첫 글자를 알 수 있으면 그 글자 집합으로 시작 위치를 먼저 거름
+- 규칙별 적중 횟수 기록
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+
+class Rule(NamedTuple):
+    category: str
+    name: str
+    pattern: str
+    flags: int = 0
+
+
+class RuleMatch(NamedTuple):
+    category: str
+    rule: str
+    start: int
+    end: int
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    """규칙별 플래그를 인라인 범위 플래그로 변환 (규칙마다 대소문자 구분이 다를 수 있음)"""
+    inline = ''
+    if flags & re.IGNORECASE:
+        inline += 'i'
+    if flags & re.DOTALL:
+        inline += 's'
+    if flags & re.MULTILINE:
+        inline += 'm'
+    return f'(?{inline}:{pattern})' if inline else f'(?:{pattern})'
+
+
+def _first_char(pattern: str) -> Optional[str]:
+    """패턴이 항상 리터럴 한 글자(\\. 같은 이스케이프 기호 포함)로 시작하면 그 글자, 아니면 None"""
+    if not pattern or pattern[0] in '.^$*+?{}[]|()':
+        return None
+    width = 1
+    if pattern[0] == '\\':
+        if len(pattern) < 2 or pattern[1].isalnum():
+            return None  # \d, \s, \b 등은 문자 집합이거나 폭 0
+        width = 2
+    if pattern[width:width + 1] in ('*', '?', '{'):
+        return None  # 첫 글자가 없어도 되는 경우
+    # 최상위 '|'가 있으면 다른 갈래는 다른 글자로 시작할 수 있음
+    depth = 0
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return None
+        i += 1
+    return pattern[width - 1]
+
+
+def _guard(rules: Sequence[Rule]) -> str:
+    """모든 규칙의 첫 글자를 알면 그 글자들로 만든 (?=...) 선검사, 아니면 ''
+
+    대소문자 무시 규칙의 글자는 (?i:[...]) 안에 두어 정규식 엔진의 대소문자 접기를 그대로 씀.
+    """
+    sensitive, insensitive = set(), set()
+    for rule in rules:
+        char = _first_char(rule.pattern)
+        if char is None:
+            return ''
+        (insensitive if rule.flags & re.IGNORECASE else sensitive).add(char)
+    parts = []
+    if insensitive:
+        parts.append('(?i:[' + ''.join(re.escape(c) for c in sorted(insensitive)) + '])')
+    if sensitive:
+        parts.append('[' + ''.join(re.escape(c) for c in sorted(sensitive)) + ']')
+    return '(?=' + '|'.join(parts) + ')' if parts else ''
+
+
+class RuleMatcher:
+    """규칙 목록을 하나의 정규식으로 묶은 분류기
+
+    categories 순서가 우선순위다. 텍스트 어디에서든 높은 카테고리의 규칙이 맞으면
+    그 카테고리로 분류하고, 카테고리 안에서는 먼저 등록된 규칙이 선택된다
+    (규칙을 등록 순서대로 re.search하는 것과 같은 결과).
+    """
+
+    def __init__(self, rules: Sequence[Rule], categories: Optional[Sequence[str]] = None):
+        self.rules: List[Rule] = list(rules)
+        if categories is None:
+            categories = list(dict.fromkeys(rule.category for rule in self.rules))
+        # 목록에 없는 카테고리는 뒤쪽 우선순위로
+        categories = list(categories) + [rule.category for rule in self.rules
+                                         if rule.category not in categories]
+        categories = list(dict.fromkeys(categories))
+        self.priority: Dict[str, int] = {category: i for i, category in enumerate(categories)}
+        self.hits: Counter = Counter()
+
+        # 카테고리 우선순위, 카테고리 안에서는 등록 순서 (sorted는 안정 정렬)
+        ordered = sorted(self.rules, key=lambda rule: self.priority[rule.category])
+        self._groups: Dict[str, Tuple[int, Rule]] = {f'r{i}': (i, rule) for i, rule in enumerate(ordered)}
+        # 모든 규칙의 첫 글자를 알면 그 글자 위치에서만 규칙들을 시도 (sre는 alternation의
+        # 공통 접두어를 못 찾아 모든 위치에서 모든 규칙을 시도함)
+        guard = _guard(ordered)
+        self.regex: Pattern = re.compile(guard + '(?=' + '|'.join(
+            f'(?P<{group}>{_scoped(rule.pattern, rule.flags)})'
+            for group, (_, rule) in self._groups.items()) + ')')
+
+    @classmethod
+    def from_dict(cls, patterns: Dict[str, Sequence[str]], flags: int = 0,
+                  categories: Optional[Sequence[str]] = None) -> 'RuleMatcher':
+        """{카테고리: [패턴, ...]} 형태에서 생성 (규칙 이름은 '카테고리#번호')"""
+        rules = [Rule(category, f'{category}#{i}', pattern, flags)
+                 for category, items in patterns.items()
+                 for i, pattern in enumerate(items)]
+        return cls(rules, categories)
+
+    def scan(self, text: str) -> List[RuleMatch]:
+        """카테고리마다 겹치지 않는 규칙 적중을 위치순으로 반환 (카운터 갱신 없음)
+
+        서로 다른 카테고리의 적중은 겹칠 수 있다. 같은 위치에서 시작하는 적중은
+        우선순위가 가장 높은 규칙 하나만 나온다.
+        """
+        found = []
+        ends: Dict[str, int] = {}  # 카테고리 → 마지막 적중 끝 (겹치는 적중 건너뜀)
+        for m in self.regex.finditer(text):
+            group = m.lastgroup
+            _, rule = self._groups[group]
+            start, end = m.span(group)
+            if start < ends.get(rule.category, 0):
+                continue
+            ends[rule.category] = max(end, start + 1)
+            found.append(RuleMatch(rule.category, rule.name, start, end))
+        return found
+
+    def classify(self, text: str) -> Optional[RuleMatch]:
+        """가장 우선순위가 높은 카테고리에서 처음 맞는 규칙을 반환하고 해당 규칙 카운터 증가"""
+        best = None
+        for m in self.regex.finditer(text):
+            group = m.lastgroup
+            rank = self._groups[group][0]
+            if best is None or rank < best[0]:
+                # 순위가 처음 나온 위치가 그 규칙의 가장 왼쪽 적중 (re.search와 같은 범위)
+                best = (rank, group, m.span(group))
+                if rank == 0:
+                    break
+        if best is None:
+            return None
+        _, group, (start, end) = best
+        rule = self._groups[group][1]
+        self.hits[rule.name] += 1
+        return RuleMatch(rule.category, rule.name, start, end)
+
+    def hit_counts(self) -> List[Tuple[str, str, str, int]]:
+        """(카테고리, 규칙 이름, 패턴, 적중 횟수) 목록"""
+        return [(rule.category, rule.name, rule.pattern, self.hits[rule.name])
+                for rule in self.rules]
+
+    def reset(self):
+        self.hits.clear()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 보고서와 규칙별 계측
+- 규칙(패턴)마다 소요 시간, 매칭 수, 제거한 바이트, 남겨 둔 후보 수를 기록
+- 실행 전후 실제 console.* / debugLog 호출 개수를 렉서로 집계 (문자열/주석 안은 제외)
+- 보고서는 JSON으로 저장하고, 필요하면 cProfile 덤프를 함께 남김
+
+transform 함수들은 report 인자를 선택적으로 받으며, None이면 계측 없이 동작한다.
+"""
+
+import cProfile
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from js_lexer import NAME, TRIVIA
+from source_index import SourceIndex
+from targets import CACHE_DIR_NAME, REPO_ROOT
+
+REPORT_VERSION = 1
+REPORT_DIR_NAME = 'reports'
+
+
+class RuleStats:
+    """규칙 하나의 누적 계측값"""
+
+    __slots__ = ('name', 'seconds', 'matches', 'bytes_removed', 'kept')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.matches = 0
+        self.bytes_removed = 0  # 순 감소량 (치환으로 늘어나면 음수)
+        self.kept = 0           # 후보였지만 조건에 걸려 남겨 둔 개수
+
+    def add(self, matches: int = 0, bytes_removed: int = 0, kept: int = 0):
+        self.matches += matches
+        self.bytes_removed += bytes_removed
+        self.kept += kept
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'seconds': round(self.seconds, 6),
+            'matches': self.matches,
+            'bytes_removed': self.bytes_removed,
+            'kept': self.kept,
+        }
+
+
+def default_report_dir() -> str:
+    return os.path.join(REPO_ROOT, CACHE_DIR_NAME, REPORT_DIR_NAME)
+
+
+def count_console_calls(content: str, path: str = '') -> Dict[str, int]:
+    """JS 영역에 실제로 존재하는 console.<method>(...) / debugLog(...) 호출 개수"""
+    counts: Dict[str, int] = {}
+    for tokens in SourceIndex.of(content, path).tokens:
+        sig = [tok for tok in tokens if tok.kind not in TRIVIA]
+        n = len(sig)
+        for i, tok in enumerate(sig):
+            if tok.kind != NAME:
+                continue
+            prev = content[sig[i - 1].start:sig[i - 1].end] if i > 0 else None
+            if prev in ('.', '?.', 'function'):
+                continue
+            name = content[tok.start:tok.end]
+            if name == 'console' and i + 3 < n and \
+                    content[sig[i + 1].start:sig[i + 1].end] == '.' and \
+                    content[sig[i + 3].start:sig[i + 3].end] == '(':
+                key = 'console.' + content[sig[i + 2].start:sig[i + 2].end]
+            elif name == 'debugLog' and i + 1 < n and content[sig[i + 1].start:sig[i + 1].end] == '(':
+                key = 'debugLog'
+            else:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+class RunReport:
+    """실행 한 번(파일 하나)의 계측 결과"""
+
+    def __init__(self, tool: str, path: str = ''):
+        self.tool = tool
+        self.path = path
+        self.stage = ''
+        self.rules: Dict[str, RuleStats] = {}
+        self.console_before: Optional[Dict[str, int]] = None
+        self.console_after: Optional[Dict[str, int]] = None
+        self.size_before: Optional[int] = None
+        self.size_after: Optional[int] = None
+        self.started = time.time()
+        self.seconds = 0.0
+        self.profile_path: Optional[str] = None
+
+    def rule(self, name: str) -> RuleStats:
+        """규칙 통계 (파이프라인 안에서는 '단계/규칙' 이름으로 구분)"""
+        key = f'{self.stage}/{name}' if self.stage else name
+        stats = self.rules.get(key)
+        if stats is None:
+            stats = self.rules[key] = RuleStats(key)
+        return stats
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[RuleStats]:
+        stats = self.rule(name)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - started
+
+    def measure(self, name: str, rewrite: Callable[[str], Tuple[str, int]],
+                content: str) -> Tuple[str, int]:
+        """rewrite(content) -> (결과, 매칭 수)를 실행하며 시간/매칭 수/감소 바이트를 기록"""
+        with self.timed(name) as stats:
+            result, n = rewrite(content)
+            stats.add(n, _utf8_len(content) - _utf8_len(result))
+        return result, n
+
+    def subn(self, name: str, pattern, repl, content: str, flags: int = 0) -> Tuple[str, int]:
+        """re.subn을 실행하며 시간/매칭 수/감소 바이트를 기록"""
+        return self.measure(name, lambda text: re.subn(pattern, repl, text, flags=flags), content)
+
+    def record_before(self, content: str):
+        self.size_before = _utf8_len(content)
+        self.console_before = count_console_calls(content, self.path)
+
+    def record_after(self, content: str):
+        self.size_after = _utf8_len(content)
+        self.console_after = count_console_calls(content, self.path)
+        self.seconds = time.time() - self.started
+
+    def to_dict(self) -> dict:
+        before = self.console_before or {}
+        after = self.console_after or {}
+        return {
+            'version': REPORT_VERSION,
+            'tool': self.tool,
+            'path': self.path,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'seconds': round(self.seconds, 6),
+            'size_before': self.size_before,
+            'size_after': self.size_after,
+            'console_before': before,
+            'console_after': after,
+            'console_removed': {key: before[key] - after.get(key, 0)
+                                for key in before if before[key] != after.get(key, 0)},
+            'rules': [stats.to_dict() for stats in
+                      sorted(self.rules.values(), key=lambda s: -s.seconds)],
+            'profile': self.profile_path,
+        }
+
+    def default_path(self, extension: str = '.json', directory: Optional[str] = None) -> str:
+        """<보고서 디렉터리>/<도구>-<파일>-<시각><확장자>"""
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started))
+        base = os.path.basename(self.path) or 'buffer'
+        return os.path.join(directory or default_report_dir(), f'{self.tool}-{base}-{stamp}{extension}')
+
+    def write(self, output_path: Optional[str] = None) -> str:
+        """JSON 보고서 저장 (기본: .cleanup_cache/reports/<도구>-<파일>-<시각>.json)"""
+        if output_path is None:
+            output_path = self.default_path()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return output_path
+
+    def print_summary(self, top: int = 10):
+        before = sum((self.console_before or {}).values())
+        after = sum((self.console_after or {}).values())
+        removed = before - after
+        rate = removed / before * 100 if before else 0.0
+        print(f"📊 {self.path or self.tool}: console 호출 {before} → {after} "
+              f"(제거 {removed}, {rate:.1f}%), {self.seconds * 1000:.1f} ms")
+        for stats in sorted(self.rules.values(), key=lambda s: -s.seconds)[:top]:
+            print(f"   - {stats.name:<40} {stats.seconds * 1000:8.1f} ms  {stats.matches:6d} matches  "
+                  f"{stats.bytes_removed:+9d} B  {stats.kept:5d} kept")
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode('utf-8'))
+
+
+def measure(report: Optional[RunReport], name: str, rewrite: Callable[[str], Tuple[str, int]],
+            content: str) -> Tuple[str, int]:
+    """report가 None이면 rewrite만 실행, 있으면 규칙 계측을 함께 기록"""
+    if report is None:
+        return rewrite(content)
+    return report.measure(name, rewrite, content)
+
+
+def subn(report: Optional[RunReport], name: str, pattern, repl, content: str,
+         flags: int = 0) -> Tuple[str, int]:
+    """report가 None이면 re.subn 그대로, 있으면 규칙 계측을 함께 기록"""
+    if report is None:
+        return re.subn(pattern, repl, content, flags=flags)
+    return report.subn(name, pattern, repl, content, flags)
+
+
+@contextmanager
+def profiled(dump_path: Optional[str], report: Optional[RunReport] = None):
+    """dump_path가 있으면 블록을 cProfile로 감싸 pstats 덤프를 저장"""
+    if not dump_path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(dump_path)), exist_ok=True)
+        profiler.dump_stats(dump_path)
+        if report is not None:
+            report.profile_path = dump_path
@@ -0,0 +1,940 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Apps Script 백엔드(scripts/appScripts.gs)의 로컬 asyncio 대역 서버
+- doPost와 같은 액션(updateSheet, updateHand, analyzeHand, updateIndex, batchVerify,
+  verifyUpdate, getHandStatus, batchWrite, test)과 같은 JSON 응답 형태
+  (batchWrite는 여러 행/Index 업데이트를 시트마다 한 번에 기록, sheet_client 참고)
+- 요청 파싱도 doPost와 같음 (application/json, text/plain JSON, 폼/쿼리 파라미터)
+- 저장소: SQLite 셀 테이블 (시트 URL의 스프레드시트 ID + gid로 시트 구분),
+  CSV로 시트를 미리 채우거나 ?format=csv로 내보내기 가능
+  (?format=delta&since=커서 는 마지막으로 받은 이후 바뀐 행만 JSON 패치로, csv_delta 참고)
+- 동시 클라이언트 처리 (HTTP/1.1 keep-alive), 액션별 지연 시간 지표를 GET /metrics로 제공
+- --record: 받은 POST 요청을 도착 시각과 함께 JSONL 트레이스로 저장 (load_replay로 재생)
+
+Google 할당량 없이 프런트엔드의 실제 요청 패턴을 높은 처리량으로 재현하고 측정하기 위한 것이다.
+Gemini 분석은 호출하지 않고 generateDefaultAnalysis 결과만 돌려준다.
+
+사용법:
+    python sheet_backend.py [--port 8787] [--db sheet.db] [--csv 시트URL CSV경로] [--delay 0]
+                            [--record trace.jsonl]
+    # index.html의 Apps Script URL 칸에 http://127.0.0.1:8787/exec 입력
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import re
+import signal
+import sqlite3
+import sys
+import time
+import traceback
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from csv_delta import DeltaTracker, parse_csv
+from hand_index import TimeIndex, batch_results, js_key, js_parse_int
+
+VERSION = 'v13.5.10'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8787
+MAX_BODY = 10 * 1024 * 1024
+LATENCY_SAMPLES = 100_000  # 액션별로 보관하는 최근 지연 시간 표본 수
+
+# 시트 열 번호 (1부터, appScripts.gs와 같음)
+COL_INDEX_HAND = 1   # A: Index 시트의 핸드 번호
+COL_TIME = 2         # B: 핸드 시간 (Unix 초)
+COL_HAND = 4         # D: 핸드 번호
+COL_STATUS = 5       # E: 상태 / Index 시트의 파일명
+COL_FILENAME = 6     # F: 파일명
+COL_G = 7            # G: 드롭다운 값
+COL_ANALYSIS = 8     # H: AI 분석
+COL_UPDATED = 9      # I: 업데이트 시간
+COL_SUBTITLE = 10    # J: 자막
+
+_SHEET_ID_RE = re.compile(r'/spreadsheets/d/([a-zA-Z0-9-_]+)')
+_GID_RE = re.compile(r'[#&?]gid=([0-9]+)')
+
+_STATUS_TEXT = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 411: 'Length Required', 413: 'Payload Too Large'}
+
+
+class SheetError(Exception):
+    """Apps Script에서 throw new Error(...)에 해당 (핸들러가 status: error로 바꿈)"""
+
+
+def iso_now() -> str:
+    """JS의 new Date().toISOString()과 같은 형식"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _truthy(value) -> bool:
+    return bool(value) and value == value
+
+
+def _text(value) -> str:
+    if isinstance(value, str) and value.strip():
+        return value
+    return ''
+
+
+def _compact(data: dict) -> dict:
+    """JSON.stringify처럼 값이 undefined(None)인 키는 뺌"""
+    return {key: value for key, value in data.items() if value is not None}
+
+
+class SheetStore:
+    """시트 셀 저장소 (SQLite). 시트 키는 '스프레드시트ID#gid'"""
+
+    def __init__(self, db_path: str = ':memory:'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sheets (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cells (
+                sheet TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                col INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (sheet, row, col)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS cells_by_column ON cells (sheet, col, row);
+        """)
+        self._time_indexes: Dict[str, TimeIndex] = {}  # 시트별 B열 인덱스 (B열이 바뀌면 버림)
+
+    def close(self):
+        self.conn.close()
+
+    def open_sheet(self, url) -> Optional[Tuple[str, str]]:
+        """openSheetByUrl 대응: (시트 키, 시트 이름). URL 형식이 틀리면 None
+
+        로컬 저장소에는 권한 개념이 없으므로 처음 보는 시트는 빈 시트로 만든다.
+        """
+        if not isinstance(url, str):
+            return None
+        m = _SHEET_ID_RE.search(url)
+        if not m:
+            return None
+        gid_match = _GID_RE.search(url)
+        gid = gid_match.group(1) if gid_match else '0'
+        key = f"{m.group(1)}#{gid}"
+        row = self.conn.execute('SELECT name FROM sheets WHERE key = ?', (key,)).fetchone()
+        if row:
+            return key, row[0]
+        name = 'Sheet1' if gid == '0' else f'Sheet{gid}'
+        self.conn.execute('INSERT INTO sheets (key, name) VALUES (?, ?)', (key, name))
+        return key, name
+
+    def set_cells(self, sheet: str, row: int, values: Dict[int, object]):
+        """한 행의 여러 셀을 한 트랜잭션으로 기록 (SpreadsheetApp.flush 한 번에 해당)"""
+        if COL_TIME in values:
+            self._time_indexes.pop(sheet, None)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO cells (sheet, row, col, value) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (sheet, row, col) DO UPDATE SET value = excluded.value',
+                [(sheet, row, col, _cell_text(value)) for col, value in values.items()])
+
+    def set_rows(self, sheet: str, rows: Dict[int, Dict[int, object]]):
+        """여러 행의 셀을 한 트랜잭션으로 기록 (batchWrite의 범위 쓰기 한 번에 해당)"""
+        if any(COL_TIME in values for values in rows.values()):
+            self._time_indexes.pop(sheet, None)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO cells (sheet, row, col, value) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (sheet, row, col) DO UPDATE SET value = excluded.value',
+                [(sheet, row, col, _cell_text(value))
+                 for row, values in rows.items() for col, value in values.items()])
+
+    def get_range(self, sheet: str, row: int, col: int, rows: int, cols: int) -> List[List[str]]:
+        """getRange(row, col, rows, cols).getValues() 대응 (빈 셀은 '')"""
+        grid = [[''] * cols for _ in range(rows)]
+        for r, c, value in self.conn.execute(
+                'SELECT row, col, value FROM cells WHERE sheet = ? AND row BETWEEN ? AND ? '
+                'AND col BETWEEN ? AND ?', (sheet, row, row + rows - 1, col, col + cols - 1)):
+            grid[r - row][c - col] = value
+        return grid
+
+    def get_rows(self, sheet: str, rows: Iterable[int], cols: int) -> Dict[int, List[str]]:
+        """요청한 행들의 1..cols열 값 (빈 셀은 ''). 행 사이 빈 구간은 읽지 않음"""
+        wanted = sorted(set(rows))
+        grid = {row: [''] * cols for row in wanted}
+        for start in range(0, len(wanted), 500):  # SQLite 변수 개수 제한
+            chunk = wanted[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            for r, c, value in self.conn.execute(
+                    f'SELECT row, col, value FROM cells WHERE sheet = ? AND row IN ({marks}) '
+                    f'AND col <= ?', (sheet, *chunk, cols)):
+                grid[r][c - 1] = value
+        return grid
+
+    def time_index(self, sheet: str) -> TimeIndex:
+        """B열(핸드 시간) 정렬 인덱스. 처음 조회할 때 만들고 B열이 바뀔 때까지 재사용"""
+        index = self._time_indexes.get(sheet)
+        if index is None:
+            index = self._time_indexes[sheet] = TimeIndex.from_values(self.column(sheet, COL_TIME))
+        return index
+
+    def column(self, sheet: str, col: int) -> Iterator[Tuple[int, str]]:
+        """한 열의 비어 있지 않은 (행, 값)을 행 순으로 (필요한 만큼만 읽음)"""
+        return self.conn.execute(
+            "SELECT row, value FROM cells WHERE sheet = ? AND col = ? AND value != '' ORDER BY row",
+            (sheet, col))
+
+    def find_in_column(self, sheet: str, col: int, needle: str) -> Optional[int]:
+        """열 값에 needle이 들어 있는 첫 행 (cellValue.toString().includes(needle))"""
+        row = self.conn.execute(
+            'SELECT row FROM cells WHERE sheet = ? AND col = ? AND instr(value, ?) > 0 '
+            'ORDER BY row LIMIT 1', (sheet, col, needle)).fetchone()
+        return row[0] if row else None
+
+    def has_data(self, sheet: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM cells WHERE sheet = ? AND value != '' LIMIT 1",
+                                 (sheet,)).fetchone() is not None
+
+    def last_row(self, sheet: str) -> int:
+        """getLastRow(): 값이 있는 마지막 행 (없으면 0)"""
+        row = self.conn.execute("SELECT MAX(row) FROM cells WHERE sheet = ? AND value != ''",
+                                (sheet,)).fetchone()
+        return row[0] or 0
+
+    def load_csv(self, url: str, csv_path: str) -> int:
+        """CSV 파일로 시트 내용을 통째로 바꿈. 읽은 행 수 반환"""
+        opened = self.open_sheet(url)
+        if opened is None:
+            raise SheetError(f'잘못된 시트 URL: {url}')
+        sheet = opened[0]
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        self._time_indexes.pop(sheet, None)
+        with self.conn:
+            self.conn.execute('DELETE FROM cells WHERE sheet = ?', (sheet,))
+            self.conn.executemany(
+                'INSERT INTO cells (sheet, row, col, value) VALUES (?, ?, ?, ?)',
+                [(sheet, r, c, value) for r, cells in enumerate(rows, 1)
+                 for c, value in enumerate(cells, 1) if value != ''])
+        return len(rows)
+
+    def to_csv(self, sheet: str) -> str:
+        """시트 전체를 CSV로 (게시된 CSV처럼 1행부터 마지막 행까지)"""
+        rows = self.last_row(sheet)
+        cols = self.conn.execute('SELECT MAX(col) FROM cells WHERE sheet = ?',
+                                 (sheet,)).fetchone()[0] or 0
+        out = io.StringIO()
+        csv.writer(out, lineterminator='\r\n').writerows(
+            self.get_range(sheet, 1, 1, rows, cols) if rows and cols else [])
+        return out.getvalue()
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+# ========================================
+# 액션 핸들러 (appScripts.gs의 handle* 함수와 같은 검증/응답)
+# ========================================
+
+def sheet_update_values(data: dict) -> Tuple[Optional[str], Optional[int], Dict[int, object], List[str]]:
+    """updateSheet 요청을 (오류 메시지, 행 번호, 열 → 값, 갱신 항목 이름)으로 바꿈
+
+    I열(업데이트 시간)은 기록하는 쪽이 채운다. 검증 순서와 메시지는 handleSheetUpdate와 같다.
+    """
+    row_number = data.get('rowNumber')
+    filename = data.get('filename')
+    if not _truthy(data.get('sheetUrl')):
+        return '시트 URL이 필요합니다', None, {}, []
+    target_row = js_parse_int(row_number)
+    if not _truthy(row_number) or target_row is None:
+        return '유효한 행 번호가 필요합니다', None, {}, []
+    if not _truthy(filename) or not str(filename).strip():
+        return '파일명이 필요합니다', None, {}, []
+
+    hand_number = data.get('handNumber')
+    g_value = data.get('gColumnValue')
+    ai_analysis = data.get('aiAnalysis')
+    subtitle = data.get('subtitle')
+    status = data.get('status')
+    updates = []
+    values: Dict[int, object] = {}
+    if _truthy(hand_number):
+        values[COL_HAND] = hand_number
+        updates.append('핸드번호(D열)')
+    status_value = status if _truthy(status) else '미완료'
+    values[COL_STATUS] = status_value
+    updates.append(f'상태(E열): {status_value}')
+    values[COL_FILENAME] = filename
+    updates.append('파일명(F열)')
+    if _text(g_value):
+        values[COL_G] = g_value
+        updates.append(f'G열({g_value})')
+    if _truthy(ai_analysis):
+        values[COL_ANALYSIS] = ai_analysis
+        updates.append('AI분석(H열)')
+    updates.append('업데이트시간(I열)')
+    if _text(subtitle):
+        values[COL_SUBTITLE] = subtitle
+        updates.append('자막(J열)')
+    return None, target_row, values, updates
+
+
+def handle_sheet_update(store: SheetStore, data: dict) -> dict:
+    error, target_row, values, updates = sheet_update_values(data)
+    if error:
+        return {'status': 'error', 'message': error}
+
+    opened = store.open_sheet(data.get('sheetUrl'))
+    if opened is None:
+        return {'status': 'error', 'message': '시트를 열 수 없습니다. URL과 권한을 확인하세요.'}
+    sheet, sheet_name = opened
+    if target_row < 1:
+        return {'status': 'error', 'message': f'셀 업데이트 실패: 잘못된 행 번호 {target_row}',
+                'updates': []}
+
+    updated_at = iso_now()
+    values[COL_UPDATED] = updated_at
+    store.set_cells(sheet, target_row, values)
+
+    return {
+        'status': 'success',
+        'message': '시트 업데이트 완료',
+        'data': _compact({
+            'sheetName': sheet_name,
+            'rowNumber': target_row,
+            'updatedFields': updates,
+            'filename': data.get('filename'),
+            'gColumnValue': data.get('gColumnValue'),
+            'aiAnalysis': data.get('aiAnalysis'),
+            'subtitle': data.get('subtitle'),
+            'updatedAt': updated_at,
+        }),
+    }
+
+
+def hand_update_data(data: dict) -> dict:
+    """updateHand 요청을 updateSheet 형식으로 바꿈 (handleHandUpdate의 convertedData)"""
+    return _compact({
+        'sheetUrl': data.get('sheetUrl'),
+        'rowNumber': data.get('virtualRow') or data.get('rowNumber'),
+        'handNumber': data.get('handNumber'),
+        'filename': data.get('filename'),
+        'aiAnalysis': data.get('aiSummary') or data.get('handAnalysis') or '분석 완료',
+        'timestamp': data.get('handEditTime') or data.get('timestamp') or iso_now(),
+        'status': data.get('status') or '미완료',
+    })
+
+
+def handle_hand_update(store: SheetStore, data: dict) -> dict:
+    """updateHand (호환성): updateSheet 형식으로 바꿔 처리"""
+    return handle_sheet_update(store, hand_update_data(data))
+
+
+def generate_default_analysis(data: dict) -> str:
+    timestamp = data.get('timestamp')
+    return '\n'.join([
+        f"핸드 #{data.get('handNumber') or 'N/A'} 분석",
+        f"파일: {data.get('filename') or 'unknown.mp4'}",
+        f"시간: {timestamp or iso_now()}",
+    ])
+
+
+def handle_hand_analysis(store: SheetStore, data: dict) -> dict:
+    hand_number = data.get('handNumber')
+    filename = data.get('filename')
+    if not _truthy(hand_number) and not _truthy(filename):
+        return {'status': 'error', 'message': '핸드 번호 또는 파일명이 필요합니다'}
+    return {
+        'status': 'success',
+        'message': 'AI 분석 완료',
+        'data': _compact({
+            'handNumber': hand_number,
+            'filename': filename,
+            'analysis': generate_default_analysis(data),
+            'analyzedAt': iso_now(),
+        }),
+    }
+
+
+def handle_index_update(store: SheetStore, data: dict) -> dict:
+    try:
+        result = update_index_sheet(store, data.get('sheetUrl') or data.get('indexSheetUrl'),
+                                    data.get('handNumber'), data.get('filename'))
+    except SheetError as error:
+        return {'status': 'error', 'message': f'Error: {error}'}
+    return {'status': 'success', 'message': 'Index 시트 업데이트 완료', 'data': result}
+
+
+def update_index_sheet(store: SheetStore, index_sheet_url, hand_number, filename) -> dict:
+    opened = store.open_sheet(index_sheet_url)
+    if opened is None:
+        raise SheetError('Index 시트를 열 수 없습니다')
+    sheet, sheet_name = opened
+    found_row = store.find_in_column(sheet, COL_INDEX_HAND, js_key(hand_number)
+                                     if hand_number is not None else 'undefined')
+    if found_row is None:
+        raise SheetError(f'핸드 번호 "{js_key(hand_number)}"를 찾을 수 없습니다')
+    store.set_cells(sheet, found_row, {COL_STATUS: filename})
+    return _compact({
+        'sheetName': sheet_name,
+        'rowNumber': found_row,
+        'handNumber': hand_number,
+        'filename': filename,
+        'updatedAt': iso_now(),
+    })
+
+
+def handle_batch_verify(store: SheetStore, data: dict) -> dict:
+    sheet_url = data.get('sheetUrl')
+    rows = data.get('rows')
+    if not _truthy(sheet_url) or not isinstance(rows, list):
+        return {'status': 'error', 'message': 'sheetUrl과 rows 배열이 필요합니다'}
+
+    opened = store.open_sheet(sheet_url)
+    if opened is None:
+        return {'status': 'error', 'message': '시트를 열 수 없습니다'}
+    sheet = opened[0]
+
+    # 요청한 행만 읽음 (min..max 연속 범위 전체를 읽지 않음)
+    results = batch_results(rows, lambda numbers: store.get_rows(sheet, numbers, 9))
+    if results is None:
+        # Math.max()가 -Infinity이거나 0 이하 행이 있어 getRange가 실패하는 경우
+        return {'status': 'error', 'message': 'Exception: 범위의 좌표가 잘못되었습니다.'}
+    return {'status': 'success', 'message': f'{len(rows)}개 행 일괄 확인 완료', 'data': results}
+
+
+def handle_get_hand_status(store: SheetStore, data: dict) -> dict:
+    sheet_url = data.get('sheetUrl')
+    hand_number = data.get('handNumber')
+    hand_time = data.get('handTime')
+    if not _truthy(sheet_url) or not _truthy(hand_number) or not _truthy(hand_time):
+        return {'status': 'error', 'message': 'sheetUrl, handNumber, handTime이 모두 필요합니다'}
+
+    opened = store.open_sheet(sheet_url)
+    if opened is None:
+        return {'status': 'error', 'message': '시트를 열 수 없습니다'}
+    sheet = opened[0]
+    if not store.has_data(sheet):
+        return {'status': 'error', 'message': '시트에 데이터가 없습니다'}
+
+    # 허용 오차 안의 가장 위쪽 행 (appScripts.gs의 선형 검색과 같은 결과를 인덱스로)
+    target_time = js_parse_int(hand_time)
+    matched_row = store.time_index(sheet).first_match(target_time) \
+        if target_time is not None else None
+    if matched_row is None:
+        return {'status': 'not_found', 'message': '해당 핸드를 찾을 수 없습니다',
+                'handNumber': hand_number}
+
+    status = store.get_range(sheet, matched_row, COL_STATUS, 1, 1)[0][0]
+    return {
+        'status': 'success',
+        'data': {
+            'handNumber': hand_number,
+            'row': matched_row,
+            'handStatus': status,
+            'checkedAt': iso_now(),
+        },
+    }
+
+
+def handle_verify_update(store: SheetStore, data: dict) -> dict:
+    sheet_url = data.get('sheetUrl')
+    row_number = data.get('rowNumber')
+    if not _truthy(sheet_url) or not _truthy(row_number):
+        return {'status': 'error', 'message': 'sheetUrl과 rowNumber가 필요합니다'}
+    opened = store.open_sheet(sheet_url)
+    if opened is None:
+        return {'status': 'error', 'message': '시트를 열 수 없습니다'}
+    row = js_parse_int(row_number)
+    if row is None or row < 1:
+        return {'status': 'error', 'message': 'Exception: 범위의 좌표가 잘못되었습니다.'}
+    row_data = store.get_range(opened[0], row, 1, 1, 9)[0]
+    return {
+        'status': 'success',
+        'data': {'row': row, 'columnE': row_data[4], 'columnF': row_data[5],
+                 'columnH': row_data[7]},
+    }
+
+
+def handle_batch_write(store: SheetStore, data: dict) -> dict:
+    """batchWrite: 여러 행 쓰기와 Index 업데이트를 시트마다 한 번에 기록
+
+    sheets: [{sheetUrl, rows: [{row, values: {열: 값}, stamp}]}] (stamp면 I열에 처리 시각)
+    index:  [{sheetUrl, handNumber, filename}] (updateIndexSheet처럼 A열에서 찾아 E열에 파일명)
+    항목별 실패는 errors에 모으고 나머지는 기록한다. 아무것도 기록하지 못하면 status: error.
+    """
+    groups = data.get('sheets') or []
+    index_updates = data.get('index') or []
+    if not isinstance(groups, list) or not isinstance(index_updates, list) or \
+            not groups and not index_updates:
+        return {'status': 'error', 'message': 'sheets 또는 index 배열이 필요합니다'}
+
+    updated_at = iso_now()
+    pending: Dict[str, Dict[int, Dict[int, object]]] = {}
+    names: Dict[str, str] = {}
+    errors = []
+
+    def target(url) -> Optional[str]:
+        opened = store.open_sheet(url)
+        if opened is None:
+            return None
+        names[opened[0]] = opened[1]
+        return opened[0]
+
+    for group in groups:
+        sheet = target(group.get('sheetUrl')) if isinstance(group, dict) else None
+        if sheet is None:
+            errors.append({'sheetUrl': group.get('sheetUrl') if isinstance(group, dict) else None,
+                           'message': '시트를 열 수 없습니다. URL과 권한을 확인하세요.'})
+            continue
+        rows = pending.setdefault(sheet, {})
+        for item in group.get('rows') or []:
+            row = js_parse_int(item.get('row')) if isinstance(item, dict) else None
+            values = item.get('values') if isinstance(item, dict) else None
+            if row is None or row < 1 or not isinstance(values, dict):
+                errors.append({'sheetUrl': group.get('sheetUrl'), 'row': item,
+                               'message': '유효한 행 번호와 values가 필요합니다'})
+                continue
+            cells = rows.setdefault(row, {})
+            for col, value in values.items():
+                col = js_parse_int(col)
+                if col is None or col < 1:
+                    errors.append({'sheetUrl': group.get('sheetUrl'), 'row': row,
+                                   'message': f'잘못된 열 번호: {col}'})
+                    continue
+                cells[col] = value
+            if item.get('stamp'):
+                cells[COL_UPDATED] = updated_at
+
+    for item in index_updates:
+        url = item.get('sheetUrl') or item.get('indexSheetUrl') if isinstance(item, dict) else None
+        sheet = target(url)
+        if sheet is None:
+            errors.append({'sheetUrl': url, 'message': 'Index 시트를 열 수 없습니다'})
+            continue
+        hand_number = item.get('handNumber')
+        needle = js_key(hand_number) if hand_number is not None else 'undefined'
+        row = store.find_in_column(sheet, COL_INDEX_HAND, needle)
+        if row is None:
+            errors.append({'sheetUrl': url, 'handNumber': hand_number,
+                           'message': f'핸드 번호 "{needle}"를 찾을 수 없습니다'})
+            continue
+        pending.setdefault(sheet, {}).setdefault(row, {})[COL_STATUS] = item.get('filename')
+
+    written = []
+    for sheet, rows in pending.items():
+        rows = {row: cells for row, cells in rows.items() if cells}
+        if rows:
+            store.set_rows(sheet, rows)
+            written.append({'sheetName': names[sheet], 'rows': len(rows),
+                            'cells': sum(len(cells) for cells in rows.values())})
+    if not written:
+        return {'status': 'error', 'message': '기록할 수 있는 항목이 없습니다', 'errors': errors}
+    result = {
+        'status': 'success',
+        'message': f"{sum(item['cells'] for item in written)}개 셀 일괄 업데이트 완료",
+        'data': {'sheets': written, 'updatedAt': updated_at},
+    }
+    if errors:
+        result['errors'] = errors
+    return result
+
+
+def handle_test(store: SheetStore, data: dict) -> dict:
+    return {
+        'status': 'success',
+        'message': 'Apps Script 연결 성공!',
+        'timestamp': iso_now(),
+        'version': VERSION,
+        'receivedData': data,
+    }
+
+
+ACTIONS: Dict[str, Callable[[SheetStore, dict], dict]] = {
+    'updateSheet': handle_sheet_update,
+    'updateHand': handle_hand_update,
+    'analyzeHand': handle_hand_analysis,
+    'updateIndex': handle_index_update,
+    'batchVerify': handle_batch_verify,
+    'verifyUpdate': handle_verify_update,
+    'getHandStatus': handle_get_hand_status,
+    'batchWrite': handle_batch_write,
+    'test': handle_test,
+}
+
+
+def dispatch(store: SheetStore, data) -> dict:
+    """doPost의 액션 라우팅. 처리 중 예외는 status: error 응답으로 바꿈"""
+    action = data.get('action') if isinstance(data, dict) else None
+    action = action or 'unknown'
+    handler = ACTIONS.get(action) if isinstance(action, str) else None
+    if handler is None:
+        return {
+            'status': 'error',
+            'message': f'알 수 없는 액션: {action}',
+            'availableActions': list(ACTIONS),
+            'receivedAction': action,
+            'receivedData': data,
+        }
+    try:
+        return handler(store, data)
+    except Exception as error:
+        return {'status': 'error', 'message': f'{type(error).__name__}: {error}',
+                'stack': traceback.format_exc()}
+
+
+def parse_post(content_type: str, body: bytes, params: Dict[str, str]):
+    """doPost의 Content-Type별 요청 데이터 파싱
+
+    Apps Script의 e.parameter는 항상 객체이므로 JSON/text가 아니면 쿼리+폼 파라미터를 쓴다.
+    application/json 본문이 잘못되면 ValueError (doPost의 catch로 가는 경우).
+    """
+    mime = content_type.split(';')[0].strip().lower()
+    text = body.decode('utf-8', errors='replace')
+    if mime == 'application/json':
+        return json.loads(text)
+    if mime == 'text/plain':
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {'raw': text}
+    return params
+
+
+def service_status() -> dict:
+    """doGet 응답"""
+    return {
+        'status': 'ok',
+        'method': 'GET',
+        'time': iso_now(),
+        'version': VERSION,
+        'service': 'Virtual Table Sheet Updater',
+        'features': ['Sheet Update', 'Gemini AI Analysis', 'CORS Support', 'G Column Update'],
+        'message': '서비스가 정상 작동 중입니다',
+    }
+
+
+# ========================================
+# 지연 시간 지표
+# ========================================
+
+class LatencyMetrics:
+    """액션별 요청 수/오류 수/지연 시간 분위수와 동시 처리 수"""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self.samples = samples
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.samples))
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections = 0
+
+    def begin(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def end(self, action: str, seconds: float, ok: bool):
+        self.in_flight -= 1
+        self.counts[action] += 1
+        if not ok:
+            self.errors[action] += 1
+        self.latencies[action].append(seconds)
+
+    def snapshot(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.counts.values())
+        actions = {}
+        for action in sorted(self.counts):
+            samples = sorted(self.latencies[action])
+            actions[action] = {
+                'count': self.counts[action],
+                'errors': self.errors[action],
+                'mean_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+                'p50_ms': _percentile_ms(samples, 0.50),
+                'p90_ms': _percentile_ms(samples, 0.90),
+                'p99_ms': _percentile_ms(samples, 0.99),
+                'max_ms': round(samples[-1] * 1000, 3) if samples else 0.0,
+            }
+        return {
+            'uptime_s': round(elapsed, 3),
+            'requests': total,
+            'rps': round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            'connections': self.connections,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'actions': actions,
+        }
+
+
+def _percentile_ms(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+
+
+def print_metrics(snapshot: dict):
+    print(f"📊 요청 {snapshot['requests']}개, {snapshot['rps']} req/s, "
+          f"연결 {snapshot['connections']}개, 최대 동시 처리 {snapshot['peak_in_flight']}")
+    for action, stats in snapshot['actions'].items():
+        print(f"   - {action:14} {stats['count']:>7}건 (오류 {stats['errors']}) "
+              f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+              f"max {stats['max_ms']:.2f} ms")
+
+
+# ========================================
+# HTTP 서버
+# ========================================
+
+class SheetBackend:
+    """asyncio HTTP/1.1 서버. 저장소 접근은 이벤트 루프 안에서 순서대로 실행한다
+    (Apps Script가 한 스프레드시트를 순차로 다루는 것과 같은 직렬화)"""
+
+    def __init__(self, store: SheetStore, delay: float = 0.0, record: Optional[TextIO] = None):
+        self.store = store
+        self.delay = delay  # 응답 전 인위 지연(초): 실제 Apps Script 왕복 시간 흉내
+        self.metrics = LatencyMetrics()
+        self.deltas = DeltaTracker()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.record = record  # POST 요청 트레이스 (load_replay 형식의 JSONL)
+        self._record_started: Optional[float] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.server = await asyncio.start_server(self._serve_connection, host, port)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.metrics.connections += 1
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                started = time.perf_counter()
+                self.metrics.begin()
+                action, ok = 'http', False
+                try:
+                    status, content_type, payload, action, ok = await self._handle(
+                        method, target, headers, body)
+                finally:
+                    seconds = time.perf_counter() - started
+                    self.metrics.end(action, seconds, ok)
+                keep_alive = _keep_alive(version, headers)
+                writer.write(_response(status, content_type, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # 클라이언트가 끊었거나 서버 종료로 취소됨
+        except BadRequest as error:
+            writer.write(_response(error.status, 'application/json',
+                                   json.dumps({'status': 'error', 'message': str(error)},
+                                              ensure_ascii=False).encode('utf-8'), False))
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """(HTTP 상태, Content-Type, 본문, 지표용 액션 이름, 성공 여부)"""
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        if method == 'OPTIONS':
+            return 204, 'text/plain', b'', 'options', True
+        if method == 'GET':
+            if url.path.rstrip('/').endswith('/metrics'):
+                if params.get('reset'):
+                    self.metrics.reset()
+                return 200, 'application/json', _json(self.metrics.snapshot()), 'metrics', True
+            if params.get('format') in ('csv', 'delta'):
+                label = params['format']
+                opened = self.store.open_sheet(params.get('sheetUrl'))
+                if opened is None:
+                    return 404, 'text/plain', '시트를 열 수 없습니다'.encode('utf-8'), label, False
+                text = self.store.to_csv(opened[0])
+                if label == 'csv':
+                    return 200, 'text/csv', text.encode('utf-8'), label, True
+                self.deltas.update(opened[0], parse_csv(text))
+                patch = self.deltas.since(opened[0], params.get('since'))
+                return 200, 'application/json', _json(patch), label, True
+            return 200, 'application/json', _json(service_status()), 'doGet', True
+        if method != 'POST':
+            return 405, 'text/plain', b'', 'http', False
+
+        content_type = headers.get('content-type', '')
+        if self.record is not None:
+            self._record_request(url.query, content_type, body)
+        if content_type.split(';')[0].strip().lower() == 'application/x-www-form-urlencoded':
+            params.update(parse_qsl(body.decode('utf-8', errors='replace'), keep_blank_values=True))
+        try:
+            data = parse_post(content_type, body, params)
+            action = data.get('action') if isinstance(data, dict) else None
+            result = dispatch(self.store, data)
+        except ValueError as error:
+            action = None
+            result = {'status': 'error', 'message': f'SyntaxError: {error}', 'stack': ''}
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        label = action if isinstance(action, str) and action in ACTIONS else 'unknown'
+        return 200, 'application/json', _json(result), label, result.get('status') != 'error'
+
+    def _record_request(self, query: str, content_type: str, body: bytes):
+        now = time.perf_counter()
+        if self._record_started is None:
+            self._record_started = now
+        entry = {'t': round(now - self._record_started, 6), 'contentType': content_type,
+                 'body': body.decode('utf-8', errors='replace')}
+        if query:
+            entry['query'] = query
+        self.record.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.record.flush()
+
+
+class BadRequest(Exception):
+    """HTTP 요청이 잘못됨 (status로 응답하고 연결을 닫음)"""
+
+    def __init__(self, status: int, message: str):
+        self.status = status
+        super().__init__(message)
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """요청 하나를 읽어 (method, target, version, headers, body). 연결이 끝났으면 None"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise BadRequest(400, '잘못된 요청 줄')
+    method, target, version = parts
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b'', None)
+        if line in (b'\r\n', b'\n'):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise BadRequest(411, 'chunked 본문은 지원하지 않음 (Content-Length 필요)')
+    raw_length = headers.get('content-length') or '0'
+    # int()는 부호와 공백, 유니코드 숫자도 받으므로 ASCII 숫자만 허용 (음수 길이로 readexactly 방지)
+    if not (raw_length.isascii() and raw_length.isdigit()):
+        raise BadRequest(400, f'잘못된 Content-Length: {raw_length[:40]!r}')
+    length = int(raw_length)
+    if length > MAX_BODY:
+        raise BadRequest(413, f'본문이 너무 큼 ({length} B)')
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, version, headers, body
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _response(status: int, content_type: str, payload: bytes, keep_alive: bool) -> bytes:
+    head = [
+        f'HTTP/1.1 {status} {_STATUS_TEXT.get(status, "OK")}',
+        f'Content-Type: {content_type}; charset=utf-8',
+        f'Content-Length: {len(payload)}',
+        'Access-Control-Allow-Origin: *',
+        'Access-Control-Allow-Methods: GET, POST, OPTIONS',
+        'Access-Control-Allow-Headers: Content-Type',
+        f'Connection: {"keep-alive" if keep_alive else "close"}',
+    ]
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload
+
+
+async def serve(store: SheetStore, host: str, port: int, delay: float,
+                metrics_json: Optional[str] = None, record: Optional[TextIO] = None):
+    backend = SheetBackend(store, delay, record)
+    server = await backend.start(host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C는 KeyboardInterrupt로 처리
+    print(f"🚀 Apps Script 대역 서버: http://{host}:{backend.port}/exec (지표: /metrics)")
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        snapshot = backend.metrics.snapshot()
+        print_metrics(snapshot)
+        if metrics_json:
+            with open(metrics_json, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            print(f"📝 {metrics_json}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apps Script doPost/doGet 로컬 대역 서버")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="바인드 주소")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="포트 (0이면 임의 포트)")
+    parser.add_argument('--db', default=':memory:', help="SQLite 파일 (기본: 메모리)")
+    parser.add_argument('--csv', nargs=2, action='append', default=[],
+                        metavar=('SHEET_URL', 'CSV_PATH'), help="시작할 때 시트를 CSV로 채움")
+    parser.add_argument('--delay', type=float, default=0.0, help="응답 전 인위 지연(ms)")
+    parser.add_argument('--metrics-json', help="종료할 때 지표를 JSON으로 저장할 경로")
+    parser.add_argument('--record', help="받은 POST 요청을 JSONL 트레이스로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    store = SheetStore(args.db)
+    for sheet_url, csv_path in args.csv:
+        try:
+            rows = store.load_csv(sheet_url, csv_path)
+        except (OSError, SheetError) as error:
+            print(f"❌ CSV 불러오기 실패: {error}")
+            return 1
+        print(f"📥 {csv_path}: {rows}행 → {sheet_url}")
+    record = open(args.record, 'w', encoding='utf-8') if args.record else None
+    try:
+        asyncio.run(serve(store, args.host, args.port, args.delay / 1000, args.metrics_json, record))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+        if record is not None:
+            record.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
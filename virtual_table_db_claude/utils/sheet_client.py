@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시트 쓰기를 모아 보내는 Apps Script 클라이언트
+- updateSheet/updateHand/updateIndex는 요청 하나에 한 행만 쓰고, 요청마다 openSheetByUrl을
+  다시 실행한다. 바쁜 세션에서는 한 행짜리 요청이 수십 개씩 연달아 나간다
+- SheetWriter는 쓰기를 큐에 모으고 같은 (시트, 행, 열)에 대한 쓰기는 마지막 값만 남긴다
+  (Index 업데이트는 (시트, 핸드 번호)마다 마지막 파일명만)
+- 셀 수가 max_cells에 이르거나 첫 쓰기 뒤 max_delay가 지나면 batchWrite 요청 한 번으로 보냄
+  → Apps Script는 시트마다 한 번 열고, 행마다 연속한 열 구간마다 setValues 한 번으로 씀
+    (범위를 먼저 읽지 않고, 쓰지 않는 칸은 건드리지 않음)
+- 검증은 보내기 전에 handleSheetUpdate와 같은 규칙으로 해서 잘못된 한 행이 묶음 전체를
+  실패시키지 않게 한다. 전송이 실패하면 묶음을 큐에 되돌린다 (그 사이 새로 들어온 값이 우선)
+
+사용 예:
+    async with SheetWriter(APPS_SCRIPT_URL) as writer:
+        await writer.update_sheet({'sheetUrl': url, 'rowNumber': 12, 'filename': 'a.mp4', ...})
+        await writer.update_index(index_url, 12, 'a.mp4')
+
+벤치마크 (로컬 sheet_backend에 한 행씩 보내기 vs 모아 보내기, 최종 시트 내용 비교):
+    python sheet_client.py --bench 200 [--delay 5] [--max-cells 500]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from hand_index import js_key
+from sheet_backend import (COL_INDEX_HAND, COL_UPDATED, SheetBackend, SheetStore,
+                           hand_update_data, sheet_update_values)
+
+DEFAULT_MAX_CELLS = 500   # 한 요청에 보낼 최대 셀 수
+DEFAULT_MAX_DELAY = 0.5   # 첫 쓰기 뒤 이 시간(초)이 지나면 보냄
+DEFAULT_TIMEOUT = 60.0
+
+Transport = Callable[[str, dict], Awaitable[dict]]
+
+
+class SheetClientError(Exception):
+    """batchWrite 요청 자체가 실패함 (네트워크, HTTP 오류, JSON이 아닌 응답)"""
+
+
+def _post_json(endpoint: str, payload: dict, timeout: float) -> dict:
+    request = urllib.request.Request(endpoint, data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (urllib.error.URLError, TimeoutError, ConnectionError, ValueError) as error:
+        raise SheetClientError(f"{endpoint}: {error}") from error
+
+
+def http_transport(timeout: float = DEFAULT_TIMEOUT) -> Transport:
+    """urllib로 JSON을 POST하는 기본 전송 (이벤트 루프를 막지 않도록 스레드에서)"""
+    async def send(endpoint: str, payload: dict) -> dict:
+        return await asyncio.to_thread(_post_json, endpoint, payload, timeout)
+    return send
+
+
+class SheetWriter:
+    """행 쓰기를 합쳐 batchWrite로 보내는 클라이언트 (asyncio)"""
+
+    def __init__(self, endpoint: str, max_cells: int = DEFAULT_MAX_CELLS,
+                 max_delay: float = DEFAULT_MAX_DELAY, transport: Optional[Transport] = None):
+        self.endpoint = endpoint
+        self.max_cells = max_cells
+        self.max_delay = max_delay
+        self.transport = transport or http_transport()
+        self.rows: Dict[str, Dict[int, Dict[int, object]]] = {}   # 시트 URL → 행 → 열 → 값
+        self.stamps: Dict[str, set] = {}                          # I열에 처리 시각을 넣을 행
+        self.index: Dict[Tuple[str, str], dict] = {}              # (시트 URL, 핸드 번호) → 항목
+        self.cells = 0
+        self.requests = 0
+        self.queued = 0      # 받은 셀 쓰기 수 (합치기 전)
+        self.sent = 0        # 실제로 보낸 셀 수
+        self.errors: List[dict] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+
+    @property
+    def pending(self) -> int:
+        return self.cells + len(self.index)
+
+    async def set_cells(self, sheet_url: str, row: int, values: Dict[int, object], stamp: bool = False):
+        """한 행의 셀 쓰기를 큐에 넣음 (같은 칸에 먼저 들어온 값은 덮어씀)"""
+        cells = self.rows.setdefault(sheet_url, {}).setdefault(row, {})
+        before = len(cells)
+        cells.update(values)
+        self.cells += len(cells) - before
+        self.queued += len(values)
+        if stamp:
+            self.stamps.setdefault(sheet_url, set()).add(row)
+        await self._queued()
+
+    async def update_sheet(self, data: dict):
+        """updateSheet 요청과 같은 셀을 씀. 검증에 실패하면 ValueError"""
+        error, row, values, _ = sheet_update_values(data)
+        if error:
+            raise ValueError(error)
+        if row < 1:
+            raise ValueError(f"잘못된 행 번호 {row}")
+        await self.set_cells(data['sheetUrl'], row, values, stamp=True)
+
+    async def update_hand(self, data: dict):
+        """updateHand 요청과 같음 (updateSheet 형식으로 바꿔 씀)"""
+        await self.update_sheet(hand_update_data(data))
+
+    async def update_index(self, sheet_url: str, hand_number, filename):
+        """updateIndex 요청과 같음: Index 시트 A열에서 핸드 번호를 찾아 E열에 파일명"""
+        key = (sheet_url, js_key(hand_number))
+        self.index[key] = {'sheetUrl': sheet_url, 'handNumber': hand_number, 'filename': filename}
+        self.queued += 1
+        await self._queued()
+
+    async def _queued(self):
+        if self.pending >= self.max_cells:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_later)
+
+    def _flush_later(self):
+        self._timer = None
+        task = asyncio.ensure_future(self._flush_quietly())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_quietly(self):
+        try:
+            await self.flush()
+        except SheetClientError as error:
+            # 묶음은 큐에 되돌아가 있으므로 다음 타이머/flush에서 다시 보냄
+            self.errors.append({'message': str(error)})
+            if self._timer is None and self.pending:
+                self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_later)
+
+    def _take(self) -> dict:
+        """큐를 비우고 batchWrite 요청 본문을 만듦"""
+        sheets = []
+        for url, rows in self.rows.items():
+            stamps = self.stamps.get(url, set())
+            sheets.append({'sheetUrl': url, 'rows': [
+                {'row': row, 'values': {str(col): value for col, value in cells.items()},
+                 **({'stamp': True} if row in stamps else {})}
+                for row, cells in rows.items()]})
+        payload = {'action': 'batchWrite', 'sheets': sheets, 'index': list(self.index.values())}
+        self.rows, self.stamps, self.index, self.cells = {}, {}, {}, 0
+        return payload
+
+    def _restore(self, payload: dict):
+        """보내지 못한 묶음을 큐에 되돌림. 그사이 새로 들어온 값이 있으면 그쪽을 남긴다"""
+        for group in payload['sheets']:
+            rows = self.rows.setdefault(group['sheetUrl'], {})
+            for item in group['rows']:
+                cells = rows.setdefault(item['row'], {})
+                before = len(cells)
+                for col, value in item['values'].items():
+                    cells.setdefault(int(col), value)
+                self.cells += len(cells) - before
+                if item.get('stamp'):
+                    self.stamps.setdefault(group['sheetUrl'], set()).add(item['row'])
+        for item in payload['index']:
+            self.index.setdefault((item['sheetUrl'], js_key(item['handNumber'])), item)
+
+    async def flush(self) -> Optional[dict]:
+        """큐에 있는 쓰기를 batchWrite 한 번으로 보냄. 보낼 것이 없으면 None"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self.pending:
+                return None
+            payload = self._take()
+            cells = sum(len(item['values']) for group in payload['sheets'] for item in group['rows'])
+            try:
+                result = await self.transport(self.endpoint, payload)
+            except SheetClientError:
+                self._restore(payload)
+                raise
+            self.requests += 1
+            self.sent += cells + len(payload['index'])
+            if not isinstance(result, dict):
+                raise SheetClientError(f"JSON 객체가 아닌 응답: {result!r}")
+            if result.get('status') != 'success' or result.get('errors'):
+                self.errors.append(result)
+            return result
+
+    async def close(self):
+        for task in list(self._flushes):
+            await task
+        await self.flush()
+
+    async def __aenter__(self) -> 'SheetWriter':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+SHEET_URL = 'https://docs.google.com/spreadsheets/d/bench/edit#gid=0'
+INDEX_URL = 'https://docs.google.com/spreadsheets/d/bench/edit#gid=1'
+
+
+def generate_session(hands: int, seed: int = 0) -> List[Tuple[str, dict]]:
+    """바쁜 세션의 요청 순서: 핸드마다 행 등록, 분석 결과로 다시 쓰기, Index 업데이트
+    (몇몇 핸드는 나중에 상태/자막을 한 번 더 고침)"""
+    rng = random.Random(seed)
+    requests = []
+    for index in range(hands):
+        hand = 1000 + index
+        row = 2 + index
+        filename = f"{hand}_Player{rng.randrange(100)}.mp4"
+        base = {'sheetUrl': SHEET_URL, 'rowNumber': row, 'handNumber': hand, 'filename': filename}
+        requests.append(('updateSheet', dict(base, gColumnValue=rng.choice(['A', 'B', '']))))
+        requests.append(('updateHand', {'sheetUrl': SHEET_URL, 'virtualRow': row, 'handNumber': hand,
+                                        'filename': filename, 'aiSummary': f"핸드 {hand} 요약"}))
+        requests.append(('updateIndex', {'sheetUrl': INDEX_URL, 'handNumber': hand, 'filename': filename}))
+        if rng.random() < 0.3:
+            requests.append(('updateSheet', dict(base, status='복사완료', subtitle=f"자막 {hand}")))
+    return requests
+
+
+def _prepared_store(hands: int) -> SheetStore:
+    store = SheetStore()
+    index = store.open_sheet(INDEX_URL)[0]
+    store.set_rows(index, {2 + i: {COL_INDEX_HAND: f"#{1000 + i}"} for i in range(hands)})
+    return store
+
+
+def _cells(store: SheetStore) -> Dict[tuple, str]:
+    """업데이트 시간(I열)을 뺀 모든 셀"""
+    return {(sheet, row, col): value for sheet, row, col, value in store.conn.execute(
+        'SELECT sheet, row, col, value FROM cells') if not (col == COL_UPDATED and sheet.endswith('#0'))}
+
+
+async def _bench_single(endpoint: str, session: List[Tuple[str, dict]], transport: Transport) -> int:
+    """지금 프런트엔드처럼 한 요청씩 차례로"""
+    for action, data in session:
+        result = await transport(endpoint, dict(data, action=action))
+        if result.get('status') != 'success':
+            raise SheetClientError(f"{action} 실패: {result.get('message')}")
+    return len(session)
+
+
+async def _bench_batched(endpoint: str, session: List[Tuple[str, dict]], transport: Transport,
+                         max_cells: int) -> SheetWriter:
+    async with SheetWriter(endpoint, max_cells=max_cells, transport=transport) as writer:
+        for action, data in session:
+            if action == 'updateSheet':
+                await writer.update_sheet(data)
+            elif action == 'updateHand':
+                await writer.update_hand(data)
+            else:
+                await writer.update_index(data['sheetUrl'], data['handNumber'], data['filename'])
+    return writer
+
+
+async def _run_backend(store: SheetStore, delay: float, job):
+    backend = SheetBackend(store, delay)
+    server = await backend.start('127.0.0.1', 0)
+    async with server:
+        started = time.perf_counter()
+        result = await job(f"http://127.0.0.1:{backend.port}/exec")
+        return result, time.perf_counter() - started
+
+
+def run_benchmark(hands: int, delay: float, max_cells: int, seed: int = 0) -> int:
+    session = generate_session(hands, seed)
+    transport = http_transport()
+    print(f"📄 핸드 {hands}개, 요청 {len(session)}개 (Apps Script 지연 {delay * 1000:.0f} ms/요청)")
+
+    single_store = _prepared_store(hands)
+    count, single_seconds = asyncio.run(_run_backend(
+        single_store, delay, lambda endpoint: _bench_single(endpoint, session, transport)))
+    print(f"🐢 한 행씩: 요청 {count}개, {single_seconds * 1000:.0f} ms "
+          f"(핸드당 왕복 {count / hands:.2f}회)")
+
+    batched_store = _prepared_store(hands)
+    writer, batched_seconds = asyncio.run(_run_backend(
+        batched_store, delay, lambda endpoint: _bench_batched(endpoint, session, transport, max_cells)))
+    print(f"⚡ 모아 보내기: 요청 {writer.requests}개, {batched_seconds * 1000:.0f} ms "
+          f"(핸드당 왕복 {writer.requests / hands:.3f}회, 셀 {writer.queued}개 → {writer.sent}개로 합침) "
+          f"| {single_seconds / batched_seconds:.1f}배")
+
+    if writer.errors:
+        print(f"❌ batchWrite 오류: {writer.errors[0]}")
+        return 1
+    if _cells(single_store) != _cells(batched_store):
+        print("❌ 최종 시트 내용이 다름")
+        return 1
+    print("✅ 최종 시트 내용 일치 (업데이트 시간 열 제외)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시트 쓰기 모아 보내기 클라이언트 벤치마크")
+    parser.add_argument('--bench', type=int, metavar='N', default=200, help="핸드 수")
+    parser.add_argument('--delay', type=float, default=5.0, help="로컬 백엔드의 요청당 인위 지연(ms)")
+    parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS, help="한 요청의 최대 셀 수")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.bench < 1 or args.max_cells < 1:
+        parser.error("--bench와 --max-cells는 1 이상이어야 합니다")
+    return run_benchmark(args.bench, args.delay / 1000, args.max_cells, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+콘텐츠 주소 기반 스냅샷 저장소 (전체 복사 백업 대체)
+- 스냅샷은 내용의 sha256으로 식별, 같은 내용은 한 번만 저장
+- 압축된 기준(base) 스냅샷 + 기준 대비 줄 단위 델타로 저장
+- 델타가 커지면 새 기준 스냅샷을 만들어 복원은 항상 기준 + 델타 1개로 끝남
+- 오래된 스냅샷 정리(gc) 지원
+
+사용법:
+    python snapshot_store.py list [파일]
+    python snapshot_store.py save <파일> [--label 설명]
+    python snapshot_store.py restore <스냅샷 id> [--output 경로]
+    python snapshot_store.py gc [--keep 20] [--days 30]
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from targets import CACHE_DIR_NAME, REPO_ROOT, default_cache_dir
+
+SNAPSHOT_DIR_NAME = 'snapshots'
+INDEX_VERSION = 1
+
+# 압축된 델타가 기준 스냅샷 압축 크기의 이 비율을 넘으면 새 기준을 만든다
+REBASE_RATIO = 0.5
+
+BASE = 'base'
+DELTA = 'delta'
+
+
+def _sha256(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def default_store_dir(file_path: str) -> str:
+    """저장소 안의 파일은 공용 스냅샷 저장소, 그 밖의 파일은 파일 옆 캐시를 사용"""
+    path = os.path.abspath(file_path)
+    if os.path.commonpath([path, REPO_ROOT]) == REPO_ROOT:
+        return os.path.join(REPO_ROOT, CACHE_DIR_NAME, SNAPSHOT_DIR_NAME)
+    return os.path.join(default_cache_dir(path), SNAPSHOT_DIR_NAME)
+
+
+def make_delta(base: str, content: str) -> list:
+    """기준 대비 줄 단위 델타 [[0, 시작줄, 끝줄] | [1, 삽입 텍스트], ...]
+
+    공통 앞/뒤 줄을 먼저 잘라내므로 국소 수정은 수정 크기에 비례해 계산된다.
+    """
+    a = base.splitlines(keepends=True)
+    b = content.splitlines(keepends=True)
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[len(a) - 1 - suffix] == b[len(b) - 1 - suffix]:
+        suffix += 1
+
+    ops: list = []
+    if prefix:
+        ops.append([0, 0, prefix])
+    middle_a = a[prefix:len(a) - suffix]
+    middle_b = b[prefix:len(b) - suffix]
+    matcher = difflib.SequenceMatcher(None, middle_a, middle_b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([0, prefix + i1, prefix + i2])
+        elif j2 > j1:
+            ops.append([1, ''.join(middle_b[j1:j2])])
+    if suffix:
+        ops.append([0, len(a) - suffix, len(a)])
+    return ops
+
+
+def apply_delta(base: str, ops: list) -> str:
+    lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if op[0] == 0:
+            parts.append(''.join(lines[op[1]:op[2]]))
+        else:
+            parts.append(op[1])
+    return ''.join(parts)
+
+
+class SnapshotStore:
+    """objects/<해시 앞 2자리>/<해시> 에 압축 객체, index.json 에 스냅샷 목록을 보관"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        self._index: Optional[Dict] = None
+
+    @classmethod
+    def for_file(cls, file_path: str) -> 'SnapshotStore':
+        return cls(default_store_dir(file_path))
+
+    # 인덱스 ---------------------------------------------------------------
+
+    @property
+    def index(self) -> Dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            if self._index.get('version') != INDEX_VERSION:
+                self._index = {'version': INDEX_VERSION, 'objects': {}, 'snapshots': []}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def _write_object(self, digest: str, payload: bytes):
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def _read_object(self, digest: str) -> bytes:
+        with open(self._object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def _file_key(self, file_path: str) -> str:
+        base_dir = os.path.dirname(os.path.dirname(self.root))
+        return os.path.relpath(os.path.abspath(file_path), base_dir).replace(os.sep, '/')
+
+    # 저장/복원 ------------------------------------------------------------
+
+    def save(self, file_path: str, content: str, label: str = '') -> str:
+        """스냅샷 저장 후 id(sha256) 반환. 이미 있는 내용이면 객체는 다시 쓰지 않는다."""
+        digest = _sha256(content)
+        file_key = self._file_key(file_path)
+        objects = self.index['objects']
+        if digest not in objects:
+            objects[digest] = self._store_object(file_key, digest, content)
+        else:
+            # 직전 스냅샷과 내용이 같으면 기록을 늘리지 않는다
+            latest = [s for s in self.index['snapshots'] if s['file'] == file_key]
+            if latest and latest[-1]['id'] == digest:
+                return digest
+        self.index['snapshots'].append({
+            'id': digest,
+            'file': file_key,
+            'time': time.time(),
+            'label': label,
+        })
+        self._save_index()
+        return digest
+
+    def _latest_base(self, file_key: str) -> Optional[str]:
+        objects = self.index['objects']
+        for snap in reversed(self.index['snapshots']):
+            if snap['file'] != file_key or snap['id'] not in objects:
+                continue
+            obj = objects[snap['id']]
+            return snap['id'] if obj['kind'] == BASE else obj['base']
+        return None
+
+    def _store_object(self, file_key: str, digest: str, content: str) -> Dict:
+        base_id = self._latest_base(file_key)
+        if base_id is not None:
+            base_text = self.load(base_id)
+            delta = zlib.compress(json.dumps(make_delta(base_text, content),
+                                             ensure_ascii=False).encode('utf-8', 'surrogatepass'), 6)
+            base_size = self.index['objects'][base_id]['stored']
+            if len(delta) <= base_size * REBASE_RATIO:
+                self._write_object(digest, delta)
+                return {'kind': DELTA, 'base': base_id, 'size': len(content), 'stored': len(delta)}
+        # 델타를 못 쓸 때만 전체를 압축 (델타 판단은 기준 스냅샷 크기와 비교하므로 필요 없음)
+        full = zlib.compress(content.encode('utf-8', 'surrogatepass'), 6)
+        self._write_object(digest, full)
+        return {'kind': BASE, 'size': len(content), 'stored': len(full)}
+
+    def resolve(self, prefix: str) -> str:
+        """id 앞부분으로 전체 id 찾기"""
+        matches = [digest for digest in self.index['objects'] if digest.startswith(prefix)]
+        if not matches:
+            raise KeyError(f"스냅샷을 찾을 수 없습니다: {prefix}")
+        if len(matches) > 1:
+            raise KeyError(f"id가 모호합니다: {prefix} ({len(matches)}개 일치)")
+        return matches[0]
+
+    def load(self, snapshot_id: str) -> str:
+        digest = self.resolve(snapshot_id)
+        obj = self.index['objects'][digest]
+        if obj['kind'] == BASE:
+            content = self._read_object(digest).decode('utf-8', 'surrogatepass')
+        else:
+            base_text = self.load(obj['base'])
+            ops = json.loads(self._read_object(digest).decode('utf-8', 'surrogatepass'))
+            content = apply_delta(base_text, ops)
+        if _sha256(content) != digest:
+            raise ValueError(f"스냅샷 손상: {digest}")
+        return content
+
+    def restore(self, snapshot_id: str, output_path: Optional[str] = None) -> str:
+        """스냅샷 내용을 원래 파일(또는 output_path)에 기록하고 그 경로를 반환"""
+        digest = self.resolve(snapshot_id)
+        content = self.load(digest)
+        if output_path is None:
+            snap = next(s for s in reversed(self.index['snapshots']) if s['id'] == digest)
+            base_dir = os.path.dirname(os.path.dirname(self.root))
+            output_path = os.path.join(base_dir, snap['file'])
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return output_path
+
+    def list(self, file_path: Optional[str] = None) -> List[Dict]:
+        snapshots = self.index['snapshots']
+        if file_path is not None:
+            key = self._file_key(file_path)
+            snapshots = [s for s in snapshots if s['file'] == key]
+        return [dict(s, **self.index['objects'].get(s['id'], {})) for s in snapshots]
+
+    # 정리 -----------------------------------------------------------------
+
+    def gc(self, keep: int = 20, max_age_days: Optional[float] = None) -> Tuple[int, int]:
+        """파일별 최근 keep개(와 max_age_days 이내)만 남기고 참조되지 않는 객체 삭제
+
+        (삭제된 스냅샷 수, 삭제된 객체 수) 반환. 남은 델타가 참조하는 기준은 유지된다.
+        """
+        now = time.time()
+        kept = []
+        per_file: Dict[str, int] = {}
+        for snap in reversed(self.index['snapshots']):
+            count = per_file.get(snap['file'], 0)
+            too_old = max_age_days is not None and now - snap['time'] > max_age_days * 86400
+            if count < keep and not too_old:
+                kept.append(snap)
+                per_file[snap['file']] = count + 1
+        kept.reverse()
+        removed_snapshots = len(self.index['snapshots']) - len(kept)
+
+        objects = self.index['objects']
+        live = set()
+        for snap in kept:
+            live.add(snap['id'])
+            obj = objects.get(snap['id'])
+            if obj and obj['kind'] == DELTA:
+                live.add(obj['base'])
+        dead = [digest for digest in objects if digest not in live]
+        for digest in dead:
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+            del objects[digest]
+
+        self.index['snapshots'] = kept
+        self._save_index()
+        return removed_snapshots, len(dead)
+
+
+def backup_content(file_path: str, content: str, label: str = '') -> str:
+    """도구들이 쓰는 백업 진입점: 공용 저장소에 스냅샷을 남기고 id 반환"""
+    return SnapshotStore.for_file(file_path).save(file_path, content, label)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스냅샷 저장소 관리")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_list = sub.add_parser('list', help="스냅샷 목록")
+    p_list.add_argument('file', nargs='?')
+    p_list.add_argument('--store', help="저장소 경로")
+
+    p_save = sub.add_parser('save', help="현재 파일을 스냅샷으로 저장")
+    p_save.add_argument('file')
+    p_save.add_argument('--label', default='manual')
+
+    p_restore = sub.add_parser('restore', help="스냅샷 복원")
+    p_restore.add_argument('id')
+    p_restore.add_argument('--output', help="복원할 경로 (기본: 원래 파일)")
+    p_restore.add_argument('--store', help="저장소 경로")
+
+    p_gc = sub.add_parser('gc', help="오래된 스냅샷 정리")
+    p_gc.add_argument('--keep', type=int, default=20, help="파일별로 남길 최근 스냅샷 수")
+    p_gc.add_argument('--days', type=float, default=None, help="이보다 오래된 스냅샷 삭제")
+    p_gc.add_argument('--store', help="저장소 경로")
+
+    args = parser.parse_args(argv)
+    default_root = os.path.join(REPO_ROOT, CACHE_DIR_NAME, SNAPSHOT_DIR_NAME)
+
+    if args.command == 'save':
+        with open(args.file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        digest = backup_content(args.file, content, args.label)
+        print(f"💾 {args.file} → {digest[:12]}")
+        return 0
+
+    store = SnapshotStore(args.store or default_root)
+    if args.command == 'list':
+        for snap in store.list(args.file):
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snap['time']))
+            print(f"{snap['id'][:12]}  {when}  {snap['kind']:<5}  {snap['size']:>9}B → "
+                  f"{snap['stored']:>7}B  {snap['file']}  {snap['label']}")
+    elif args.command == 'restore':
+        try:
+            path = store.restore(args.id, args.output)
+        except (KeyError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"♻️  {args.id} → {path}")
+    elif args.command == 'gc':
+        snapshots, objects = store.gc(args.keep, args.days)
+        print(f"🧹 스냅샷 {snapshots}개, 객체 {objects}개 삭제")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문서 하나에 대한 공용 위치 인덱스 (SourceIndex)
+- 한 번의 렉서 패스로 만들고 모든 도구가 같은 인덱스를 조회
+  (줄 표는 바로, 토큰/구간과 함수 경계는 처음 조회할 때 한 번만 계산)
+- 줄 시작 오프셋 표: offset ↔ 줄/열 변환을 bisect로 O(log n)
+- <script> 블록(JS 영역) 경계와 영역별 토큰 (공백 제외, 주석 포함)
+- 문자열/주석/템플릿/정규식 리터럴 구간
+- 함수 경계 (function 선언/식, 블록 본문 화살표 함수, 클래스/객체 메서드)
+
+같은 내용에 대해 SourceIndex.of(content, path)를 다시 부르면 캐시된 인덱스를 돌려준다.
+"""
+
+import bisect
+import re
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from js_lexer import (
+    COMMENT, NAME, PUNCT, REGEX, STRING, TEMPLATE, WS, Token, js_regions, tokenize,
+)
+
+# 구간 종류 (js_lexer 토큰 종류와 같은 이름)
+SPAN_KINDS = frozenset([STRING, TEMPLATE, COMMENT, REGEX])
+
+# 함수 종류
+FUNCTION = 'function'
+ARROW = 'arrow'
+METHOD = 'method'
+
+# '이름(...) {' 형태여도 메서드가 아닌 키워드
+_NOT_METHOD = frozenset([
+    'if', 'for', 'while', 'switch', 'catch', 'with', 'function', 'return', 'typeof',
+    'await', 'new', 'delete', 'void', 'in', 'of', 'instanceof', 'yield',
+])
+# 메서드 이름 앞에 올 수 있는 토큰 (블록/객체 시작, 구분자, 수식어)
+_METHOD_BEFORE = frozenset(['{', '}', ';', ',', 'async', 'static', 'get', 'set', '*'])
+
+_OPENERS = frozenset('([{')
+_CLOSER_OF = {')': '(', ']': '[', '}': '{'}
+
+_INDEX_CACHE_SIZE = 4
+_cache: 'OrderedDict[Tuple[str, int], SourceIndex]' = OrderedDict()
+
+
+class Span(NamedTuple):
+    kind: str
+    start: int
+    end: int
+
+
+class FunctionSpan(NamedTuple):
+    name: str        # 익명이면 ''
+    kind: str        # FUNCTION / ARROW / METHOD
+    start: int       # 'function'/이름/매개변수 시작
+    body_start: int  # 본문 '{' 위치
+    end: int         # 본문 '}' 다음 (닫히지 않았으면 영역 끝)
+
+
+class SourceIndex:
+    """문서 하나의 줄/영역/구간/함수 경계 인덱스"""
+
+    def __init__(self, content: str, path: str = ''):
+        self.content = content
+        self.path = path
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(m.end() for m in re.finditer('\n', content))
+        self.regions: List[Tuple[int, int]] = js_regions(content, path)
+        self._region_starts = [lo for lo, _ in self.regions]
+        self._tokens: Optional[List[List[Token]]] = None
+        self._spans: List[Span] = []
+        self._span_starts: List[int] = []
+        self._functions: Optional[List[FunctionSpan]] = None
+        self._function_starts: List[int] = []
+
+    @classmethod
+    def of(cls, content: str, path: str = '') -> 'SourceIndex':
+        """내용이 같으면 이미 만든 인덱스를 재사용 (최근 몇 개만 보관)"""
+        key = (path, hash(content))
+        index = _cache.get(key)
+        if index is not None and index.content == content:
+            _cache.move_to_end(key)
+            return index
+        index = cls(content, path)
+        _cache[key] = index
+        if len(_cache) > _INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+        return index
+
+    @property
+    def tokens(self) -> List[List[Token]]:
+        """영역별 공백 제외 토큰 (주석 포함)"""
+        if self._tokens is None:
+            self._tokens = []
+            for lo, hi in self.regions:
+                tokens = [tok for tok in tokenize(self.content, lo, hi) if tok.kind != WS]
+                self._tokens.append(tokens)
+                self._spans.extend(Span(tok.kind, tok.start, tok.end)
+                                   for tok in tokens if tok.kind in SPAN_KINDS)
+            self._span_starts = [span.start for span in self._spans]
+        return self._tokens
+
+    @property
+    def spans(self) -> List[Span]:
+        """문자열/주석/템플릿/정규식 구간 (오프셋 순)"""
+        self.tokens  # 토큰화할 때 함께 채워짐
+        return self._spans
+
+    @property
+    def functions(self) -> List[FunctionSpan]:
+        """함수 경계 목록 (시작 오프셋 순)"""
+        if self._functions is None:
+            functions = []
+            for (lo, hi), tokens in zip(self.regions, self.tokens):
+                functions.extend(self._find_functions(
+                    [tok for tok in tokens if tok.kind != COMMENT], hi))
+            functions.sort(key=lambda f: f.start)
+            self._functions = functions
+            self._function_starts = [f.start for f in functions]
+        return self._functions
+
+    # 줄 ↔ 오프셋
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """offset이 속한 줄 번호 (1부터)"""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def column_of(self, offset: int) -> int:
+        """offset의 열 번호 (1부터)"""
+        return offset - self.line_starts[self.line_of(offset) - 1] + 1
+
+    def offset_of(self, line: int, column: int = 1) -> int:
+        return self.line_starts[line - 1] + column - 1
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """줄의 (시작, 끝) 오프셋. 끝은 줄바꿈 문자 앞"""
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.content)
+        return start, end
+
+    def line_text(self, line: int) -> str:
+        start, end = self.line_span(line)
+        return self.content[start:end]
+
+    # 영역/구간
+
+    def region_at(self, offset: int) -> Optional[int]:
+        """offset을 포함하는 JS 영역 번호 (영역 밖이면 None)"""
+        i = bisect.bisect_right(self._region_starts, offset) - 1
+        if i >= 0 and offset < self.regions[i][1]:
+            return i
+        return None
+
+    def span_at(self, offset: int) -> Optional[Span]:
+        """offset을 포함하는 문자열/주석/템플릿/정규식 구간 (코드 위치면 None)"""
+        spans = self.spans
+        i = bisect.bisect_right(self._span_starts, offset) - 1
+        if i >= 0 and offset < spans[i].end:
+            return spans[i]
+        return None
+
+    def in_code(self, offset: int) -> bool:
+        """JS 영역 안이고 문자열/주석/템플릿/정규식 밖인지"""
+        return self.region_at(offset) is not None and self.span_at(offset) is None
+
+    # 함수 경계
+
+    def function_at(self, offset: int) -> Optional[FunctionSpan]:
+        """offset을 포함하는 가장 안쪽 함수"""
+        functions = self.functions
+        i = bisect.bisect_right(self._function_starts, offset) - 1
+        while i >= 0:
+            if offset < functions[i].end:
+                return functions[i]
+            i -= 1
+        return None
+
+    def function_named(self, name: str) -> List[FunctionSpan]:
+        return [f for f in self.functions if f.name == name]
+
+    def _find_functions(self, sig: List[Token], hi: int) -> List[FunctionSpan]:
+        text = self.content
+        partner = _pair_brackets(text, sig)
+        values = [text[tok.start:tok.end] for tok in sig]
+        n = len(sig)
+        found = []
+
+        def body(paren: int) -> int:
+            """닫는 ')' 다음이 '{'이면 그 토큰 번호"""
+            close = partner.get(paren)
+            if close is not None and close + 1 < n and values[close + 1] == '{':
+                return close + 1
+            return -1
+
+        def end_of(brace: int) -> int:
+            close = partner.get(brace)
+            return sig[close].end if close is not None else hi
+
+        for i in range(n):
+            value = values[i]
+            if value == 'function' and sig[i].kind == NAME:
+                j = i + 1
+                if j < n and values[j] == '*':
+                    j += 1
+                name = ''
+                if j < n and sig[j].kind == NAME:
+                    name = values[j]
+                    j += 1
+                elif i >= 2 and values[i - 1] in ('=', ':') and sig[i - 2].kind in (NAME, STRING):
+                    name = values[i - 2].strip('\'"')
+                if j < n and values[j] == '(':
+                    brace = body(j)
+                    if brace >= 0:
+                        found.append(FunctionSpan(name, FUNCTION, sig[i].start,
+                                                  sig[brace].start, end_of(brace)))
+            elif value == '=>' and i + 1 < n and values[i + 1] == '{':
+                if i >= 1 and values[i - 1] == ')' and sig[i - 1].kind == PUNCT:
+                    opened = partner.get(i - 1)
+                    if opened is None:
+                        continue
+                    q = opened
+                elif i >= 1 and sig[i - 1].kind == NAME:
+                    q = i - 1
+                else:
+                    continue
+                if q >= 1 and values[q - 1] == 'async':
+                    q -= 1
+                name = ''
+                if q >= 2 and values[q - 1] in ('=', ':') and sig[q - 2].kind in (NAME, STRING):
+                    name = values[q - 2].strip('\'"')
+                found.append(FunctionSpan(name, ARROW, sig[q].start, sig[i + 1].start,
+                                          end_of(i + 1)))
+            elif sig[i].kind == NAME and value not in _NOT_METHOD and \
+                    i + 1 < n and values[i + 1] == '(' and \
+                    (i == 0 or values[i - 1] in _METHOD_BEFORE):
+                brace = body(i + 1)
+                if brace >= 0:
+                    found.append(FunctionSpan(value, METHOD, sig[i].start,
+                                              sig[brace].start, end_of(brace)))
+        return found
+
+
+def _pair_brackets(text: str, sig: List[Token]) -> Dict[int, int]:
+    """여는 괄호 토큰 번호 ↔ 닫는 괄호 토큰 번호 (템플릿 ${ } 포함, 양방향)
+
+    짝이 안 맞는 닫는 괄호는 스택 안쪽의 같은 종류까지 되감아 맞추고 (js_verify와 같은 복구),
+    그런 여는 괄호가 없으면 무시한다.
+    """
+    partner: Dict[int, int] = {}
+    stack: List[Tuple[str, int]] = []
+    for i, tok in enumerate(sig):
+        if tok.kind == TEMPLATE:
+            if text[tok.start] == '}':
+                _close(stack, '${', i, partner)
+            if text.endswith('${', tok.start, tok.end):
+                stack.append(('${', i))
+        elif tok.kind == PUNCT and tok.end - tok.start == 1:
+            c = text[tok.start]
+            if c in _OPENERS:
+                stack.append((c, i))
+            elif c in _CLOSER_OF:
+                _close(stack, _CLOSER_OF[c], i, partner)
+    return partner
+
+
+def _close(stack: List[Tuple[str, int]], opener: str, i: int, partner: Dict[int, int]):
+    for depth in range(len(stack) - 1, -1, -1):
+        if stack[depth][0] == opener:
+            opened = stack[depth][1]
+            partner[opened] = i
+            partner[i] = opened
+            del stack[depth:]
+            return
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대용량 입력용 스트리밍 console/debugLog 제거
+- 버퍼 단위로 읽고 처리한 부분은 곧바로 임시 파일에 기록 (전체 내용을 메모리에 올리지 않음)
+- 청크는 템플릿 밖의 문장 경계에서만 자르고, 걸쳐 있는 호출은 다음 청크로 이월
+- HTML은 <script> 열림/닫힘 상태를 청크 사이에서 유지
+- 스냅샷 백업은 전체 내용이 필요하므로 만들지 않음 (원본 보존이 필요하면 --output 사용)
+
+사용법:
+    python stream_cleaner.py [파일|디렉터리|glob ...] [--chunk-size 1048576] [--output 경로]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Iterable, NamedTuple, Optional, TextIO, Tuple
+
+from console_stripper import DEFAULT_METHODS, Predicate, scan_console_calls
+from js_lexer import apply_splices, is_html
+from targets import expand_targets
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_SCRIPT_OPEN_RE = re.compile(r'<script\b([^>]*)>', re.IGNORECASE)
+_SCRIPT_CLOSE_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+_TYPE_ATTR_RE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+_JS_TYPES = frozenset([
+    'text/javascript', 'application/javascript', 'module', 'text/ecmascript',
+    'application/ecmascript',
+])
+
+
+class StreamStats(NamedTuple):
+    chars_in: int
+    chars_out: int
+    removed: int
+    chunks: int
+    max_buffer: int
+    seconds: float
+
+
+class StreamStripper:
+    """청크를 받아 처리 가능한 앞부분의 결과를 돌려주고 나머지는 이월하는 상태 기계"""
+
+    def __init__(self, html: bool, methods: Iterable[str] = DEFAULT_METHODS,
+                 include_debuglog: bool = True, predicate: Optional[Predicate] = None):
+        self.methods = frozenset(methods)
+        self.include_debuglog = include_debuglog
+        self.predicate = predicate
+        self.html = html
+        self.in_script = not html   # JS 파일은 처음부터 스크립트 모드
+        self.script_is_js = True
+        self.carry = ''
+        self.removed = 0
+        self.max_buffer = 0
+
+    def _strip(self, text: str, final: bool) -> Tuple[str, str]:
+        """JS 텍스트에서 안전한 경계까지 처리해 (출력, 이월분) 반환"""
+        boundaries = [] if not final else None
+        calls, unclosed = scan_console_calls(text, 0, len(text), self.methods,
+                                             self.include_debuglog, self.predicate,
+                                             boundaries=boundaries)
+        if final:
+            cut = len(text)
+        else:
+            cut = 0
+            spans = [(c.start, c.splice_end) for c in calls]
+            for b in reversed(boundaries):
+                if b > unclosed:
+                    continue
+                if any(start < b < end for start, end in spans):
+                    continue
+                cut = b
+                break
+            calls = [c for c in calls if c.splice_end <= cut]
+        self.removed += len(calls)
+        splices = [(c.splice_start, c.splice_end, c.replacement) for c in calls]
+        return apply_splices(text[:cut], splices), text[cut:]
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        buffer = self.carry + chunk
+        self.carry = ''
+        self.max_buffer = max(self.max_buffer, len(buffer))
+        out = []
+        pos = 0
+        while pos < len(buffer):
+            if not self.in_script:
+                m = _SCRIPT_OPEN_RE.search(buffer, pos)
+                if m is None:
+                    # '<script' 태그가 청크 경계에 걸쳐 있을 수 있으므로 마지막 '<'부터 이월
+                    tail = buffer.rfind('<', pos)
+                    if final or tail < 0:
+                        out.append(buffer[pos:])
+                    else:
+                        out.append(buffer[pos:tail])
+                        self.carry = buffer[tail:]
+                    break
+                out.append(buffer[pos:m.end()])
+                type_match = _TYPE_ATTR_RE.search(m.group(1))
+                self.script_is_js = not type_match or type_match.group(1).lower() in _JS_TYPES
+                self.in_script = True
+                pos = m.end()
+                continue
+
+            close = _SCRIPT_CLOSE_RE.search(buffer, pos) if self.html else None
+            if close is not None:
+                body = buffer[pos:close.start()]
+                out.append(self._strip(body, True)[0] if self.script_is_js else body)
+                out.append(buffer[close.start():close.end()])
+                self.in_script = False
+                pos = close.end()
+                continue
+
+            body = buffer[pos:]
+            if not self.script_is_js:
+                # 닫는 태그가 경계에 걸쳐 있을 수 있으므로 마지막 '<'부터 이월
+                tail = body.rfind('<')
+                if final or tail < 0:
+                    out.append(body)
+                else:
+                    out.append(body[:tail])
+                    self.carry = body[tail:]
+                break
+            done, self.carry = self._strip(body, final)
+            out.append(done)
+            break
+        return ''.join(out)
+
+
+def strip_stream(src: TextIO, dst: TextIO, html: bool, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 **options) -> StreamStats:
+    """src에서 청크 단위로 읽어 dst에 바로 기록"""
+    started = time.perf_counter()
+    stripper = StreamStripper(html, **options)
+    chars_in = chars_out = chunks = 0
+    while True:
+        # 자를 경계를 못 찾아 이월분이 쌓이면 읽기 크기를 늘려 재스캔 비용을 선형으로 유지
+        chunk = src.read(max(chunk_size, len(stripper.carry)))
+        final = not chunk
+        out = stripper.feed(chunk, final=final)
+        dst.write(out)
+        chars_out += len(out)
+        if final:
+            break
+        chars_in += len(chunk)
+        chunks += 1
+    return StreamStats(chars_in, chars_out, stripper.removed, chunks, stripper.max_buffer,
+                       time.perf_counter() - started)
+
+
+def strip_file_streaming(file_path: str, output_path: Optional[str] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE, **options) -> StreamStats:
+    """파일을 스트리밍으로 정리. output_path가 없으면 임시 파일에 쓴 뒤 원본을 교체"""
+    target = output_path or file_path + '.stream.tmp'
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as src, \
+                open(target, 'w', encoding='utf-8', newline='') as dst:
+            stats = strip_stream(src, dst, is_html(file_path), chunk_size, **options)
+    except Exception:
+        if output_path is None and os.path.exists(target):
+            os.remove(target)
+        raise
+    if output_path is None:
+        os.replace(target, file_path)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대용량 파일을 일정한 메모리로 정리")
+    parser.add_argument('files', nargs='*', help="대상 파일/디렉터리/glob (기본: index.html)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="한 번에 읽을 문자 수")
+    parser.add_argument('--output', help="결과를 쓸 경로 (파일 하나일 때만, 기본: 원본 교체)")
+    args = parser.parse_args(argv)
+
+    paths = expand_targets(args.files)
+    if args.output and len(paths) != 1:
+        print("❌ --output은 파일 하나에만 사용할 수 있습니다")
+        return 1
+    for file_path in paths:
+        stats = strip_file_streaming(file_path, args.output, args.chunk_size)
+        print(f"📁 {file_path}: {stats.removed} calls removed, {stats.chunks} chunks, "
+              f"max buffer {stats.max_buffer} chars, {stats.seconds * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
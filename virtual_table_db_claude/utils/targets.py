@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+처리 대상 파일 목록 해석
+- 파일, 디렉터리, glob 패턴을 받아 정렬된 소스 파일 목록으로 확장
+- 인자가 없으면 저장소의 index.html
+"""
+
+import glob
+import os
+from typing import Iterable, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGET = os.path.join(REPO_ROOT, 'index.html')
+
+# 매니페스트/스냅샷 등 도구 캐시 디렉터리 이름 (대상 파일 옆에 생성)
+CACHE_DIR_NAME = '.cleanup_cache'
+
+# 디렉터리를 지정했을 때 포함할 확장자
+SOURCE_EXTENSIONS = ('.html', '.htm', '.js', '.gs')
+# 디렉터리 탐색에서 제외할 경로
+SKIP_DIRS = frozenset(['.git', 'node_modules', CACHE_DIR_NAME, 'dist', 'build', '__pycache__'])
+
+
+def default_cache_dir(file_path: str) -> str:
+    """대상 파일과 같은 디렉터리의 도구 캐시 경로"""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+
+
+def _walk(directory: str) -> Iterable[str]:
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def expand_targets(args: Iterable[str]) -> List[str]:
+    """파일/디렉터리/glob 인자를 중복 없는 정렬된 파일 목록으로 변환"""
+    args = list(args) or [DEFAULT_TARGET]
+    found = set()
+    for arg in args:
+        if os.path.isdir(arg):
+            found.update(_walk(arg))
+        elif glob.has_magic(arg):
+            for path in glob.glob(arg, recursive=True):
+                if os.path.isdir(path):
+                    found.update(_walk(path))
+                elif os.path.isfile(path):
+                    found.add(path)
+        else:
+            found.add(arg)
+    return sorted(os.path.normpath(path) for path in found)
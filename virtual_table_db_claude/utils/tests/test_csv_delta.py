@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DeltaTracker 패치를 클라이언트 쪽에서 적용(apply_patch)하면 서버 스냅샷과 같아지는지,
+기록 밖이거나 epoch이 다른 커서는 전체 스냅샷을 받는지 확인
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_delta import DeltaTracker, apply_patch, diff_hashes, row_hash, trim_row  # noqa: E402
+
+
+def mutate(rows, rng):
+    """행 삽입/삭제/수정/끝 추가와 끝 빈 칸 추가를 무작위로 섞는다"""
+    rows = [list(row) for row in rows]
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        at = rng.randrange(len(rows) + 1)
+        if roll < 0.25:
+            rows.insert(at, [f'new{rng.random():.6f}', str(rng.randint(0, 9))])
+        elif roll < 0.45 and rows:
+            del rows[at % len(rows):at % len(rows) + rng.randint(1, 3)]
+        elif roll < 0.7 and rows:
+            rows[at % len(rows)][0] = f'edit{rng.randint(0, 99)}'
+        elif roll < 0.85:
+            rows.append(['', ''] if rng.random() < 0.5 else [f'tail{len(rows)}'])
+        elif rows:
+            rows[at % len(rows)] = rows[at % len(rows)] + ['', '']
+    return rows
+
+
+class CsvDeltaTest(unittest.TestCase):
+    def test_patches_rebuild_the_snapshot_from_every_cursor(self):
+        rng = random.Random(17)
+        tracker = DeltaTracker(history=8)
+        rows = [[f'r{i}', str(i), ''] for i in range(200)]
+        tracker.update('s', rows)
+        clients = {tracker.since('s')['cursor']: [trim_row(row) for row in rows]}
+        for _ in range(60):
+            rows = mutate(rows, rng)
+            tracker.update('s', rows)
+            expected = [trim_row(row) for row in rows]
+            for cursor, snapshot in list(clients.items()):
+                patch = tracker.since('s', cursor)
+                with self.subTest(cursor=cursor):
+                    self.assertEqual(apply_patch(snapshot, patch), expected)
+            clients[tracker.since('s')['cursor']] = expected
+            self.assertEqual(tracker.sheets['s'].rows, expected)
+
+    def test_stale_or_foreign_cursor_gets_full_snapshot(self):
+        tracker = DeltaTracker(history=2)
+        tracker.update('s', [['a']])
+        old = tracker.sheets['s'].cursor()
+        for value in 'bcd':
+            tracker.update('s', [['a'], [value]])
+        epoch = tracker.sheets['s'].epoch
+        for cursor in [old, 'other.1', f'{epoch}.x', None]:
+            with self.subTest(cursor=cursor):
+                patch = tracker.since('s', cursor)
+                self.assertTrue(patch.get('full'))
+                self.assertEqual(patch['data'], [['a'], ['d']])
+
+    def test_trailing_empty_cells_are_not_a_change(self):
+        tracker = DeltaTracker()
+        version, _ = tracker.update('s', [['a', 'b']])
+        self.assertEqual(tracker.update('s', [['a', 'b', '', '']]), (version, False))
+
+    def test_diff_hashes_covers_every_change(self):
+        rng = random.Random(5)
+        old = [[str(rng.randint(0, 5))] for _ in range(300)]
+        for _ in range(200):
+            new = mutate(old, rng)
+            a, b = [row_hash(r) for r in old], [row_hash(r) for r in new]
+            rebuilt = list(a)
+            for i1, i2, j1, j2 in reversed(diff_hashes(a, b)):
+                rebuilt[i1:i2] = b[j1:j2]
+            self.assertEqual(rebuilt, b)
+
+
+if __name__ == '__main__':
+    unittest.main()
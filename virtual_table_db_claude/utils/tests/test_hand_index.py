@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TimeIndex 조회가 appScripts.gs 방식의 선형 검색(linear_first_match/linear_nearest,
+range_batch_verify)과 같은 결과를 내는지 확인
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hand_index import (HandTable, TIME_COLUMN, generate_hand_rows, linear_first_match,  # noqa: E402
+                        linear_nearest, range_batch_verify)
+
+
+def messy_rows(count: int, seed: int):
+    """생성한 시트에 중복 시각, 숫자 아닌 값, 짧은 행을 섞는다"""
+    rng = random.Random(seed)
+    rows = generate_hand_rows(count, seed=seed)
+    for row in rows:
+        roll = rng.random()
+        if roll < 0.05:
+            row[TIME_COLUMN - 1] = rng.choice(['abc', ' 12x', '-', '1e3', '  '])
+        elif roll < 0.10 and len(row) >= TIME_COLUMN:
+            other = rows[rng.randrange(count)]
+            row[TIME_COLUMN - 1] = other[TIME_COLUMN - 1] if len(other) >= TIME_COLUMN else ''
+        elif roll < 0.12:
+            del row[TIME_COLUMN - 1:]
+    return rows
+
+
+class TimeIndexTest(unittest.TestCase):
+    def test_lookups_match_linear_scan(self):
+        for seed in range(4):
+            table = HandTable(messy_rows(2000, seed))
+            stamps = table.time_index.stamps
+            rng = random.Random(seed)
+            targets = [str(rng.randint(stamps[0] - 900, stamps[-1] + 900)) for _ in range(300)]
+            targets += [row[TIME_COLUMN - 1] for row in rng.sample(table.rows, 100) if len(row) >= TIME_COLUMN]
+            for target in targets:
+                if not target.strip() or table.find_hand(target) is None and linear_first_match(table, target) is None:
+                    continue
+                with self.subTest(seed=seed, target=target):
+                    self.assertEqual(table.find_hand(target), linear_first_match(table, target))
+                    self.assertEqual(table.find_hand(target, nearest=True), linear_nearest(table, target))
+
+    def test_misses_match_linear_scan(self):
+        table = HandTable(messy_rows(500, 7))
+        for target in ['', 'abc', '-999999999999', str(table.time_index.stamps[-1] + 10_000)]:
+            with self.subTest(target=target):
+                self.assertIsNone(table.find_hand(target))
+                self.assertEqual(table.find_hand(target), linear_first_match(table, target))
+                self.assertIsNone(table.find_hand(target, nearest=True))
+                self.assertIsNone(linear_nearest(table, target))
+
+    def test_batch_verify_matches_range_read(self):
+        table = HandTable(messy_rows(1000, 1))
+        rng = random.Random(1)
+        for _ in range(50):
+            rows = rng.sample(range(1, 1100), 20) + [str(rng.randint(1, 1000)), 'x']
+            with self.subTest(rows=rows):
+                self.assertEqual(table.batch_verify(rows), range_batch_verify(table, rows))
+        self.assertIsNone(table.batch_verify(['x', 0]))
+        self.assertIsNone(range_batch_verify(table, ['x', 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 실행(run_incremental) 결과가 전체 실행(pipeline.run_pipeline)과 같은지 확인
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental import IncrementalRunner, run_incremental  # noqa: E402
+from pipeline import UNIT_SAFE_STAGES, run_pipeline, run_stages  # noqa: E402
+from targets import REPO_ROOT  # noqa: E402
+
+INDEX_HTML = os.path.join(REPO_ROOT, 'index.html')
+
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def copy(self, name: str) -> str:
+        path = os.path.join(self.tmp, name)
+        shutil.copyfile(INDEX_HTML, path)
+        return path
+
+    def read(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_index_html_matches_full_pipeline(self):
+        for stage in sorted(UNIT_SAFE_STAGES):
+            with self.subTest(stage=stage):
+                full = self.copy(f'full-{stage}.html')
+                incremental = self.copy(f'incremental-{stage}.html')
+                run_pipeline(full, [stage], backup=False, verify=False)
+                cache_dir = os.path.join(self.tmp, 'cache')
+                run_incremental(incremental, [stage], cache_dir)
+                self.assertEqual(self.read(incremental), self.read(full))
+                # 캐시를 재사용하는 두 번째 실행도 전체 실행을 한 번 더 한 것과 같아야 함
+                stats = run_incremental(incremental, [stage], cache_dir)
+                run_pipeline(full, [stage], backup=False, verify=False)
+                self.assertEqual(stats.transformed, 0)
+                self.assertEqual(self.read(incremental), self.read(full))
+
+    def test_blank_line_collapse_across_statements(self):
+        # 문장 경계에 걸친 빈 줄: 문장 단위로 자르면 advanced/final_console 결과가 달라짐
+        doc = '<script>\nfunction a() {\n' + '  x();\n' * 300 + '}\n\n\n\nfunction b() {}\n</script>\n'
+        for stages in (['advanced_console'], ['final_console'], ['strip_console'],
+                       ['strip_console', 'advanced_console']):
+            with self.subTest(stages=stages):
+                output, _, _ = IncrementalRunner(stages).run(doc, 'doc.html', {})
+                self.assertEqual(output, run_stages(doc, stages, 'doc.html')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
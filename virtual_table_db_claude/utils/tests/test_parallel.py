@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+병렬 실행이 pipeline.run_pipeline과 같은 결과를 쓰고, 구문을 깨뜨린 결과는 저장하지 않는지 확인
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline  # noqa: E402
+from parallel import run_parallel  # noqa: E402
+from targets import REPO_ROOT  # noqa: E402
+
+
+def _break_braces(content, path='', report=None):
+    """첫 '{'를 지워 구문 오류를 만드는 시험용 단계"""
+    return content.replace('{', '', 1), 1
+
+
+class ParallelTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        pipeline.STAGES['break_braces'] = _break_braces
+        self.addCleanup(pipeline.STAGES.pop, 'break_braces')
+
+    def copy(self, name: str, target: str) -> str:
+        path = os.path.join(self.tmp, target)
+        shutil.copyfile(os.path.join(REPO_ROOT, name), path)
+        return path
+
+    def read(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_matches_full_pipeline(self):
+        paths = [self.copy('index.html', 'index.html'), self.copy('g-column-checkbox-handler.js', 'g.js')]
+        expected = []
+        for path in paths:
+            full = path + '.full'
+            shutil.copyfile(path, full)
+            pipeline.run_pipeline(full, ['strip_console'], backup=False)
+            expected.append(self.read(full))
+        results = run_parallel(paths, ['strip_console'], workers=1, backup=False)
+        self.assertEqual([r.error for r in results], [None, None])
+        self.assertEqual([self.read(path) for path in paths], expected)
+
+    def test_broken_output_is_reported_not_saved(self):
+        path = self.copy('g-column-checkbox-handler.js', 'g.js')
+        original = self.read(path)
+        [result] = run_parallel([path], ['break_braces'], workers=1, backup=False)
+        self.assertIn('break_braces', result.error)
+        self.assertFalse(result.changed)
+        self.assertEqual(self.read(path), original)
+
+    def test_reports_collect_rule_stats(self):
+        path = self.copy('g-column-checkbox-handler.js', 'g.js')
+        [result] = run_parallel([path], ['strip_console'], workers=1, backup=False)
+        self.assertTrue(result.report.rules)
+        self.assertLess(sum(result.report.console_after.values()), sum(result.report.console_before.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DuplicateScanner가 참조 구현(naive_duplicates)과 같은 행을 삭제 대상으로 고르는지 확인
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player_dedupe import DuplicateScanner, generate_player_rows, naive_duplicates, normalize_seat  # noqa: E402
+
+HEADER = ['h'] * 8
+
+
+class PlayerDedupeTest(unittest.TestCase):
+    def test_non_decimal_digit_seat_is_kept_as_text(self):
+        scanner = DuplicateScanner().scan([HEADER, ['a', 'T', '', '', '', '', '²', 'IN']])
+        self.assertEqual((scanner.players, scanner.unique), (1, 1))
+        self.assertEqual(normalize_seat('²'), '²')
+
+    def test_seat_leading_zeros_are_ignored(self):
+        rows = [HEADER, ['a', 'T', '', '', '', '', '3', 'IN'], ['a', 'T', '', '', '', '', '03', 'IN']]
+        self.assertEqual([d.row for d in DuplicateScanner().scan(rows).duplicates], [3])
+
+    def test_generated_rows_match_reference(self):
+        for seed in range(5):
+            rows = list(generate_player_rows(3000, tables=20, duplicate_ratio=0.2, seed=seed))
+            with self.subTest(seed=seed):
+                actual = [d.row for d in DuplicateScanner().scan(rows).duplicates]
+                self.assertEqual(actual, naive_duplicates(rows))
+
+    def test_fuzzed_cells_match_reference(self):
+        rng = random.Random(18)
+        cells = ['', ' ', '"', 'a', 'A', ' a ', 'T', 'T1', '3', '03', '²', '٣', '½', 'in', 'IN', 'OUT', 'é', 'é']
+        rows = [HEADER] + [[rng.choice(cells) for _ in range(8)] for _ in range(5000)]
+        actual = [d.row for d in DuplicateScanner().scan(rows).duplicates]
+        self.assertEqual(actual, naive_duplicates(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
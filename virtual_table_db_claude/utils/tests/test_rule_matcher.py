@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RuleMatcher 분류가 규칙별 re.search 기준 구현과 같은지 확인
+(user-003 이전 ConsoleLogCleaner.should_remove_console을 그대로 옮긴 기준 구현과 비교)
+"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console_cleanup_script import ConsoleLogCleaner  # noqa: E402
+from rule_matcher import Rule, RuleMatcher  # noqa: E402
+
+
+def baseline_should_remove(patterns, line):
+    """규칙별로 순서대로 검사하던 원래 판단 (True 제거 / False 보존 / None 콘솔 아님)"""
+    for pattern in patterns['critical_errors']:
+        if re.search(pattern, line, re.IGNORECASE):
+            return False
+    for pattern in patterns['debug_logs']:
+        if re.search(pattern, line, re.IGNORECASE):
+            return True
+    if re.search(r'console\.(log|warn|info|debug)\s*\(', line):
+        if 'console.error' in line and ('catch' in line or 'error' in line.lower()):
+            return False
+        return True
+    return None
+
+
+FRAGMENTS = [
+    'console.log(', 'console.warn(', 'console.info(', 'console.debug(', 'console.error(',
+    'debugLog(', '.catch(', 'catch (e) { ', 'onerror = ', "'DEBUG'", '"API"', "'WARN'",
+    "'ERROR'", '파일명 생성 오류', '캐시 갱신 실패', '`🔍 ', '`✅ ', '`', ')', ');', '(',
+    'e', 'x', ' ', '\n', '{', '}', 'error', 'CONSOLE.LOG(',
+]
+
+
+class RuleMatcherEquivalenceTest(unittest.TestCase):
+    def setUp(self):
+        self.cleaner = ConsoleLogCleaner('')
+        self.patterns = self.cleaner.console_patterns
+
+    def decide(self, line):
+        before = self.cleaner.removed_count + self.cleaner.preserved_count
+        removed = self.cleaner.should_remove_console(line)
+        if self.cleaner.removed_count + self.cleaner.preserved_count == before:
+            return None
+        return removed
+
+    def test_critical_inside_debug_match_is_preserved(self):
+        line = 'debugLog(.catch(console.error(x));'
+        self.assertFalse(baseline_should_remove(self.patterns, line))
+        self.assertFalse(self.decide(line))
+
+    def test_fuzzed_statements_match_baseline(self):
+        rng = random.Random(3)
+        for _ in range(20000):
+            line = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+            with self.subTest(line=line):
+                self.assertEqual(self.decide(line), baseline_should_remove(self.patterns, line))
+
+    def test_first_registered_rule_wins_within_category(self):
+        matcher = RuleMatcher([Rule('a', 'a#0', r'foo'), Rule('a', 'a#1', r'bar'),
+                               Rule('b', 'b#0', r'baz')], ['a', 'b'])
+        match = matcher.classify('baz bar foo')
+        self.assertEqual((match.category, match.rule), ('a', 'a#0'))
+        self.assertEqual(matcher.hits['a#0'], 1)
+
+    def test_scan_reports_overlapping_hits_across_categories(self):
+        matcher = RuleMatcher([Rule('low', 'low#0', r'debugLog\([^)]*\)'),
+                               Rule('high', 'high#0', r'\.catch\(')], ['high', 'low'])
+        categories = {m.category for m in matcher.scan('debugLog(.catch(x)')}
+        self.assertEqual(categories, {'high', 'low'})
+
+    def test_first_char_guard_keeps_every_match(self):
+        # 최상위 |, 생략 가능한 첫 글자가 있으면 선검사 없이, 대소문자 접기는 엔진에 맡김
+        cases = [
+            ([Rule('a', 'a#0', r'b|x')], 'ax', 'a#0'),
+            ([Rule('a', 'a#0', r'y?z')], 'z', 'a#0'),
+            ([Rule('a', 'a#0', r'\.catch'), Rule('b', 'b#0', r'st', re.IGNORECASE)], 'ſt', 'b#0'),
+            ([Rule('a', 'a#0', r'[(]x'), Rule('b', 'b#0', r'q')], '(x', 'a#0'),
+        ]
+        for rules, text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(RuleMatcher(rules).classify(text).rule, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
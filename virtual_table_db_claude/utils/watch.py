@@ -0,0 +1,697 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+저장할 때마다 정리 파이프라인을 다시 적용하는 감시 모드
+- 파일 변경은 inotify(리눅스, ctypes)로 받고, 안 되면 mtime/크기 폴링
+- 연달아 들어오는 저장은 조용해질 때까지(--debounce) 모아서 한 번에 처리
+- 문서를 문장 조각으로 나눠 두고, 저장 전후 내용의 공통 앞/뒤를 잘라 편집된 조각만
+  다시 토큰화/변환 (나머지 조각은 캐시된 결과 재사용)
+- 결과는 원본을 건드리지 않고 --out-dir에 같은 상대 경로로 저장. 단계가 새 구문 오류를
+  만들면 저장하지 않음 (pipeline과 같은 검증). 검증도 단계를 다시 실행한 조각에서만 하고
+  결과를 조각 캐시에 같이 둔다. 첫 처리와 전체 다시 처리 때는 문서 전체를 검증
+
+조각 경계: console 호출 밖에서 ';' '{' '}' 뒤의 줄바꿈 (빈 줄이 아닌 곳). 경계에서 렉서에 남는 상태는
+템플릿 표현식 중괄호 스택뿐이라 조각마다 그 스택을 같이 저장하고, 스택이 있는 조각은 같은
+상태를 만드는 짧은 접두어("`${" + "{"*n ... ";\n")를 붙여 토큰화/변환한 뒤 떼어 낸다.
+(닫히지 않은 템플릿 뒤의 긴 구간도 잘게 나뉜다.) 편집 때문에 끝 경계가 더는 유효하지 않거나
+상태가 달라지면(문자열/주석/템플릿을 열어 둔 경우 등) 뒤 조각까지 두 배씩 넓혀 다시 자른다.
+단계가 pipeline.STATEMENT_SAFE_STAGES가 아니면 스크립트 블록 단위로만 다시 실행한다.
+
+사용법:
+    python watch.py [파일|디렉터리|glob ...] [--stages strip_console] [--out-dir build]
+                    [--debounce 50] [--poll] [--interval 0.1] [--once]
+    python watch.py --bench 200 [index.html]
+"""
+
+import argparse
+import bisect
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import random
+import re
+import select
+import statistics
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from console_stripper import DEBUG_LOG, DEFAULT_METHODS
+from js_lexer import COMMENT, PUNCT, TEMPLATE, WS, js_regions, tokenize
+from js_verify import SyntaxIssue, new_issues, verify
+from pipeline import DEFAULT_STAGES, STAGES, STATEMENT_SAFE_STAGES, UNIT_SAFE_STAGES, run_stages
+from targets import REPO_ROOT, expand_targets
+
+DEFAULT_OUT_DIR = 'build'
+DEFAULT_DEBOUNCE_MS = 50
+MAX_DELAY_MS = 1000        # 저장이 계속 이어져도 이 시간 안에는 한 번 처리
+DEFAULT_POLL_INTERVAL = 0.1
+# 조각이 너무 작으면 캐시 키 계산만 늘어나므로 이 크기 이상에서만 자른다
+MIN_CHUNK_SIZE = 2048
+_NOT_CALL = ('.', '?.', 'function')  # console_stripper와 같이 이 뒤의 이름은 호출로 보지 않음
+
+DEFAULT_WATCH = (
+    os.path.join(REPO_ROOT, 'index.html'),
+    os.path.join(REPO_ROOT, 'g-column-checkbox-handler.js'),
+    os.path.join(REPO_ROOT, 'src', 'js'),
+)
+
+_LEADING_WS_RE = re.compile(r'[ \t\r\n\f\v\u00a0\u2028\u2029\ufeff]*')
+
+
+State = Tuple[int, ...]  # 조각 시작에서 렉서의 템플릿 표현식 중괄호 스택
+
+
+class Chunk(NamedTuple):
+    start: int
+    end: int
+    is_js: bool
+    state: State = ()
+
+
+class ChunkResult(NamedTuple):
+    output: str
+    edits: int
+    added: List[SyntaxIssue]  # 단계가 조각 안에 새로 만든 구문 오류 (조각 기준 위치)
+
+
+class UpdateStats(NamedTuple):
+    chunks: int        # 문서 전체 조각 수 (JS)
+    dirty: int         # 다시 자른 조각 수 (JS)
+    transformed: int   # 단계를 실제로 실행한 조각 수
+    edits: int         # 문서 전체의 단계 수정 횟수
+    full: bool         # 전체 다시 처리 여부
+    seconds: float
+    added: List[Tuple[int, SyntaxIssue]]  # (문서 기준 줄, 새 구문 오류)
+
+
+def state_prefix(state: State) -> str:
+    """렉서를 state(템플릿 표현식 중괄호 스택)와 문장 경계 상태로 만드는 접두어"""
+    if not state:
+        return ''
+    return ''.join('`${' + '{' * braces for braces in state) + ';\n'
+
+
+def statement_cuts(text: str, lo: int, hi: int, state: State = (),
+                   min_size: int = MIN_CHUNK_SIZE) -> Tuple[List[Tuple[int, State]], Optional[State]]:
+    """JS 구간 [lo, hi)의 (경계, 그 위치의 렉서 상태) 목록과, hi가 경계라면 그 상태 (아니면 None)
+
+    lo에서 렉서 상태가 state라고 보고 토큰화한다. 경계는 ';' '{' '}' 뒤에 오는, 줄바꿈이
+    하나뿐인 공백의 줄바꿈 직후 중에서 console/debugLog 호출 후보가 열려 있지 않은 곳.
+    호출 짝은 console_stripper와 같이 ( [ {를 섞어 센다. 호출이 경계 바로 앞에서 닫히면
+    다음 토큰에 따라 치환이 달라지므로 그 위치도 경계로 쓰지 않는다.
+    """
+    prefix = state_prefix(state)
+    if prefix:
+        source = prefix + text[lo:hi]
+        shift = lo - len(prefix)
+        tokens = tokenize(source)
+    else:
+        source, shift = text, 0
+        tokens = tokenize(text, lo, hi)
+    skip = len(prefix)
+    cuts = []
+    stack: List[int] = list(state)
+    depth = 0
+    calls: List[int] = []  # 열린 호출 후보의 여는 괄호 직전 깊이
+    recent = ['', '', '', '']  # 직전 유효 토큰 4개
+    statement_end = bool(prefix)
+    last = lo
+    tok = None
+    for tok in tokens:
+        if tok.start < skip:
+            continue
+        kind = tok.kind
+        if kind == WS:
+            if statement_end and not calls:
+                newline = source.find('\n', tok.start, tok.end)
+                cut = newline + 1 + shift
+                if newline >= 0 and source.find('\n', newline + 1, tok.end) < 0 \
+                        and cut - last >= min_size and cut < hi:
+                    cuts.append((cut, tuple(stack)))
+                    last = cut
+            continue
+        if kind == COMMENT:
+            continue
+        statement_end = False
+        word = source[tok.start:tok.end]
+        if kind == TEMPLATE:
+            if word[0] == '}' and stack:
+                stack.pop()
+            if word.endswith('${'):
+                stack.append(0)
+        elif kind == PUNCT and len(word) == 1:
+            if word in '([{':
+                if word == '(' and (
+                        recent[-1] == DEBUG_LOG and recent[-2] not in _NOT_CALL or
+                        recent[-1] in DEFAULT_METHODS and recent[-2] == '.' and
+                        recent[-3] == 'console' and recent[-4] not in _NOT_CALL):
+                    calls.append(depth)
+                depth += 1
+            elif word in ')]}':
+                depth -= 1
+            if stack and word in '{}':
+                stack[-1] += 1 if word == '{' else -1
+            if calls and depth <= calls[-1]:
+                while calls and depth <= calls[-1]:
+                    calls.pop()
+            elif word in ';{}':
+                statement_end = True
+        recent = recent[1:] + [word]
+    end = len(source)
+    if tok is None or tok.start < skip:
+        return cuts, tuple(stack)
+    if statement_end and not calls and tok.kind == WS and tok.end == end and \
+            source[end - 1] == '\n' and source.count('\n', tok.start, end) == 1:
+        return cuts, tuple(stack)
+    return cuts, None
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode('utf-8', 'surrogatepass'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """두 문자열의 공통 앞부분 길이 (슬라이스 비교로 이분 탐색)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class WatchedDocument:
+    """한 파일의 조각 목록과 조각별 단계 결과"""
+
+    def __init__(self, path: str, stages: Sequence[str] = DEFAULT_STAGES):
+        unsafe = [name for name in stages if name not in UNIT_SAFE_STAGES]
+        if unsafe:
+            raise ValueError(f"조각별 실행이 불가능한 단계: {', '.join(unsafe)}")
+        self.path = path
+        self.stages = list(stages)
+        self.stage_key = ','.join(self.stages)
+        self.fine = all(name in STATEMENT_SAFE_STAGES for name in self.stages)
+        self.content = ''
+        self.regions: List[Tuple[int, int]] = []
+        self.chunks: List[Chunk] = []
+        self.outputs: List[str] = []
+        self.keys: List[Optional[str]] = []
+        self.cache: Dict[str, ChunkResult] = {}
+
+    @property
+    def output(self) -> str:
+        return ''.join(self.outputs)
+
+    @property
+    def edits(self) -> int:
+        return sum(self.cache[key].edits for key in self.keys if key is not None)
+
+    def added_issues(self) -> List[Tuple[int, SyntaxIssue]]:
+        """현재 조각들에서 단계가 만든 구문 오류 (문서 기준 줄 번호와 함께)"""
+        found = []
+        for chunk, key in zip(self.chunks, self.keys):
+            if key is not None and self.cache[key].added:
+                line = self.content.count('\n', 0, chunk.start)
+                found.extend((line + issue.line, issue) for issue in self.cache[key].added)
+        return found
+
+    def _stats(self, dirty: int, transformed: int, full: bool, started: float) -> UpdateStats:
+        return UpdateStats(sum(1 for chunk in self.chunks if chunk.is_js), dirty, transformed,
+                           self.edits, full, time.perf_counter() - started, self.added_issues())
+
+    def _split(self, content: str, regions: List[Tuple[int, int]], lo: int, hi: int,
+               state: State = (), end_state: State = ()) -> Optional[List[Chunk]]:
+        """[lo, hi)를 조각으로 나눔 (lo의 렉서 상태는 state)
+
+        hi가 스크립트 중간인데 경계가 아니거나 그 위치의 상태가 end_state와 다르면 None.
+        """
+        chunks = []
+        pos = lo
+        for rlo, rhi in regions:
+            if rhi <= lo or rlo >= hi:
+                continue
+            s, e = max(rlo, lo), min(rhi, hi)
+            if s > pos:
+                chunks.append(Chunk(pos, s, False))
+            start_state = state if s == lo else ()
+            if self.fine:
+                cuts, at_end = statement_cuts(content, s, e, start_state)
+            else:
+                cuts, at_end = [], ()
+            if e < rhi and at_end != end_state:
+                return None
+            bounds = [(s, start_state)] + cuts + [(e, ())]
+            chunks.extend(Chunk(x, y, True, st) for (x, st), (y, _) in zip(bounds, bounds[1:]))
+            pos = e
+        if pos < hi:
+            chunks.append(Chunk(pos, hi, False))
+        return chunks
+
+    def _transform(self, content: str, chunks: List[Chunk]) -> Tuple[List[str], List[Optional[str]], int]:
+        outputs = []
+        keys = []
+        transformed = 0
+        for chunk in chunks:
+            text = content[chunk.start:chunk.end]
+            if not chunk.is_js:
+                outputs.append(text)
+                keys.append(None)
+                continue
+            prefix = state_prefix(chunk.state)
+            key = _digest(self.stage_key, prefix, text)
+            entry = self.cache.get(key)
+            if entry is None:
+                source = prefix + text
+                output, results = run_stages(source, self.stages, 'unit.js')
+                if not output.startswith(prefix):
+                    raise ValueError(f"{self.path}: 단계가 조각 접두어를 바꿈 (offset {chunk.start})")
+                added = []
+                if output != source:
+                    skipped = prefix.count('\n')
+                    added = [issue._replace(line=issue.line - skipped)
+                             for issue in new_issues(source, verify(source, 'unit.js'),
+                                                     output, verify(output, 'unit.js'))]
+                entry = self.cache[key] = ChunkResult(output[len(prefix):],
+                                                      sum(r.edits for r in results), added)
+                transformed += 1
+            outputs.append(entry.output)
+            keys.append(key)
+        return outputs, keys, transformed
+
+    def _prune(self):
+        if len(self.cache) > 2 * len(self.keys) + 64:
+            self.cache = {key: self.cache[key] for key in self.keys if key is not None}
+
+    def load(self, content: str) -> UpdateStats:
+        """전체 다시 처리"""
+        started = time.perf_counter()
+        regions = js_regions(content, self.path)
+        chunks = self._split(content, regions, 0, len(content))
+        outputs, keys, transformed = self._transform(content, chunks)
+        self.content, self.regions, self.chunks = content, regions, chunks
+        self.outputs, self.keys = outputs, keys
+        self._prune()
+        return self._stats(sum(1 for chunk in chunks if chunk.is_js), transformed, True, started)
+
+    def update(self, content: str) -> Optional[UpdateStats]:
+        """바뀐 조각만 다시 처리. 내용이 같으면 None"""
+        old = self.content
+        if content == old:
+            return None
+        if not self.chunks:
+            return self.load(content)
+        started = time.perf_counter()
+        a = _common_prefix(old, content)
+        suffix = _common_suffix(old, content, min(len(old), len(content)) - a)
+        b_old = len(old) - suffix
+        delta = len(content) - len(old)
+
+        # 스크립트 블록 구조가 편집 위치 이동만큼만 바뀌었는지 확인 (아니면 전체 처리)
+        regions = js_regions(content, self.path)
+        expected = []
+        for lo, hi in self.regions:
+            if hi < a:
+                expected.append((lo, hi))
+            elif lo > b_old:
+                expected.append((lo + delta, hi + delta))
+            elif lo <= a and b_old <= hi:
+                expected.append((lo, hi + delta))
+            else:
+                return self.load(content)
+        if regions != expected:
+            return self.load(content)
+
+        chunks = self.chunks
+        i = bisect.bisect_left([chunk.end for chunk in chunks], a)
+        if 0 < i < len(chunks) and chunks[i - 1].is_js and chunks[i].is_js and \
+                a <= _LEADING_WS_RE.match(old, chunks[i].start).end():
+            i -= 1  # 조각 앞 공백이 바뀌면 앞 경계의 조건도 다시 확인
+        i = min(i, len(chunks) - 1)
+        j = max(bisect.bisect_right([chunk.start for chunk in chunks], b_old) - 1, i)
+        step = 1
+        while True:
+            end_state = chunks[j + 1].state if j + 1 < len(chunks) else ()
+            replaced = self._split(content, regions, chunks[i].start, chunks[j].end + delta,
+                                   chunks[i].state, end_state)
+            if replaced is not None:
+                break
+            # 렉서 상태가 바로 다시 맞지 않으면(따옴표/백틱을 연 경우) 한 조각씩이 아니라
+            # 두 배씩 넓혀 다시 토큰화하는 양을 선형으로 유지
+            j = min(j + step, len(chunks) - 1)
+            step *= 2
+
+        outputs, keys, transformed = self._transform(content, replaced)
+        tail = [chunk._replace(start=chunk.start + delta, end=chunk.end + delta) for chunk in chunks[j + 1:]]
+        self.chunks = chunks[:i] + replaced + tail
+        self.outputs[i:j + 1] = outputs
+        self.keys[i:j + 1] = keys
+        self.content, self.regions = content, regions
+        self._prune()
+        return self._stats(sum(1 for chunk in replaced if chunk.is_js), transformed, False, started)
+
+
+# ========================================
+# 변경 감지
+# ========================================
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """디렉터리별 inotify 감시. wait()는 바뀐 파일 경로 집합 (넘치면 None)"""
+
+    def __init__(self, directories: Iterable[str]):
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify를 지원하지 않는 환경")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.directories: Dict[int, str] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+            self.directories[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self.directories.get(wd)
+            if directory is not None and name:
+                changed.add(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """mtime/크기 폴링. resolve()가 돌려주는 현재 대상 파일만 본다"""
+
+    def __init__(self, resolve: Callable[[], List[str]], interval: float = DEFAULT_POLL_INTERVAL):
+        self.resolve = resolve
+        self.interval = interval
+        self.stats = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        for path in self.resolve():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def wait(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+            current = self._snapshot()
+            changed = {path for path in current.keys() | self.stats.keys()
+                       if current.get(path) != self.stats.get(path)}
+            self.stats = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def _watch_directories(args: Sequence[str], targets: Iterable[str]) -> Set[str]:
+    directories = {os.path.dirname(os.path.abspath(path)) for path in targets}
+    for arg in args:
+        if os.path.isdir(arg):
+            for root, dirs, _ in os.walk(arg):
+                dirs[:] = [d for d in dirs if d not in ('.git', 'node_modules', '__pycache__')
+                           and not d.startswith('.')]
+                directories.add(os.path.abspath(root))
+    return directories
+
+
+# ========================================
+# 감시 루프
+# ========================================
+
+class Watcher:
+    """대상 파일들의 WatchedDocument를 유지하며 변경을 처리하고 결과를 out_dir에 기록"""
+
+    def __init__(self, args: Sequence[str], stages: Sequence[str], out_dir: str):
+        self.args = list(args) or list(DEFAULT_WATCH)
+        self.stages = list(stages)
+        self.out_dir = os.path.abspath(out_dir)
+        self.documents: Dict[str, WatchedDocument] = {}
+        self.written: Dict[str, str] = {}
+
+    def resolve(self) -> List[str]:
+        return [os.path.abspath(path) for path in expand_targets(self.args) if os.path.isfile(path)]
+
+    def output_path(self, path: str) -> str:
+        rel = os.path.relpath(path, REPO_ROOT)
+        if rel.startswith(os.pardir):
+            rel = os.path.basename(path)
+        output = os.path.join(self.out_dir, rel)
+        if os.path.abspath(output) == os.path.abspath(path):
+            raise ValueError(f"출력 경로가 원본과 같음: {path} (--out-dir 확인)")
+        return output
+
+    def process(self, path: str) -> Optional[str]:
+        """파일 하나를 처리하고 보고 문자열 반환 (바뀐 게 없으면 None)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            if self.documents.pop(path, None) is not None:
+                return f"🗑️ {os.path.relpath(path, REPO_ROOT)}: 삭제됨 (출력은 그대로 둠)"
+            return None
+        except (OSError, UnicodeDecodeError) as error:
+            return f"⚠️ {path}: 읽기 실패 ({error})"
+
+        started = time.perf_counter()
+        document = self.documents.get(path)
+        if document is None:
+            document = self.documents[path] = WatchedDocument(path, self.stages)
+            stats = document.load(content)
+        else:
+            stats = document.update(content)
+            if stats is None:
+                return None
+        output = document.output
+
+        name = os.path.relpath(path, REPO_ROOT)
+        work = "전체" if stats.full else f"조각 {stats.dirty}/{stats.chunks}"
+        summary = f"{name}: {work} (실행 {stats.transformed}), 수정 {stats.edits}"
+        if stats.full:
+            # 첫 처리/전체 처리: 문서 전체로 다시 확인 (조각 경계에 걸친 괄호까지)
+            issues = verify(content, path)
+            after = verify(output, path) if output != content else issues
+            added = [(issue.line, issue) for issue in new_issues(content, issues, output, after)]
+            summary += f", 원본 구문 오류 {len(issues)}"
+        else:
+            added = stats.added
+        if added:
+            line, issue = added[0]
+            elapsed = (time.perf_counter() - started) * 1000
+            return f"❌ {summary} | 단계가 새 구문 오류 {len(added)}개를 만듦, 저장 안 함: " \
+                   f"line {line}: {issue.message} ({elapsed:.1f} ms)"
+        target = self.output_path(path)
+        if self.written.get(path) != output:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_path = target + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(output)
+            os.replace(tmp_path, target)
+            self.written[path] = output
+        elapsed = (time.perf_counter() - started) * 1000
+        return f"✅ {summary} → {os.path.relpath(target, REPO_ROOT)} ({elapsed:.1f} ms)"
+
+    def process_all(self, paths: Iterable[str]):
+        for path in sorted(paths):
+            message = self.process(path)
+            if message:
+                print(message, flush=True)
+
+    def run(self, debounce: float, poll: bool, interval: float):
+        targets = self.resolve()
+        for path in targets:
+            self.output_path(path)  # 출력이 원본을 덮어쓰지 않는지 먼저 확인
+        self.process_all(targets)
+
+        watcher = None
+        if not poll:
+            try:
+                watcher = InotifyWatcher(_watch_directories(self.args, targets))
+                mode = 'inotify'
+            except OSError as error:
+                print(f"⚠️ inotify 사용 불가 ({error}), 폴링으로 전환")
+        if watcher is None:
+            watcher = PollingWatcher(self.resolve, interval)
+            mode = f'폴링 {interval * 1000:.0f} ms'
+        print(f"👀 {len(targets)}개 파일 감시 중 ({mode}, 디바운스 {debounce * 1000:.0f} ms) "
+              f"→ {os.path.relpath(self.out_dir, REPO_ROOT)}/", flush=True)
+
+        pending: Set[str] = set()
+        first_seen = 0.0
+        try:
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, min(debounce, first_seen + MAX_DELAY_MS / 1000 - time.monotonic()))
+                changed = watcher.wait(timeout)
+                if changed is None:  # 이벤트 큐가 넘침: 전부 다시 확인
+                    changed = set(self.resolve()) | set(self.documents)
+                if changed:
+                    relevant = changed & (set(self.resolve()) | set(self.documents))
+                    if relevant and not pending:
+                        first_seen = time.monotonic()
+                    pending |= relevant
+                    if not pending or time.monotonic() - first_seen < MAX_DELAY_MS / 1000:
+                        continue
+                if pending:
+                    batch, pending = pending, set()
+                    self.process_all(batch)
+        finally:
+            watcher.close()
+
+
+# ========================================
+# 벤치마크: 무작위 편집을 적용하며 전체 실행 결과와 대조
+# ========================================
+
+def _random_edit(content: str, rng: random.Random) -> str:
+    """줄 단위의 흔한 편집 하나 (줄 추가/삭제/한 글자 수정/console.log 추가)"""
+    lines = content.split('\n')
+    n = rng.randrange(len(lines))
+    choice = rng.random()
+    if choice < 0.3:
+        indent = lines[n][:len(lines[n]) - len(lines[n].lstrip())]
+        lines.insert(n, f"{indent}console.log('watch {n}', value);")
+    elif choice < 0.5 and len(lines) > 1:
+        del lines[n]
+    elif choice < 0.8 and lines[n]:
+        k = rng.randrange(len(lines[n]))
+        lines[n] = lines[n][:k] + rng.choice('abc;{}()`\'"/ ') + lines[n][k:]
+    else:
+        lines.insert(n, '')
+    return '\n'.join(lines)
+
+
+def run_benchmark(path: str, edits: int, stages: Sequence[str], seed: int = 0) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    rng = random.Random(seed)
+    document = WatchedDocument(path, stages)
+    stats = document.load(content)
+    print(f"📄 {path}: {len(content):,}자, JS 조각 {stats.chunks}개, 첫 처리 {stats.seconds * 1000:.0f} ms")
+
+    timings = []
+    full = mismatches = 0
+    for _ in range(edits):
+        content = _random_edit(content, rng)
+        started = time.perf_counter()
+        stats = document.update(content)
+        output = document.output
+        timings.append((time.perf_counter() - started) * 1000)
+        full += bool(stats and stats.full)
+        expected, _ = run_stages(content, stages, path)
+        if output != expected:
+            mismatches += 1
+    timings.sort()
+    print(f"⚡ 편집 {edits}회 (조각 갱신+검증): 중앙값 {statistics.median(timings):.1f} ms, "
+          f"p90 {timings[int(len(timings) * 0.9)]:.1f} ms, 최대 {timings[-1]:.1f} ms, 전체 처리 {full}회")
+    if mismatches:
+        print(f"❌ 전체 실행 결과와 다름: {mismatches}회")
+        return 1
+    print("✅ 모든 편집에서 전체 실행 결과와 일치")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장할 때마다 바뀐 조각만 다시 정리/검증")
+    parser.add_argument('files', nargs='*', help="감시할 파일/디렉터리/glob "
+                                                 "(기본: index.html, g-column-checkbox-handler.js, src/js)")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"쉼표로 구분한 단계 순서 (사용 가능: {', '.join(sorted(UNIT_SAFE_STAGES))})")
+    parser.add_argument('--out-dir', default=os.path.join(REPO_ROOT, DEFAULT_OUT_DIR), help="결과 저장 위치")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE_MS, help="저장 묶음 대기(ms)")
+    parser.add_argument('--poll', action='store_true', help="inotify 대신 폴링")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="폴링 간격(초)")
+    parser.add_argument('--once', action='store_true', help="한 번 처리하고 종료")
+    parser.add_argument('--bench', type=int, metavar='N', help="첫 대상 파일에 무작위 편집 N회로 지연/정확성 측정")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        print(f"❌ 알 수 없는 단계: {', '.join(unknown)}")
+        return 1
+
+    try:
+        if args.bench:
+            target = expand_targets(args.files)[0]
+            return run_benchmark(target, args.bench, stages, args.seed)
+        watcher = Watcher(args.files, stages, args.out_dir)
+        if args.once:
+            targets = watcher.resolve()
+            for path in targets:
+                watcher.output_path(path)
+            watcher.process_all(targets)
+            return 0
+        watcher.run(args.debounce / 1000, args.poll, args.interval)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())